@@ -0,0 +1,33 @@
+"""
+Offline benchmarks of the Table/View parsing of PyEZ.
+
+The recorded RPC replies of ``tests/unit/rpc-reply`` and
+``tests/unit/factory/rpc-reply`` are replayed through OpTable, CfgTable,
+CMDTable (StateMachine), the jxml transforms and ``to_json``, as recorded or
+scaled to any number of items by synthetic generators. No device is needed::
+
+    python -m benchmarks                       # every case, recorded + 10k
+    python -m benchmarks -s 10k,100k,1M -c cmdtable_columns
+    python -m benchmarks -o before.json        # save the results ...
+    python -m benchmarks --compare before.json # ... and compare with them
+
+Every case and size runs in its own interpreter, which reports the parsing
+throughput (items/sec, best of the repeats) and the peak RSS of the process
+while parsing.
+
+:mod:`benchmarks.netconf_server` is a NETCONF over SSH stand-in for a device
+answering the recorded replies, and :mod:`benchmarks.sessions` measures the
+session setup, RPC throughput and concurrent sessions end to end against it::
+
+    python -m benchmarks.sessions --sessions 1,8,32 --latency 0.005
+
+The ``lib`` directory of this checkout is put first on ``sys.path``, so the
+working tree is measured rather than an installed copy of junos-eznc.
+"""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, os.path.join(ROOT, "lib"))
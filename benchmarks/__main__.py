@@ -0,0 +1,291 @@
+"""
+Runs the benchmarks, see :mod:`benchmarks`.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks import ROOT
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows
+    resource = None
+
+_SUFFIXES = {"k": 10**3, "m": 10**6}
+
+
+def parse_size(size):
+    """
+    :returns: the number of items of :size: ("recorded", "500", "10k", "1M"),
+      None for the recorded reply
+    """
+    if size == "recorded":
+        return None
+    multiplier = _SUFFIXES.get(size[-1:].lower())
+    if multiplier is not None:
+        return int(float(size[:-1]) * multiplier)
+    return int(size)
+
+
+# -----------------------------------------------------------------------------
+# memory
+# -----------------------------------------------------------------------------
+
+
+def _reset_peak_rss():
+    """
+    Resets the peak RSS of the process, on Linux only.
+
+    :returns: True when the peak RSS was reset
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as fp:
+            fp.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _rss():
+    """
+    :returns: tuple of the current and peak RSS of the process in bytes; the
+      current RSS is None when unknown.
+    """
+    try:
+        with open("/proc/self/status") as fp:
+            status = dict(line.split(":", 1) for line in fp if ":" in line)
+        return (
+            int(status["VmRSS"].split()[0]) * 1024,
+            int(status["VmHWM"].split()[0]) * 1024,
+        )
+    except (OSError, KeyError, ValueError):
+        pass
+    if resource is None:
+        return None, None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes, but bytes on macOS
+    return None, peak if sys.platform == "darwin" else peak * 1024
+
+
+# -----------------------------------------------------------------------------
+# child process: one case and size
+# -----------------------------------------------------------------------------
+
+
+def measure(name, size, repeat, min_time):
+    """
+    Runs the case :name: on a reply of :size: items. The first run measures
+    the peak RSS, the next ones (at least :repeat:, for at least :min_time:
+    seconds) the time.
+
+    :returns: dict of the results
+    """
+    from benchmarks.cases import CASES
+
+    generate, setup, run = CASES[name]
+    payload = generate(parse_size(size))
+
+    arg = setup(payload)
+    gc.collect()
+    reset = _reset_peak_rss()
+    rss, _ = _rss()
+    items = run(arg)
+    _, peak = _rss()
+    del arg
+
+    times = []
+    while len(times) < repeat or sum(times) < min_time:
+        arg = setup(payload)
+        start = time.perf_counter()
+        run(arg)
+        times.append(time.perf_counter() - start)
+        del arg
+
+    best = min(times)
+    return {
+        "case": name,
+        "size": size,
+        "items": items,
+        "runs": len(times),
+        "seconds": best,
+        "items_per_sec": items / best if best else None,
+        "peak_rss": peak,
+        "rss_delta": peak - rss if reset and rss is not None else None,
+    }
+
+
+# -----------------------------------------------------------------------------
+# parent process
+# -----------------------------------------------------------------------------
+
+
+def _run_child(name, size, args):
+    cmd = [
+        sys.executable,
+        "-m",
+        "benchmarks",
+        "--child",
+        name,
+        size,
+        "--repeat",
+        str(args.repeat),
+        "--min-time",
+        str(args.min_time),
+    ]
+    proc = subprocess.run(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError("benchmark %s/%s failed" % (name, size))
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def _mb(value):
+    return "-" if value is None else "%.1f" % (value / 2.0**20)
+
+
+def _change(new, old):
+    if not new or not old:
+        return "-"
+    return "%+.1f%%" % ((new - old) * 100.0 / old)
+
+
+_HEADER = "%-24s %9s %9s %10s %12s %9s %9s"
+_ROW = "%-24s %9s %9d %10.5f %12.0f %9s %9s"
+
+
+def main(argv=None):
+    from benchmarks.cases import CASES
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Offline parsing benchmarks of the Tables and Views",
+    )
+    parser.add_argument(
+        "-c",
+        "--cases",
+        default=",".join(CASES),
+        help="comma separated cases (default: all of %(default)s)",
+    )
+    parser.add_argument(
+        "-s",
+        "--sizes",
+        default="recorded,10k",
+        help="comma separated number of items, e.g. 10k,100k,1M, or "
+        "'recorded' for the recorded replies (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3, help="minimum number of runs"
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=1.0, help="minimum time of the runs"
+    )
+    parser.add_argument("-o", "--output", help="save the results to a JSON file")
+    parser.add_argument(
+        "--compare", help="compare with the results saved in a JSON file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=10.0,
+        help="slow down in %% of items/sec reported as a regression by "
+        "--compare, which then exits with status 1 (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--child", nargs=2, metavar=("CASE", "SIZE"), help=argparse.SUPPRESS
+    )
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(
+            json.dumps(
+                measure(args.child[0], args.child[1], args.repeat, args.min_time)
+            )
+        )
+        return 0
+
+    cases = args.cases.split(",")
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error("unknown cases: %s" % ", ".join(sorted(unknown)))
+    sizes = args.sizes.split(",")
+    for size in sizes:
+        try:
+            parse_size(size)
+        except ValueError:
+            parser.error("invalid size: %s" % size)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as fp:
+            for result in json.load(fp)["results"]:
+                baseline[(result["case"], result["size"])] = result
+
+    header = (
+        "case",
+        "size",
+        "items",
+        "best s",
+        "items/sec",
+        "peak MB",
+        "+RSS MB",
+    )
+    line = _HEADER % header
+    if baseline:
+        line += " %9s %9s" % ("items/sec", "peak MB")
+    print(line)
+
+    results = []
+    regressions = []
+    for name in cases:
+        for size in sizes:
+            result = _run_child(name, size, args)
+            results.append(result)
+            line = _ROW % (
+                name,
+                size,
+                result["items"],
+                result["seconds"],
+                result["items_per_sec"] or 0,
+                _mb(result["peak_rss"]),
+                _mb(result["rss_delta"]),
+            )
+            old = baseline.get((name, size))
+            if old is not None:
+                line += " %9s %9s" % (
+                    _change(result["items_per_sec"], old["items_per_sec"]),
+                    _change(result["peak_rss"], old["peak_rss"]),
+                )
+                if result["items_per_sec"] and old["items_per_sec"]:
+                    if result["items_per_sec"] < old["items_per_sec"] * (
+                        1 - args.threshold / 100.0
+                    ):
+                        regressions.append("%s/%s" % (name, size))
+            print(line)
+            sys.stdout.flush()
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                fp,
+                indent=2,
+            )
+
+    if regressions:
+        print("regressions: %s" % ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,158 @@
+"""
+Benchmark cases, registered in :data:`CASES` by name.
+
+A case is made of:
+
+* a generator, called once with the number of items (``None`` for the
+  recorded reply) and returning the payload of the reply,
+* a setup, called before every run out of the timing, turning the payload
+  into the argument of the run,
+* the run itself, which parses the argument and returns the number of
+  parsed items.
+"""
+
+from collections import OrderedDict
+
+from jnpr.junos import jxml as JXML
+from jnpr.junos.command.fpc_link_stats import FPCLinkStats
+from jnpr.junos.command.fpc_threads import FPCThread
+from jnpr.junos.op.lldp import LLDPNeighborTable
+from jnpr.junos.op.phyport import PhyPortStatsTable
+from jnpr.junos.resources.user import UserTable
+from lxml import etree
+
+from benchmarks import generators
+
+CASES = OrderedDict()
+
+# as ncclient parses the replies
+_PARSER = etree.XMLParser(huge_tree=True)
+
+_normalize = etree.XSLT(etree.XML(JXML.normalize_xslt))
+
+
+def case(name, generate, setup=None):
+    def register(run):
+        CASES[name] = (generate, setup or (lambda payload: payload), run)
+        return run
+
+    return register
+
+
+# -----------------------------------------------------------------------------
+# generators
+# -----------------------------------------------------------------------------
+
+
+def _neighbors(count):
+    return generators.scale_xml(
+        generators.fixture(
+            "factory", "rpc-reply", "get-lldp-neighbors-information.xml"
+        ),
+        "lldp-neighbor-information",
+        "lldp-local-port-id",
+        count,
+    )
+
+
+def _interfaces(count):
+    return generators.scale_xml(
+        generators.fixture("factory", "rpc-reply", "get-interface-information.xml"),
+        "physical-interface",
+        "name",
+        count,
+    )
+
+
+def _users(count):
+    return generators.scale_xml(
+        generators.fixture("factory", "rpc-reply", "user.xml"), "user", "name", count
+    )
+
+
+def _reply(payload):
+    """
+    :returns: the content of the <rpc-reply> :payload:, as returned by an RPC
+      with the default transform of the OpTables
+    """
+    root = JXML.remove_namespaces_and_spaces(etree.fromstring(payload, _PARSER))
+    return root[0] if root.tag == "rpc-reply" else root
+
+
+def _neighbors_tree(payload):
+    root = etree.fromstring(payload, _PARSER)
+    return root, len(root.findall(".//{*}lldp-neighbor-information"))
+
+
+# -----------------------------------------------------------------------------
+# OpTable
+# -----------------------------------------------------------------------------
+
+
+@case("optable", _neighbors)
+def optable(payload):
+    return len(LLDPNeighborTable(xml=_reply(payload)).items())
+
+
+@case("optable_to_json", _neighbors)
+def optable_to_json(payload):
+    tbl = LLDPNeighborTable(xml=_reply(payload))
+    tbl.to_json()
+    return len(tbl)
+
+
+# interfaces extensive, ~17kB of XML per item
+@case("optable_interfaces", _interfaces)
+def optable_interfaces(payload):
+    return len(PhyPortStatsTable(xml=_reply(payload)).items())
+
+
+# -----------------------------------------------------------------------------
+# CfgTable
+# -----------------------------------------------------------------------------
+
+
+@case("cfgtable", _users)
+def cfgtable(payload):
+    return len(UserTable(xml=etree.fromstring(payload, _PARSER)).items())
+
+
+# -----------------------------------------------------------------------------
+# CMDTable / StateMachine
+# -----------------------------------------------------------------------------
+
+
+@case("cmdtable_columns", generators.threads_output)
+def cmdtable_columns(raw):
+    return len(FPCThread(raw=raw).get().output)
+
+
+@case("cmdtable_delimiter", generators.link_stats_output)
+def cmdtable_delimiter(raw):
+    return len(FPCLinkStats(raw=raw).get().output)
+
+
+@case("cmdtable_to_json", generators.threads_output)
+def cmdtable_to_json(raw):
+    tbl = FPCThread(raw=raw).get()
+    tbl.to_json()
+    return len(tbl.output)
+
+
+# -----------------------------------------------------------------------------
+# jxml transforms, applied in place or to a tree parsed out of the timing
+# -----------------------------------------------------------------------------
+
+
+@case("jxml_remove_namespaces", _neighbors, _neighbors_tree)
+def jxml_remove_namespaces(tree):
+    root, items = tree
+    JXML.remove_namespaces_and_spaces(root)
+    return items
+
+
+@case("jxml_normalize", _neighbors, _neighbors_tree)
+def jxml_normalize(tree):
+    root, items = tree
+    _normalize(root)
+    return items
@@ -0,0 +1,101 @@
+"""
+Recorded RPC replies of the unit tests and synthetic replies scaled from them.
+"""
+
+import os
+
+from lxml import etree
+
+from benchmarks import ROOT
+
+# placeholders replaced while generating the synthetic replies
+_ITEMS = "__BENCH_ITEMS__"
+_KEY = "__BENCH_KEY__"
+
+
+def fixture(*path):
+    """
+    :returns: bytes of the recorded reply :path: relative to ``tests/unit``
+    """
+    with open(os.path.join(ROOT, "tests", "unit", *path), "rb") as fp:
+        return fp.read()
+
+
+def scale_xml(reply, item, key, count):
+    """
+    Replicates the :item: elements of the XML :reply: into :count: items,
+    whose :key: child is made unique.
+
+    :param bytes reply: recorded XML reply
+    :param str item: tag of the items, e.g. ``physical-interface``
+    :param str key: tag of the key of the items, e.g. ``name``
+    :param int count: number of items of the generated reply
+
+    :returns: bytes of the generated reply, or :reply: when :count: is None
+    """
+    if count is None:
+        return reply
+    root = etree.fromstring(reply)
+    first = root.find(".//{*}" + item)
+    if first is None:
+        raise ValueError("no <%s> item in the reply" % item)
+    parent = first.getparent()
+    items = parent.findall("{*}" + item)
+    for elem in items:
+        parent.remove(elem)
+
+    # every item is serialized in place, so that it does not redeclare the
+    # namespaces of its ancestors
+    templates = []
+    parent.text = _ITEMS
+    for elem in items:
+        name = elem.find("{*}" + key)
+        name.text = "%s-%s" % (name.text.strip(), _KEY)
+        elem.tail = _ITEMS
+        parent.append(elem)
+        templates.append(etree.tostring(root, encoding="unicode").split(_ITEMS)[1])
+        parent.remove(elem)
+
+    head, tail = etree.tostring(root, encoding="unicode").split(_ITEMS)
+    body = "".join(
+        templates[i % len(templates)].replace(_KEY, str(i)) for i in range(count)
+    )
+    return (head + body + tail).encode()
+
+
+def output(reply):
+    """
+    :returns: the text of the recorded ``<output>`` of a CMDTable
+    """
+    return etree.fromstring(reply).text
+
+
+def threads_output(count):
+    """
+    :returns: ``show threads`` output of :count: threads, or the recorded one
+      when :count: is None
+    """
+    recorded = output(fixture("factory", "rpc-reply", "show_threads.xml"))
+    if count is None:
+        return recorded
+    lines = recorded.splitlines()
+    header = lines[: lines.index(next(i for i in lines if i.startswith("---"))) + 1]
+    rows = [
+        "%5d M  asleep    %-22s %5d/8192   0/0/%d ms  0%%"
+        % (i, "Thread %d" % i, 200 + i % 1000, i)
+        for i in range(count)
+    ]
+    return "\n".join(header + rows) + "\n"
+
+
+def link_stats_output(count):
+    """
+    :returns: ``show link stats`` output of :count: counters, or the recorded
+      one when :count: is None
+    """
+    recorded = output(fixture("factory", "rpc-reply", "show_link_stats.xml"))
+    if count is None:
+        return recorded
+    header = recorded.splitlines()[:3]
+    rows = ["Protocol %d: %d" % (i, i * 7) for i in range(count)]
+    return "\n".join(header + rows) + "\n"
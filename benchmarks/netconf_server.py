@@ -0,0 +1,428 @@
+"""
+NETCONF over SSH stand-in for a Junos device, for load and latency tests.
+
+The server answers the RPCs with the recorded replies of ``tests/unit/rpc-reply``
+and ``tests/unit/factory/rpc-reply`` (or of other directories): ``<foo-bar/>``
+is answered with ``foo-bar.xml`` (``foo-bar.json`` for ``format="json"``),
+``<command>show foo</command>`` with ``show-foo.xml``. Other RPCs are answered
+with an ``<rpc-error>``, ``<close-session/>`` with ``<ok/>``.
+
+Latency, jitter, minimum reply size, injected errors and dropped replies are
+configurable::
+
+    from jnpr.junos import Device
+    from benchmarks.netconf_server import NetconfServer
+
+    with NetconfServer(latency=0.01, jitter=0.005) as server:
+        with Device(host=server.host, port=server.port, user='bench',
+                    passwd='bench', gather_facts=False) as dev:
+            dev.rpc.get_software_information()
+
+or from the command line, in its own process::
+
+    python -m benchmarks.netconf_server --port 8300 --latency 0.01
+
+Like Junos, the server only advertises the NETCONF base:1.0 capability, so
+the messages are framed with the ``]]>]]>`` delimiter.
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import socket
+import sys
+import threading
+import time
+
+import paramiko
+from lxml import etree
+
+from benchmarks import ROOT
+
+logger = logging.getLogger("benchmarks.netconf_server")
+
+REPLY_DIRS = [
+    os.path.join(ROOT, "tests", "unit", "rpc-reply"),
+    os.path.join(ROOT, "tests", "unit", "factory", "rpc-reply"),
+]
+
+DELIMITER = b"]]>]]>"
+
+_HELLO = """\
+<hello xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+  <capabilities>
+    <capability>urn:ietf:params:netconf:base:1.0</capability>
+    <capability>urn:ietf:params:netconf:capability:candidate:1.0</capability>
+    <capability>urn:ietf:params:netconf:capability:confirmed-commit:1.0</capability>
+    <capability>urn:ietf:params:netconf:capability:validate:1.0</capability>
+    <capability>urn:ietf:params:netconf:capability:url:1.0?scheme=http,ftp,file</capability>
+    <capability>http://xml.juniper.net/netconf/junos/1.0</capability>
+    <capability>http://xml.juniper.net/dmi/system/1.0</capability>
+  </capabilities>
+  <session-id>%d</session-id>
+</hello>"""
+
+_OK = """\
+<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+<ok/>
+</rpc-reply>"""
+
+_RPC_ERROR = """\
+<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+<rpc-error>
+<error-type>protocol</error-type>
+<error-tag>operation-failed</error-tag>
+<error-severity>error</error-severity>
+<error-message>%s</error-message>
+</rpc-error>
+</rpc-reply>"""
+
+_PADDING = "<!-- %s -->\n" % ("x" * 1000)
+
+
+class NetconfServer(object):
+    """
+    NETCONF server listening on a local TCP port, every connection is
+    served by its own threads.
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        user="bench",
+        password="bench",
+        reply_dirs=None,
+        latency=0.0,
+        jitter=0.0,
+        reply_size=None,
+        error_rate=0.0,
+        drop_rate=0.0,
+        host_key=None,
+        seed=None,
+    ):
+        """
+        :param str host: *OPTIONAL* address to listen on
+        :param int port: *OPTIONAL* port to listen on, 0 for any free port
+        :param str user: *OPTIONAL* login of the clients
+        :param str password: *OPTIONAL* password of the clients
+        :param list reply_dirs:
+          *OPTIONAL* directories of the recorded replies, searched in order,
+          defaults to :data:`REPLY_DIRS`
+        :param float latency: *OPTIONAL* seconds to wait before every reply
+        :param float jitter:
+          *OPTIONAL* the wait before the replies varies uniformly by up to
+          +/- :jitter: seconds
+        :param int reply_size:
+          *OPTIONAL* replies smaller than :reply_size: bytes are padded with
+          XML comments
+        :param float error_rate:
+          *OPTIONAL* probability (0 to 1) of answering an ``<rpc-error>``
+        :param float drop_rate:
+          *OPTIONAL* probability (0 to 1) of never answering an RPC
+        :param str host_key:
+          *OPTIONAL* file name of the RSA host key, generated by default
+        :param int seed: *OPTIONAL* seed of the error and latency draws
+        """
+        self.user = user
+        self.password = password
+        self.reply_dirs = reply_dirs or REPLY_DIRS
+        self.latency = latency
+        self.jitter = jitter
+        self.reply_size = reply_size
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        if host_key is not None:
+            self.host_key = paramiko.RSAKey(filename=host_key)
+        else:
+            self.host_key = paramiko.RSAKey.generate(2048)
+        self._random = random.Random(seed)
+        self._replies = {}
+        self._lock = threading.Lock()
+        self._session_id = 0
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind((host, port))
+        self._thread = None
+        self._transports = set()
+        self.stats = {"sessions": 0, "rpcs": 0, "errors": 0, "dropped": 0}
+
+    @property
+    def host(self):
+        return self._sock.getsockname()[0]
+
+    @property
+    def port(self):
+        return self._sock.getsockname()[1]
+
+    # -------------------------------------------------------------------------
+    # start/stop
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """
+        Starts accepting connections in a background thread.
+
+        :returns NetconfServer: *self*
+        """
+        self._sock.listen(128)
+        self._thread = threading.Thread(target=self._accept, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops listening and closes all of the connections.
+        """
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        with self._lock:
+            transports = list(self._transports)
+        for transport in transports:
+            transport.close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def serve_forever(self):
+        if self._thread is None:
+            self.start()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                # socket closed by stop()
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._connect, args=(conn,), daemon=True).start()
+
+    def _connect(self, conn):
+        transport = paramiko.Transport(conn)
+        transport.add_server_key(self.host_key)
+        transport.set_subsystem_handler("netconf", _NetconfSession, self)
+        with self._lock:
+            self._transports.add(transport)
+        try:
+            transport.start_server(server=_SSHServer(self))
+            # the channel is served by the subsystem handler, but is closed
+            # once garbage collected
+            channel = transport.accept(30)
+            transport.join()
+            if channel is not None:
+                channel.close()
+        except Exception as ex:
+            logger.debug("connection failed: %s" % ex)
+        finally:
+            transport.close()
+            with self._lock:
+                self._transports.discard(transport)
+
+    # -------------------------------------------------------------------------
+    # replies
+    # -------------------------------------------------------------------------
+
+    def _next_session_id(self):
+        with self._lock:
+            self._session_id += 1
+            self.stats["sessions"] += 1
+            return self._session_id
+
+    def _recorded(self, fname):
+        """
+        :returns: the recorded reply :fname:, as an <rpc-reply>, or None
+        """
+        if fname not in self._replies:
+            reply = None
+            for dirname in self.reply_dirs:
+                path = os.path.join(dirname, fname)
+                if os.path.isfile(path):
+                    with open(path) as fp:
+                        reply = fp.read().strip()
+                    if not reply.startswith("<rpc-reply"):
+                        reply = "<rpc-reply>\n%s\n</rpc-reply>" % reply
+                    break
+            self._replies[fname] = reply
+        return self._replies[fname]
+
+    def reply(self, rpc):
+        """
+        :param rpc: the operation element of an <rpc>
+
+        :returns: the <rpc-reply> to :rpc:, without message-id, or None when
+          the reply is dropped
+        """
+        with self._lock:
+            self.stats["rpcs"] += 1
+            draw = self._random.random()
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            if draw < self.drop_rate:
+                self.stats["dropped"] += 1
+                return None
+            error = draw < self.drop_rate + self.error_rate
+            if error:
+                self.stats["errors"] += 1
+        if delay > 0:
+            time.sleep(delay)
+
+        name = etree.QName(rpc).localname
+        if error:
+            reply = _RPC_ERROR % "injected error"
+        elif name == "close-session":
+            reply = _OK
+        else:
+            if name == "command":
+                name = re.sub(r"\W+", "-", rpc.text or "").strip("-")
+            reply = None
+            if rpc.get("format", "").lower() == "json":
+                reply = self._recorded(name + ".json")
+            if reply is None:
+                reply = self._recorded(name + ".xml")
+            if reply is None:
+                reply = _RPC_ERROR % ("syntax error: " + name)
+
+        if self.reply_size and len(reply) < self.reply_size:
+            index = reply.rindex("</rpc-reply>")
+            count = (self.reply_size - len(reply)) // len(_PADDING) + 1
+            reply = reply[:index] + _PADDING * count + reply[index:]
+        return reply
+
+
+class _SSHServer(paramiko.ServerInterface):
+    """
+    Password authentication and the "netconf" subsystem only.
+    """
+
+    def __init__(self, server):
+        self._server = server
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        if username == self._server.user and password == self._server.password:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+
+class _NetconfSession(paramiko.SubsystemHandler):
+    """
+    Serves the NETCONF messages of a channel.
+    """
+
+    def __init__(self, channel, name, ssh_server, server):
+        super(_NetconfSession, self).__init__(channel, name, ssh_server)
+        self._server = server
+
+    def start_subsystem(self, name, transport, channel):
+        channel.sendall((_HELLO % self._server._next_session_id()).encode() + DELIMITER)
+        buf = bytearray()
+        start = 0
+        while True:
+            data = channel.recv(65536)
+            if not data:
+                return
+            buf += data
+            while True:
+                # the delimiter may straddle the previous and the new data
+                end = buf.find(DELIMITER, start)
+                if end < 0:
+                    start = max(0, len(buf) - len(DELIMITER) + 1)
+                    break
+                message = bytes(buf[:end])
+                del buf[: end + len(DELIMITER)]
+                start = 0
+                if not self._handle(channel, message):
+                    return
+
+    def _handle(self, channel, message):
+        """
+        Answers the :message: of the client.
+
+        :returns: False when the session is closed
+        """
+        root = etree.fromstring(message)
+        if etree.QName(root).localname == "hello":
+            return True
+        rpc = root[0]
+        reply = self._server.reply(rpc)
+        if reply is not None:
+            message_id = root.get("message-id")
+            if message_id is not None:
+                reply = reply.replace(
+                    "<rpc-reply", '<rpc-reply message-id="%s"' % message_id, 1
+                )
+            channel.sendall(reply.encode() + DELIMITER)
+        return etree.QName(rpc).localname != "close-session"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.netconf_server",
+        description="NETCONF over SSH stand-in server answering recorded replies",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8300, help="0 for any free port")
+    parser.add_argument("--user", default="bench")
+    parser.add_argument("--password", default="bench")
+    parser.add_argument(
+        "--reply-dir",
+        action="append",
+        dest="reply_dirs",
+        help="directory of recorded replies, repeatable (default: the unit tests')",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--reply-size", type=int, help="minimum reply size in bytes")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--host-key", help="RSA host key file")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+    # clients dropping the connection once closed are logged as errors
+    logging.getLogger("paramiko.transport").setLevel(logging.CRITICAL)
+
+    server = NetconfServer(
+        host=args.host,
+        port=args.port,
+        user=args.user,
+        password=args.password,
+        reply_dirs=args.reply_dirs,
+        latency=args.latency,
+        jitter=args.jitter,
+        reply_size=args.reply_size,
+        error_rate=args.error_rate,
+        drop_rate=args.drop_rate,
+        host_key=args.host_key,
+        seed=args.seed,
+    )
+    server.start()
+    # read by benchmarks.sessions to find the port, once listening
+    print("listening on %s:%d" % (server.host, server.port))
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
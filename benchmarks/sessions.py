@@ -0,0 +1,190 @@
+"""
+End to end benchmark of NETCONF sessions against the stand-in server of
+:mod:`benchmarks.netconf_server`, run in its own process.
+
+For every number of concurrent sessions, the sessions are opened at once
+with ``Device.open()``, then every session executes its RPCs back to back::
+
+    python -m benchmarks.sessions --sessions 1,8,32 --rpcs 200 --latency 0.005
+
+reports the session setup time, the RPC throughput of all of the sessions
+and the latency of the RPCs.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+
+from jnpr.junos import Device
+from jnpr.junos.exception import RpcError, RpcTimeoutError
+
+from benchmarks import ROOT
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent / 100.0))]
+
+
+def start_server(server_args):
+    """
+    Starts :mod:`benchmarks.netconf_server` in a child process.
+
+    :returns: tuple of the process and of its port
+    """
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.netconf_server", "--port", "0"]
+        + server_args,
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = proc.stdout.readline()
+    if not line.startswith("listening on "):
+        proc.kill()
+        raise RuntimeError("the NETCONF server did not start")
+    return proc, int(line.rsplit(":", 1)[1])
+
+
+def run(port, sessions, rpcs, rpc, timeout):
+    """
+    Opens :sessions: sessions on :port:, each executing :rpcs: times the
+    :rpc:.
+
+    :returns: dict of the results
+    """
+    opens = []
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    start = []
+    barrier = threading.Barrier(sessions, action=lambda: start.append(time.time()))
+
+    def session():
+        began = time.time()
+        dev = Device(
+            host="127.0.0.1",
+            port=port,
+            user="bench",
+            passwd="bench",
+            gather_facts=False,
+        )
+        dev.open()
+        dev.timeout = timeout
+        opened = time.time() - began
+        barrier.wait()
+        times = []
+        failed = 0
+        for _ in range(rpcs):
+            began = time.time()
+            try:
+                dev.execute(rpc)
+            except (RpcError, RpcTimeoutError):
+                failed += 1
+            times.append(time.time() - began)
+        dev.close()
+        with lock:
+            opens.append(opened)
+            latencies.extend(times)
+            errors.append(failed)
+
+    threads = [threading.Thread(target=session) for _ in range(sessions)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start[0]
+
+    return {
+        "sessions": sessions,
+        "rpcs": sessions * rpcs,
+        "open_mean": sum(opens) / len(opens),
+        "open_max": max(opens),
+        "rpcs_per_sec": sessions * rpcs / elapsed,
+        "latency_p50": _percentile(latencies, 50),
+        "latency_p99": _percentile(latencies, 99),
+        "errors": sum(errors),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.sessions",
+        description="End to end NETCONF session benchmark against a local "
+        "stand-in server",
+    )
+    parser.add_argument(
+        "--sessions",
+        default="1,4,16",
+        help="comma separated numbers of concurrent sessions (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--rpcs", type=int, default=100, help="RPCs per session (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--rpc",
+        default="<get-software-information/>",
+        help="RPC executed by the sessions (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--timeout", type=int, default=30, help="RPC timeout in seconds"
+    )
+    parser.add_argument("-o", "--output", help="save the results to a JSON file")
+    # passed to the server
+    for option in ("--latency", "--jitter", "--error-rate", "--drop-rate"):
+        parser.add_argument(option, help="see python -m benchmarks.netconf_server")
+    parser.add_argument("--reply-size", help="see python -m benchmarks.netconf_server")
+    args = parser.parse_args(argv)
+
+    server_args = []
+    for option in ("latency", "jitter", "error_rate", "drop_rate", "reply_size"):
+        value = getattr(args, option)
+        if value is not None:
+            server_args += ["--" + option.replace("_", "-"), value]
+
+    proc, port = start_server(server_args)
+    results = []
+    try:
+        print(
+            "%8s %10s %10s %10s %10s %10s %8s"
+            % (
+                "sessions",
+                "open ms",
+                "open max",
+                "rpcs/sec",
+                "p50 ms",
+                "p99 ms",
+                "errors",
+            )
+        )
+        for sessions in [int(i) for i in args.sessions.split(",")]:
+            result = run(port, sessions, args.rpcs, args.rpc, args.timeout)
+            results.append(result)
+            print(
+                "%8d %10.1f %10.1f %10.0f %10.2f %10.2f %8d"
+                % (
+                    sessions,
+                    result["open_mean"] * 1000,
+                    result["open_max"] * 1000,
+                    result["rpcs_per_sec"],
+                    result["latency_p50"] * 1000,
+                    result["latency_p99"] * 1000,
+                    result["errors"],
+                )
+            )
+            sys.stdout.flush()
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump({"results": results}, fp, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
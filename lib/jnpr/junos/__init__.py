@@ -2,6 +2,7 @@ import json
 import logging
 
 import yaml
+from jnpr.junos.asyncdevice import AsyncDevice
 from jnpr.junos.console import Console
 from jnpr.junos.device import Device
 from jnpr.junos.factory.to_json import PyEzJSONEncoder
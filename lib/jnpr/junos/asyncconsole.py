@@ -0,0 +1,384 @@
+"""
+Console sessions driven by an ``asyncio`` event loop, so that a single
+thread logs in to many consoles at once, e.g. to all of the ports of a
+terminal server.
+
+:class:`AsyncConsole` runs the login and logout state-machines of
+:class:`jnpr.junos.transport.tty.Terminal` on the event loop: the console is
+read as text arrives and the state-machine waits are ``asyncio.sleep()``,
+rather than each console blocking a thread. :class:`ConsoleGroup` runs an
+operation on many consoles, a bounded number of them at a time::
+
+    from jnpr.junos.asyncconsole import ConsoleGroup
+    from jnpr.junos.utils.config import Config
+
+    def bootstrap(dev):
+        cu = Config(dev)
+        cu.load(path='noob.conf', format='text')
+        cu.commit()
+
+    group = ConsoleGroup(range(7001, 7049), host='opengear1', user='root',
+                         max_workers=16, progress=print)
+    for name, result in group.run(bootstrap):
+        ...
+
+.. note::
+    The consoles are watched with ``loop.add_reader()``, which requires a
+    selector event loop. Serial ports are only supported on POSIX.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from jnpr.junos.console import Console
+
+logger = logging.getLogger("jnpr.junos.asyncconsole")
+
+# -----------------------------------------------------------------------------
+# state-machines on the event loop
+# -----------------------------------------------------------------------------
+
+
+async def _expect(tty, pattern, timeout, idle=False):
+    """
+    reads from :tty: as data arrives until :pattern: matches, the event loop
+    counterpart of :meth:`jnpr.junos.transport.tty.Terminal._expect`
+    """
+    loop = asyncio.get_running_loop()
+    readable = asyncio.Event()
+    rxb = bytearray()
+    data = tty._rx_unread()
+    loop.add_reader(tty._rx, readable.set)
+    try:
+        deadline = loop.time() + timeout
+        while True:
+            if data:
+                found = tty._expect_search(rxb, data, pattern)
+                if found is not None:
+                    return bytes(rxb), found
+                if idle:
+                    deadline = loop.time() + timeout
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return bytes(rxb), None
+            try:
+                await asyncio.wait_for(readable.wait(), remaining)
+            except asyncio.TimeoutError:
+                return bytes(rxb), None
+            readable.clear()
+            data = tty._tty_recv(0)
+            if data is None:
+                return bytes(rxb), None
+    finally:
+        loop.remove_reader(tty._rx)
+
+
+async def _run_events(tty, events):
+    """
+    runs the state-machine :events: of :tty: to its end, the event loop
+    counterpart of :meth:`jnpr.junos.transport.tty.Terminal._run_events`
+    """
+    result = None
+    while True:
+        try:
+            request = events.send(result)
+        except StopIteration as stop:
+            return stop.value
+        if request is None:
+            result = tty._prompt_found(*await _expect(tty, *tty._prompt_expect()))
+        elif isinstance(request, tuple):
+            result = await _expect(tty, *request)
+        else:
+            await asyncio.sleep(request)
+            result = None
+
+
+def _login_events(tty):
+    # the state-machines of Terminal.login()
+    tty.state = tty._ST_INIT
+    yield from tty._login_events()
+    logger.info("TTY: OK.....starting NETCONF")
+    yield from tty.nc._open_events(at_shell=tty.at_shell)
+    tty.session_id = tty.nc._session_id
+
+
+def _logout_events(tty):
+    # the state-machines of Terminal.logout()
+    yield from tty.nc._close_events()
+    yield from tty._logout_events()
+
+
+def _console_name(kvargs):
+    host, port = kvargs.get("host"), kvargs.get("port")
+    if host is None:
+        return str(port)
+    return "{}:{}".format(host, port)
+
+
+# -----------------------------------------------------------------------------
+# AsyncConsole
+# -----------------------------------------------------------------------------
+
+
+class AsyncConsole(object):
+    """
+    Junos Console class driven by an ``asyncio`` event loop.
+
+    Takes the same arguments as :class:`jnpr.junos.console.Console`.
+    :meth:`open` and :meth:`close` are coroutines logging in and out of the
+    console on the event loop. Once open, the
+    :class:`jnpr.junos.console.Console` is used with its blocking API, e.g.
+    in an executor with :meth:`run`::
+
+        async with AsyncConsole(host='opengear1', port=7001) as dev:
+            version = await dev.run(lambda console: console.facts['version'])
+
+    .. note::
+        The connection to the console (telnet, SSH or serial port) is opened
+        in the default executor of the event loop.
+    """
+
+    def __init__(self, **kvargs):
+        """
+        AsyncConsole object constructor, see
+        :meth:`jnpr.junos.console.Console.__init__`.
+        """
+        self._console = Console(**kvargs)
+        self._name = _console_name(kvargs)
+
+    # -----------------------------------------------------------------------
+    # PROPERTIES
+    # -----------------------------------------------------------------------
+
+    @property
+    def console(self):
+        """
+        :returns: the underlying :class:`jnpr.junos.console.Console`
+        """
+        return self._console
+
+    @property
+    def connected(self):
+        return self._console.connected
+
+    # -----------------------------------------------------------------------
+    # open/close
+    # -----------------------------------------------------------------------
+
+    async def open(self, **kvargs):
+        """
+        Opens the connection to the console, logs in and starts the NETCONF
+        session, see :meth:`jnpr.junos.console.Console.open`.
+
+        :param kvargs: passed to :meth:`jnpr.junos.console.Console.open`,
+          e.g. ``gather_facts``.
+
+        :returns AsyncConsole: AsyncConsole instance (*self*).
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._tty_open)
+        tty = self._console._tty
+        try:
+            await _run_events(tty, _login_events(tty))
+        except Exception as ex:
+            logger.error("Exception occurred: {}:{}\n".format("login", str(ex)))
+            self._tty_close()
+            raise
+        await loop.run_in_executor(
+            None, functools.partial(self._console._tty_opened, **kvargs)
+        )
+        return self
+
+    async def close(self):
+        """
+        Logs out of the console only if connected, see
+        :meth:`jnpr.junos.console.Console.close`.
+        """
+        if self._console.connected is not True:
+            return
+        try:
+            await _run_events(self._console._tty, _logout_events(self._console._tty))
+        finally:
+            self._console.connected = False
+
+    async def run(self, func, *vargs, **kvargs):
+        """
+        Runs ``func(console, *vargs, **kvargs)`` in the default executor of
+        the event loop.
+
+        :returns: the return value of **func**
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, functools.partial(func, self._console, *vargs, **kvargs)
+        )
+
+    def _tty_open(self):
+        self._console._tty_create()
+        tty = self._console._tty
+        logger.info("TTY: connecting to TTY:{} ...".format(tty.tty_name))
+        tty._tty_open()
+
+    def _tty_close(self):
+        try:
+            self._console._tty._tty_close()
+        except Exception as ex:
+            logger.error("close of {} hit exception: {}".format(self._name, ex))
+
+    # -----------------------------------------------------------------------
+    # Context Manager
+    # -----------------------------------------------------------------------
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._console.connected:
+            await self.close()
+
+    def __repr__(self):
+        return "AsyncConsole(%s)" % self._name
+
+
+# -----------------------------------------------------------------------------
+# ConsoleGroup
+# -----------------------------------------------------------------------------
+
+
+class ConsoleGroup(object):
+    """
+    A set of consoles on which the same operation is run concurrently, e.g.
+    to bootstrap the devices behind the ports of a terminal server.
+
+    All of the consoles are logged in and out of by one event loop, see
+    :class:`AsyncConsole`, and the operation runs in a pool of
+    **max_workers** threads. Only **max_workers** consoles are worked on at
+    a time. The operation returns a ``list`` of ``(name, result)`` tuples, in
+    the order of the consoles. When a console fails, ``result`` is the
+    exception which was raised, the other consoles are not affected. The
+    name of a console is ``<host>:<port>``, or the serial port.
+    """
+
+    def __init__(self, consoles, max_workers=10, progress=None, **kvargs):
+        """
+        ConsoleGroup object constructor.
+
+        :param list consoles:
+            **REQUIRED** The consoles, each of them either a port (the TCP
+            port of the terminal server, or the serial port) or a ``dict``
+            of :class:`jnpr.junos.console.Console` arguments.
+
+        :param int max_workers:
+            *OPTIONAL* maximum number of consoles worked on at the same time,
+            default is 10.
+
+        :param callable progress:
+            *OPTIONAL* called with ``(name, state)`` as each console goes
+            through the states ``open``, ``run``, ``close`` and then ``done``
+            or ``failed``. It is called from the event loop and must not
+            block.
+
+        :param kvargs:
+            *OPTIONAL* :class:`jnpr.junos.console.Console` arguments common
+            to all of the consoles, e.g. ``host`` (the terminal server),
+            ``user`` or ``passwd``. They are overridden by the per-console
+            arguments.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._consoles = [
+            dict(console) if isinstance(console, dict) else dict(port=console)
+            for console in consoles
+        ]
+        self._max_workers = max_workers
+        self._progress = progress
+        self._kvargs = kvargs
+
+    # -----------------------------------------------------------------------
+    # PROPERTIES
+    # -----------------------------------------------------------------------
+
+    @property
+    def names(self):
+        """
+        :returns: ``list`` of the names of the consoles in the group
+        """
+        return [_console_name(self._params(console)) for console in self._consoles]
+
+    # -----------------------------------------------------------------------
+    # PUBLIC METHODS
+    # -----------------------------------------------------------------------
+
+    def run(self, func, *vargs, **kvargs):
+        """
+        Opens every console of the group, runs
+        ``func(console, *vargs, **kvargs)`` with the
+        :class:`jnpr.junos.console.Console` instance and closes the console
+        again. This runs an event loop until done, use :meth:`run_async`
+        from a running event loop.
+
+        :param callable func: its return value is the result for that
+          console.
+
+        :returns: ``list`` of ``(name, result or exception)``
+        """
+        return asyncio.run(self.run_async(func, *vargs, **kvargs))
+
+    async def run_async(self, func, *vargs, **kvargs):
+        """
+        Coroutine counterpart of :meth:`run`.
+        """
+        semaphore = asyncio.Semaphore(self._max_workers)
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        call = functools.partial(self._call, semaphore, executor, func, vargs, kvargs)
+        try:
+            return await asyncio.gather(*[call(console) for console in self._consoles])
+        finally:
+            executor.shutdown(wait=False)
+
+    # -----------------------------------------------------------------------
+    # PRIVATE METHODS
+    # -----------------------------------------------------------------------
+
+    def _params(self, console):
+        params = dict(self._kvargs)
+        params.update(console)
+        return params
+
+    async def _call(self, semaphore, executor, func, vargs, kvargs, console):
+        params = self._params(console)
+        name = _console_name(params)
+        async with semaphore:
+            dev = AsyncConsole(**params)
+            loop = asyncio.get_running_loop()
+            try:
+                self._report(name, "open")
+                await dev.open()
+                try:
+                    self._report(name, "run")
+                    result = await loop.run_in_executor(
+                        executor, functools.partial(func, dev.console, *vargs, **kvargs)
+                    )
+                finally:
+                    self._report(name, "close")
+                    await dev.close()
+            except Exception as ex:
+                self._report(name, "failed")
+                return (name, ex)
+        self._report(name, "done")
+        return (name, result)
+
+    def _report(self, name, state):
+        logger.info("console {}: {}".format(name, state))
+        if self._progress is None:
+            return
+        try:
+            self._progress(name, state)
+        except Exception as ex:
+            logger.error("progress of {} hit exception: {}".format(name, ex))
+
+    def __repr__(self):
+        return "ConsoleGroup(%d consoles)" % len(self._consoles)
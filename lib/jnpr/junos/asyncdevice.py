@@ -0,0 +1,365 @@
+import asyncio
+import functools
+import logging
+import threading
+
+from jnpr.junos import exception as EzErrors
+from jnpr.junos import jxml as JXML
+from jnpr.junos.device import Device
+from jnpr.junos.rpcmeta import _RpcMetaExec
+from ncclient.transport.session import SessionListener
+
+logger = logging.getLogger("jnpr.junos.asyncdevice")
+
+
+class _AsyncReplyListener(SessionListener):
+    """
+    Listens to the Session class of the Netconf Transport and wakes up the
+    coroutines waiting for an <rpc-reply> on the event loop.
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._lock = threading.Lock()
+        self._waiters = {}
+
+    def expect(self, message_id):
+        """
+        :returns: an ``asyncio.Future`` resolved once the reply with
+          **message_id** (or a transport error) is received.
+        """
+        future = self._loop.create_future()
+        with self._lock:
+            self._waiters[message_id] = future
+        return future
+
+    def discard(self, message_id):
+        with self._lock:
+            self._waiters.pop(message_id, None)
+
+    def callback(self, root, raw):
+        """Called from the session thread for every received message."""
+        tag, attrs = root
+        with self._lock:
+            future = self._waiters.pop(attrs.get("message-id"), None)
+        if future is not None:
+            self._loop.call_soon_threadsafe(_wake, future)
+
+    def errback(self, ex):
+        """Called when an error occurs, wakes up all of the waiters."""
+        with self._lock:
+            futures = list(self._waiters.values())
+            self._waiters.clear()
+        for future in futures:
+            self._loop.call_soon_threadsafe(_wake, future)
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class _AsyncRpcMetaExec(_RpcMetaExec):
+    """
+    ~PRIVATE CLASS~
+    RPC meta-executor of :class:`AsyncDevice`. Every metafunction returns a
+    coroutine, as returned by :meth:`AsyncDevice.execute`.
+    """
+
+    async def get_config(
+        self,
+        filter_xml=None,
+        options={},
+        model=None,
+        namespace=None,
+        remove_ns=True,
+        **kwargs,
+    ):
+        """
+        retrieve configuration from the Junos device, see
+        :meth:`jnpr.junos.rpcmeta._RpcMetaExec.get_config`
+        """
+        rpc = self._get_config_rpc(filter_xml, options, model, namespace)
+        if remove_ns is False:
+            kwargs["transform"] = lambda: JXML.strip_namespaces_prefix
+        response = await self._junos.execute(rpc, **kwargs)
+        return self._get_config_response(response, filter_xml, options, model)
+
+    async def pipeline(self, rpc_cmds, return_exceptions=False, **kvargs):
+        """
+        executes the :rpc_cmds: concurrently on the NETCONF session and
+        returns the results in the order of :rpc_cmds:, see
+        :meth:`jnpr.junos.rpcmeta._RpcMetaExec.pipeline`
+        """
+        return await asyncio.gather(
+            *[self._junos.execute(rpc_cmd, **dict(kvargs)) for rpc_cmd in rpc_cmds],
+            return_exceptions=return_exceptions,
+        )
+
+
+class AsyncDevice(object):
+    """
+    Junos Device class driven by an ``asyncio`` event loop.
+
+    Takes the same arguments as :class:`jnpr.junos.device.Device`.
+    :meth:`open`, :meth:`close`, :meth:`execute`, :meth:`cli`,
+    :meth:`facts_refresh` and the ``rpc.<name>()`` metafunctions are
+    coroutines. RPCs are sent without blocking and their replies are awaited
+    on the event loop, so a single thread can have RPCs outstanding on any
+    number of devices::
+
+        from jnpr.junos import AsyncDevice
+
+        async def uptime(host):
+            async with AsyncDevice(host=host, user='foo', passwd='bar') as dev:
+                return await dev.rpc.get_system_uptime_information()
+
+        results = await asyncio.gather(*[uptime(host) for host in hosts])
+
+    Errors are reported with the same :mod:`jnpr.junos.exception` classes
+    and the ``ignore_warning``, ``normalize`` and ``dev_timeout`` arguments
+    behave as they do with :meth:`Device.execute`.
+
+    .. note::
+        The SSH connection setup and the close are blocking operations in
+        ncclient; :meth:`open` and :meth:`close` run them in the default
+        executor of the event loop.
+
+    .. note::
+        Facts are gathered with blocking RPCs. Accessing a fact which is not
+        cached yet blocks the event loop; ``await dev.facts_refresh()`` gathers
+        all of the facts in the default executor instead.
+    """
+
+    def __init__(self, *vargs, **kvargs):
+        """
+        AsyncDevice object constructor, see
+        :meth:`jnpr.junos.device.Device.__init__`.
+
+        :raises ValueError:
+            When the arguments describe a console (telnet/serial) connection
+        """
+        self._dev = Device(*vargs, **kvargs)
+        if not isinstance(self._dev, Device):
+            raise ValueError("AsyncDevice does not support console connections")
+        self._listener = None
+        self.rpc = _AsyncRpcMetaExec(self)
+
+    # -----------------------------------------------------------------------
+    # PROPERTIES
+    # -----------------------------------------------------------------------
+
+    @property
+    def device(self):
+        """
+        :returns: the underlying :class:`jnpr.junos.device.Device`
+        """
+        return self._dev
+
+    @property
+    def hostname(self):
+        return self._dev.hostname
+
+    @property
+    def connected(self):
+        return self._dev.connected
+
+    @property
+    def facts(self):
+        return self._dev.facts
+
+    @property
+    def timeout(self):
+        return self._dev.timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self._dev.timeout = value
+
+    @property
+    def transform(self):
+        return self._dev.transform
+
+    @transform.setter
+    def transform(self, func):
+        self._dev.transform = func
+
+    # -----------------------------------------------------------------------
+    # open/close
+    # -----------------------------------------------------------------------
+
+    async def open(self, *vargs, **kvargs):
+        """
+        Opens a connection to the device, see
+        :meth:`jnpr.junos.device.Device.open`.
+
+        :returns AsyncDevice: AsyncDevice instance (*self*).
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None, functools.partial(self._dev.open, *vargs, **kvargs)
+        )
+        self._listener = _AsyncReplyListener(loop)
+        self._dev._conn._session.add_listener(self._listener)
+        return self
+
+    async def close(self):
+        """
+        Closes the connection to the device only if connected.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, self._dev.close)
+        finally:
+            if self._listener is not None:
+                self._dev._conn._session.remove_listener(self._listener)
+                self._listener = None
+
+    # -----------------------------------------------------------------------
+    # execute
+    # -----------------------------------------------------------------------
+
+    async def execute(self, rpc_cmd, ignore_warning=False, **kvargs):
+        """
+        Executes an XML RPC and returns results as either XML or native
+        python, see :meth:`jnpr.junos.device.Device.execute`.
+
+        :param int dev_timeout:
+          *OPTIONAL* timeout for this RPC only, defaults to :attr:`timeout`.
+
+        :param bool normalize:
+          *OPTIONAL* overrides the device normalize value for this RPC only.
+        """
+        dev = self._dev
+        if dev.connected is not True:
+            raise EzErrors.ConnectClosedError(dev)
+
+        rpc_cmd_e = dev._rpc_cmd_element(rpc_cmd)
+
+        # the transformation is bound to the RPC rather than swapped on the
+        # device as the normalizeDecorator does, other coroutines are
+        # executing RPCs on the same device meanwhile.
+        normalize = kvargs.pop("normalize", dev._normalize)
+        transform = kvargs.pop("transform", None)
+        if transform is None:
+            transform = dev._norm_transform if normalize else dev._nc_transform
+        timeout = kvargs.pop("dev_timeout", None)
+        if timeout is None:
+            timeout = dev.timeout
+        raw = kvargs.pop("raw", False)
+
+        with dev._rpc_observed(rpc_cmd_e) as sample:
+            with dev._rpc_errors(rpc_cmd_e, timeout):
+                op = dev._rpc_op()
+                waiter = self._listener.expect(op.id)
+                # once woken up, the reply is delivered to the RPC operation
+                # by another listener of the same session dispatch, so that
+                # the wait in _rpc_collect() is only ever a short one.
+                wait = timeout
+                try:
+                    dev._rpc_send(rpc_cmd_e, kvargs.get("filter_xml"), op)
+                    await asyncio.wait_for(waiter, timeout)
+                except asyncio.TimeoutError:
+                    # raised as an RpcTimeoutError by _rpc_collect() below.
+                    wait = 0
+                finally:
+                    self._listener.discard(op.id)
+                rpc_rsp_e = dev._rpc_collect(
+                    op,
+                    wait,
+                    transform,
+                    raw=raw,
+                    ignore_warning=ignore_warning,
+                    sample=sample,
+                )
+
+            if raw:
+                return dev._rpc_raw_response(rpc_rsp_e)
+            return dev._rpc_response(rpc_cmd_e, rpc_rsp_e, **kvargs)
+
+    # -----------------------------------------------------------------------
+    # cli
+    # -----------------------------------------------------------------------
+
+    async def display_xml_rpc(self, command, format="xml"):
+        """
+        Executes the CLI command and returns the CLI xml object by default,
+        see :meth:`jnpr.junos.device.Device.display_xml_rpc`.
+        """
+        try:
+            command = command + "| display xml rpc"
+            rsp = await self.rpc.cli(command, format="xml")
+            return self._dev._xml_rpc(rsp, format)
+        except TypeError:
+            return "No RPC equivalent found for: " + command
+        except:
+            return "invalid command: " + command
+
+    async def cli_to_rpc_string(self, command):
+        """
+        Translate a CLI command string into the equivalent RPC method call,
+        see :meth:`jnpr.junos.device.Device.cli_to_rpc_string`.
+        """
+        command, _, _ = command.partition("|")
+        rpc = await self.display_xml_rpc(command.strip())
+        return self._dev._rpc_string(rpc)
+
+    async def cli(self, command, format="text", warning=True):
+        """
+        Executes the CLI command and returns the CLI text output by default,
+        see :meth:`jnpr.junos.device.Device.cli`.
+
+        .. warning::
+            This function is provided for **DEBUG** purposes only!
+        """
+        if "display xml rpc" not in command and warning is True:
+            # Get the equivalent rpc metamethod
+            self._dev._cli_warning(command, await self.cli_to_rpc_string(command))
+
+        rsp = await self.rpc.cli(command=command, format=format)
+        return self._dev._cli_output(rsp, format)
+
+    # -----------------------------------------------------------------------
+    # facts
+    # -----------------------------------------------------------------------
+
+    async def facts_refresh(
+        self, exception_on_failure=False, warnings_on_failure=None, keys=None
+    ):
+        """
+        Refresh the facts from the Junos device into :attr:`facts`, see
+        :meth:`jnpr.junos.device.Device.facts_refresh`. The facts are
+        gathered in the default executor, so that accessing them afterwards
+        does not block the event loop.
+        """
+
+        def refresh():
+            self._dev.facts_refresh(
+                exception_on_failure=exception_on_failure,
+                warnings_on_failure=warnings_on_failure,
+                keys=keys,
+            )
+            # populate the fact cache now
+            str(self._dev.facts)
+
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, refresh)
+
+    # -----------------------------------------------------------------------
+    # Context Manager
+    # -----------------------------------------------------------------------
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._dev._conn.connected and not isinstance(exc_val, EzErrors.ConnectError):
+            try:
+                await self.close()
+            except Exception as ex:
+                # exit should not raise any exception
+                logger.error("Close in context manager hit exception: {}".format(ex))
+
+    def __repr__(self):
+        return "AsyncDevice(%s)" % self.hostname
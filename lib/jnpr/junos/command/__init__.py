@@ -4,6 +4,7 @@ from importlib.abc import Loader, MetaPathFinder
 from importlib.util import spec_from_loader
 
 import yaml
+from jnpr.junos.factory.catalog import load_catalog
 from jnpr.junos.factory.factory_loader import FactoryLoader
 from yamlloader import ordereddict
 
@@ -11,11 +12,15 @@ __all__ = []
 
 
 class _CommandMetaPathFinder(MetaPathFinder):
+    def __init__(self):
+        # the content of the package directory does not change, list it once
+        self._modules = frozenset(
+            os.path.splitext(i)[0] for i in os.listdir(os.path.dirname(__file__))
+        )
+
     def find_spec(self, fullname, path=None, target=None):
         mod = fullname.split(".")[-1]
-        if mod in [
-            os.path.splitext(i)[0] for i in os.listdir(os.path.dirname(__file__))
-        ]:
+        if mod in self._modules:
             return spec_from_loader(fullname, MetaPathLoader(fullname))
 
 
@@ -29,13 +34,15 @@ class MetaPathLoader(Loader):
             return self.modules[self.fullname]
 
         mod = self.fullname.split(".")[-1]
-        with open(os.path.join(os.path.dirname(__file__), mod + ".yml"), "r") as stream:
-            try:
-                modules = FactoryLoader().load(
-                    yaml.load(stream, Loader=ordereddict.Loader)
+        try:
+            modules = FactoryLoader().load(
+                load_catalog(
+                    os.path.join(os.path.dirname(__file__), mod + ".yml"),
+                    ordereddict.Loader,
                 )
-            except yaml.YAMLError as exc:
-                raise ImportError("%s is not loaded" % mod)
+            )
+        except yaml.YAMLError as exc:
+            raise ImportError("%s is not loaded" % mod)
 
         for k, v in modules.items():
             setattr(module, k, v)
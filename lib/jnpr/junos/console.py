@@ -1,7 +1,9 @@
 import logging
 import socket
 import sys
+import time
 import traceback
+import types
 import warnings
 
 from jnpr.junos import jxml as JXML
@@ -15,7 +17,6 @@ from jnpr.junos.transport.tty_ssh import SSH
 from jnpr.junos.transport.tty_telnet import Telnet
 from lxml import etree
 from ncclient.devices.junos import JunosDeviceHandler
-from ncclient.xml_ import NCElement
 
 logger = logging.getLogger("jnpr.junos.console")
 
@@ -71,6 +72,15 @@ class Console(_Connection):
             release. The value 'old' is only present to workaround bugs in
             new-style fact gathering. It will be removed in a future release.
 
+        :param fact_store:
+            *OPTIONAL* A :class:`jnpr.junos.factstore.FactStore` in which
+            the facts of the device are persisted, see
+            :class:`jnpr.junos.device.Device`.
+
+        :param list rpc_observers:
+            *OPTIONAL* RPC observers, see
+            :meth:`jnpr.junos.device.Device.add_rpc_observer`.
+
         :param bool console_has_banner:
             *OPTIONAL* default is ``False``.  If ``False`` then in case of a
             hung state, <close-session/> rpc is sent to the console.
@@ -112,6 +122,8 @@ class Console(_Connection):
         self._fact_style = kvargs.get("fact_style", "new")
         self._use_filter = False
         self._huge_tree = kvargs.get("huge_tree", False)
+        self._fact_store = kvargs.get("fact_store", None)
+        self._rpc_observers = tuple(kvargs.get("rpc_observers") or ())
         if self._fact_style != "new":
             warnings.warn(
                 "fact-style %s will be removed in "
@@ -124,6 +136,7 @@ class Console(_Connection):
         self.junos_dev_handler = JunosDeviceHandler(
             device_params={"name": "junos", "local": False}
         )
+        self._reply_xslt = None
         self._conn = None
         self._j2ldr = _Jinja2ldr
         if self._fact_style == "old":
@@ -211,6 +224,12 @@ class Console(_Connection):
         except Exception as ex:
             logger.error("Exception occurred: {}:{}\n".format("login", str(ex)))
             raise ex
+        return self._tty_opened(**kvargs)
+
+    def _tty_opened(self, **kvargs):
+        """
+        sets up the console once logged in, see :meth:`open`
+        """
         self.connected = True
 
         self._nc_transform = self.transform
@@ -235,6 +254,9 @@ class Console(_Connection):
         """
         Closes the connection to the device.
         """
+        if isinstance(self.facts, _FactCache):
+            # Write the facts gathered on demand to the fact store.
+            self.facts._flush()
         if skip_logout is False and self.connected is True:
             try:
                 self._tty_logout()
@@ -263,23 +285,49 @@ class Console(_Connection):
 
     @ignoreWarnDecorator
     def _rpc_reply(self, rpc_cmd_e, *args, **kwargs):
+        sample = kwargs.get("sample")
         encode = None if sys.version < "3" else "unicode"
         rpc_cmd = (
             etree.tostring(rpc_cmd_e, encoding=encode)
             if isinstance(rpc_cmd_e, etree._Element)
             else rpc_cmd_e
         )
-        reply = self._tty.nc.rpc(rpc_cmd)
-        rpc_rsp_e = NCElement(
-            reply, self.junos_dev_handler.transform_reply(), self._huge_tree
-        )._NCElement__doc
+        reply, rpc_rsp_e = self._tty.nc.rpc_reply(rpc_cmd)
+        if sample is not None:
+            # the reply is parsed by the tty netconf along with the read
+            now = time.perf_counter()
+            sample.ttfb = now - sample.start
+            sample.reply_bytes = len(reply)
+        if kwargs.get("raw"):
+            return reply
+        rpc_rsp_e = self._transform_reply(rpc_rsp_e, kwargs.get("transform"))
+        if sample is not None:
+            sample.transform_time = time.perf_counter() - now
         return rpc_rsp_e
 
+    def _transform_reply(self, rpc_rsp_e, transform=None):
+        """
+        applies the RPC XML Transformation to the parsed <rpc-reply>, as
+        ncclient NCElement does to the text of the reply, **transform**
+        rather than the current one if given
+        """
+        transform = (transform or self.junos_dev_handler.transform_reply)()
+        if isinstance(transform, types.FunctionType):
+            return transform(rpc_rsp_e)
+        # the XSLT is compiled once per transformation
+        if self._reply_xslt is None or self._reply_xslt[0] != transform:
+            self._reply_xslt = (transform, etree.XSLT(etree.XML(transform)))
+        return self._reply_xslt[1](rpc_rsp_e).getroot()
+
     # -------------------------------------------------------------------------
     # LOGIN/LOGOUT
     # -------------------------------------------------------------------------
 
     def _tty_login(self):
+        self._tty_create()
+        self._tty.login()
+
+    def _tty_create(self):
         tty_args = dict()
         tty_args["user"] = self._auth_user
         tty_args["passwd"] = self._auth_password
@@ -310,8 +358,6 @@ class Console(_Connection):
             logger.error("Mode should be either telnet or serial")
             raise AttributeError("Mode to be telnet/serial")
 
-        self._tty.login()
-
     def _tty_logout(self):
         self._tty.logout()
 
@@ -1,4 +1,5 @@
 # stdlib
+import inspect
 import re
 import sys
 from functools import wraps
@@ -36,6 +37,12 @@ def timeoutDecorator(function):
 
 
 def normalizeDecorator(function):
+    # A function with a transform argument applies the transformation to its
+    # own RPC rather than the device swapping it, which would race with the
+    # RPCs executed by other threads on the same device (see
+    # _FactCache._gather).
+    per_call = "transform" in inspect.signature(function).parameters
+
     @wraps(function)
     def wrapper(*args, **kwargs):
         if "normalize" in kwargs:
@@ -45,7 +52,13 @@ def normalizeDecorator(function):
             except:
                 dev = args[0]
 
-            if dev._normalize != normalize:
+            if dev._normalize != normalize and per_call:
+                if normalize is False:
+                    kwargs["transform"] = dev._nc_transform
+                else:
+                    kwargs["transform"] = dev._norm_transform
+                return function(*args, **kwargs)
+            elif dev._normalize != normalize:
                 restore_transform = dev.transform
 
                 if normalize is False:
@@ -107,7 +120,14 @@ def ignoreWarnDecorator(function):
             case-insensitive substring match. However, any regular expression
             pattern supported by the re library may be used for more
             complicated match conditions.
+
+    The reply of an ignored warning is transformed with the ``transform``
+    argument of the decorated function, when given (see normalizeDecorator),
+    rather than with the transform of the device.
     """
+    # position of the transform argument in *args, None if there is none
+    params = list(inspect.signature(function).parameters)
+    transform_arg = params.index("transform") - 1 if "transform" in params else None
 
     @wraps(function)
     def wrapper(self, *args, **kwargs):
@@ -149,8 +169,12 @@ def ignoreWarnDecorator(function):
                 # 1) A normal response has been run through the XSLT
                 #    transformation, but ex.xml has not. Do that now.
                 encode = None if sys.version < "3" else "unicode"
+                transform = kwargs.get("transform")
+                if transform_arg is not None and transform_arg < len(args):
+                    transform = args[transform_arg]
                 rsp = NCElement(
-                    etree.tostring(rsp, encoding=encode), self.transform()
+                    etree.tostring(rsp, encoding=encode),
+                    (transform or self.transform)(),
                 )._NCElement__doc
                 # 2) Now remove all of the <rpc-error> elements from
                 #    the response. We've already confirmed they are
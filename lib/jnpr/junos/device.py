@@ -1,4 +1,5 @@
 # stdlib
+import contextlib
 import datetime
 import inspect
 import json
@@ -29,16 +30,18 @@ from jnpr.junos.decorators import (
 from jnpr.junos.exception import ConnectError, JSONLoadError
 from jnpr.junos.factcache import _FactCache
 from jnpr.junos.ofacts import *
-from jnpr.junos.rpcmeta import _RpcMetaExec
+from jnpr.junos.rpcmeta import _RpcBatch, _RpcMetaExec
+from jnpr.junos.rpcstats import RpcSample
 from lxml import etree
 from ncclient import manager as netconf_ssh
-from ncclient.operations import RPCError
+from ncclient.operations import RaiseMode, RPCError
 
 # check for ncclient support for filter_xml. Remove these changes once ncclient
 # release filter_xml/SAX parsing feature
 # https://github.com/ncclient/ncclient/pull/324
 from ncclient.operations.third_party.juniper.rpc import ExecuteRpc
 from ncclient.transport.session import SessionListener
+from ncclient.xml_ import NCElement, to_ele
 
 if sys.version_info[0] >= 3:
     NCCLIENT_FILTER_XML = len(inspect.signature(ExecuteRpc.request).parameters) == 3
@@ -494,16 +497,25 @@ class _Connection(object):
         try:
             command = command + "| display xml rpc"
             rsp = self.rpc.cli(command, format="xml")
-            rsp = rsp.getparent().find(".//rpc")
-            if format == "text":
-                encode = None if sys.version < "3" else "unicode"
-                return etree.tostring(rsp[0], encoding=encode)
-            return rsp[0]
+            return self._xml_rpc(rsp, format)
         except TypeError:
             return "No RPC equivalent found for: " + command
         except:
             return "invalid command: " + command
 
+    @staticmethod
+    def _xml_rpc(rsp, format="xml"):
+        """
+        :returns: the RPC element held by the reply **rsp** to a
+          ``| display xml rpc`` command, as a string when **format** is
+          "text".
+        """
+        rsp = rsp.getparent().find(".//rpc")
+        if format == "text":
+            encode = None if sys.version < "3" else "unicode"
+            return etree.tostring(rsp[0], encoding=encode)
+        return rsp[0]
+
     # ------------------------------------------------------------------------
     # Template: retrieves a Jinja2 template
     # ------------------------------------------------------------------------
@@ -665,6 +677,15 @@ class _Connection(object):
         command = command.strip()
         # Get the equivalent RPC
         rpc = self.display_xml_rpc(command)
+        return self._rpc_string(rpc)
+
+    @staticmethod
+    def _rpc_string(rpc):
+        """
+        :returns: (str) the RPC meta-method call equivalent to the RPC element
+                  **rpc**, or None if **rpc** is the error string returned by
+                  :meth:`display_xml_rpc`.
+        """
         if isinstance(rpc, six.string_types):
             # No RPC is available.
             return None
@@ -720,38 +741,11 @@ class _Connection(object):
         """
         if "display xml rpc" not in command and warning is True:
             # Get the equivalent rpc metamethod
-            rpc_string = self.cli_to_rpc_string(command)
-            if rpc_string is not None:
-                warning_string = "\nCLI command is for debug use only!\n"
-                warning_string += "Instead of:\ncli('%s')\n" % (command)
-                warning_string += "Use:\n%s\n" % (rpc_string)
-                warnings.simplefilter("always")
-                warnings.warn(warning_string, RuntimeWarning)
-                warnings.resetwarnings()
+            self._cli_warning(command, self.cli_to_rpc_string(command))
 
         try:
             rsp = self.rpc.cli(command=command, format=format)
-            if isinstance(rsp, dict) and format.lower() == "json":
-                return rsp
-            # rsp returned True means <rpc-reply> is empty, hence return
-            # empty str as would be the case on cli
-            # ex:
-            # <rpc-reply message-id="urn:uuid:281f624f-022b-11e6-bfa8">
-            # </rpc-reply>
-            if rsp is True:
-                return ""
-            if rsp.tag in ["output", "rpc-reply"]:
-                if rsp.tag == "output" and rsp.getparent() is not None:
-                    rsp = rsp.getparent()
-                encode = None if sys.version < "3" else "unicode"
-                return etree.tostring(
-                    rsp, method="text", with_tail=False, encoding=encode
-                )
-            if rsp.tag == "configuration-information":
-                return rsp.findtext("configuration-output")
-            if rsp.tag == "rpc":
-                return rsp[0]
-            return rsp
+            return self._cli_output(rsp, format)
         except (
             EzErrors.ConnectClosedError,
             EzErrors.RpcError,
@@ -765,13 +759,117 @@ class _Connection(object):
             )
             raise ex
 
+    @staticmethod
+    def _cli_warning(command, rpc_string):
+        """
+        Warns that **command** should be replaced by the RPC meta-method call
+        **rpc_string**, if there is one.
+        """
+        if rpc_string is not None:
+            warning_string = "\nCLI command is for debug use only!\n"
+            warning_string += "Instead of:\ncli('%s')\n" % (command)
+            warning_string += "Use:\n%s\n" % (rpc_string)
+            warnings.simplefilter("always")
+            warnings.warn(warning_string, RuntimeWarning)
+            warnings.resetwarnings()
+
+    @staticmethod
+    def _cli_output(rsp, format="text"):
+        """
+        :returns: the CLI output held by the reply **rsp** of a <command> RPC
+        """
+        if isinstance(rsp, dict) and format.lower() == "json":
+            return rsp
+        # rsp returned True means <rpc-reply> is empty, hence return
+        # empty str as would be the case on cli
+        # ex:
+        # <rpc-reply message-id="urn:uuid:281f624f-022b-11e6-bfa8">
+        # </rpc-reply>
+        if rsp is True:
+            return ""
+        if rsp.tag in ["output", "rpc-reply"]:
+            if rsp.tag == "output" and rsp.getparent() is not None:
+                rsp = rsp.getparent()
+            encode = None if sys.version < "3" else "unicode"
+            return etree.tostring(rsp, method="text", with_tail=False, encoding=encode)
+        if rsp.tag == "configuration-information":
+            return rsp.findtext("configuration-output")
+        if rsp.tag == "rpc":
+            return rsp[0]
+        return rsp
+
+    # ------------------------------------------------------------------------
+    # RPC observers
+    # ------------------------------------------------------------------------
+
+    _rpc_observers = ()
+
+    def add_rpc_observer(self, observer):
+        """
+        Registers an RPC observer, see :mod:`jnpr.junos.rpcstats`.
+
+        :param observer: callable called with a
+          :class:`jnpr.junos.rpcstats.RpcSample` once each RPC executed on
+          this device has completed, successfully or not.
+        """
+        self._rpc_observers = self._rpc_observers + (observer,)
+
+    def remove_rpc_observer(self, observer):
+        """
+        Unregisters an RPC observer registered with :meth:`add_rpc_observer`
+        or the ``rpc_observers`` argument.
+        """
+        self._rpc_observers = tuple(
+            registered for registered in self._rpc_observers if registered != observer
+        )
+
+    def _rpc_sample(self, rpc_cmd_e):
+        """
+        :returns: a new :class:`jnpr.junos.rpcstats.RpcSample` of
+          **rpc_cmd_e**, or ``None`` when there is no RPC observer, in which
+          case nothing is measured.
+        """
+        if not self._rpc_observers:
+            return None
+        return RpcSample(self._hostname, rpc_cmd_e)
+
+    def _rpc_observe(self, sample, error=None):
+        """
+        Finishes **sample** with the exception **error** raised by the RPC,
+        if any, and hands it over to the RPC observers. An observer raising
+        an exception does not fail the RPC.
+        """
+        sample.finish(error)
+        for observer in self._rpc_observers:
+            try:
+                observer(sample)
+            except Exception as ex:
+                logger.error("RPC observer {} failed: {}".format(observer, ex))
+
+    @contextlib.contextmanager
+    def _rpc_observed(self, rpc_cmd_e):
+        """
+        Observes the RPC **rpc_cmd_e** executed within the context, yields
+        the sample to fill in, see :meth:`_rpc_sample`.
+        """
+        sample = self._rpc_sample(rpc_cmd_e)
+        if sample is None:
+            yield None
+            return
+        try:
+            yield sample
+        except Exception as ex:
+            self._rpc_observe(sample, ex)
+            raise
+        self._rpc_observe(sample)
+
     # ------------------------------------------------------------------------
     # execute
     # ------------------------------------------------------------------------
 
     @normalizeDecorator
     @timeoutDecorator
-    def execute(self, rpc_cmd, ignore_warning=False, **kvargs):
+    def execute(self, rpc_cmd, ignore_warning=False, transform=None, **kvargs):
         """
         Executes an XML RPC and returns results as either XML or native python
 
@@ -803,6 +901,25 @@ class _Connection(object):
 
             to_py( self, rpc_rsp, **kvargs )
 
+        :param bool raw:
+          If ``True``, the <rpc-reply> is returned as received, a ``str``,
+          rather than as an XML object: no XML tree is built, and neither
+          namespaces removal, normalization nor **to_py** are applied. This
+          is the cheapest way to save large replies, e.g. the configuration,
+          as they are::
+
+            cfg = dev.rpc.get_config(options={'format': 'text'}, raw=True)
+
+          The reply is only parsed when it holds an <rpc-error>. When that
+          error is an ignored warning (see **ignore_warning**), the reply
+          without the warning is serialized back.
+
+        :param transform:
+          *OPTIONAL* the RPC XML Transformation applied to the reply of this
+          RPC only, defaults to the current :attr:`transform`. This is how
+          the ``normalize`` argument is applied, without changing the
+          :attr:`transform` of the device.
+
         :raises ValueError:
             When the **rpc_cmd** is of unknown origin
 
@@ -818,35 +935,70 @@ class _Connection(object):
             RPC-reply as XML object.  If **to_py** is provided, then
             that function is called, and return of that function is
             provided back to the caller; presumably to convert the XML to
-            native python data-types (e.g. ``dict``).
+            native python data-types (e.g. ``dict``). The <rpc-reply>
+            ``str`` when **raw** is ``True``.
         """
 
         if self.connected is not True:
             raise EzErrors.ConnectClosedError(self)
 
+        rpc_cmd_e = self._rpc_cmd_element(rpc_cmd)
+        raw = kvargs.pop("raw", False)
+
+        # invoking a bad RPC will cause a connection object exception
+        # will will be raised directly to the caller ... for now ...
+        # @@@ need to trap this and re-raise accordingly.
+
+        with self._rpc_observed(rpc_cmd_e) as sample:
+            with self._rpc_errors(rpc_cmd_e):
+                rpc_rsp_e = self._rpc_reply(
+                    rpc_cmd_e,
+                    ignore_warning=ignore_warning,
+                    filter_xml=kvargs.get("filter_xml"),
+                    sample=sample,
+                    raw=raw,
+                    transform=transform,
+                )
+
+            if raw:
+                return self._rpc_raw_response(rpc_rsp_e)
+            return self._rpc_response(rpc_cmd_e, rpc_rsp_e, **kvargs)
+
+    def _rpc_cmd_element(self, rpc_cmd):
+        """
+        :returns: the RPC command **rpc_cmd** (XML Element or xml-as-string)
+          as an XML Element.
+
+        :raises ValueError:
+            When the **rpc_cmd** is of unknown origin
+        """
         if isinstance(rpc_cmd, str):
-            rpc_cmd_e = etree.XML(rpc_cmd)
+            return etree.XML(rpc_cmd)
         elif isinstance(rpc_cmd, etree._Element):
-            rpc_cmd_e = rpc_cmd
+            return rpc_cmd
         else:
             raise ValueError(
                 "Dont know what to do with rpc of type %s" % rpc_cmd.__class__.__name__
             )
 
-        # invoking a bad RPC will cause a connection object exception
-        # will will be raised directly to the caller ... for now ...
-        # @@@ need to trap this and re-raise accordingly.
+    @contextlib.contextmanager
+    def _rpc_errors(self, rpc_cmd_e, timeout=None):
+        """
+        Translates the transport/ncclient exceptions raised while waiting for
+        the reply of **rpc_cmd_e** into the :mod:`jnpr.junos.exception`
+        hierarchy.
 
+        :param int timeout: the RPC timeout reported in
+          :class:`RpcTimeoutError`, defaults to the device :attr:`timeout`.
+        """
         try:
-            rpc_rsp_e = self._rpc_reply(
-                rpc_cmd_e,
-                ignore_warning=ignore_warning,
-                filter_xml=kvargs.get("filter_xml"),
-            )
+            yield
         except NcOpErrors.TimeoutExpiredError:
             # err is a TimeoutExpiredError from ncclient,
             # which has no such attribute as xml.
-            raise EzErrors.RpcTimeoutError(self, rpc_cmd_e.tag, self.timeout)
+            raise EzErrors.RpcTimeoutError(
+                self, rpc_cmd_e.tag, self.timeout if timeout is None else timeout
+            )
         except NcErrors.TransportError:
             raise EzErrors.ConnectClosedError(self)
         except RPCError as ex:
@@ -866,6 +1018,21 @@ class _Connection(object):
             )
             raise
 
+    @staticmethod
+    def _rpc_raw_response(rpc_rsp):
+        """
+        :returns: the <rpc-reply> ``str`` **rpc_rsp** of a raw RPC. When
+          warnings were ignored, the reply was parsed and is serialized back.
+        """
+        if isinstance(rpc_rsp, str):
+            return rpc_rsp
+        return etree.tostring(rpc_rsp, encoding="unicode")
+
+    def _rpc_response(self, rpc_cmd_e, rpc_rsp_e, **kvargs):
+        """
+        Converts the <rpc-reply> **rpc_rsp_e** of **rpc_cmd_e** into the
+        value returned by :meth:`execute`.
+        """
         # From 14.2 onward, junos supports JSON, so now code can be written as
         # dev.rpc.get_route_engine_information({'format': 'json'})
         # should not convert rpc response to json when loading json config
@@ -926,6 +1093,39 @@ class _Connection(object):
         else:
             return ret_rpc_rsp
 
+    # ------------------------------------------------------------------------
+    # batch
+    # ------------------------------------------------------------------------
+
+    def batch(self):
+        """
+        Pipelines RPCs on the NETCONF session: each RPC is sent as soon as it
+        is invoked, without waiting for the <rpc-reply> of the previous ones.
+        Replies are matched to the RPCs by message-id. Use as a context
+        manager, exiting the context waits for every reply::
+
+            with dev.batch() as batch:
+                sw = batch.rpc.get_software_information()
+                re = batch.rpc.get_route_engine_information(normalize=True)
+                cfg = batch.rpc.get_config(filter_xml='system')
+            print(sw.result().findtext('host-name'))
+
+        The RPC metafunctions of ``batch.rpc`` take the same arguments as
+        those of :attr:`rpc` and return a pending result. Its ``result()``
+        method returns the value :meth:`execute` would have returned, or
+        raises the exception :meth:`execute` would have raised, e.g.
+        :class:`jnpr.junos.exception.RpcError` per **ignore_warning**.
+        ``batch.results()`` returns all of them in the order the RPCs were
+        sent. See also ``dev.rpc.pipeline()``.
+
+        .. note::
+            Connections which can not pipeline RPCs (console) execute each
+            RPC when it is invoked.
+
+        :returns: the batch object
+        """
+        return _RpcBatch(self)
+
     # ------------------------------------------------------------------------
     # facts
     # ------------------------------------------------------------------------
@@ -1175,6 +1375,17 @@ class Device(_Connection):
             release. The value 'old' is only present to workaround bugs in
             new-style fact gathering. It will be removed in a future release.
 
+        :param fact_store:
+            *OPTIONAL* A :class:`jnpr.junos.factstore.FactStore` in which
+            the facts of the device are persisted. Facts are served from the
+            store while they are valid rather than gathered from the device.
+            default is ``None``.
+
+        :param list rpc_observers:
+            *OPTIONAL* callables called with a
+            :class:`jnpr.junos.rpcstats.RpcSample` once each RPC has
+            completed, see :meth:`add_rpc_observer`. default is ``None``.
+
         :param str mode:
             *OPTIONAL*  mode, mode for console connection (telnet/serial)
 
@@ -1268,6 +1479,8 @@ class Device(_Connection):
         self._bind_addr = kvargs.get("bind_addr", None)
         self._hostkey_verify = kvargs.get("hostkey_verify", False)
         self._proxy_command = kvargs.get("proxy_command", None)
+        self._fact_store = kvargs.get("fact_store", None)
+        self._rpc_observers = tuple(kvargs.get("rpc_observers") or ())
         if self._fact_style != "new":
             warnings.warn(
                 "fact-style %s will be removed in a future "
@@ -1518,6 +1731,9 @@ class Device(_Connection):
         """
         Closes the connection to the device only if connected.
         """
+        if isinstance(self.facts, _FactCache):
+            # Write the facts gathered on demand to the fact store.
+            self.facts._flush()
         if self.connected is True:
             self.connected = False
             try:
@@ -1528,12 +1744,130 @@ class Device(_Connection):
                 pass
 
     @ignoreWarnDecorator
-    def _rpc_reply(self, rpc_cmd_e, filter_xml=None):
+    def _rpc_reply(
+        self, rpc_cmd_e, filter_xml=None, sample=None, raw=False, transform=None
+    ):
+        if sample is not None or raw or transform is not None:
+            # the synchronous ncclient RPC does not expose the reply before
+            # it is parsed and transformed, which is measured, skipped or
+            # transformed for this RPC only by _rpc_collect()
+            op = self._rpc_send(rpc_cmd_e, filter_xml)
+            return self._rpc_collect(op, transform=transform, raw=raw, sample=sample)
         if NCCLIENT_FILTER_XML:
             return self._conn.rpc(rpc_cmd_e, filter_xml)._NCElement__doc
         else:
             return self._conn.rpc(rpc_cmd_e)._NCElement__doc
 
+    def _rpc_op(self):
+        """
+        :returns: a new, not yet sent, asynchronous ncclient RPC operation
+          bound to the NETCONF session. Its message-id is available as
+          ``op.id`` before :meth:`_rpc_send` puts it on the wire.
+        """
+        return ExecuteRpc(
+            self._conn._session,
+            self._conn._device_handler,
+            async_mode=True,
+            timeout=self._conn.timeout,
+            raise_mode=self._conn.raise_mode,
+            huge_tree=self._conn.huge_tree,
+        )
+
+    def _rpc_send(self, rpc_cmd_e, filter_xml=None, op=None):
+        """
+        Sends **rpc_cmd_e** on the NETCONF session without waiting for the
+        <rpc-reply>. The reply is matched to the request by message-id and
+        is retrieved with :meth:`_rpc_collect`.
+
+        :returns: the pending ncclient RPC operation
+        """
+        if op is None:
+            op = self._rpc_op()
+        if NCCLIENT_FILTER_XML:
+            op.request(rpc_cmd_e, filter_xml)
+        else:
+            op.request(rpc_cmd_e)
+        return op
+
+    @ignoreWarnDecorator
+    def _rpc_collect(self, op, timeout=None, transform=None, raw=False, sample=None):
+        """
+        Waits for the reply of an RPC operation returned by :meth:`_rpc_send`
+        and returns the <rpc-reply> element, exactly as :meth:`_rpc_reply`
+        does for a synchronous RPC.
+
+        :param int timeout: seconds to wait for the reply, defaults to the
+          device :attr:`timeout`.
+
+        :param transform: the RPC XML Transformation to apply to the reply,
+          defaults to the current :attr:`transform`.
+
+        :param bool raw: if ``True``, returns the <rpc-reply> as received,
+          a ``str``. The reply is only parsed when it contains an
+          <rpc-error>, to raise it.
+
+        :param sample: the :class:`jnpr.junos.rpcstats.RpcSample` of the RPC
+          in which the reply is measured, if any.
+        """
+        op.event.wait(self.timeout if timeout is None else timeout)
+        if not op.event.is_set():
+            raise NcOpErrors.TimeoutExpiredError(
+                "ncclient timed out while waiting for an rpc reply."
+            )
+        if op.error:
+            # Error that prevented reply delivery
+            raise op.error
+        reply = op.reply
+        if sample is not None:
+            now = time.perf_counter()
+            sample.ttfb = now - sample.start
+            sample.reply_bytes = len(reply._raw)
+        if raw and "rpc-error" not in reply._raw:
+            return reply._raw
+        reply.parse()
+        if sample is not None:
+            sample.parse_time = time.perf_counter() - now
+        handler = self._conn._device_handler
+        if reply.error is not None and not handler.is_rpc_error_exempt(
+            reply.error.message
+        ):
+            raise_mode = self._conn.raise_mode
+            if raise_mode == RaiseMode.ALL or (
+                raise_mode == RaiseMode.ERRORS and reply.error.severity == "error"
+            ):
+                if len(reply.errors) > 1:
+                    raise RPCError(to_ele(reply._raw), errs=reply.errors)
+                raise reply.error
+        if raw:
+            return reply._raw
+        transform = transform or self.transform
+        if sample is not None:
+            now = time.perf_counter()
+        rpc_rsp_e = NCElement(
+            reply, transform(), huge_tree=self._conn.huge_tree
+        )._NCElement__doc
+        if sample is not None:
+            sample.transform_time = time.perf_counter() - now
+        return rpc_rsp_e
+
+    def _rpc_raw(self, rpc_cmd_e, dev_timeout=None, ignore_warning=False, **kvargs):
+        """
+        Executes **rpc_cmd_e** and returns the <rpc-reply> as received, see
+        :meth:`_rpc_collect`. RPC errors are raised as :meth:`execute` does.
+
+        :returns: the <rpc-reply> ``str``, or the <rpc-reply> element when
+          warnings were ignored.
+        """
+        if self.connected is not True:
+            raise EzErrors.ConnectClosedError(self)
+        timeout = self.timeout if dev_timeout is None else dev_timeout
+        with self._rpc_observed(rpc_cmd_e) as sample:
+            with self._rpc_errors(rpc_cmd_e, timeout):
+                op = self._rpc_send(rpc_cmd_e, kvargs.get("filter_xml"))
+                return self._rpc_collect(
+                    op, timeout, raw=True, ignore_warning=ignore_warning, sample=sample
+                )
+
     # -----------------------------------------------------------------------
     # Context Manager
     # -----------------------------------------------------------------------
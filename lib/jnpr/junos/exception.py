@@ -193,6 +193,42 @@ class SwRollbackError(RpcError):
     __str__ = __repr__
 
 
+class SwUpgradeError(RuntimeError):
+    """
+    Generated when a stage of a :class:`jnpr.junos.upgrade.FleetUpgrade`
+    fails on a device, ``stage`` is the name of the stage.
+    """
+
+    def __init__(self, stage, msg):
+        self.stage = stage
+        self.msg = msg
+        RuntimeError.__init__(self, "{}: {}".format(stage, msg))
+
+    def __repr__(self):
+        return "{}(stage: {}, msg: {})".format(
+            self.__class__.__name__, self.stage, self.msg
+        )
+
+
+class FleetTimeoutError(RuntimeError):
+    """
+    Generated when a device of a :class:`jnpr.junos.fleet.Fleet` gives no
+    result within the ``deadline`` of the fleet.
+    """
+
+    def __init__(self, host, deadline):
+        self.host = host
+        self.deadline = deadline
+        RuntimeError.__init__(
+            self, "{}: no result within {} seconds".format(host, deadline)
+        )
+
+    def __repr__(self):
+        return "{}(host: {}, deadline: {})".format(
+            self.__class__.__name__, self.host, self.deadline
+        )
+
+
 # ================================================================
 # ================================================================
 #                    Connection Exceptions
@@ -1,11 +1,16 @@
+import logging
+import threading
 import warnings
 from pprint import pformat
 from collections.abc import MutableMapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 import jnpr.junos.exception
 import jnpr.junos.facts
 from jnpr.junos.facts import __doc__ as facts_doc
 
+logger = logging.getLogger("jnpr.junos.factcache")
+
 
 class _FactCache(MutableMapping):
     """
@@ -24,8 +29,27 @@ class _FactCache(MutableMapping):
 
     **Additional methods:**
       * :meth:`_refresh`: Refreshes the fact cache.
+
+    **Persistent store:**
+      When the device has a ``fact_store``
+      (see :mod:`jnpr.junos.factstore`), the first fact which is not cached
+      loads the facts from the store, provided that the boot and last
+      commit times of the device still match the stored ones. Facts
+      gathered from the device are written back to the store once all of
+      the facts are gathered, and when the device is closed.
+
+    **Concurrent gathering:**
+      When all of the facts are gathered (:meth:`__str__`, :meth:`__repr__`
+      and :meth:`_refresh` with exception_on_failure or warnings_on_failure),
+      the fact modules are invoked in the order of the dependency graph
+      declared by their ``requires_facts()`` function. Modules which do not
+      depend on each other run concurrently, in up to :attr:`_max_workers`
+      threads, when the device supports concurrent RPCs on its session.
     """
 
+    # Maximum number of fact modules invoked at the same time.
+    _max_workers = 8
+
     def __init__(self, device):
         """
         _FactCache object constructor.
@@ -35,11 +59,28 @@ class _FactCache(MutableMapping):
         """
         self._device = device
         self._cache = dict()
-        self._call_stack = list()
+        self._local = threading.local()
         self._callbacks = jnpr.junos.facts._callbacks
+        self._dependencies = jnpr.junos.facts._dependencies
         self._exception_on_failure = False
         self._warnings_on_failure = False
         self._should_warn = False
+        self._store = getattr(device, "_fact_store", None)
+        self._store_loaded = False
+        self._dirty = False
+        self._fingerprint = None
+        self._failed = set()
+
+    @property
+    def _call_stack(self):
+        """
+        The callbacks being invoked by the current thread.
+        """
+        try:
+            return self._local.call_stack
+        except AttributeError:
+            self._local.call_stack = list()
+            return self._local.call_stack
 
     def __getitem__(self, key):
         """
@@ -74,6 +115,9 @@ class _FactCache(MutableMapping):
             raise KeyError(
                 "%s: There is no function to gather the %s fact" % (key, key)
             )
+        if key not in self._cache and self._store is not None:
+            if not self._store_loaded:
+                self._load()
         if key not in self._cache:
             # A known fact, but not yet cached. Go get it and cache it.
             if self._callbacks[key] in self._call_stack:
@@ -104,6 +148,7 @@ class _FactCache(MutableMapping):
                 for new_key in self._callbacks:
                     if self._callbacks[key] is self._callbacks[new_key]:
                         self._cache[new_key] = None
+                        self._failed.add(new_key)
             else:
                 # No exception
                 for new_key in new_facts:
@@ -126,6 +171,9 @@ class _FactCache(MutableMapping):
                 # Always pop the current callback from _call_stack,
                 # regardless of whether or not an exception was raised.
                 self._call_stack.pop()
+            if self._store is not None:
+                # Written by _flush(), not on every gathered fact.
+                self._dirty = True
         if key in self._cache:
             # key fact is cached. Return it.
             if self._device._fact_style == "both":
@@ -208,6 +256,7 @@ class _FactCache(MutableMapping):
           side-effect of causing any ungathered facts to be gathered and then
           cached.
         """
+        self._gather()
         string = ""
         for key in sorted(self):
             if not key.startswith("_"):
@@ -227,8 +276,60 @@ class _FactCache(MutableMapping):
           side-effect of causing any ungathered facts to be gathered and then
           cached.
         """
+        self._gather()
         return pformat(dict(self))
 
+    def _gather(self):
+        """
+        Gathers all of the facts which are not cached yet, invoking the
+        callbacks whose requirements are cached concurrently.
+
+        Does nothing if the device can not execute concurrent RPCs (e.g. a
+        console connection); the facts are then gathered on demand.
+
+        :raises other exceptions as defined by the fact gathering modules:
+            When an error is encountered and _exception_on_failure is True.
+        """
+        if getattr(self._device, "_rpc_send", None) is None:
+            return
+        if self._store is not None and not self._store_loaded:
+            self._load()
+        # One key to invoke each callback with.
+        keys = {}
+        for key in self._callbacks:
+            if key not in self._cache:
+                keys.setdefault(self._callbacks[key], key)
+        if len(keys) < 2:
+            return
+        required = dict(
+            (callback, set(self._dependencies.get(callback, ())) & set(keys))
+            for callback in keys
+        )
+        pool = ThreadPoolExecutor(max_workers=self._max_workers)
+        running = {}
+        try:
+            while required or running:
+                for callback in [cb for cb in required if not required[cb]]:
+                    del required[callback]
+                    future = pool.submit(self.__getitem__, keys[callback])
+                    running[future] = callback
+                if not running:
+                    # Unreachable unless the requirements form a loop, which
+                    # the on demand gathering reports.
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    callback = running.pop(future)
+                    # Raises when _exception_on_failure is True.
+                    future.result()
+                    for pending in required.values():
+                        pending.discard(callback)
+        finally:
+            for future in running:
+                future.cancel()
+            pool.shutdown(wait=True)
+            self._flush()
+
     def _refresh(
         self, exception_on_failure=False, warnings_on_failure=False, keys=None
     ):
@@ -266,6 +367,7 @@ class _FactCache(MutableMapping):
                 if key in self._callbacks:
                     if key in self._cache:
                         del self._cache[key]
+                    self._failed.discard(key)
                 else:
                     raise RuntimeError(
                         "The %s fact can not be refreshed. %s "
@@ -273,6 +375,9 @@ class _FactCache(MutableMapping):
                     )
         else:
             self._cache = dict()
+            self._failed = set()
+            # Consult the store again, the device may have changed since.
+            self._store_loaded = False
         if exception_on_failure or warnings_on_failure:
             self._exception_on_failure = exception_on_failure
             self._warnings_on_failure = warnings_on_failure
@@ -293,6 +398,89 @@ class _FactCache(MutableMapping):
                 self._exception_on_failure = False
                 self._warnings_on_failure = False
                 self._should_warn = False
+                self._flush()
+
+    def _store_key(self):
+        """
+        :returns: the key of the device facts in the store,
+          ``'host-name:port'`` as the same address may lead to several
+          devices (port forwards, jump hosts, ...), ``None`` when the device
+          has no host-name (e.g. a serial console.)
+        """
+        hostname = getattr(self._device, "_hostname", None)
+        if hostname is None:
+            return None
+        return "%s:%s" % (hostname, getattr(self._device, "_port", None))
+
+    def _device_fingerprint(self):
+        """
+        The boot and last commit times of the device, which change when the
+        software or the configuration (and thus any fact) may have changed.
+
+        :returns: a ``list`` of strings.
+        """
+        rsp = self._device.rpc.get_system_uptime_information(normalize=True)
+        return [
+            elem.text
+            for path in (
+                ".//system-booted-time/date-time",
+                ".//last-configured-time/date-time",
+            )
+            for elem in rsp.iterfind(path)
+        ]
+
+    def _load(self):
+        """
+        Populates the cache with the stored facts of the device, if they are
+        still valid.
+        """
+        self._store_loaded = True
+        key = self._store_key()
+        if key is None:
+            return
+        try:
+            self._fingerprint = self._device_fingerprint()
+            record = self._store.get(key)
+        except Exception as ex:
+            self._fingerprint = None
+            logger.warning("Unable to load the stored facts of %s: %s" % (key, ex))
+            return
+        if record is None:
+            return
+        if record.get("fingerprint") != self._fingerprint:
+            logger.debug("Stored facts of %s are outdated" % key)
+            return
+        for new_key, value in record.get("facts", {}).items():
+            if new_key in self._callbacks and new_key not in self._cache:
+                self._cache[new_key] = value
+
+    def _flush(self):
+        """
+        Writes the cached facts to the store if facts were gathered from the
+        device since they were last written.
+        """
+        if self._store is None or not self._dirty:
+            return
+        self._dirty = False
+        self._save()
+
+    def _save(self):
+        """
+        Writes the cached facts to the store. Facts which could not be
+        gathered are not written.
+        """
+        key = self._store_key()
+        if key is None or self._fingerprint is None:
+            return
+        facts = dict(
+            (fact, value)
+            for fact, value in self._cache.items()
+            if fact not in self._failed
+        )
+        try:
+            self._store.set(key, {"fingerprint": self._fingerprint, "facts": facts})
+        except Exception as ex:
+            logger.warning("Unable to store the facts of %s: %s" % (key, ex))
 
     # In case optimization flag is enabled, it strips of docstring and __doc__ becomes None
     _class_doc: str = __doc__ or ""
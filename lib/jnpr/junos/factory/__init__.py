@@ -1,6 +1,7 @@
 import os.path
 
 import yaml
+from jnpr.junos.factory.catalog import load_catalog
 from jnpr.junos.factory.factory_loader import FactoryLoader
 
 __all__ = ["loadyaml", "FactoryLoader"]
@@ -26,8 +27,11 @@ def loadyaml(path):
       table = MyTable(dev)
       table.get()
       ...
+
+    The parsed YAML files of the package are cached, but not the user ones,
+    see :mod:`jnpr.junos.factory.catalog`.
     """
     # if no extension is given, default to '.yml'
     if os.path.splitext(path)[1] == "":
         path += ".yml"
-    return FactoryLoader().load(yaml.load(open(path, "r"), Loader=yaml.SafeLoader))
+    return FactoryLoader().load(load_catalog(path, yaml.SafeLoader))
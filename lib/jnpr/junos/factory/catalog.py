@@ -0,0 +1,109 @@
+"""
+Cache of the parsed YAML catalogs of Tables and Views.
+
+Parsing the YAML files of the :mod:`jnpr.junos.op`, :mod:`jnpr.junos.resources`
+and :mod:`jnpr.junos.command` packages is most of the time spent importing a
+Table.  The parsed catalog of a YAML file is pickled into the ``__pycache__``
+directory next to it, like the bytecode of Python modules, and reused as long
+as the modification time and the size of the YAML file are unchanged.
+
+As for bytecode, no cache is written when ``sys.dont_write_bytecode`` is set
+or when the directory is not writable.
+
+Only the YAML files installed with the package are cached: a cache file is
+unpickled, which would run the code of whoever could write it, and the
+directories of the user YAML files are left untouched.
+"""
+
+import logging
+import os
+import pickle
+import sys
+import tempfile
+
+import yaml
+
+logger = logging.getLogger("jnpr.junos.factory.catalog")
+
+# bumped when the format of the cache files changes
+_CACHE_VERSION = 1
+
+# the jnpr.junos package directory, the YAML files below it are cached
+_PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+
+def _cache_file(path, loader):
+    dirname, fname = os.path.split(path)
+    return os.path.join(
+        dirname,
+        "__pycache__",
+        "%s.%s-%s.pickle"
+        % (os.path.splitext(fname)[0], loader.__name__, sys.implementation.cache_tag),
+    )
+
+
+def _cached(path):
+    path = os.path.realpath(path)
+    try:
+        return os.path.commonpath([path, _PACKAGE_DIR]) == _PACKAGE_DIR
+    except ValueError:
+        # e.g. paths on different drives
+        return False
+
+
+def _load(path, loader):
+    with open(path, "r") as stream:
+        return yaml.load(stream, Loader=loader)
+
+
+def load_catalog(path, loader=yaml.FullLoader):
+    """
+    :returns: the catalog of the YAML file :path:, parsed with the yaml
+      :loader:, from the cache when it is up to date and :path: is part of
+      the package.
+
+    :raises yaml.YAMLError: when the YAML file can not be parsed
+    """
+    if not _cached(path):
+        return _load(path, loader)
+
+    stat = os.stat(path)
+    stamp = (
+        _CACHE_VERSION,
+        loader.__module__ + "." + loader.__name__,
+        stat.st_mtime_ns,
+        stat.st_size,
+    )
+    cache = _cache_file(path, loader)
+
+    try:
+        with open(cache, "rb") as fp:
+            if pickle.load(fp) == stamp:
+                return pickle.load(fp)
+    except FileNotFoundError:
+        pass
+    except Exception as ex:
+        logger.debug("ignoring the cache file {}: {}".format(cache, ex))
+
+    catalog = _load(path, loader)
+    if not sys.dont_write_bytecode:
+        _write_cache(cache, stamp, catalog, stat.st_mode)
+    return catalog
+
+
+def _write_cache(cache, stamp, catalog, mode):
+    try:
+        dirname = os.path.dirname(cache)
+        os.makedirs(dirname, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+        try:
+            os.chmod(tmp, mode & 0o666)
+            with os.fdopen(fd, "wb") as fp:
+                pickle.dump(stamp, fp)
+                pickle.dump(catalog, fp)
+            os.replace(tmp, cache)
+        except Exception:
+            os.remove(tmp)
+            raise
+    except Exception as ex:
+        logger.debug("unable to write the cache file {}: {}".format(cache, ex))
@@ -8,7 +8,37 @@ from jnpr.junos.factory.cmdview import CMDView
 from jnpr.junos.factory.optable import OpTable
 from jnpr.junos.factory.table import Table
 from jnpr.junos.factory.view import View
+from jnpr.junos.jxml import compiled_xpath
 from jnpr.junos.utils.config import Config
+from lxml import etree
+
+
+def _compile_xpaths(*expressions):
+    """
+    compiles the XPath expressions of a Table or View class once, when the
+    class is built, rather than on each evaluation.  Invalid expressions are
+    left to fail when used, as they did before.
+    """
+    for expr in expressions:
+        if isinstance(expr, list):
+            _compile_xpaths(*expr)
+        elif isinstance(expr, str) and expr:
+            try:
+                compiled_xpath(expr)
+            except etree.XPathError:
+                pass
+
+
+def _compile_table_xpaths(item, key):
+    """
+    compiles the item and key XPath expressions of a Table class.
+    """
+    if item is None:
+        return
+    _compile_xpaths(item, key)
+    if isinstance(key, str) and " | " not in key:
+        # the expression of Table.keys()
+        _compile_xpaths(item + "/" + key)
 
 
 def FactoryCfgTable(table_name=None, data_dict={}):
@@ -45,6 +75,7 @@ def FactoryOpTable(
     new_cls.VIEW = view
     new_cls.USE_FILTER = use_filter
     new_cls.__module__ = __name__.replace("factory_cls", "OpTable")
+    _compile_table_xpaths(item, key)
     return new_cls
 
 
@@ -116,6 +147,7 @@ def FactoryTable(
     new_cls.VIEW = view
     new_cls.USE_FILTER = use_filter
     new_cls.__module__ = __name__.replace("factory_cls", "Table")
+    _compile_table_xpaths(item, key)
     return new_cls
 
 
@@ -158,6 +190,14 @@ def FactoryView(fields, **kvargs):
         new_cls.FIELDS.update(kvargs["eval"])
 
     new_cls.__module__ = __name__.replace("factory_cls", "View")
+    _compile_xpaths(
+        [
+            field["xpath"]
+            for field in new_cls.FIELDS.values()
+            if isinstance(field, dict) and "xpath" in field
+        ],
+        list((new_cls.GROUPS or {}).values()),
+    )
     return new_cls
 
 
@@ -1,4 +1,5 @@
 import logging
+import re
 from copy import deepcopy
 from typing import Optional
 
@@ -14,6 +15,9 @@ from lxml.builder import E
 
 logger = logging.getLogger("jnpr.junos.factory.optable")
 
+# size of the chunks of the <rpc-reply> fed to the streaming parser
+_STREAM_CHUNK = 65536
+
 
 class OpTable(Table):
     # Default RPC and args placeholders to satisfy type checkers; subclasses override.
@@ -64,19 +68,114 @@ class OpTable(Table):
         if self._lxml is not None:
             return self
 
+        self.D.transform = lambda: remove_namespaces_and_spaces
+        rpc_args = self._rpc_args(vargs, kvargs, self._use_filter)
+
+        # execute the Junos RPC to retrieve the table
+        self.xml = getattr(self.RPC, self.GET_RPC)(**rpc_args)
+
+        # returning self for call-chaining purposes, yo!
+        return self
+
+    def stream(self, *vargs, **kvargs):
+        r"""
+        Retrieve the XML table data from the Device instance like
+        :meth:`get`, but rather than loading the table, yields the View of
+        each table item (or the XML element of the item if the table has no
+        View) as soon as it is parsed::
+
+            for route in RouteTable(dev).stream(table='inet.0'):
+                print(route.key, route.nexthop)
+
+        The <rpc-reply> is parsed incrementally and never held as a tree;
+        each item is detached from the reply before it is yielded, so
+        memory is bounded by the reply text and a single item, regardless of
+        the number of items. The Table itself stays empty.
+
+        The :vargs: and :kvargs: are the ones of :meth:`get`.
+
+        NOTES:
+          Only ITEM_XPATH values which are paths of element names, e.g.
+          'route-table/rt' or '//physical-interface', are streamed. Tables
+          with another ITEM_XPATH, Tables created with a :path: or :xml:
+          and console connections fall back to :meth:`get` followed by an
+          iteration of the Table.
+
+          The View fields are evaluated on the detached item, XPath
+          expressions which reach outside of the item ('../name') do not
+          match anything.
+        """
+        use_filter = kvargs.pop("use_filter", self._use_filter)
+        item_path = _stream_item_path(self.ITEM_XPATH)
+        if (
+            item_path is None
+            or self._path is not None
+            or self._lxml is not None
+            or getattr(self.D, "_rpc_raw", None) is None
+        ):
+            for item in self.get(*vargs, use_filter=use_filter, **kvargs):
+                yield item
+            return
+
+        self._clearkeys()
+        self.xml = None
+        rpc_args = self._rpc_args(vargs, kvargs, use_filter)
+        rpc, dec_args = self.RPC._rpc_element(
+            re.sub("_", "-", self.GET_RPC), **rpc_args
+        )
+        rsp = self.D._rpc_raw(rpc, **dec_args)
+
+        view_as = self.view or (lambda table, view_xml: view_xml)
+        if not isinstance(rsp, str):
+            # warnings were ignored, the reply has been parsed already.
+            rsp = remove_namespaces_and_spaces(rsp)
+            for item in rsp[0].xpath(self.ITEM_XPATH) if len(rsp) else []:
+                yield view_as(self, item)
+            return
+
+        path_re, tag = item_path
+        parser = etree.XMLPullParser(
+            events=("end",),
+            tag="{*}" + tag if tag is not None else None,
+            huge_tree=self.D._huge_tree,
+        )
+        for start in range(0, len(rsp) + 1, _STREAM_CHUNK):
+            if start < len(rsp):
+                parser.feed(rsp[start : start + _STREAM_CHUNK])
+            else:
+                parser.close()
+            for _, elem in parser.read_events():
+                # the path of the item below the <rpc-reply>
+                names = []
+                parent = elem
+                while parent.getparent() is not None:
+                    names.append(etree.QName(parent).localname)
+                    parent = parent.getparent()
+                if not path_re.match("/".join(reversed(names))):
+                    continue
+                elem.getparent().remove(elem)
+                yield view_as(self, remove_namespaces_and_spaces(elem))
+
+    # -------------------------------------------------------------------------
+    # PRIVATE METHODS
+    # -------------------------------------------------------------------------
+
+    def _rpc_args(self, vargs, kvargs, use_filter):
+        """
+        :returns: the arguments of the GET_RPC metafunction for the :vargs:
+          and :kvargs: of :meth:`get`
+        """
         argkey = vargs[0] if len(vargs) else None
 
         rpc_args = {}
 
-        if self._use_filter:
+        if use_filter:
             try:
                 filter_xml = generate_sax_parser_input(self)
                 rpc_args["filter_xml"] = filter_xml
             except Exception as ex:
                 logger.debug("Not able to create SAX parser input due to '%s'" % ex)
-            self.D.transform = lambda: remove_namespaces_and_spaces
 
-        self.D.transform = lambda: remove_namespaces_and_spaces
         rpc_args.update(self.GET_ARGS)  # copy default args
         # saltstack get_table pass args as named keyword
         if "args" in kvargs and isinstance(kvargs["args"], dict):
@@ -88,11 +187,41 @@ class OpTable(Table):
             if get_key is not None:
                 rpc_args.update({get_key: argkey})
 
-        # execute the Junos RPC to retrieve the table
-        self.xml = getattr(self.RPC, self.GET_RPC)(**rpc_args)
+        return rpc_args
 
-        # returning self for call-chaining purposes, yo!
-        return self
+
+def _stream_item_path(item_xpath):
+    """
+    Translates an ITEM_XPATH made of element names into a regular
+    expression matching the '/' separated names of the item element and its
+    ancestors, below the <rpc-reply>.
+
+    :returns: tuple of the compiled expression and the name of the item
+      element (``None`` for '*'), or ``None`` if the ITEM_XPATH can not be
+      streamed.
+    """
+    if not item_xpath or (item_xpath[0] == "/" and item_xpath[:2] != "//"):
+        return None
+    tokens = re.split("(//|/)", item_xpath)
+    if tokens[0]:
+        # relative to the RPC response element
+        tokens.insert(0, "")
+        tokens.insert(1, "/")
+    pattern = "^[^/]+" if tokens[1] == "/" else "^(?:.*/)?"
+    for index in range(1, len(tokens), 2):
+        sep, step = tokens[index], tokens[index + 1]
+        if step == "*":
+            step_re = "[^/]+"
+        elif re.match(r"^[\w.-]+$", step) and step not in (".", ".."):
+            step_re = re.escape(step)
+        else:
+            return None
+        if index == 1:
+            pattern += ("/" if sep == "/" else "") + step_re
+        else:
+            pattern += ("/" if sep == "/" else "/(?:.+/)?") + step_re
+    tag = tokens[-1] if tokens[-1] != "*" else None
+    return re.compile(pattern + "$"), tag
 
 
 def generate_sax_parser_input(obj):
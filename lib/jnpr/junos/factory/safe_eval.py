@@ -1,5 +1,7 @@
 import ast
+import functools
 import re
+from collections.abc import Hashable
 
 from jinja2 import Template, meta
 
@@ -20,6 +22,10 @@ SAFE_FUNCTIONS = {
 
 SAFE_METHODS = {"values", "items", "keys", "endswith", "get"}
 
+# number of compiled expressions kept, expressions are fixed per
+# View/CMDView definition so that this is rarely reached
+EXPRESSION_CACHE_SIZE = 1024
+
 SAFE_BINOPS = (
     ast.Add,
     ast.Sub,
@@ -215,24 +221,39 @@ def coerce_expression_value(value):
     return value
 
 
-def eval_expression(expression, names=None):
-    names = names or {}
+@functools.lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def _compile_expression(expression, names):
+    """
+    returns the code object of :expression:, validated against the frozenset
+    of the bound :names:.
+    """
     try:
         parsed = ast.parse(expression, mode="eval")
     except SyntaxError as ex:
         raise UnsafeExpressionError(str(ex))
 
-    _ExpressionValidator(names.keys()).visit(parsed)
+    _ExpressionValidator(names).visit(parsed)
+    return compile(parsed, "<safe-eval>", "eval")
+
+
+def eval_expression(expression, names=None):
+    names = names or {}
+    code = _compile_expression(expression, frozenset(names))
     scope = dict(SAFE_FUNCTIONS)
     scope.update(names)
     # Comprehensions in Python 3 resolve names from globals, not locals.
     # Provide the same safe scope in globals to keep behavior consistent.
     safe_globals = {"__builtins__": {}}
     safe_globals.update(scope)
-    return eval(compile(parsed, "<safe-eval>", "eval"), safe_globals, scope)
+    return eval(code, safe_globals, scope)
 
 
-def eval_jinja_expression(expression, context):
+def _render_jinja_expression(expression):
+    """
+    returns the sorted variables of the jinja :expression: and the python
+    expression it renders to, with the variables replaced by the names
+    __val_<index>.
+    """
     template = Template(expression)
     if isinstance(expression, str):
         variables = sorted(
@@ -242,18 +263,36 @@ def eval_jinja_expression(expression, context):
         variables = sorted(meta.find_undeclared_variables(expression))
 
     placeholder_context = {}
+    for index, var_name in enumerate(variables):
+        placeholder_context[var_name] = "__val_%s" % index
+
+    rendered_expression = template.render(placeholder_context)
+    # Preserve legacy patterns like "'{{ cpu }}'[:-1]" by converting
+    # quoted placeholders to bare variable names bound in eval_names.
+    rendered_expression = re.sub(r"([\"'])(__val_\d+)\1", r"\2", rendered_expression)
+    return tuple(variables), rendered_expression
+
+
+# the rendering only depends on the expression, as the template is given the
+# placeholder names rather than the values. Expressions are either strings or
+# the jinja2 Template nodes of the Table/View definitions, hashed by identity.
+_render_jinja_expression_cached = functools.lru_cache(maxsize=EXPRESSION_CACHE_SIZE)(
+    _render_jinja_expression
+)
+
+
+def eval_jinja_expression(expression, context):
+    if isinstance(expression, Hashable):
+        variables, rendered_expression = _render_jinja_expression_cached(expression)
+    else:
+        variables, rendered_expression = _render_jinja_expression(expression)
+
     eval_names = {}
     for index, var_name in enumerate(variables):
-        placeholder = "__val_%s" % index
-        placeholder_context[var_name] = placeholder
         if callable(context):
             value = context(var_name)
         else:
             value = context.get(var_name)
-        eval_names[placeholder] = coerce_expression_value(value)
+        eval_names["__val_%s" % index] = coerce_expression_value(value)
 
-    rendered_expression = template.render(placeholder_context)
-    # Preserve legacy patterns like "'{{ cpu }}'[:-1]" by converting
-    # quoted placeholders to bare variable names bound in eval_names.
-    rendered_expression = re.sub(r"([\"'])(__val_\d+)\1", r"\2", rendered_expression)
     return eval_expression(rendered_expression, names=eval_names)
@@ -2,12 +2,12 @@ import copy
 import logging
 import re
 from collections import OrderedDict
-from functools import reduce
+from functools import lru_cache, partialmethod, reduce
 from typing import Any, Dict, List, cast
 
 import pyparsing as pp
 from jnpr.junos.factory.safe_eval import eval_jinja_expression
-from transitions import Machine
+from transitions import MachineError
 
 logger = logging.getLogger("jnpr.junos.factory.state_machine")
 
@@ -41,6 +41,18 @@ class Identifiers:
     ) + pp.StringEnd()
 
 
+# precompiled equivalents of Identifiers.numbers and Identifiers.header_bar
+# parsed with parseAll=True, which are checked against every parsed item.
+# pyparsing skips the " \t\n\r" white spaces between the tokens.
+_WS = "[ \t\n\r]*"
+_NUMBER_RE = re.compile(
+    _WS + r"[0-9]+(" + _WS + r"\." + _WS + r"[0-9]+)?" + _WS + r"\Z"
+)
+_HEADER_BAR_RE = re.compile(
+    _WS + r"(?:-+(?:" + _WS + r"-+)*|=+(?:" + _WS + r"=+)*)" + _WS + r"\Z"
+)
+
+
 def data_type(item):
     """
 
@@ -50,20 +62,11 @@ def data_type(item):
     Returns: item converted to data type it should represent
 
     """
-    try:
-        obj = Identifiers.numbers.parseString(item, parseAll=True)
-        if "." in obj[0]:
-            return float
-        else:
-            return int
-    except pp.ParseException as ex:
-        pass
-    try:
-        Identifiers.hex_numbers.parseString(item, parseAll=True)
-        return str  # special case
-    except pp.ParseException as ex:
-        pass
-    return str
+    obj = _NUMBER_RE.match(item)
+    if obj is None:
+        # hex numbers (Identifiers.hex_numbers) are strings as well
+        return str
+    return float if obj.group(1) else int
 
 
 def convert_to_data_type(items):
@@ -79,109 +82,211 @@ def convert_to_data_type(items):
     return list(map(lambda x, y: int(x) if y is int else x.strip(), items, item_types))
 
 
-class StateMachine(Machine):
+# states and transitions of StateMachine, compiled once into _EVENTS rather
+# than building a transitions.Machine for every parsed (nested) table.
+_STATES: List[str] = [
+    "start",
+    "row_column",
+    "title_data",
+    "regex_data",
+    "delimiter_data",
+    "exists_bool_data",
+]
+_TRANSITIONS: List[Dict[str, Any]] = [
+    {
+        "trigger": "column_provided",
+        "source": "*",
+        "dest": "row_column",
+        "conditions": "match_columns",
+        "before": "check_header_bar",
+        "after": "parse_raw_columns",
+    },
+    {
+        "trigger": "check_next_row",
+        "source": "row_column",
+        "dest": "row_column",
+        "conditions": "prev_next_row_same_type",
+        "after": "parse_raw_columns",
+    },
+    {
+        "trigger": "title_provided",
+        "source": "start",
+        "dest": "title_data",
+        "conditions": ["match_title", "title_not_followed_by_columns"],
+        "after": "parse_title_data",
+    },
+    {
+        "trigger": "regex_provided",
+        "source": "title_data",
+        "dest": "regex_data",
+        "conditions": ["match_title"],
+        "before": "check_header_bar",
+        "after": "parse_using_regex",
+    },
+    {
+        "trigger": "delimiter_without_title",
+        "source": "start",
+        "dest": "delimiter_data",
+        "after": "parse_using_delimiter",
+    },
+    {
+        "trigger": "delimiter_with_title",
+        "source": ["start", "delimiter_data"],
+        "dest": "delimiter_data",
+        "conditions": ["match_title"],
+        "before": "check_header_bar",
+        "after": "parse_using_delimiter",
+    },
+    {
+        "trigger": "regex_with_item",
+        "source": ["start", "regex_data"],
+        "dest": "regex_data",
+        "after": "parse_using_item_and_regex",
+    },
+    {
+        "trigger": "regex_parser",
+        "source": "start",
+        "dest": "regex_data",
+        "after": "parse_using_regex",
+    },
+    {
+        "trigger": "regex_parser",
+        "source": "regex_data",
+        "dest": "regex_data",
+        "after": "parse_using_regex",
+    },
+    {
+        "trigger": "regex_parser",
+        "source": "row_column",
+        "dest": "regex_data",
+        "after": "parse_using_regex",
+    },
+    {
+        "trigger": "exists_check",
+        "source": ["start", "regex_data", "row_column"],
+        "dest": "exists_bool_data",
+        "after": "parse_exists",
+    },
+    {
+        "trigger": "exists_check",
+        "source": "title_data",
+        "dest": "exists_bool_data",
+        "after": "parse_exists",
+    },
+]
+
+
+def _as_tuple(value):
+    if value is None:
+        return ()
+    return (value,) if isinstance(value, str) else tuple(value)
+
+
+def _compile_transitions(transitions):
+    """
+    :returns: the :transitions: indexed as
+      ``{trigger: {source state: [(conditions, before, dest, after), ...]}}``
+    """
+    events: Dict[str, Dict[str, List[Any]]] = {}
+    for trans in transitions:
+        sources = _STATES if trans["source"] == "*" else _as_tuple(trans["source"])
+        for source in sources:
+            events.setdefault(trans["trigger"], {}).setdefault(source, []).append(
+                (
+                    _as_tuple(trans.get("conditions")),
+                    _as_tuple(trans.get("before")),
+                    trans["dest"],
+                    _as_tuple(trans.get("after")),
+                )
+            )
+    return events
+
+
+_EVENTS = _compile_transitions(_TRANSITIONS)
+
+
+class _EventData(object):
+    """
+    Data given to the conditions and callbacks of a triggered event, as with
+    the ``send_event`` option of ``transitions.Machine``.
+    """
+
+    def __init__(self, event, kwargs):
+        self.event = event
+        self.kwargs = kwargs
+
+
+@lru_cache(maxsize=None)
+def _columns_parser(columns):
+    """
+    :returns: the parser matching all of the :columns: titles in any order.
+    """
+    return cast(Any, reduce(lambda x, y: x & y, [pp.Literal(i) for i in columns]))
+
+
+@lru_cache(maxsize=None)
+def _regex_parser(regex):
+    """
+    :param tuple regex: (key, regex) items of a view REGEX
+
+    :returns: tuple of the parser matching all of the :regex: in a row and of
+      the (index, compiled regex) of the items whose value is the first group
+      of their regex.
+    """
+    exprs = []
+    groups = []
+    for index, (key, val) in enumerate(regex):
+        if val in Identifiers.__dict__:
+            exprs.append(Identifiers.__dict__[val])
+        else:
+            exprs.append(pp.Regex(val, flags=re.IGNORECASE))
+            groups.append((index, re.compile(val, re.I)))
+    return reduce(lambda x, y: x + y, exprs), tuple(groups)
+
+
+class StateMachine(object):
+    """
+    Parses the text output of a command into the data of a CMDTable.
+
+    The transitions between the parsing states follow ``_TRANSITIONS``; each
+    trigger (e.g. :meth:`column_provided`) fires the first transition from the
+    current state whose conditions are met, like a ``transitions.Machine``
+    with ``send_event=True`` would.
+    """
+
     def __init__(self, table_view):
         self._data = {}
         self._table = table_view
         self._view = self._table.VIEW
         self._raw = ""
         self._lines = []
-        states_list: List[str] = [
-            "row_column",
-            "title_data",
-            "regex_data",
-            "delimiter_data",
-            "exists_bool_data",
-        ]
-        transitions_list: List[Dict[str, Any]] = [
-            {
-                "trigger": "column_provided",
-                "source": "*",
-                "dest": "row_column",
-                "conditions": "match_columns",
-                "before": "check_header_bar",
-                "after": "parse_raw_columns",
-            },
-            {
-                "trigger": "check_next_row",
-                "source": "row_column",
-                "dest": "row_column",
-                "conditions": "prev_next_row_same_type",
-                "after": "parse_raw_columns",
-            },
-            {
-                "trigger": "title_provided",
-                "source": "start",
-                "dest": "title_data",
-                "conditions": ["match_title", "title_not_followed_by_columns"],
-                "after": "parse_title_data",
-            },
-            {
-                "trigger": "regex_provided",
-                "source": "title_data",
-                "dest": "regex_data",
-                "conditions": ["match_title"],
-                "before": "check_header_bar",
-                "after": "parse_using_regex",
-            },
-            {
-                "trigger": "delimiter_without_title",
-                "source": "start",
-                "dest": "delimiter_data",
-                "after": "parse_using_delimiter",
-            },
-            {
-                "trigger": "delimiter_with_title",
-                "source": ["start", "delimiter_data"],
-                "dest": "delimiter_data",
-                "conditions": ["match_title"],
-                "before": "check_header_bar",
-                "after": "parse_using_delimiter",
-            },
-            {
-                "trigger": "regex_with_item",
-                "source": ["start", "regex_data"],
-                "dest": "regex_data",
-                "after": "parse_using_item_and_regex",
-            },
-            {
-                "trigger": "regex_parser",
-                "source": "start",
-                "dest": "regex_data",
-                "after": "parse_using_regex",
-            },
-            {
-                "trigger": "regex_parser",
-                "source": "regex_data",
-                "dest": "regex_data",
-                "after": "parse_using_regex",
-            },
-            {
-                "trigger": "regex_parser",
-                "source": "row_column",
-                "dest": "regex_data",
-                "after": "parse_using_regex",
-            },
-            {
-                "trigger": "exists_check",
-                "source": ["start", "regex_data", "row_column"],
-                "dest": "exists_bool_data",
-                "after": "parse_exists",
-            },
-            {
-                "trigger": "exists_check",
-                "source": "title_data",
-                "dest": "exists_bool_data",
-                "after": "parse_exists",
-            },
-        ]
-        Machine.__init__(
-            self,
-            states=states_list,
-            transitions=transitions_list,
-            initial="start",
-            send_event=True,
-        )
+        self.state = "start"
+
+    def trigger(self, event, **kwargs):
+        """
+        Fires the transitions of the trigger :event: from the current state.
+
+        :returns: True when a transition was executed, False when the
+          conditions of none were met.
+
+        :raises transitions.MachineError:
+          when :event: can not be triggered from the current state
+        """
+        transitions = _EVENTS[event].get(self.state)
+        if transitions is None:
+            raise MachineError(
+                "Can't trigger event %s from state %s!" % (event, self.state)
+            )
+        event_data = _EventData(event, kwargs)
+        for conditions, before, dest, after in transitions:
+            if all(getattr(self, cond)(event_data) for cond in conditions):
+                for callback in before:
+                    getattr(self, callback)(event_data)
+                self.state = dest
+                for callback in after:
+                    getattr(self, callback)(event_data)
+                return True
+        return False
 
     def parse(self, lines):
         """
@@ -194,7 +299,7 @@ class StateMachine(Machine):
         Returns: dictionary (self._data) with parsed data.
 
         """
-        self._lines = copy.deepcopy(lines)
+        self._lines = list(lines)
         self._raw = "\n".join(lines)
         if self._view is None:
             if self._table.DELIMITER is not None:
@@ -348,29 +453,15 @@ class StateMachine(Machine):
             )
             for index, item in enumerate(columns):
                 columns[index] = item + [None] * (max_title_len - len(item))
-            col_parser = cast(
-                Any,
-                reduce(
-                    lambda x, y: x & y,
-                    [pp.Literal(i[0]) for i in columns],  # type: ignore[arg-type]
-                ),
-            )
+            titles = tuple(i[0] for i in columns)
             for line in self._lines:
-                if self._parse_literal(line, col_parser):
+                if self._parse_literal(line, titles):
                     for index in range(1, max_title_len):
-                        col_parser = cast(
-                            Any,
-                            reduce(
-                                lambda x, y: x & y,  # type: ignore[arg-type]
-                                [
-                                    pp.Literal(i[index])
-                                    for i in columns
-                                    if i[index] is not None
-                                ],
-                            ),
+                        next_titles = tuple(
+                            i[index] for i in columns if i[index] is not None
                         )
                         if self._parse_literal(
-                            self._lines[self._lines.index(line) + 1], col_parser
+                            self._lines[self._lines.index(line) + 1], next_titles
                         ):
                             # removing next lines in header title, dont see any
                             # use of these lines
@@ -383,15 +474,9 @@ class StateMachine(Machine):
                 else:
                     continue
         else:
-            col_parser_single = cast(
-                Any,
-                reduce(
-                    lambda x, y: x & y,
-                    [pp.Literal(i) for i in columns],  # type: ignore[arg-type]
-                ),
-            )
+            titles = tuple(columns)
             for line in self._lines:
-                if self._parse_literal(line, col_parser_single):
+                if self._parse_literal(line, titles):
                     d = set(map(lambda x, y: x in y, columns, [line] * len(columns)))
                     if d.pop():
                         current_index = self._lines.index(line)
@@ -420,9 +505,14 @@ class StateMachine(Machine):
     def title_not_followed_by_columns(self, event):
         return not self.match_columns(event)
 
-    def _parse_literal(self, line, col_parser):
+    def _parse_literal(self, line, titles):
+        # a line missing any of the titles can not match, which spares the
+        # parser on most of the lines
+        for title in titles:
+            if title not in line:
+                return False
         try:
-            if col_parser.searchString(line):
+            if _columns_parser(titles).searchString(line):
                 return True
         except pp.ParseException as ex:
             return False
@@ -444,11 +534,9 @@ class StateMachine(Machine):
 
         """
         line = self._lines[1]
-        try:
-            Identifiers.header_bar.parseString(line, parseAll=True)
-            self._lines.pop(1)
-        except pp.ParseException as ex:
+        if _HEADER_BAR_RE.match(line) is None:
             return False
+        self._lines.pop(1)
         return True
 
     def parse_raw_columns(self, event):
@@ -790,14 +878,8 @@ class StateMachine(Machine):
          'appidd': {'cmd': 'appidd', 'pid': 19686, 'wcpu': '0.00'},
          'apsd': {'cmd': 'apsd', 'pid': 20435, 'wcpu': '0.00'},
         """
-        _regex = copy.deepcopy(self._view.REGEX)
-        for key, val in _regex.items():
-            if val in Identifiers.__dict__:
-                _regex[key] = Identifiers.__dict__[val]
-            else:
-                _regex[key] = pp.Regex(val, flags=re.IGNORECASE)
-
-        _regex = reduce(lambda x, y: x + y, _regex.values())
+        _regex, groups = _regex_parser(tuple(self._view.REGEX.items()))
+        keys = list(self._view.REGEX.keys())
         for index, line in enumerate(self._lines):
             tmp_dict = {}
             # checking index as there can be blank line at position 0 and 2
@@ -821,22 +903,14 @@ class StateMachine(Machine):
                 else:
                     continue
             for result, start, end in _regex.scanString(line):
-                # write a different function for this
-                for key, val in self._view.REGEX.items():
-                    if val not in Identifiers.__dict__:
-                        obj = re.search(
-                            val, result[list(self._view.REGEX.keys()).index(key)], re.I
-                        )
-                        if obj and len(obj.groups()) >= 1:
-                            result[list(self._view.REGEX.keys()).index(key)] = (
-                                obj.groups()[0]
-                            )
+                for index, regex in groups:
+                    obj = regex.search(result[index])
+                    if obj and len(obj.groups()) >= 1:
+                        result[index] = obj.groups()[0]
                 items = convert_to_data_type(result)
-                tmp_dict = dict(zip(self._view.REGEX.keys(), items))
+                tmp_dict = dict(zip(keys, items))
                 if len(tmp_dict) > 0:
-                    self._insert_data(
-                        self._table.KEY, tmp_dict, list(self._view.REGEX.keys())
-                    )
+                    self._insert_data(self._table.KEY, tmp_dict, keys)
 
     def parse_using_item_and_regex(self, event):
         r"""
@@ -1032,3 +1106,14 @@ class StateMachine(Machine):
             for name, expression in self._view.EVAL.items():
                 val = eval_jinja_expression(expression, tmp_dict)
                 tmp_dict[name] = val
+
+
+# trigger and state check methods, e.g. column_provided() and is_row_column()
+for _event in _EVENTS:
+    setattr(StateMachine, _event, partialmethod(StateMachine.trigger, _event))
+for _state in _STATES:
+    setattr(
+        StateMachine,
+        "is_" + _state,
+        partialmethod(lambda self, state: self.state == state, _state),
+    )
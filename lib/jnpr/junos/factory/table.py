@@ -5,7 +5,10 @@ from datetime import datetime
 from inspect import isclass
 from time import time
 
+from jnpr.junos import jxml as JXML
+from jnpr.junos.factory.safe_eval import eval_jinja_expression
 from jnpr.junos.factory.to_json import TableJSONEncoder
+from jnpr.junos.factory.view import _field_value, _groups_xml
 
 # 3rd-party
 from lxml import etree
@@ -30,6 +33,7 @@ class Table(object):
         self.xml = xml
         self.view = self.VIEW
         self._key_list = []
+        self._key_index = None
         self._path = path
         self._lxml = xml
         self._use_filter = self.USE_FILTER and use_filter
@@ -98,7 +102,7 @@ class Table(object):
         keys = []
         for k in key_list:
             try:
-                keys.append(this.xpath(k)[0].text)
+                keys.append(JXML.xpath(this, k)[0].text)
             except:
                 # Case where key is provided like key: re-name | Null
                 if " | " in k and "Null" in k:
@@ -108,10 +112,10 @@ class Table(object):
 
     def _keys_composite(self, xpath, key_list):
         """composite keys return a tuple of key-items"""
-        return [self._tkey(item, key_list) for item in self.xml.xpath(xpath)]
+        return [self._tkey(item, key_list) for item in JXML.xpath(self.xml, xpath)]
 
     def _keys_simple(self, xpath):
-        return [x.text.strip() for x in self.xml.xpath(xpath)]
+        return [x.text.strip() for x in JXML.xpath(self.xml, xpath)]
 
     def _keyspec(self):
         """returns tuple (keyname-xpath, item-xpath)"""
@@ -119,6 +123,43 @@ class Table(object):
 
     def _clearkeys(self):
         self._key_list = []
+        self._key_index = None
+
+    def _index(self):
+        """
+        returns a dict of the table items keyed by their key value (a tuple
+        for composite keys), as returned by :meth:`keys`.  The first item
+        wins when items share a key.  The index is built on first use and
+        rebuilt when the table XML changes.
+
+        returns None for the keys which can not be indexed (union keys
+        using " | ", or no key.)
+        """
+        self._assert_data()
+        if self._key_index is not None and self._key_index[0] is self.xml:
+            return self._key_index[1]
+
+        key_value, xpath = self._keyspec()
+        if isinstance(key_value, str):
+            if " | " in key_value:
+                return None
+            index = {}
+            for item in JXML.xpath(self.xml, xpath):
+                for key in JXML.xpath(item, key_value):
+                    key = key.text if isinstance(key, etree._Element) else key
+                    if key is not None:
+                        index.setdefault(key.strip(), item)
+        elif isinstance(key_value, list):
+            if any(" | " in k for k in key_value):
+                return None
+            index = {}
+            for item in JXML.xpath(self.xml, xpath):
+                index.setdefault(self._tkey(item, key_value), item)
+        else:
+            return None
+
+        self._key_index = (self.xml, index)
+        return index
 
     # -------------------------------------------------------------------------
     # PUBLIC METHODS
@@ -189,6 +230,103 @@ class Table(object):
         """returns list of tuple(name,values) for each table entry"""
         return list(zip(self.keys(), self.values()))
 
+    # ------------------------------------------------------------------------
+    # to_columns / to_records - bulk extraction of the view fields
+    # ------------------------------------------------------------------------
+
+    def to_columns(self, fields=None):
+        """
+        Extracts the View fields of all the table items in a single pass,
+        without creating a View object for each item.  Each field xpath is
+        looked up once for the whole column.
+
+        :fields:
+          list of the field names to extract, defaults to all of the View
+          fields.
+
+        :returns: dict of field name/list of values, one value per item in
+          the order of :meth:`keys`.  Values are the ones of
+          ``dict(view.items())``, i.e. None for a missing field and
+          True/False for a flag.
+
+        :raises ValueError: when the table has no View or a field is unknown
+        """
+        self._assert_data()
+        view = self.view
+        if view is None:
+            raise ValueError("Table has no View")
+        if fields is None:
+            fields = list(view.FIELDS.keys())
+
+        items = JXML.xpath(self.xml, self.ITEM_XPATH)
+        if view.GROUPS is not None:
+            groups = [_groups_xml(view.GROUPS, this) for this in items]
+        else:
+            groups = [{}] * len(items)
+
+        columns = {}
+        for name in fields:
+            if name in view.EVAL:
+                continue
+            item = view.FIELDS.get(name)
+            if item is None:
+                raise ValueError("Unknown field: '%s'" % name)
+            if "table" in item:
+                columns[name] = [item["table"](self.D, this) for this in items]
+                continue
+            find = JXML.compiled_xpath(item["xpath"])
+            if "group" in item:
+                contexts = [this.get(item["group"]) for this in groups]
+            else:
+                contexts = items
+            columns[name] = [
+                None if this is None else _field_value(name, item, find(this))
+                for this in contexts
+            ]
+
+        # eval fields refer to other fields of the same item, these are
+        # taken from the columns when extracted, else from a View.
+        for name in [name for name in fields if name in view.EVAL]:
+            values = []
+            for index, this in enumerate(items):
+                item_view = []
+
+                def _lookup(key):
+                    if key in columns:
+                        return columns[key][index]
+                    if not item_view:
+                        item_view.append(view(self, this))
+                    return item_view[0][key]
+
+                values.append(eval_jinja_expression(view.EVAL[name], _lookup))
+            columns[name] = values
+
+        return dict((name, columns[name]) for name in fields)
+
+    def to_records(self, fields=None):
+        """
+        :returns: list of dict of field name/value, one per item in the
+          order of :meth:`keys`, same as ``[dict(view.items()) for view in
+          table]``.  See :meth:`to_columns`.
+        """
+        columns = self.to_columns(fields)
+        names = list(columns.keys())
+        return [dict(zip(names, values)) for values in zip(*columns.values())]
+
+    def to_dataframe(self, fields=None):
+        """
+        :returns: pandas DataFrame of the :meth:`to_columns` values, a row
+          per item in the order of :meth:`keys`.
+
+        :raises ImportError: when pandas is not installed
+        """
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError("pandas is missing. Need to be installed explicitly.")
+        columns = self.to_columns(fields)
+        return pandas.DataFrame(columns)
+
     # ------------------------------------------------------------------------
     # get - loads the data from source
     # ------------------------------------------------------------------------
@@ -282,7 +420,7 @@ class Table(object):
         as_xml = lambda table, view_xml: view_xml
         view_as = self.view or as_xml
 
-        for this in self.xml.xpath(self.ITEM_XPATH):
+        for this in JXML.xpath(self.xml, self.ITEM_XPATH):
             yield view_as(self, this)
 
     def __getitem__(self, value):
@@ -311,6 +449,24 @@ class Table(object):
             # implements the 'slice' mechanism
             return [self.__getitem__(key) for key in keys[value]]
 
+        as_xml = lambda table, view_xml: view_xml
+        use_view = self.view or as_xml
+
+        # ---[ key index ] ----------------------------------------------------
+
+        namekey_xpath = self._keyspec()[0]
+        if (isinstance(value, str) and isinstance(namekey_xpath, str)) or (
+            isinstance(value, tuple)
+            and isinstance(namekey_xpath, list)
+            and len(value) == len(namekey_xpath)
+            and None not in value
+        ):
+            index = self._index()
+            if index is not None:
+                if value not in index:
+                    return None
+                return use_view(table=self, view_xml=index[value])
+
         # ---[ get_xpath ] ----------------------------------------------------
 
         def get_xpath(find_value):
@@ -338,11 +494,12 @@ class Table(object):
         if not len(found):
             return None
 
-        as_xml = lambda table, view_xml: view_xml
-        use_view = self.view or as_xml
-
         return use_view(table=self, view_xml=found[0])
 
     def __contains__(self, key):
         """membership for use with 'in'"""
+        if isinstance(key, (str, tuple)):
+            index = self._index()
+            if index is not None:
+                return key in index
         return bool(key in self.keys())
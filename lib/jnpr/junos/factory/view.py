@@ -4,6 +4,7 @@ import warnings
 from contextlib import contextmanager
 from copy import deepcopy
 
+from jnpr.junos import jxml as JXML
 from jnpr.junos.factory.safe_eval import eval_jinja_expression
 from jnpr.junos.factory.to_json import TableViewJSONEncoder
 from jnpr.junos.factory.viewfields import ViewFields
@@ -53,13 +54,7 @@ class View(object):
     def _init_xml(self, given_xml):
         self._xml = given_xml
         if self.GROUPS is not None:
-            self._groups = {}
-            for xg_name, xg_xpath in self.GROUPS.items():
-                xg_xml = self._xml.xpath(xg_xpath)
-                # @@@ this is technically an error; need to trap it
-                if not len(xg_xml):
-                    continue
-                self._groups[xg_name] = xg_xml[0]
+            self._groups = _groups_xml(self.GROUPS, self._xml)
 
     # -------------------------------------------------------------------------
     # PROPERTIES
@@ -88,7 +83,7 @@ class View(object):
                     return self._check_key_delimiter_null(
                         self._xml, self.ITEM_NAME_XPATH
                     )
-                return self._xml.xpath(self.ITEM_NAME_XPATH)[0].text.strip()
+                return JXML.xpath(self._xml, self.ITEM_NAME_XPATH)[0].text.strip()
             # simple key
             return self._xml.findtext(self.ITEM_NAME_XPATH).strip()
         else:
@@ -104,7 +99,9 @@ class View(object):
                         keys.append(key_with_null_cleaned)
                 else:
                     try:
-                        keys.append(self.xml.xpath(item_name_xpath)[0].text.strip())
+                        keys.append(
+                            JXML.xpath(self.xml, item_name_xpath)[0].text.strip()
+                        )
                     except:
                         keys.append(None)
             if keys:
@@ -127,7 +124,7 @@ class View(object):
             # Let try get value for valid xpath key
             xpath_key = [x for x in item_name_xpath.split(" | ") if x != "Null"]
             if xpath_key:
-                val = xml.xpath(xpath_key[0])
+                val = JXML.xpath(xml, xpath_key[0])
                 if val:
                     return val[0].text.strip()
                 else:
@@ -266,60 +263,15 @@ class View(object):
             return item["table"](self.D, self._xml)
 
         # otherwise, not a sub-table, and handle the field
-        astype = item.get("astype", str)
         if "group" in item:
             if item["group"] in self._groups:
-                found = self._groups[item["group"]].xpath(item["xpath"])
+                found = JXML.xpath(self._groups[item["group"]], item["xpath"])
             else:
                 return
         else:
-            found = self._xml.xpath(item["xpath"])
-
-        len_found = len(found)
-
-        if astype is bool:
-            # handle the boolean flag case separately
-            return bool(len_found)
-
-        if not len_found:
-            # even for the case of numbers, do not set the value.  we
-            # want to detect "does not exist" vs. defaulting to 0
-            # -- 2013-nov-19, JLS.
-            return None
-
-        try:
-            # added exception handler to catch malformed xpath expressesion
-            # -- 2013-nov-19, JLS.
-            # added support to handle multiple xpath values, i.e. a list of
-            # things that have the same xpath expression (common in configs)
-            # -- 2031-dec-06, JLS
-            # added support to use the element tag if the text is empty
-            def _munch(x):
-                if sys.version < "3":
-                    as_str = x if isinstance(x, str) else x.text
-                    if isinstance(as_str, unicode):
-                        as_str = as_str.encode("ascii", "replace")
-                else:
-                    as_str = x if isinstance(x, str) else x.text
-                if as_str is not None:
-                    as_str = as_str.strip()
-                if not as_str:
-                    as_str = x.tag  # use 'not' to test for empty
-                return astype(as_str)
-
-            if 1 == len_found:
-                return _munch(found[0])
-            # -- 2020-March-26, if  string function (like string-before or string-after) is used as xpath (instead of as xpath condition), lxml will return ElementUnicodeResult object, which will be converted wrongly by the next interation, we should return the original UnicodeResult
-            if isinstance(found, etree._ElementUnicodeResult):
-                return found
-
-            return [_munch(this) for this in found]
-
-        except:
-            raise RuntimeError("Unable to handle field:'%s'" % name)
+            found = JXML.xpath(self._xml, item["xpath"])
 
-        # and if we are here, then we didn't handle the field.
-        raise RuntimeError("Unable to handle field:'%s'" % name)
+        return _field_value(name, item, found)
 
     def __getitem__(self, name):
         """
@@ -327,3 +279,71 @@ class View(object):
         the same way they would do :obj.name:
         """
         return getattr(self, name)
+
+
+def _groups_xml(groups, xml):
+    """
+    returns the dict of group name/XML of the item :xml:, for the GROUPS
+    name/xpath :groups: of a View.
+    """
+    found = {}
+    for xg_name, xg_xpath in groups.items():
+        xg_xml = JXML.xpath(xml, xg_xpath)
+        # @@@ this is technically an error; need to trap it
+        if not len(xg_xml):
+            continue
+        found[xg_name] = xg_xml[0]
+    return found
+
+
+def _field_value(name, item, found):
+    """
+    returns the value of the View field :name:, defined by :item:, from the
+    result :found: of the field xpath.
+    """
+    astype = item.get("astype", str)
+    len_found = len(found)
+
+    if astype is bool:
+        # handle the boolean flag case separately
+        return bool(len_found)
+
+    if not len_found:
+        # even for the case of numbers, do not set the value.  we
+        # want to detect "does not exist" vs. defaulting to 0
+        # -- 2013-nov-19, JLS.
+        return None
+
+    try:
+        # added exception handler to catch malformed xpath expressesion
+        # -- 2013-nov-19, JLS.
+        # added support to handle multiple xpath values, i.e. a list of
+        # things that have the same xpath expression (common in configs)
+        # -- 2031-dec-06, JLS
+        # added support to use the element tag if the text is empty
+        def _munch(x):
+            if sys.version < "3":
+                as_str = x if isinstance(x, str) else x.text
+                if isinstance(as_str, unicode):
+                    as_str = as_str.encode("ascii", "replace")
+            else:
+                as_str = x if isinstance(x, str) else x.text
+            if as_str is not None:
+                as_str = as_str.strip()
+            if not as_str:
+                as_str = x.tag  # use 'not' to test for empty
+            return astype(as_str)
+
+        if 1 == len_found:
+            return _munch(found[0])
+        # -- 2020-March-26, if  string function (like string-before or string-after) is used as xpath (instead of as xpath condition), lxml will return ElementUnicodeResult object, which will be converted wrongly by the next interation, we should return the original UnicodeResult
+        if isinstance(found, etree._ElementUnicodeResult):
+            return found
+
+        return [_munch(this) for this in found]
+
+    except:
+        raise RuntimeError("Unable to handle field:'%s'" % name)
+
+    # and if we are here, then we didn't handle the field.
+    raise RuntimeError("Unable to handle field:'%s'" % name)
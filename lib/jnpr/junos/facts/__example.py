@@ -32,6 +32,19 @@ def provides_facts():
     }
 
 
+# The file may include a requires_facts() function.
+# The requires_facts() function must return a tuple of the facts which the
+# get_facts(device) function reads from device.facts. These facts are gathered
+# before get_facts(device) is invoked. Facts which do not depend on each other
+# may be gathered concurrently, so a fact which is read but not listed here
+# might be gathered twice.
+def requires_facts():
+    """
+    Returns a tuple of the facts read by get_facts().
+    """
+    return ()
+
+
 # The file must include a get_facts(device) function. The get_facts(device)
 # function takes a single mandatory device argument which is the Device object
 # on which the fact is discovered.
@@ -85,8 +85,58 @@ def _build_fact_callbacks_and_doc_strings():
     return (callbacks, doc_strings)
 
 
+def _build_fact_dependencies(callbacks):
+    """
+    Builds the dependency graph of the fact callbacks from the
+    requires_facts() function of the fact modules.
+
+    :param callbacks: a dict of the callback function to invoke for each fact,
+      as returned by _build_fact_callbacks_and_doc_strings().
+
+    :returns:
+      A dict of the set of callbacks which must be invoked before each
+      callback.
+
+    :raises:
+      RuntimeError if a module requires an unknown fact or if the requirements
+                   of the modules form a loop.
+    """
+    dependencies = {}
+    for callback in set(callbacks.values()):
+        module = sys.modules[callback.__module__]
+        requires_facts = getattr(module, "requires_facts", None)
+        required = set()
+        for key in requires_facts() if requires_facts is not None else ():
+            if key not in callbacks:
+                raise RuntimeError(
+                    "The %s module requires the unknown %s fact. Please "
+                    "report this error." % (module.__name__, key)
+                )
+            if callbacks[key] is not callback:
+                required.add(callbacks[key])
+        dependencies[callback] = required
+    # Detect loops by removing the callbacks without pending requirements.
+    pending = dict(
+        (callback, set(required)) for callback, required in dependencies.items()
+    )
+    while pending:
+        ready = [callback for callback, required in pending.items() if not required]
+        if not ready:
+            raise RuntimeError(
+                "The requirements of the %s modules form a loop. Please "
+                "report this error."
+                % ", ".join(sorted(callback.__module__ for callback in pending))
+            )
+        for callback in ready:
+            del pending[callback]
+        for required in pending.values():
+            required.difference_update(ready)
+    return dependencies
+
+
 # Import all of the fact modules and build the callbacks and doc strings
-(_callbacks, _doc_strings) = _build_fact_callbacks_and_doc_strings()
+_callbacks, _doc_strings = _build_fact_callbacks_and_doc_strings()
+_dependencies = _build_fact_dependencies(_callbacks)
 
 # In case optimization flag is enabled, it strips of docstring and __doc__ becomes None
 if __doc__ is None:
@@ -17,6 +17,17 @@ def provides_facts():
     }
 
 
+def requires_facts():
+    """
+    Returns a tuple of the facts read by get_facts().
+    """
+    return (
+        "_is_linux",
+        "_iri_hostname",
+        "srx_cluster_id",
+    )
+
+
 def get_facts(device):
     """
     The RPC-equivalent of show interfaces terse on private routing instance.
@@ -15,6 +15,13 @@ def provides_facts():
     }
 
 
+def requires_facts():
+    """
+    Returns a tuple of the facts read by get_facts().
+    """
+    return ("hostname",)
+
+
 def get_facts(device):
     """
     Gathers domain facts from the configuration or /etc/resolv.conf.
@@ -119,6 +119,17 @@ def provides_facts():
     }
 
 
+def requires_facts():
+    """
+    Returns a tuple of the facts read by get_facts().
+    """
+    return (
+        "_is_linux",
+        "vc_capable",
+        "current_re",
+    )
+
+
 def get_facts(device):
     """
     Gathers facts from the <get-software-information/> RPC.
@@ -9,6 +9,13 @@ def provides_facts():
     }
 
 
+def requires_facts():
+    """
+    Returns a tuple of the facts read by get_facts().
+    """
+    return ("personality",)
+
+
 def get_facts(device):
     """
     Determines ifd_style fact based on the personality.
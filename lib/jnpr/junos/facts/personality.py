@@ -14,6 +14,16 @@ def provides_facts():
     }
 
 
+def requires_facts():
+    """
+    Returns a tuple of the facts read by get_facts().
+    """
+    return (
+        "model",
+        "re_info",
+    )
+
+
 def get_facts(device):
     """
     Determines personality fact based on the model.
@@ -43,6 +43,16 @@ def provides_facts():
     }
 
 
+def requires_facts():
+    """
+    Returns a tuple of the facts read by get_facts().
+    """
+    return (
+        "_is_linux",
+        "version",
+    )
+
+
 def get_facts(device):
     """
     Gathers facts from the sysctl command.
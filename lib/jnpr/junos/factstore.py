@@ -0,0 +1,208 @@
+"""
+Persistent stores for the facts of Junos devices.
+
+A fact store is given to a :class:`jnpr.junos.device.Device` with the
+``fact_store`` argument. Facts gathered from the device are written to the
+store and the next :class:`jnpr.junos.device.Device` instance for the same
+host and port is served from the store, as long as the record is younger
+than the store ``ttl`` and the device was neither rebooted nor committed
+since::
+
+    from jnpr.junos import Device
+    from jnpr.junos.factstore import JsonFactStore
+
+    store = JsonFactStore('/var/tmp/facts', ttl=3600)
+    with Device(host='router1', user='foo', fact_store=store) as dev:
+        print(dev.facts['version'])
+
+The facts of a device are stored under the ``'host:port'`` key, e.g.
+``'router1:830'``.
+
+Validating a record costs a single ``<get-system-uptime-information>`` RPC
+instead of the RPCs needed to gather the facts.
+"""
+
+import contextlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+
+from jnpr.junos.facts.swver import version_info
+
+logger = logging.getLogger("jnpr.junos.factstore")
+
+
+class FactStore(object):
+    """
+    Base class of the fact stores. A record is a ``dict`` which is JSON
+    serializable once encoded with :func:`_encode`.
+
+    Subclasses implement :meth:`_read`, :meth:`_write` and :meth:`delete`.
+    """
+
+    def __init__(self, ttl=900):
+        """
+        :param int ttl:
+          *OPTIONAL* time in seconds a record is valid for, default is 900.
+          ``None`` means that records never expire.
+        """
+        self.ttl = ttl
+
+    def get(self, key):
+        """
+        :returns: the record stored for **key**, or ``None`` when there is no
+          record or the record is older than :attr:`ttl`.
+        """
+        data = self._read(key)
+        if data is None:
+            return None
+        record = json.loads(data, object_hook=_decode)
+        if self.ttl is not None and time.time() - record.get("time", 0) > self.ttl:
+            logger.debug("facts of {} have expired".format(key))
+            return None
+        return record
+
+    def set(self, key, record):
+        """
+        Stores **record** for **key**, timestamped with the current time.
+        """
+        record = dict(record, time=time.time())
+        self._write(key, json.dumps(_encode(record), sort_keys=True))
+
+    def delete(self, key):
+        """
+        Removes the record of **key**, if any.
+        """
+        raise NotImplementedError
+
+    def _read(self, key):
+        raise NotImplementedError
+
+    def _write(self, key, data):
+        raise NotImplementedError
+
+
+class JsonFactStore(FactStore):
+    """
+    Stores the facts of every device as a JSON file in a directory. Files are
+    replaced atomically, so the directory can be shared by processes.
+    """
+
+    def __init__(self, path, ttl=900):
+        """
+        :param str path:
+          **REQUIRED** directory of the JSON files, created if needed.
+
+        :param int ttl: see :class:`FactStore`
+        """
+        super(JsonFactStore, self).__init__(ttl)
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def delete(self, key):
+        try:
+            os.remove(self._file(key))
+        except FileNotFoundError:
+            pass
+
+    def _file(self, key):
+        return os.path.join(self.path, re.sub(r"[^\w.@-]", "_", key) + ".json")
+
+    def _read(self, key):
+        try:
+            with open(self._file(key)) as fp:
+                return fp.read()
+        except FileNotFoundError:
+            return None
+
+    def _write(self, key, data):
+        fd, tmp = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as fp:
+                fp.write(data)
+            os.replace(tmp, self._file(key))
+        except Exception:
+            os.remove(tmp)
+            raise
+
+
+class SqliteFactStore(FactStore):
+    """
+    Stores the facts of every device in a table of a SQLite database.
+    """
+
+    def __init__(self, path, ttl=900):
+        """
+        :param str path:
+          **REQUIRED** file name of the SQLite database, created if needed.
+
+        :param int ttl: see :class:`FactStore`
+        """
+        super(SqliteFactStore, self).__init__(ttl)
+        self.path = path
+        self._lock = threading.Lock()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS facts (key TEXT PRIMARY KEY, record TEXT)"
+            )
+
+    def delete(self, key):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM facts WHERE key = ?", (key,))
+
+    @contextlib.contextmanager
+    def _connect(self):
+        # a connection per call, devices are used from several threads
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _read(self, key):
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT record FROM facts WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def _write(self, key, data):
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO facts (key, record) VALUES (?, ?)", (key, data)
+            )
+
+
+def _encode(value):
+    """
+    Converts the fact values which JSON does not preserve, i.e. tuples and
+    :class:`jnpr.junos.facts.swver.version_info` objects.
+    """
+    if isinstance(value, version_info):
+        return {"__version_info__": _encode(vars(value))}
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return dict((key, _encode(item)) for key, item in value.items())
+    return value
+
+
+def _decode(obj):
+    """
+    ``object_hook`` reverting :func:`_encode`.
+    """
+    if "__tuple__" in obj:
+        return tuple(obj["__tuple__"])
+    if "__version_info__" in obj:
+        value = version_info.__new__(version_info)
+        value.__dict__.update(obj["__version_info__"])
+        return value
+    return obj
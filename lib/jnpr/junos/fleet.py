@@ -0,0 +1,382 @@
+"""
+Run the same operation across many Junos devices with a bounded pool of
+worker threads.
+"""
+
+import collections
+import logging
+import re
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+
+from jnpr.junos import exception as EzErrors
+from jnpr.junos.device import Device
+
+logger = logging.getLogger("jnpr.junos.fleet")
+
+
+class _FleetRpcMetaExec(object):
+    """
+    ~PRIVATE CLASS~
+    metaprograms the ``fleet.rpc.<name>()`` functions, each of them runs
+    ``dev.rpc.<name>()`` across the fleet.
+    """
+
+    def __init__(self, fleet):
+        self._fleet = fleet
+
+    def __getattr__(self, rpc_cmd_name):
+        def _exec_rpc(*vargs, **kvargs):
+            return self._fleet.run(
+                lambda dev: getattr(dev.rpc, rpc_cmd_name)(*vargs, **kvargs)
+            )
+
+        _exec_rpc.__doc__ = re.sub("_", "-", rpc_cmd_name)
+        _exec_rpc.__name__ = rpc_cmd_name
+        return _exec_rpc
+
+
+class Fleet(object):
+    """
+    A set of Junos devices on which the same operation is run concurrently.
+
+    Every operation returns a generator of ``(hostname, result)`` tuples, one
+    per device. When the operation fails on a device, ``result`` is the
+    exception which was raised, the other devices are not affected. Only
+    **max_workers** devices are worked on at a time and results are handed
+    out as they are produced, so memory stays flat regardless of the size of
+    the fleet::
+
+        from jnpr.junos.fleet import Fleet
+        from jnpr.junos.op.routes import RouteTable
+
+        fleet = Fleet(hosts, user='foo', passwd='bar', max_workers=50)
+
+        for host, rsp in fleet.rpc.get_software_information():
+            ...
+
+        for host, tbl in fleet.get(RouteTable, table='inet.0'):
+            ...
+
+    When the fleet was not opened with :meth:`open`, each operation opens a
+    NETCONF session to the device, runs and closes the session again.
+    Sessions opened with :meth:`open` are kept and reused until
+    :meth:`close`, one per host and port::
+
+        with Fleet(hosts, user='foo', passwd='bar') as fleet:
+            for host, dev in fleet.open():
+                ...
+            for host, facts in fleet.facts_refresh():
+                ...
+    """
+
+    def __init__(
+        self,
+        devices,
+        max_workers=10,
+        timeout=None,
+        ordered=False,
+        deadline=None,
+        **kvargs,
+    ):
+        """
+        Fleet object constructor.
+
+        :param list devices:
+            **REQUIRED** The devices, each of them either a host-name or a
+            ``dict`` of :class:`jnpr.junos.device.Device` arguments.
+
+        :param int max_workers:
+            *OPTIONAL* maximum number of devices worked on at the same time,
+            default is 10.
+
+        :param int timeout:
+            *OPTIONAL* per-device timeout in seconds, used both to open the
+            connection and as the RPC timeout. Defaults to the
+            :class:`jnpr.junos.device.Device` defaults. See **deadline** to
+            bound the whole operation.
+
+        :param bool ordered:
+            *OPTIONAL* default is ``False``, results are returned as soon as
+            they are available. If ``True``, results are returned in the
+            order of **devices**.
+
+        :param int deadline:
+            *OPTIONAL* wall-clock limit in seconds of the operation on each
+            device, opening the connection included. The result of a device
+            which is late is a :class:`jnpr.junos.exception.FleetTimeoutError`
+            and the next device is worked on; the late operation is left to
+            end in the background and its result is discarded. Default is no
+            limit.
+
+        :param kvargs:
+            *OPTIONAL* :class:`jnpr.junos.device.Device` arguments common to
+            all of the devices, e.g. ``user`` or ``passwd``. They are
+            overridden by the per-device arguments.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._devices = [
+            dict(host=device) if isinstance(device, str) else dict(device)
+            for device in devices
+        ]
+        self._max_workers = max_workers
+        self._timeout = timeout
+        self._ordered = ordered
+        self._deadline = deadline
+        self._kvargs = kvargs
+        self._open = {}
+        self.rpc = _FleetRpcMetaExec(self)
+
+    # -----------------------------------------------------------------------
+    # PROPERTIES
+    # -----------------------------------------------------------------------
+
+    @property
+    def hostnames(self):
+        """
+        :returns: ``list`` of the host-names of the devices in the fleet
+        """
+        return [device.get("host") for device in self._devices]
+
+    @property
+    def devices(self):
+        """
+        :returns: ``dict`` of the :class:`jnpr.junos.device.Device` instances
+          opened with :meth:`open`, keyed by host-name, or by
+          ``'host-name:port'`` for the devices given a port.
+        """
+        return dict(
+            (host if port is None else "%s:%s" % (host, port), dev)
+            for (host, port), dev in self._open.items()
+        )
+
+    # -----------------------------------------------------------------------
+    # PUBLIC METHODS
+    # -----------------------------------------------------------------------
+
+    def open(self, **kvargs):
+        """
+        Opens a connection to every device of the fleet and keeps it open
+        until :meth:`close`.
+
+        :param kvargs: passed to :meth:`jnpr.junos.device.Device.open`
+
+        :returns: generator of ``(hostname, Device or exception)``
+        """
+
+        def _open(params):
+            dev = self._open.get(self._key(params))
+            if dev is None or not dev.connected:
+                dev = self._device(params, **kvargs)
+                self._open[self._key(params)] = dev
+            return dev
+
+        return self._stream(_open)
+
+    def close(self):
+        """
+        Closes the connections opened with :meth:`open`. Errors closing a
+        connection are logged rather than raised.
+        """
+        devices = self._open
+        self._open = {}
+
+        def _close(params):
+            devices[self._key(params)].close()
+
+        opened = [params for params in self._devices if self._key(params) in devices]
+        for host, result in self._stream(_close, opened):
+            if isinstance(result, Exception):
+                logger.error("close of {} hit exception: {}".format(host, result))
+
+    def run(self, func, *vargs, **kvargs):
+        """
+        Runs ``func(dev, *vargs, **kvargs)`` for every device of the fleet.
+
+        :param callable func: called with the
+          :class:`jnpr.junos.device.Device` instance, its return value is the
+          result for that device.
+
+        :returns: generator of ``(hostname, result or exception)``
+        """
+
+        def _run(params):
+            dev = self._open.get(self._key(params))
+            if dev is not None and dev.connected:
+                return func(dev, *vargs, **kvargs)
+            dev = self._device(params, gather_facts=False)
+            try:
+                return func(dev, *vargs, **kvargs)
+            finally:
+                dev.close()
+
+        return self._stream(_run)
+
+    def get(self, table_cls, *vargs, **kvargs):
+        """
+        Retrieves the :class:`jnpr.junos.factory.optable.OpTable` subclass
+        **table_cls** from every device of the fleet.
+
+        :param vargs, kvargs: passed to the table ``get()`` method
+
+        :returns: generator of ``(hostname, table or exception)``
+        """
+        return self.run(lambda dev: table_cls(dev).get(*vargs, **kvargs))
+
+    def facts_refresh(self, **kvargs):
+        """
+        Refreshes and gathers the facts of every device of the fleet.
+
+        :param kvargs: passed to
+          :meth:`jnpr.junos.device.Device.facts_refresh`
+
+        :returns: generator of ``(hostname, facts dict or exception)``
+        """
+
+        def _facts(dev):
+            dev.facts_refresh(**kvargs)
+            return dict(dev.facts)
+
+        return self.run(_facts)
+
+    # -----------------------------------------------------------------------
+    # PRIVATE METHODS
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _key(params):
+        """
+        :returns: the key of the session of the device **params** in
+          :attr:`_open`, as the same host may be reached on several ports
+          (port forwards, jump hosts, ...)
+        """
+        return (params.get("host"), params.get("port"))
+
+    def _device(self, params, **kvargs):
+        """
+        :returns: an opened :class:`jnpr.junos.device.Device` for **params**
+        """
+        dev_kvargs = dict(self._kvargs)
+        if self._timeout is not None:
+            dev_kvargs["conn_open_timeout"] = self._timeout
+        dev_kvargs.update(params)
+        dev = Device(**dev_kvargs)
+        dev.open(**kvargs)
+        if self._timeout is not None:
+            dev.timeout = self._timeout
+        return dev
+
+    def _stream(self, func, devices=None):
+        """
+        Runs ``func(params)`` for the **devices** parameters and yields
+        ``(hostname, result or exception)``. No more than max_workers calls
+        run at any time, not counting the calls which missed the deadline.
+        """
+        devices = iter(self._devices if devices is None else devices)
+
+        def _call(params):
+            try:
+                return func(params)
+            except Exception as ex:
+                return ex
+
+        # future: (hostname, deadline)
+        pending = collections.OrderedDict()
+
+        def _submit():
+            for params in devices:
+                deadline = None
+                if self._deadline is not None:
+                    deadline = time.monotonic() + self._deadline
+                pending[self._spawn(_call, params)] = (params.get("host"), deadline)
+                return True
+            return False
+
+        def _timeout(futures):
+            deadlines = [
+                pending[future][1]
+                for future in futures
+                if pending[future][1] is not None
+            ]
+            if not deadlines:
+                return None
+            return max(0, min(deadlines) - time.monotonic())
+
+        try:
+            for _ in range(self._max_workers):
+                if not _submit():
+                    break
+            while pending:
+                if self._ordered:
+                    futures = [next(iter(pending))]
+                else:
+                    futures = list(pending)
+                done, _ = wait(futures, _timeout(futures), FIRST_COMPLETED)
+                now = time.monotonic()
+                late = [
+                    future
+                    for future in futures
+                    if future not in done
+                    and pending[future][1] is not None
+                    and pending[future][1] <= now
+                ]
+                for future in done:
+                    host, _ = pending.pop(future)
+                    _submit()
+                    yield (host, future.result())
+                for future in late:
+                    host, _ = pending.pop(future)
+                    logger.error(
+                        "{}: no result within {} seconds".format(host, self._deadline)
+                    )
+                    _submit()
+                    yield (host, EzErrors.FleetTimeoutError(host, self._deadline))
+        finally:
+            # the consumer may stop before the end of the fleet, the running
+            # calls are waited for until their deadline
+            deadlines = [deadline for _, deadline in pending.values()]
+            if None in deadlines:
+                wait(pending)
+            elif deadlines:
+                wait(pending, max(0, max(deadlines) - time.monotonic()))
+
+    @staticmethod
+    def _spawn(func, params):
+        """
+        Runs ``func(params)`` in a thread of its own.
+
+        A call which missed the deadline may never return, its daemon thread
+        does not hold a worker of the fleet nor the exit of the interpreter.
+
+        :returns: the ``concurrent.futures.Future`` of the call
+        """
+        future = Future()
+
+        def _target():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(func(params))
+            except BaseException as ex:
+                future.set_exception(ex)
+
+        thread = threading.Thread(
+            target=_target, name="fleet-%s" % params.get("host"), daemon=True
+        )
+        thread.start()
+        return future
+
+    # -----------------------------------------------------------------------
+    # Context Manager
+    # -----------------------------------------------------------------------
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        return "Fleet(%d devices)" % len(self._devices)
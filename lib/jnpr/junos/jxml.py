@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 import six
 from lxml import etree
 from ncclient import manager
@@ -191,6 +193,30 @@ def remove_namespaces_and_spaces(xml):
     return xml
 
 
+@lru_cache(maxsize=4096)
+def compiled_xpath(expr):
+    """
+    returns the etree.XPath evaluator of the XPath expression :expr:,
+    compiled on first use and then shared, up to the 4096 most recently
+    used expressions.  Calling the evaluator with an element is the same
+    as element.xpath(expr), without compiling the expression again.  lxml
+    serializes the concurrent calls of an evaluator.
+
+    :raises etree.XPathSyntaxError: when :expr: is not a valid expression.
+    """
+    return etree.XPath(expr)
+
+
+def xpath(xml, expr):
+    """
+    same as xml.xpath(expr), using the compiled evaluator of :expr: when
+    :xml: is an lxml element.
+    """
+    if isinstance(xml, etree._Element):
+        return compiled_xpath(expr)(xml)
+    return xml.xpath(expr)
+
+
 def rpc_error(rpc_xml):
     """
     extract the various bits from an <rpc-error> element
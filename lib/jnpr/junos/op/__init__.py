@@ -4,18 +4,23 @@ from importlib.abc import Loader, MetaPathFinder
 from importlib.util import spec_from_loader
 
 import yaml
+from jnpr.junos.factory.catalog import load_catalog
 from jnpr.junos.factory.factory_loader import FactoryLoader
 
 __all__ = []
 
 
 class OPMetaPathFinder(MetaPathFinder):
+    def __init__(self):
+        # the content of the package directory does not change, list it once
+        self._modules = frozenset(
+            os.path.splitext(i)[0] for i in os.listdir(os.path.dirname(__file__))
+        )
+
     def find_spec(self, fullname, path=None, target=None):
         if fullname.startswith("jnpr.junos"):
             mod = fullname.split(".")[-1]
-            if mod in [
-                os.path.splitext(i)[0] for i in os.listdir(os.path.dirname(__file__))
-            ]:
+            if mod in self._modules:
                 return spec_from_loader(fullname, OPMetaPathLoader(fullname))
 
 
@@ -30,13 +35,15 @@ class OPMetaPathLoader(Loader):
 
         mod = self.fullname.split(".")[-1]
 
-        with open(os.path.join(os.path.dirname(__file__), mod + ".yml"), "r") as stream:
-            try:
-                modules = FactoryLoader().load(
-                    yaml.load(stream, Loader=yaml.FullLoader)
+        try:
+            modules = FactoryLoader().load(
+                load_catalog(
+                    os.path.join(os.path.dirname(__file__), mod + ".yml"),
+                    yaml.FullLoader,
                 )
-            except yaml.YAMLError as exc:
-                raise ImportError("%s is not loaded" % mod)
+            )
+        except yaml.YAMLError as exc:
+            raise ImportError("%s is not loaded" % mod)
         for k, v in modules.items():
             setattr(module, k, v)
 
@@ -0,0 +1,421 @@
+"""
+Reuse of NETCONF sessions to Junos devices across the calls of a long
+running process, e.g. a web service handling API calls for many devices.
+
+Opening a session costs the SSH handshake, authentication and the NETCONF
+<hello> exchange. A :class:`DevicePool` keeps the sessions warm between
+calls and hands them out with a context manager::
+
+    from jnpr.junos.pool import DevicePool
+
+    pool = DevicePool(user='foo', passwd='bar', max_sessions=2, max_idle=300)
+
+    def handler(host):
+        with pool.device(host) as dev:
+            return dev.rpc.get_route_summary_information()
+
+Sessions are keyed by all of their :class:`jnpr.junos.device.Device`
+arguments (host, port, credentials, ...), so that a session is only ever
+reused for the same host and credentials.
+"""
+
+import collections
+import contextlib
+import logging
+import threading
+import time
+
+from jnpr.junos import exception as EzErrors
+from jnpr.junos.device import Device
+
+logger = logging.getLogger("jnpr.junos.pool")
+
+
+class _PooledSession(object):
+    """
+    ~PRIVATE CLASS~
+    a session of the pool and its timestamps, in ``time.monotonic()`` seconds
+    """
+
+    __slots__ = ("dev", "key", "created", "released")
+
+    def __init__(self, dev, key):
+        self.dev = dev
+        self.key = key
+        self.created = self.released = time.monotonic()
+
+
+class DevicePool(object):
+    """
+    A pool of open :class:`jnpr.junos.device.Device` sessions, reused from
+    one call to the next. A pool is safe to use from many threads at once,
+    a session is handed out to one caller at a time.
+    """
+
+    def __init__(
+        self,
+        max_sessions=4,
+        max_idle=300,
+        max_lifetime=3600,
+        keepalive=30,
+        keepalive_rpc="get-system-uptime-information",
+        probe_timeout=5,
+        wait_timeout=None,
+        **kvargs,
+    ):
+        """
+        DevicePool object constructor.
+
+        :param int max_sessions:
+            *OPTIONAL* maximum number of sessions open at the same time per
+            host and credentials, default is 4. Callers wait for a session to
+            be released beyond that number, which keeps the pool below the
+            ``max-sessions`` of the device.
+
+        :param int max_idle:
+            *OPTIONAL* sessions not used for longer than **max_idle** seconds
+            are closed, default is 300. ``None`` means no limit.
+
+        :param int max_lifetime:
+            *OPTIONAL* sessions opened for longer than **max_lifetime**
+            seconds are closed once released, default is 3600. ``None`` means
+            no limit.
+
+        :param int keepalive:
+            *OPTIONAL* sessions idle for longer than **keepalive** seconds
+            are health checked before being handed out, default is 30: the
+            device is probed, see :meth:`jnpr.junos.device.Device.probe`, and
+            the **keepalive_rpc** is executed on the session. A session
+            failing the check is closed and replaced. ``None`` disables the
+            check.
+
+        :param str keepalive_rpc:
+            *OPTIONAL* the RPC of the health check, default is
+            ``get-system-uptime-information``.
+
+        :param int probe_timeout:
+            *OPTIONAL* the timeout in seconds of the probe of the health
+            check, default is 5. ``None`` skips the probe, e.g. for the
+            devices reached through an ssh-jumphost.
+
+        :param int wait_timeout:
+            *OPTIONAL* maximum time in seconds to wait for a session when
+            **max_sessions** are in use, ``None`` (default) waits forever.
+
+        :param kvargs:
+            *OPTIONAL* :class:`jnpr.junos.device.Device` arguments common to
+            all of the sessions, e.g. ``user`` or ``passwd``. They are
+            overridden by the arguments of :meth:`device`. Use ``auto_probe``
+            to probe the device, see :meth:`jnpr.junos.device.Device.probe`,
+            before a session is opened.
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        self.max_sessions = max_sessions
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.keepalive = keepalive
+        self.keepalive_rpc = keepalive_rpc
+        self.probe_timeout = probe_timeout
+        self.wait_timeout = wait_timeout
+        self._kvargs = kvargs
+        self._cond = threading.Condition()
+        self._closed = False
+        # idle sessions per key, the most recently released last
+        self._idle = collections.defaultdict(list)
+        # number of sessions per key, idle, in use or being opened
+        self._count = collections.defaultdict(int)
+        self._in_use = {}
+        self._stats = dict(hits=0, misses=0, evictions=0, waits=0, wait_time=0.0)
+
+    # -----------------------------------------------------------------------
+    # PROPERTIES
+    # -----------------------------------------------------------------------
+
+    @property
+    def stats(self):
+        """
+        :returns: ``dict`` of the pool statistics:
+
+          * ``hits``: sessions handed out from the pool,
+          * ``misses``: sessions opened to be handed out,
+          * ``evictions``: sessions closed by the pool, because they were
+            idle or open for too long, failed the health check or were
+            discarded,
+          * ``waits`` and ``wait_time``: number of times and total time in
+            seconds callers waited for a session,
+          * ``sessions``, ``idle`` and ``in_use``: current number of
+            sessions.
+        """
+        with self._cond:
+            stats = dict(self._stats)
+            stats["sessions"] = sum(self._count.values())
+            stats["idle"] = sum(len(idle) for idle in self._idle.values())
+            stats["in_use"] = len(self._in_use)
+        return stats
+
+    # -----------------------------------------------------------------------
+    # PUBLIC METHODS
+    # -----------------------------------------------------------------------
+
+    @contextlib.contextmanager
+    def device(self, host=None, **kvargs):
+        """
+        Context manager handing out an open session of the pool::
+
+            with pool.device('router1') as dev:
+                ...
+
+        The session goes back to the pool at the end of the block. It is
+        closed instead when the block raised a connection error or an RPC
+        timeout, which may leave the session unusable.
+
+        :param str host: host-name or ipaddress of the device.
+
+        :param kvargs: :class:`jnpr.junos.device.Device` arguments, they
+          override the arguments of the pool.
+        """
+        dev = self.acquire(host, **kvargs)
+        try:
+            yield dev
+        except (EzErrors.ConnectError, EzErrors.RpcTimeoutError):
+            self.release(dev, discard=True)
+            raise
+        except BaseException:
+            self.release(dev)
+            raise
+        self.release(dev)
+
+    def acquire(self, host=None, **kvargs):
+        """
+        Hands out an open session of the pool, opening one when there is no
+        idle session for the host. The session must be given back with
+        :meth:`release`, prefer :meth:`device`.
+
+        :returns: an open :class:`jnpr.junos.device.Device`
+
+        :raises ConnectTimeoutError:
+            When no session became available within **wait_timeout**
+
+        :raises ConnectError:
+            When the session can not be opened, see
+            :meth:`jnpr.junos.device.Device.open`
+        """
+        params = dict(self._kvargs)
+        params.update(kvargs)
+        if host is not None:
+            params["host"] = host
+        key = self._key(params)
+        self.prune()
+        while True:
+            session = self._checkout(key, params)
+            if session is None:
+                break
+            if self._healthy(session):
+                return session.dev
+            self._evict(session)
+
+        # a new session was accounted for by _checkout()
+        try:
+            dev = Device(**params)
+            dev.open()
+        except Exception:
+            with self._cond:
+                self._count[key] -= 1
+                self._cond.notify_all()
+            raise
+        session = _PooledSession(dev, key)
+        with self._cond:
+            self._in_use[id(dev)] = session
+        return dev
+
+    def release(self, dev, discard=False):
+        """
+        Gives back a session handed out by :meth:`acquire`.
+
+        :param bool discard: if ``True``, the session is closed rather than
+          kept in the pool.
+        """
+        now = time.monotonic()
+        with self._cond:
+            session = self._in_use.pop(id(dev))
+            if (
+                discard
+                or self._closed
+                or not dev.connected
+                or self._expired(self.max_lifetime, session.created, now)
+            ):
+                evict = True
+            else:
+                evict = False
+                session.released = now
+                self._idle[session.key].append(session)
+                self._cond.notify_all()
+        if evict:
+            self._evict(session)
+
+    def prune(self):
+        """
+        Closes the idle sessions which were idle or open for too long. This
+        is done on each :meth:`acquire`, calling :meth:`prune` periodically
+        also frees the sessions of the devices which are no longer used.
+        """
+        with self._cond:
+            expired = self._expire(time.monotonic())
+        for session in expired:
+            self._close(session)
+
+    def close(self):
+        """
+        Closes the idle sessions of the pool. The sessions in use are closed
+        once released and no session is handed out anymore.
+        """
+        with self._cond:
+            self._closed = True
+            sessions = [session for idle in self._idle.values() for session in idle]
+            self._idle.clear()
+            for session in sessions:
+                self._count[session.key] -= 1
+            self._cond.notify_all()
+        for session in sessions:
+            self._close(session)
+
+    # -----------------------------------------------------------------------
+    # PRIVATE METHODS
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _key(params):
+        return tuple(sorted((name, repr(value)) for name, value in params.items()))
+
+    @staticmethod
+    def _expired(limit, since, now):
+        return limit is not None and now - since > limit
+
+    def _expire(self, now):
+        """
+        Removes the expired idle sessions of the pool, called locked.
+
+        :returns: ``list`` of the removed sessions, to be closed unlocked.
+        """
+        expired = []
+        for key, idle in self._idle.items():
+            keep = []
+            for session in idle:
+                if self._expired(self.max_idle, session.released, now) or self._expired(
+                    self.max_lifetime, session.created, now
+                ):
+                    expired.append(session)
+                    self._count[key] -= 1
+                else:
+                    keep.append(session)
+            idle[:] = keep
+        if expired:
+            self._stats["evictions"] += len(expired)
+            self._cond.notify_all()
+        return expired
+
+    def _checkout(self, key, params):
+        """
+        Takes the most recently released idle session of **key** out of the
+        pool, waiting for one when **max_sessions** are in use.
+
+        :returns: the session, or ``None`` when a new session is to be opened
+        """
+        deadline = None
+        if self.wait_timeout is not None:
+            deadline = time.monotonic() + self.wait_timeout
+        waited = None
+        with self._cond:
+            try:
+                while True:
+                    if self._closed:
+                        raise ValueError("the device pool is closed")
+                    idle = self._idle.get(key)
+                    if idle:
+                        session = idle.pop()
+                        self._in_use[id(session.dev)] = session
+                        self._stats["hits"] += 1
+                        return session
+                    if self._count[key] < self.max_sessions:
+                        self._count[key] += 1
+                        self._stats["misses"] += 1
+                        return None
+                    if waited is None:
+                        waited = time.monotonic()
+                        self._stats["waits"] += 1
+                    remaining = None
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise EzErrors.ConnectTimeoutError(
+                                Device(**params),
+                                "no session available within %s seconds"
+                                % self.wait_timeout,
+                            )
+                    self._cond.wait(remaining)
+            finally:
+                if waited is not None:
+                    self._stats["wait_time"] += time.monotonic() - waited
+
+    def _healthy(self, session):
+        """
+        :returns: ``True`` when **session** is connected and, if it was idle
+          for longer than **keepalive**, passed the health check
+        """
+        if not session.dev.connected:
+            return False
+        if not self._expired(self.keepalive, session.released, time.monotonic()):
+            return True
+        if self.probe_timeout is not None and not session.dev.probe(
+            timeout=self.probe_timeout
+        ):
+            logger.info(
+                "session to {} failed the health check: probe failed".format(
+                    session.dev.hostname
+                )
+            )
+            return False
+        try:
+            session.dev.execute("<%s/>" % self.keepalive_rpc)
+        except Exception as ex:
+            logger.info(
+                "session to {} failed the health check: {}".format(
+                    session.dev.hostname, ex
+                )
+            )
+            return False
+        return True
+
+    def _evict(self, session):
+        """
+        Closes **session**, which is no longer idle in the pool.
+        """
+        with self._cond:
+            self._in_use.pop(id(session.dev), None)
+            self._count[session.key] -= 1
+            self._stats["evictions"] += 1
+            self._cond.notify_all()
+        self._close(session)
+
+    def _close(self, session):
+        try:
+            session.dev.close()
+        except Exception as ex:
+            logger.error(
+                "close of {} hit exception: {}".format(session.dev.hostname, ex)
+            )
+
+    # -----------------------------------------------------------------------
+    # Context Manager
+    # -----------------------------------------------------------------------
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __repr__(self):
+        stats = self.stats
+        return "DevicePool(%d sessions, %d idle)" % (stats["sessions"], stats["idle"])
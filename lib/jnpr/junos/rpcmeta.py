@@ -1,10 +1,32 @@
+import copy
 import re
 import sys
+from functools import lru_cache
 
+from jnpr.junos import exception as EzErrors
 from jnpr.junos import jxml as JXML
 from lxml import etree
 from lxml.builder import E
 
+# keywords of the metafunctions which are passed to :junos:execute() rather
+# than encoded as RPC arguments
+_DEC_ARG_KEYWORDS = (
+    "dev_timeout",
+    "normalize",
+    "ignore_warning",
+    "filter_xml",
+    "raw",
+)
+
+
+@lru_cache(maxsize=4096)
+def _xml_name(name):
+    """
+    :returns: the XML tag of the python name :name:, e.g. 'interface-name'
+      for 'interface_name'
+    """
+    return name.replace("_", "-")
+
 
 class _RpcMetaExec(object):
     # -----------------------------------------------------------------------
@@ -110,6 +132,20 @@ class _RpcMetaExec(object):
                         remove_ns=False)
         """
 
+        rpc = self._get_config_rpc(filter_xml, options, model, namespace)
+        transform = self._junos.transform
+        if remove_ns is False:
+            self._junos.transform = lambda: JXML.strip_namespaces_prefix
+        try:
+            response = self._junos.execute(rpc, **kwargs)
+        finally:
+            self._junos.transform = transform
+        return self._get_config_response(response, filter_xml, options, model)
+
+    def _get_config_rpc(self, filter_xml=None, options={}, model=None, namespace=None):
+        """
+        builds the <get-configuration> RPC for :meth:`get_config`
+        """
         nmspaces = {
             "openconfig": "http://openconfig.net/yang/",
             "ietf": "urn:ietf:params:xml:ns:yang:ietf-",
@@ -145,15 +181,17 @@ class _RpcMetaExec(object):
                     ns = namespace or (nmspaces.get(model.lower()) + filter_xml.tag)
                     filter_xml.attrib["xmlns"] = ns
                 rpc.append(filter_xml)
-        transform = self._junos.transform
-        if remove_ns is False:
-            self._junos.transform = lambda: JXML.strip_namespaces_prefix
-        try:
-            response = self._junos.execute(rpc, **kwargs)
-        finally:
-            self._junos.transform = transform
+        return rpc
+
+    def _get_config_response(self, response, filter_xml=None, options={}, model=None):
+        """
+        post-processes the :meth:`get_config` RPC response
+        """
         # in case of model provided top level should be data
         # return response
+        if isinstance(response, str):
+            # raw <rpc-reply>
+            return response
         if model and filter_xml is None and options.get("format") != "json":
             response = response.getparent()
             response.tag = "data"
@@ -297,10 +335,108 @@ class _RpcMetaExec(object):
             rpc.attrib["format"] = format
         return self._junos.execute(rpc, normalize=normalize)
 
+    # -----------------------------------------------------------------------
+    # pipeline
+    # -----------------------------------------------------------------------
+
+    def pipeline(self, rpc_cmds, return_exceptions=False, **kvargs):
+        """
+        executes the :rpc_cmds: back-to-back on the NETCONF session of the
+        :junos: object, without waiting for each <rpc-reply> before sending
+        the next RPC, and returns the results in the order of :rpc_cmds:
+
+        .. code-block:: python
+
+           sw, re = dev.rpc.pipeline([
+               '<get-software-information/>',
+               etree.Element('get-route-engine-information')])
+
+        :rpc_cmds: list of RPCs, each of them an XML Element or
+                   xml-as-string as accepted by :junos:execute()
+
+        :param bool return_exceptions: if ``False`` (default), the first
+            exception raised by one of the RPCs is raised. If ``True``, the
+            exception is returned in place of the result of that RPC.
+
+        kvargs (ignore_warning, normalize, dev_timeout, ...) are applied to
+        every RPC as they are by :junos:execute()
+
+        .. note::
+            See :meth:`jnpr.junos.device.Device.batch` for using the RPC
+            metafunctions instead of XML.
+        """
+        with self._junos.batch() as batch:
+            for rpc_cmd in rpc_cmds:
+                batch.execute(rpc_cmd, **dict(kvargs))
+        return batch.results(return_exceptions)
+
     # -----------------------------------------------------------------------
     # method missing
     # -----------------------------------------------------------------------
 
+    def _rpc_element(self, rpc_cmd, *vargs, **kvargs):
+        """
+        builds the XML command of the :rpc_cmd: RPC from the metafunction
+        arguments
+
+        :returns: tuple of the RPC element and the dict of the
+          :meth:`execute` keywords (dev_timeout, normalize, ...) found in
+          :kvargs:
+        """
+        # create the rpc as XML command
+        rpc = etree.Element(rpc_cmd)
+
+        # Gather decorator keywords into dec_args and remove from kvargs
+        dec_args = self._dec_args(kvargs)
+
+        # kvargs are the command parameter/values
+        if kvargs:
+            self._set_rpc_args(rpc, kvargs)
+
+        # vargs[0] is a dict, command options like format='text'
+        if vargs:
+            for k, v in vargs[0].items():
+                if v is not True:
+                    rpc.attrib[k] = v
+
+        return rpc, dec_args
+
+    @staticmethod
+    def _dec_args(kvargs):
+        """
+        removes the :junos:execute() keywords from :kvargs:
+
+        :returns: dict of the removed keywords
+        """
+        dec_args = {}
+        for keyword in _DEC_ARG_KEYWORDS:
+            if keyword in kvargs:
+                dec_args[keyword] = kvargs.pop(keyword)
+        return dec_args
+
+    @staticmethod
+    def _set_rpc_args(rpc, kvargs):
+        """
+        appends the :kvargs: command parameter/values to the :rpc: element
+        """
+        for arg_name, arg_value in kvargs.items():
+            arg_name = _xml_name(arg_name)
+            if not isinstance(arg_value, (tuple, list)):
+                arg_value = [arg_value]
+            for a in arg_value:
+                if not isinstance(a, (bool, str)):
+                    raise TypeError(
+                        "The value %s for argument %s"
+                        " is of %s. Argument "
+                        "values must be a string, "
+                        "boolean, or list/tuple of "
+                        "strings and booleans." % (a, arg_name, str(type(a)))
+                    )
+                if a is not False:
+                    arg = etree.SubElement(rpc, arg_name)
+                if not isinstance(a, bool):
+                    arg.text = a
+
     def __getattr__(self, rpc_cmd_name):
         """
         metaprograms a function to execute the :rpc_cmd_name:
@@ -309,51 +445,15 @@ class _RpcMetaExec(object):
         execution of the meta function; these are the specific
         rpc command arguments(**kvargs) and options bound
         as XML attributes (*vargs)
+
+        the metafunction is memoized, only the first lookup of
+        :rpc_cmd_name: gets here.
         """
 
-        rpc_cmd = re.sub("_", "-", rpc_cmd_name)
+        rpc_cmd = _xml_name(rpc_cmd_name)
 
         def _exec_rpc(*vargs, **kvargs):
-            # create the rpc as XML command
-            rpc = etree.Element(rpc_cmd)
-
-            # Gather decorator keywords into dec_args and remove from kvargs
-            dec_arg_keywords = [
-                "dev_timeout",
-                "normalize",
-                "ignore_warning",
-                "filter_xml",
-            ]
-            dec_args = {}
-            for keyword in dec_arg_keywords:
-                if keyword in kvargs:
-                    dec_args[keyword] = kvargs.pop(keyword)
-
-            # kvargs are the command parameter/values
-            if kvargs:
-                for arg_name, arg_value in kvargs.items():
-                    arg_name = re.sub("_", "-", arg_name)
-                    if not isinstance(arg_value, (tuple, list)):
-                        arg_value = [arg_value]
-                    for a in arg_value:
-                        if not isinstance(a, (bool, str)):
-                            raise TypeError(
-                                "The value %s for argument %s"
-                                " is of %s. Argument "
-                                "values must be a string, "
-                                "boolean, or list/tuple of "
-                                "strings and booleans." % (a, arg_name, str(type(a)))
-                            )
-                        if a is not False:
-                            arg = etree.SubElement(rpc, arg_name)
-                        if not isinstance(a, bool):
-                            arg.text = a
-
-            # vargs[0] is a dict, command options like format='text'
-            if vargs:
-                for k, v in vargs[0].items():
-                    if v is not True:
-                        rpc.attrib[k] = v
+            rpc, dec_args = self._rpc_element(rpc_cmd, *vargs, **kvargs)
 
             # now invoke the command against the
             # associated :junos: device and return
@@ -366,9 +466,55 @@ class _RpcMetaExec(object):
         _exec_rpc.__doc__ = rpc_cmd
         _exec_rpc.__name__ = rpc_cmd_name
 
+        # python protocol lookups (__deepcopy__, ...) are not memoized
+        if not rpc_cmd_name.startswith("__"):
+            self.__dict__[rpc_cmd_name] = _exec_rpc
+
         # return the metafunction that the caller will in-turn invoke
         return _exec_rpc
 
+    # -----------------------------------------------------------------------
+    # prepare
+    # -----------------------------------------------------------------------
+
+    def prepare(self, rpc_cmd_name, *vargs, **kvargs):
+        """
+        builds the :rpc_cmd_name: RPC once, with the arguments of a
+        metafunction call, and returns a function executing it. The
+        arguments given to that function replace the prebuilt arguments of
+        the same name, so that only the changing arguments are encoded on
+        each call
+
+        .. code-block:: python
+
+           get_intf = dev.rpc.prepare('get_interface_information',
+                                      extensive=True, interface_name='')
+           for name in ['ge-0/0/0', 'ge-0/0/1']:
+               rsp = get_intf(interface_name=name)
+
+        :junos:execute() keywords (dev_timeout, normalize, ...) can be given
+        to both and the ones of the call take precedence.
+        """
+        rpc, dec_args = self._rpc_element(_xml_name(rpc_cmd_name), *vargs, **kvargs)
+
+        def _exec_rpc(**kvargs):
+            call_dec_args = dict(dec_args)
+            call_dec_args.update(self._dec_args(kvargs))
+            rpc_e = copy.deepcopy(rpc)
+            for arg_name, arg_value in kvargs.items():
+                args = rpc_e.findall(_xml_name(arg_name))
+                if len(args) == 1 and isinstance(arg_value, str):
+                    args[0].text = arg_value
+                    continue
+                for arg in args:
+                    rpc_e.remove(arg)
+                self._set_rpc_args(rpc_e, {arg_name: arg_value})
+            return self._junos.execute(rpc_e, **call_dec_args)
+
+        _exec_rpc.__doc__ = rpc.tag
+        _exec_rpc.__name__ = rpc_cmd_name
+        return _exec_rpc
+
     # -----------------------------------------------------------------------
     # callable
     # -----------------------------------------------------------------------
@@ -382,3 +528,188 @@ class _RpcMetaExec(object):
         kvargs is simply passed 'as-is' to :junos:execute()
         """
         return self._junos.execute(rpc_cmd, **kvargs)
+
+
+class _RpcBatchMetaExec(_RpcMetaExec):
+    """
+    ~PRIVATE CLASS~
+    RPC meta-executor of :class:`_RpcBatch`, every metafunction returns a
+    :class:`_PendingRpc`.
+    """
+
+    def _get_config_response(self, response, *vargs):
+        response._post.append(
+            lambda rsp: _RpcMetaExec._get_config_response(self, rsp, *vargs)
+        )
+        return response
+
+
+class _PendingRpc(object):
+    """
+    ~PRIVATE CLASS~
+    the pending result of an RPC sent in a :class:`_RpcBatch`
+    """
+
+    def __init__(self, collect):
+        self._collect = collect
+        self._post = []
+        self._done = False
+        self._result = None
+        self._exception = None
+
+    def wait(self):
+        """
+        waits for the <rpc-reply>, the RPC exception (if any) is kept rather
+        than raised
+        """
+        if self._done is False:
+            try:
+                result = self._collect()
+                for post in self._post:
+                    result = post(result)
+                self._result = result
+            except Exception as ex:
+                self._exception = ex
+            self._done = True
+
+    def exception(self):
+        """
+        :returns: the exception raised by the RPC, or None
+        """
+        self.wait()
+        return self._exception
+
+    def result(self):
+        """
+        :returns: the RPC result, as returned by :junos:execute()
+
+        :raises: the exception raised by the RPC, as raised by
+          :junos:execute()
+        """
+        self.wait()
+        if self._exception is not None:
+            raise self._exception
+        return self._result
+
+
+class _RpcBatch(object):
+    """
+    ~PRIVATE CLASS~
+    pipelines RPCs on the NETCONF session of the :junos: object, see
+    :meth:`jnpr.junos.device.Device.batch`
+    """
+
+    def __init__(self, junos):
+        self._junos = junos
+        self._pending = []
+        self.rpc = _RpcBatchMetaExec(self)
+
+    @property
+    def transform(self):
+        return self._junos.transform
+
+    @transform.setter
+    def transform(self, func):
+        self._junos.transform = func
+
+    def execute(self, rpc_cmd, ignore_warning=False, **kvargs):
+        """
+        sends :rpc_cmd: without waiting for the <rpc-reply>
+
+        :returns: :class:`_PendingRpc` whose result() is the value returned
+          by :junos:execute()
+        """
+        junos = self._junos
+        if not hasattr(junos, "_rpc_send"):
+            # not able to pipeline on this :junos: object (console), the RPC
+            # is executed right away.
+            pending = _PendingRpc(
+                lambda: junos.execute(rpc_cmd, ignore_warning=ignore_warning, **kvargs)
+            )
+            pending.wait()
+            self._pending.append(pending)
+            return pending
+
+        if junos.connected is not True:
+            raise EzErrors.ConnectClosedError(junos)
+
+        rpc_cmd_e = junos._rpc_cmd_element(rpc_cmd)
+
+        # the transformation and timeout are bound to the RPC when it is sent
+        # as the normalizeDecorator and timeoutDecorator would do for the
+        # duration of :junos:execute()
+        normalize = kvargs.pop("normalize", None)
+        if normalize is None:
+            transform = junos.transform
+        else:
+            transform = junos._norm_transform if normalize else junos._nc_transform
+        timeout = kvargs.pop("dev_timeout", None)
+        raw = kvargs.pop("raw", False)
+
+        # the RPC is observed from when it is sent until its reply is
+        # collected, see junos._rpc_observed()
+        sample = junos._rpc_sample(rpc_cmd_e)
+        try:
+            with junos._rpc_errors(rpc_cmd_e, timeout):
+                op = junos._rpc_send(rpc_cmd_e, kvargs.get("filter_xml"))
+        except Exception as ex:
+            if sample is not None:
+                junos._rpc_observe(sample, ex)
+            raise
+
+        def collect():
+            try:
+                with junos._rpc_errors(rpc_cmd_e, timeout):
+                    rpc_rsp_e = junos._rpc_collect(
+                        op,
+                        timeout,
+                        transform,
+                        raw=raw,
+                        ignore_warning=ignore_warning,
+                        sample=sample,
+                    )
+                if raw:
+                    rsp = junos._rpc_raw_response(rpc_rsp_e)
+                else:
+                    rsp = junos._rpc_response(rpc_cmd_e, rpc_rsp_e, **kvargs)
+            except Exception as ex:
+                if sample is not None:
+                    junos._rpc_observe(sample, ex)
+                raise
+            if sample is not None:
+                junos._rpc_observe(sample)
+            return rsp
+
+        pending = _PendingRpc(collect)
+        self._pending.append(pending)
+        return pending
+
+    def results(self, return_exceptions=False):
+        """
+        :returns: ``list`` of the results of the RPCs, in the order they were
+          sent
+
+        :param bool return_exceptions: if ``False`` (default), the first
+            exception raised by one of the RPCs is raised. If ``True``, the
+            exception is returned in place of the result of that RPC.
+        """
+        self.wait()
+        if return_exceptions:
+            return [
+                pending._result if pending._exception is None else pending._exception
+                for pending in self._pending
+            ]
+        return [pending.result() for pending in self._pending]
+
+    def wait(self):
+        """
+        waits for the <rpc-reply> of every RPC sent
+        """
+        for pending in self._pending:
+            pending.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.wait()
@@ -0,0 +1,350 @@
+"""
+Timing and size instrumentation of the RPCs executed on Junos devices.
+
+An RPC observer is any callable given to a
+:class:`jnpr.junos.device.Device` or :class:`jnpr.junos.console.Console`
+with the ``rpc_observers`` argument, or registered with
+:meth:`add_rpc_observer`. It is called with an :class:`RpcSample` once each
+RPC has completed, successfully or not.
+
+:class:`RpcStatsCollector` is an observer aggregating the samples in
+histograms per RPC, exported as a ``dict`` or in the Prometheus text
+format::
+
+    from jnpr.junos import Device
+    from jnpr.junos.rpcstats import RpcStatsCollector
+
+    stats = RpcStatsCollector(per_device=True)
+    for host in ('router1', 'router2'):
+        with Device(host=host, user='foo', rpc_observers=[stats]) as dev:
+            dev.rpc.get_interface_information(terse=True)
+    print(stats.to_prometheus())
+
+Nothing is measured for a device without observer.
+"""
+
+import bisect
+import threading
+import time
+
+from jnpr.junos import exception as EzErrors
+from lxml import etree
+
+# -----------------------------------------------------------------------------
+# RPC sample
+# -----------------------------------------------------------------------------
+
+
+class RpcSample(object):
+    """
+    Timing and size of one RPC. The times are in seconds, the sizes in
+    bytes, and are ``None`` when not measured, e.g. the reply size of an RPC
+    which timed out.
+
+    :ivar str device: host-name of the device.
+    :ivar str rpc: tag of the RPC, e.g. ``get-interface-information``.
+    :ivar int request_bytes: size of the serialized RPC.
+    :ivar int reply_bytes: size of the <rpc-reply>, as received.
+    :ivar float ttfb: time until the <rpc-reply> was received. The NETCONF
+      transport only hands over complete messages, so this is the time to the
+      last byte of the reply rather than to its first byte.
+    :ivar float parse_time: time spent parsing the <rpc-reply> into XML.
+    :ivar float transform_time: time spent applying the RPC XML
+      Transformation (e.g. normalization) to the reply.
+    :ivar float elapsed: total time of the RPC, including the conversion of
+      the reply into the value returned (e.g. JSON).
+    :ivar str outcome: ``ok``, ``rpc-error``, ``timeout``, ``closed`` (the
+      connection was closed) or ``error`` (any other exception).
+    :ivar error: the exception raised by the RPC, ``None`` when ``ok``.
+    """
+
+    __slots__ = (
+        "device",
+        "rpc",
+        "request_bytes",
+        "reply_bytes",
+        "ttfb",
+        "parse_time",
+        "transform_time",
+        "elapsed",
+        "outcome",
+        "error",
+        "start",
+    )
+
+    def __init__(self, device, rpc_cmd_e):
+        self.device = device
+        self.rpc = rpc_cmd_e.tag
+        self.request_bytes = len(etree.tostring(rpc_cmd_e))
+        self.reply_bytes = None
+        self.ttfb = None
+        self.parse_time = None
+        self.transform_time = None
+        self.elapsed = None
+        self.outcome = None
+        self.error = None
+        # time.perf_counter() when the RPC started
+        self.start = time.perf_counter()
+
+    def finish(self, error=None):
+        """
+        Records the end of the RPC and its outcome.
+
+        :param error: the exception raised by the RPC, if any.
+        """
+        self.elapsed = time.perf_counter() - self.start
+        self.error = error
+        if error is None:
+            self.outcome = "ok"
+        elif isinstance(error, EzErrors.RpcTimeoutError):
+            self.outcome = "timeout"
+        elif isinstance(error, EzErrors.ConnectClosedError):
+            self.outcome = "closed"
+        elif isinstance(error, EzErrors.RpcError):
+            self.outcome = "rpc-error"
+        else:
+            self.outcome = "error"
+
+    def to_dict(self):
+        """
+        :returns: ``dict`` of the sample, without the exception.
+        """
+        return dict(
+            (name, getattr(self, name))
+            for name in self.__slots__
+            if name not in ("error", "start")
+        )
+
+    def __repr__(self):
+        return "RpcSample(%s, %s, %s, %.6fs)" % (
+            self.device,
+            self.rpc,
+            self.outcome,
+            self.elapsed or 0,
+        )
+
+
+# -----------------------------------------------------------------------------
+# histograms
+# -----------------------------------------------------------------------------
+
+TIME_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# (metric, RpcSample attribute, buckets, help)
+_METRICS = (
+    ("seconds", "elapsed", TIME_BUCKETS, "Total time of the RPCs."),
+    (
+        "ttfb_seconds",
+        "ttfb",
+        TIME_BUCKETS,
+        "Time until the reply of the RPCs was received.",
+    ),
+    (
+        "parse_seconds",
+        "parse_time",
+        TIME_BUCKETS,
+        "Time spent parsing the replies of the RPCs.",
+    ),
+    (
+        "transform_seconds",
+        "transform_time",
+        TIME_BUCKETS,
+        "Time spent transforming the replies of the RPCs.",
+    ),
+    ("request_bytes", "request_bytes", SIZE_BUCKETS, "Size of the RPCs."),
+    ("reply_bytes", "reply_bytes", SIZE_BUCKETS, "Size of the replies of the RPCs."),
+)
+
+
+class _Histogram(object):
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # the last count is the +Inf bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self):
+        """
+        :returns: ``list`` of (upper bound, cumulative count), the last upper
+          bound is ``+Inf``
+        """
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class _RpcStats(object):
+    __slots__ = ("outcomes", "histograms")
+
+    def __init__(self):
+        self.outcomes = {}
+        self.histograms = dict(
+            (metric, _Histogram(buckets)) for (metric, _, buckets, _) in _METRICS
+        )
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value)
+
+
+# -----------------------------------------------------------------------------
+# collector
+# -----------------------------------------------------------------------------
+
+
+class RpcStatsCollector(object):
+    """
+    RPC observer aggregating the :class:`RpcSample` of one or more devices
+    in histograms per RPC. A collector is safe to share between devices used
+    from different threads.
+    """
+
+    def __init__(self, per_device=False, prefix="junos_rpc"):
+        """
+        :param bool per_device:
+          *OPTIONAL* if ``True``, the RPCs are aggregated per device and per
+          RPC, rather than per RPC only. default is ``False``.
+
+        :param str prefix:
+          *OPTIONAL* prefix of the names of the Prometheus metrics, default is
+          ``junos_rpc``.
+        """
+        self.per_device = per_device
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def __call__(self, sample):
+        key = (sample.device if self.per_device else None, sample.rpc)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _RpcStats()
+            stats.outcomes[sample.outcome] = stats.outcomes.get(sample.outcome, 0) + 1
+            for metric, attr, _, _ in _METRICS:
+                value = getattr(sample, attr)
+                if value is not None:
+                    stats.histograms[metric].observe(value)
+
+    def reset(self):
+        """
+        Discards the aggregated samples.
+        """
+        with self._lock:
+            self._stats = {}
+
+    def to_dict(self):
+        """
+        :returns: ``dict`` of the statistics per RPC tag, or per device
+          host-name then per RPC tag when :attr:`per_device`. The statistics
+          of an RPC are::
+
+            {'count': 3,
+             'outcomes': {'ok': 2, 'timeout': 1},
+             'seconds': {'count': 3, 'sum': 0.75,
+                         'buckets': [(0.005, 0), ..., (inf, 3)]},
+             'ttfb_seconds': {...},
+             ...}
+
+          The buckets are (upper bound, cumulative count) pairs. Histograms
+          count the RPCs the value was measured for, e.g. ``reply_bytes``
+          does not count the RPCs which timed out.
+        """
+        result = {}
+        with self._lock:
+            for (device, rpc), stats in self._stats.items():
+                value = {
+                    "count": sum(stats.outcomes.values()),
+                    "outcomes": dict(stats.outcomes),
+                }
+                for metric, histogram in stats.histograms.items():
+                    value[metric] = {
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "buckets": histogram.cumulative(),
+                    }
+                if self.per_device:
+                    result.setdefault(device, {})[rpc] = value
+                else:
+                    result[rpc] = value
+        return result
+
+    def to_prometheus(self):
+        """
+        :returns: the statistics in the Prometheus text exposition format,
+          a counter ``<prefix>_total`` of the RPCs per outcome and a
+          histogram ``<prefix>_<metric>`` per metric, labelled with the
+          ``rpc`` (and ``device`` when :attr:`per_device`).
+        """
+        with self._lock:
+            items = sorted(
+                self._stats.items(), key=lambda item: (str(item[0][0]), item[0][1])
+            )
+            lines = [
+                "# HELP %s_total Number of RPCs per outcome." % self.prefix,
+                "# TYPE %s_total counter" % self.prefix,
+            ]
+            for key, stats in items:
+                labels = self._labels(key)
+                for outcome, count in sorted(stats.outcomes.items()):
+                    lines.append(
+                        '%s_total{%s,outcome="%s"} %d'
+                        % (self.prefix, labels, _label(outcome), count)
+                    )
+            for metric, _, _, text in _METRICS:
+                name = "%s_%s" % (self.prefix, metric)
+                lines.append("# HELP %s %s" % (name, text))
+                lines.append("# TYPE %s histogram" % name)
+                for key, stats in items:
+                    labels = self._labels(key)
+                    histogram = stats.histograms[metric]
+                    for bound, count in histogram.cumulative():
+                        lines.append(
+                            '%s_bucket{%s,le="%s"} %d'
+                            % (name, labels, _number(bound), count)
+                        )
+                    lines.append(
+                        "%s_sum{%s} %s" % (name, labels, _number(histogram.sum))
+                    )
+                    lines.append("%s_count{%s} %d" % (name, labels, histogram.count))
+        return "\n".join(lines) + "\n"
+
+    def _labels(self, key):
+        device, rpc = key
+        labels = 'rpc="%s"' % _label(rpc)
+        if self.per_device:
+            labels = 'device="%s",%s' % (_label(device), labels)
+        return labels
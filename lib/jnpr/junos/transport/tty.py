@@ -1,5 +1,6 @@
 import logging
-from time import sleep
+import re
+from time import monotonic, sleep
 from typing import Any, Optional, Tuple
 
 from jnpr.junos import exception as EzErrors
@@ -58,6 +59,10 @@ class Terminal(object):
         "(?P<hotkey>connection: <CTRL>Z)",
     ]
 
+    # number of bytes, already searched, which are searched again with the
+    # data read next so that a match straddling two reads is found
+    _EXPECT_LOOKBACK = 1024
+
     # -----------------------------------------------------------------------
     # CONSTRUCTOR
     # -----------------------------------------------------------------------
@@ -92,6 +97,8 @@ class Terminal(object):
         self.state = self._ST_INIT
         self._badpasswd = 0
         self._loader = 0
+        # text read past the last match, see _expect()
+        self._rx_pending = b""
 
     @property
     def tty_name(self):
@@ -110,9 +117,101 @@ class Terminal(object):
     def write(self, data: str) -> Any:
         raise NotImplementedError
 
-    def read_prompt(self) -> Tuple[Optional[str], Optional[str]]:
+    def _tty_recv(self, timeout: float) -> Optional[bytes]:
+        """
+        waits up to :timeout: seconds for data from the TTY and returns the
+        data available, empty when there is none and None when the TTY
+        was closed
+        """
         raise NotImplementedError
 
+    # -------------------------------------------------------------------
+    # Reading from the TTY
+    # -------------------------------------------------------------------
+
+    def read_prompt(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        reads text from the TTY until a match is found against one of the
+        prompts of :_RE_PAT:. When a match is found, return a
+        tuple(<text>,<found>) where <text> is the complete text and <found>
+        is the name of the regular-expression group. If a timeout occurs,
+        then return the tuple(None,None).
+        """
+        return self._prompt_found(*self._expect(*self._prompt_expect()))
+
+    def _prompt_expect(self):
+        """
+        :returns: tuple(<pattern>,<timeout>,<idle>), the :_expect: arguments
+          reading a prompt
+        """
+        return _PROMPT, self.EXPECT_TIMEOUT, False
+
+    def _prompt_found(self, rxb, found):
+        """
+        :returns: the :read_prompt: result of the :_expect: result
+        """
+        if found is None:
+            return None, None
+        logger.debug("Got: %s" % rxb)
+        return rxb, found.lastgroup
+
+    def _expect(self, pattern, timeout, idle=False):
+        """
+        reads from the TTY, as data arrives, until the compiled bytes
+        regular-expression :pattern: matches the text read. Only the data
+        read since the previous search, and the :_EXPECT_LOOKBACK: bytes
+        before it, are searched. The text read after the match is searched
+        first by the next read.
+
+        :timeout:
+          seconds to wait for the match, counted from the last data read
+          rather than from the call when :idle: is True.
+
+        :returns: tuple(<text>,<match>), <text> ends with the match and
+          <match> is None when the timeout expired or the TTY was closed
+          before a match.
+        """
+        rxb = bytearray()
+        data = self._rx_unread()
+        deadline = monotonic() + timeout
+        while True:
+            if data:
+                found = self._expect_search(rxb, data, pattern)
+                if found is not None:
+                    return bytes(rxb), found
+                if idle:
+                    deadline = monotonic() + timeout
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return bytes(rxb), None
+            data = self._tty_recv(remaining)
+            if data is None:
+                return bytes(rxb), None
+
+    def _expect_search(self, rxb, data, pattern):
+        """
+        appends :data: to the text :rxb: read so far and searches it for
+        :pattern:, see :_expect:. The text after a match is cut from :rxb:
+        and kept for the next read.
+
+        :returns: the match, or None
+        """
+        pos = max(0, len(rxb) - self._EXPECT_LOOKBACK)
+        rxb += data
+        found = pattern.search(rxb, pos)
+        if found is not None:
+            self._rx_pending = bytes(rxb[found.end() :])
+            del rxb[found.end() :]
+        return found
+
+    def _rx_unread(self):
+        """
+        :returns: the text read from the TTY after the last match, which is
+          handed out only once
+        """
+        data, self._rx_pending = self._rx_pending, b""
+        return data
+
     # -----------------------------------------------------------------------
     # Login/logout
     # -----------------------------------------------------------------------
@@ -146,93 +245,168 @@ class Terminal(object):
         self._logout_state_machine()
         return True
 
-        # ---------------------------------------------------------------------
-        # TTY logout state-machine
-        # ---------------------------------------------------------------------
+    # -----------------------------------------------------------------------
+    # State-machines
+    # -----------------------------------------------------------------------
 
-    def _logout_state_machine(self, attempt=0):
-        if 10 == attempt:
-            raise RuntimeError("logout_sm_failure")
+    # The state-machines are generators, so that they are run the same way
+    # by the blocking methods of the Terminal and on the event loop of an
+    # :class:`jnpr.junos.asyncconsole.AsyncConsole`. A state-machine yields
+    # what it waits for and is sent the result:
+    #
+    #   * ``None``: the next prompt, sent the :read_prompt: result
+    #   * tuple(<pattern>,<timeout>,<idle>): the text matching <pattern>,
+    #     sent the :_expect: result
+    #   * a number: that many seconds to elapse, sent nothing
+    #
+    # and returns its result with StopIteration.
+
+    def _run_events(self, events):
+        """
+        runs the state-machine :events: to its end, blocking on the TTY
 
-        prompt, found = self.read_prompt()
+        :returns: the result of the state-machine
+        """
+        result = None
+        while True:
+            try:
+                request = events.send(result)
+            except StopIteration as stop:
+                return stop.value
+            if request is None:
+                result = self.read_prompt()
+            elif isinstance(request, tuple):
+                result = self._expect(*request)
+            else:
+                sleep(request)
+                result = None
 
-        def _ev_login():
-            # back at login prompt, so we are cleanly done!
-            self._tty_close()
+    def _login_state_machine(self, attempt=0):
+        return self._run_events(self._login_events(attempt))
 
-        def _ev_shell():
-            self.write("exit")
+    def _logout_state_machine(self, attempt=0):
+        return self._run_events(self._logout_events(attempt))
 
-        def _ev_cli():
-            self.write("exit")
+    # ---------------------------------------------------------------------
+    # TTY logout state-machine
+    # ---------------------------------------------------------------------
 
-        # Connection closed by foreign host
-        def _ev_netconf_closed():
-            return True
+    def _logout_events(self, attempt=0):
+        while True:
+            if 10 == attempt:
+                raise RuntimeError("logout_sm_failure")
 
-        _ev_tbl = {
-            "login": _ev_login,
-            "shell": _ev_shell,
-            "cli": _ev_cli,
-            "netconf_closed": _ev_netconf_closed,
-        }
+            prompt, found = yield None
 
-        # hack for now
-        # in case of telnet to management port, after writing exit on console
-        # it exits completely and returns None
-        ###
-        if found is not None:
-            _ev_tbl[found]()
-        else:
-            return True
+            def _ev_login():
+                # back at login prompt, so we are cleanly done!
+                self._tty_close()
 
-        if found == "login":
-            return True
+            def _ev_shell():
+                self.write("exit")
+
+            def _ev_cli():
+                self.write("exit")
+
+            # Connection closed by foreign host
+            def _ev_netconf_closed():
+                return True
+
+            _ev_tbl = {
+                "login": _ev_login,
+                "shell": _ev_shell,
+                "cli": _ev_cli,
+                "netconf_closed": _ev_netconf_closed,
+            }
+
+            # hack for now
+            # in case of telnet to management port, after writing exit on console
+            # it exits completely and returns None
+            ###
+            if found is not None:
+                _ev_tbl[found]()
+            else:
+                return True
 
-        else:
-            sleep(1)
-            return self._logout_state_machine(attempt=attempt + 1)
+            if found == "login":
+                return True
+
+            yield 1
+            attempt += 1
 
     # -----------------------------------------------------------------------
     # TTY login state-machine
     # -----------------------------------------------------------------------
-    def _login_state_machine(self, attempt=0):
-        if self.login_attempts == attempt:
-            raise RuntimeError("login_sm_failure")
-
-        prompt, found = self.read_prompt()
-
-        def _ev_loader():
-            self.state = self._ST_LOADER
-            self.write("boot")
-            self.write("\n")
-            sleep(300)
-            self._login_state_machine(attempt=0)
-            self._loader += 1
-            if self._loader == 2:
-                raise RuntimeError("probably corrupted image, stuck in loader")
-
-        def _ev_login():
-            self.state = self._ST_LOGIN
-            self.write(self.user)
-
-        def _ev_passwd():
-            self.state = self._ST_PASSWD
-            self.write(self.passwd)
-
-        def _ev_bad_passwd():
-            self.state = self._ST_BAD_PASSWD
-            self.write("\n")
-            self._badpasswd += 1
-            if self._badpasswd == 2:
-                self._tty_close()
-                # raise RuntimeError("Bad username/password")
-                raise EzErrors.ConnectAuthError(self, "Bad username/password")
-            # return through and try again ... could have been
-            # prior failed attempt
 
-        def _ev_tty_nologin():
-            if self._ST_INIT == self.state:
+    def _login_events(self, attempt=0):
+        while True:
+            if self.login_attempts == attempt:
+                raise RuntimeError("login_sm_failure")
+
+            prompt, found = yield None
+
+            if found == "loader":
+                self.state = self._ST_LOADER
+                self.write("boot")
+                self.write("\n")
+                yield 300
+                yield from self._login_events(attempt=0)
+                self._loader += 1
+                if self._loader == 2:
+                    raise RuntimeError("probably corrupted image, stuck in loader")
+
+            elif found == "login":
+                self.state = self._ST_LOGIN
+                self.write(self.user)
+
+            elif found == "passwd":
+                self.state = self._ST_PASSWD
+                self.write(self.passwd)
+
+            elif found == "badpasswd":
+                self.state = self._ST_BAD_PASSWD
+                self.write("\n")
+                self._badpasswd += 1
+                if self._badpasswd == 2:
+                    self._tty_close()
+                    # raise RuntimeError("Bad username/password")
+                    raise EzErrors.ConnectAuthError(self, "Bad username/password")
+                # return through and try again ... could have been
+                # prior failed attempt
+
+            elif found == "shell":
+                if self.state == self._ST_INIT:
+                    # this means that the shell was left
+                    # open.  probably not a good thing,
+                    # so issue a logging message, but move on.
+                    logger.warning("login_warn: Shell login was open!!")
+
+                self.at_shell = True
+                self.state = self._ST_DONE
+                # if we are here, then we are done
+
+            elif found == "cli":
+                if self.state == self._ST_INIT:
+                    # this means that the shell was left open.  probably not a
+                    # good thing, so issue a logging message, hit <ENTER> and try
+                    # again just to be sure...
+                    logger.warning("login_warn: waiting on TTY..... ")
+                    yield 5
+                    #  return
+
+                self.at_shell = False
+                self.state = self._ST_DONE
+
+            elif found == "option":
+                self.state = self._ST_TTY_OPTION
+                self.write("1")
+
+            elif found == "hotkey":
+                self.state = self._ST_TTY_HOTKEY
+                self.write("\n")
+
+            elif self._ST_INIT == self.state:
+                # no prompt, or one not handled, e.g. netconf_closed:
                 # assume we're in a hung state, i.e. we don't see
                 # a login prompt for whatever reason
                 self.state = self._ST_TTY_NOLOGIN
@@ -244,59 +418,17 @@ class Terminal(object):
                 # # use this hack
                 #     sleep(5)
                 #     self.write("\n")
-                sleep(5)
+                yield 5
                 self.write("\n")
+
             else:
                 # @@@ this is still a hack - used by default
                 self.write("<close-session/>")
 
-        def _ev_shell():
-            if self.state == self._ST_INIT:
-                # this means that the shell was left
-                # open.  probably not a good thing,
-                # so issue a logging message, but move on.
-                logger.warning("login_warn: Shell login was open!!")
-
-            self.at_shell = True
-            self.state = self._ST_DONE
-            # if we are here, then we are done
-
-        def _ev_cli():
-            if self.state == self._ST_INIT:
-                # this means that the shell was left open.  probably not a
-                # good thing, so issue a logging message, hit <ENTER> and try
-                # again just to be sure...
-                logger.warning("login_warn: waiting on TTY..... ")
-                sleep(5)
-                #  return
-
-            self.at_shell = False
-            self.state = self._ST_DONE
-
-        def _ev_option():
-            self.state = self._ST_TTY_OPTION
-            self.write("1")
-
-        def _ev_hot_key():
-            self.state = self._ST_TTY_HOTKEY
-            self.write("\n")
-
-        _ev_tbl = {
-            "loader": _ev_loader,
-            "login": _ev_login,
-            "passwd": _ev_passwd,
-            "badpasswd": _ev_bad_passwd,
-            "shell": _ev_shell,
-            "cli": _ev_cli,
-            "option": _ev_option,
-            "hotkey": _ev_hot_key,
-        }
-
-        handler = _ev_tbl.get(found) if found is not None else None
-        (handler or _ev_tty_nologin)()
-
-        if self.state == self._ST_DONE:
-            return True
-        else:
+            if self.state == self._ST_DONE:
+                return True
             # if we are here, then loop the event again
-            self._login_state_machine(attempt + 1)
+            attempt += 1
+
+
+_PROMPT = re.compile(b"|".join([i.encode() for i in Terminal._RE_PAT]))
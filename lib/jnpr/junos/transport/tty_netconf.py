@@ -1,18 +1,14 @@
 import logging
 import re
-import select
-import socket
 import sys
-import time
-from datetime import datetime, timedelta
 
 import six
 from lxml import etree
 from lxml.builder import E
 from lxml.etree import XMLSyntaxError
-from ncclient.operations.rpc import RPCError, RPCReply
+from ncclient.operations.rpc import RPCError
 from ncclient.transport.session import HelloHandler
-from ncclient.xml_ import to_ele
+from ncclient.xml_ import qualify
 
 
 class PY6:
@@ -20,6 +16,8 @@ class PY6:
     EMPTY_STR = six.b("")
     NETCONF_EOM = six.b("]]>]]>")
     STARTS_WITH = six.b("<!--")
+    XNM_ERROR = six.b("</xnm:error>")
+    MESSAGE = six.b("<message>")
 
 
 __all__ = ["xmlmode_netconf"]
@@ -29,6 +27,15 @@ _xmlns = re.compile(six.b("xmlns=[^>]+"))
 _xmlns_strip = lambda text: _xmlns.sub(PY6.EMPTY_STR, text)
 _junosns = re.compile(six.b("junos:"))
 _junosns_strip = lambda text: _junosns.sub(PY6.EMPTY_STR, text)
+# whitespace around the line breaks, and the blank lines, of a message
+_line_ws = re.compile(six.b(r"[ \t\f\v]*[\r\n]\s*"))
+# seconds between two checks of the TTY while waiting for a message
+_RECV_WAIT = 1.0
+_NETCONF_EOM_RE = re.compile(re.escape(PY6.NETCONF_EOM))
+# first line of the XML API output, a comment
+_banner = re.compile(six.b(r"^<!--"), re.M)
+# seconds to wait for the 'hello' message
+_HELLO_TIMEOUT = 15
 
 logger = logging.getLogger("jnpr.junos.tty_netconf")
 
@@ -53,34 +60,44 @@ class tty_netconf(object):
 
     def open(self, at_shell):
         """start the XML API process and receive the 'hello' message"""
+        self._tty._run_events(self._open_events(at_shell))
+
+    def close(self, force=False):
+        """issue the XML API to close the session"""
+        self._tty._run_events(self._close_events(force))
+
+    # The session open and close are state-machines run by the TTY, see
+    # :meth:`jnpr.junos.transport.tty.Terminal._run_events`
+
+    def _open_events(self, at_shell):
         nc_cmd = ("junoscript", "xml-mode")[at_shell]
         self._tty.write(nc_cmd + " netconf need-trailer")
-        mark_start = datetime.now()
-        mark_end = mark_start + timedelta(seconds=15)
-
-        while datetime.now() < mark_end:
-            time.sleep(0.1)
-            line = self._tty.read()
-            if line.startswith(PY6.STARTS_WITH):
-                break
-        else:
-            # exceeded the while loop timeout
+
+        # the 'hello' follows the comment line of the XML API banner
+        rxbuf, found = yield (_NETCONF_EOM_RE, _HELLO_TIMEOUT, False)
+        banner = None if found is None else _banner.search(rxbuf, 0, found.start())
+        if banner is None:
+            # exceeded the timeout
             raise RuntimeError("Error: netconf not responding")
 
-        self.hello = self._receive()
+        rcvd_data, root = self._parse_buffer(rxbuf[banner.start() : found.start()])
+        self.hello = root if rcvd_data is None else rcvd_data
         self._session_id, _ = HelloHandler.parse(
             self.hello.decode("utf-8") if isinstance(self.hello, bytes) else self.hello
         )
 
-    def close(self, force=False):
-        """issue the XML API to close the session"""
-
+    def _close_events(self, force=False):
         # if we do not have an open connection, then return now.
         if force is False:
             if self.hello is None:
                 return
 
-        self.rpc("close-session")
+        self._tty.rawwrite(six.b("<rpc><close-session/></rpc>"))
+        rxbuf, found = yield (_NETCONF_EOM_RE, self._tty.EXPECT_TIMEOUT, False)
+        if found is None:
+            logger.warning("close: no reply to <close-session/>")
+            return
+        self._check_reply(self._parse_buffer(rxbuf[: found.start()])[1])
         # removed flush
 
     # -------------------------------------------------------------------------
@@ -116,109 +133,113 @@ class tty_netconf(object):
           the <rpc-reply>.  There is also no error-checking
           performing by this routine.
         """
+        return self.rpc_reply(cmd)[0]
+
+    def rpc_reply(self, cmd):
+        """
+        Write the XML cmd, see :meth:`rpc`, and return the response both as
+        text and as the XML tree it was parsed into, parsing it only once.
+
+        :returns: tuple(<text>, <element>), <element> is the <rpc-reply>
+
+        :raises RPCError: when the <rpc-reply> has <rpc-error>s
+        """
         if not cmd.startswith("<"):
             cmd = "<{}/>".format(cmd)
         rpc_bytes = six.b("<rpc>{}</rpc>".format(cmd))
         logger.info("Calling rpc: %s", rpc_bytes.decode("utf-8", "replace"))
         self._tty.rawwrite(rpc_bytes)
 
-        rsp = self._receive()
-        rsp = rsp.decode("utf-8") if isinstance(rsp, bytes) else rsp
-        reply = RPCReply(rsp, huge_tree=self._tty._huge_tree)
-        errors = reply.errors
+        rsp, root = self._receive_reply()
+        rsp = etree.tostring(root) if rsp is None else rsp
+        rsp = rsp.decode("utf-8")
+        self._check_reply(root)
+        return rsp, root
+
+    @staticmethod
+    def _check_reply(root):
+        """
+        raises the <rpc-error>s of the <rpc-reply> :root:, as found by
+        ncclient RPCReply.parse()
+        """
+        if root.find(qualify("ok")) is not None:
+            return
+        errors = [RPCError(err) for err in root.iter(qualify("rpc-error"))]
         if len(errors) > 1:
-            raise RPCError(to_ele(reply._raw), errs=errors)
+            raise RPCError(root, errs=errors)
         elif len(errors) == 1:
-            raise reply.error
-        return rsp
+            raise errors[0]
 
     # -------------------------------------------------------------------------
     # LOW-LEVEL I/O for reading back XML response
     # -------------------------------------------------------------------------
 
     def _receive(self):
-        # On windows select.select throws io.UnsupportedOperation: fileno
-        # so use read function for windows serial COM ports
-        if hasattr(self._tty, "port") and str(self._tty.port).startswith("COM"):
-            return self._receive_serial_win()
-        else:
-            return self._receive_serial()
-
-    def _receive_serial(self):
-        """process the XML response into an XML object"""
-        rxbuf = PY6.EMPTY_STR
-        line = PY6.EMPTY_STR
-        while True:
-            try:
-                rd, wt, err = select.select([self._tty._rx], [], [], 0.1)
-            except select.error as err:
-                raise err
-            except socket.error as err:
-                raise err
-            if rd:
-                line, lastline = rd[0].read_until(PY6.NETCONF_EOM, 0.1), line
-                if not line:
-                    continue
-                if _NETCONF_EOM in line or _NETCONF_EOM in lastline + line:
-                    rxbuf = rxbuf + line
-                    break
-                else:
-                    rxbuf = rxbuf + line
-                    if _NETCONF_EOM in rxbuf:
-                        break
-        return self._parse_buffer(rxbuf)
+        """
+        reads the next message from the TTY
 
-    # -------------------------------------------------------------------------
-    # Read message from windows COM ports
-    # -------------------------------------------------------------------------
+        :returns: the text of the message, or an <error-in-receive> element
+          when it is not XML
+        """
+        rcvd_data, root = self._receive_reply()
+        return root if rcvd_data is None else rcvd_data
+
+    def _receive_reply(self):
+        return self._parse_buffer(self._read_message())
+
+    def _read_message(self):
+        """
+        reads from the TTY, as data arrives, until the NETCONF
+        end-of-message marker. The marker is only searched for in the data
+        read since the previous search. The text read after the marker is
+        read first by the next :meth:`Terminal._expect`.
 
-    def _receive_serial_win(self):
-        """process incoming data from windows port"""
-        rxbuf = PY6.EMPTY_STR
-        line = PY6.EMPTY_STR
+        :returns: the message, without the marker
+        """
+        rxbuf = bytearray()
+        data = self._tty._rx_unread()
         while True:
-            line, lastline = self._tty.read().strip(), line
-            if not line:
-                continue
-            if _NETCONF_EOM in line or _NETCONF_EOM in lastline + line:
-                rxbuf = rxbuf + line
-                break
-            else:
-                rxbuf = rxbuf + line
-                if _NETCONF_EOM in rxbuf:
-                    break
-        return self._parse_buffer(rxbuf)
+            if data:
+                start = max(0, len(rxbuf) - len(_NETCONF_EOM) + 1)
+                rxbuf += data
+                end = rxbuf.find(_NETCONF_EOM, start)
+                if end >= 0:
+                    del rxbuf[end:]
+                    return rxbuf
+            data = self._tty._tty_recv(_RECV_WAIT)
+            if data is None:
+                raise EOFError("TTY closed while receiving a NETCONF message")
 
     def _parse_buffer(self, rxbuf):
-        rxbuf = rxbuf.splitlines()
-        if _NETCONF_EOM in rxbuf[-1]:
-            if rxbuf[-1] == _NETCONF_EOM:
-                rxbuf.pop()
-            else:
-                rxbuf[-1] = rxbuf[-1].split(_NETCONF_EOM)[0]
+        """
+        strips the whitespace around the lines of :rxbuf: and parses it
+
+        :returns: tuple(<text>, <element>) of the message, <text> is None
+          and <element> is an <error-in-receive> when the message is not XML
+        """
+        rcvd_data = _line_ws.sub(PY6.NEW_LINE, rxbuf).strip()
+        logger.debug("Received: \n%s", rcvd_data)
+        parser = etree.XMLParser(remove_blank_text=True, huge_tree=self._tty._huge_tree)
         try:
-            rxbuf = [i.strip() for i in rxbuf if i.strip() != PY6.EMPTY_STR]
-            rcvd_data = PY6.NEW_LINE.join(rxbuf)
-            logger.debug("Received: \n%s", rcvd_data)
-            parser = etree.XMLParser(
-                remove_blank_text=True, huge_tree=self._tty._huge_tree
-            )
-            try:
-                etree.XML(rcvd_data, parser)
-            except XMLSyntaxError:
-                if _NETCONF_EOM in rcvd_data:
-                    rcvd_data = rcvd_data[: rcvd_data.index(_NETCONF_EOM)]
-                    etree.XML(rcvd_data)  # just to recheck
-                else:
-                    parser = etree.XMLParser(recover=True)
-                    rcvd_data = etree.tostring(etree.XML(rcvd_data, parser=parser))
-            return rcvd_data
-        except:
-            if "</xnm:error>" in rxbuf:
-                for x in rxbuf:
-                    if "<message>" in x:
-                        return etree.XML(
-                            "<error-in-receive>" + x + "</error-in-receive>"
+            return rcvd_data, etree.XML(rcvd_data, parser)
+        except XMLSyntaxError:
+            pass
+        parser = etree.XMLParser(recover=True, huge_tree=self._tty._huge_tree)
+        try:
+            root = etree.XML(rcvd_data, parser)
+        except XMLSyntaxError:
+            root = None
+        if root is not None:
+            return etree.tostring(root), root
+        if PY6.XNM_ERROR in rcvd_data:
+            for line in rcvd_data.splitlines():
+                if PY6.MESSAGE in line:
+                    try:
+                        return None, etree.XML(
+                            six.b("<error-in-receive>")
+                            + line
+                            + six.b("</error-in-receive>")
                         )
-            else:
-                return etree.XML("<error-in-receive/>")
+                    except XMLSyntaxError:
+                        break
+        return None, etree.XML("<error-in-receive/>")
@@ -1,7 +1,3 @@
-import re
-from datetime import datetime, timedelta
-from time import sleep
-
 import serial
 import six
 from jnpr.junos.transport.tty import Terminal
@@ -10,8 +6,6 @@ from jnpr.junos.transport.tty import Terminal
 # Terminal connection over SERIAL CONSOLE
 # -------------------------------------------------------------------------
 
-_PROMPT = re.compile(six.b("|").join([six.b(i) for i in Terminal._RE_PAT]))
-
 
 class Serial(Terminal):
     def __init__(self, port="/dev/ttyUSB0", **kvargs):
@@ -66,30 +60,13 @@ class Serial(Terminal):
         """read a single line"""
         return self._ser.readline()
 
-    def read_prompt(self):
-        """
-        reads text from the serial console (using readline) until
-        a match is found against the :expect: regular-expression object.
-        When a match is found, return a tuple(<text>,<found>) where
-        <text> is the complete text and <found> is the name of the
-        regular-expression group. If a timeout occurs, then return
-        the tuple(None,None).
-        """
-        rxb = six.b("")
-        mark_start = datetime.now()
-        mark_end = mark_start + timedelta(seconds=self.EXPECT_TIMEOUT)
-
-        while datetime.now() < mark_end:
-            sleep(0.1)  # do not remove
-            line = self._ser.readline()
-            if not line:
-                continue
-            rxb += line
-            found = _PROMPT.search(rxb)
-            if found is not None:
-                break  # done reading
-        else:
-            # exceeded the while loop timeout
-            return (None, None)
-
-        return (rxb, found.lastgroup)
+    def _tty_recv(self, timeout):
+        # waits for the first byte up to the read timeout of the port, which
+        # bounds how late the :timeout: is enforced, then takes the rest of
+        # the text already received
+        data = self._ser.read(1)
+        if data:
+            waiting = self._ser.in_waiting
+            if waiting:
+                data += self._ser.read(waiting)
+        return data
@@ -3,18 +3,17 @@ import re
 import select
 import socket
 import sys
-from time import sleep, time
+from time import sleep
 
 import paramiko
 import six
-from jnpr.junos.transport.tty import Terminal
+from jnpr.junos.transport.tty import _PROMPT, Terminal
 
 logger = logging.getLogger("jnpr.junos.tty_ssh")
 
 # -------------------------------------------------------------------------
 # Terminal connection over SSH CONSOLE
 # -------------------------------------------------------------------------
-_PROMPT = re.compile(six.b("|").join([six.b(i) for i in Terminal._RE_PAT]))
 
 
 class PY6:
@@ -170,44 +169,22 @@ class SSH(Terminal):
 
         return rxb
 
-    def read_prompt(self):
-        """
-        reads text from the serial console (using paramiko recv) until
-        a match is found against the :expect: regular-expression object.
-        When a match is found, return a tuple(<text>,<found>) where
-        <text> is the complete text and <found> is the name of the
-        regular-expression group. If a timeout occurs, then return
-        the tuple(None,None).
-        """
-        rxb = six.b("")
-        timeout = time() + self.READ_PROMPT_DELAY
-
-        while time() < timeout:
-            sleep(0.1)
-            rd, _, _ = select.select([self._ssh], [], [], 0.1)
-            sleep(0.05)
-            if rd:
-                rxb += self._ssh.recv(self.RECVSZ)
-                found = _PROMPT.search(rxb)
-                if found is not None:
-                    break
-                timeout = time() + self.READ_PROMPT_DELAY
-        else:
-            return None, None
-        logger.debug("Got: %s" % rxb)
-        return rxb, found.lastgroup
+    def _tty_recv(self, timeout):
+        rd, _, _ = select.select([self._ssh], [], [], timeout)
+        if not rd:
+            return PY6.EMPTY_STR
+        # an empty read of a readable channel means it was closed
+        return self._ssh.recv(self.MAX_BUFFER) or None
+
+    def _prompt_expect(self):
+        # the prompt is read until found, or for as long as the console
+        # keeps sending text, waiting up to :READ_PROMPT_DELAY: seconds for
+        # each piece of it
+        return _PROMPT, self.READ_PROMPT_DELAY, True
 
     def _read_until(self, match, timeout=None):
-        rxb = six.b("")
-        timeout = time() + self.READ_PROMPT_DELAY
-
-        while time() < timeout:
-            sleep(0.1)
-            rd, _, _ = select.select([self._ssh], [], [], 0.1)
-            sleep(0.05)
-            if rd:
-                rxb += self._ssh.recv(self.MAX_BUFFER)
-                if re.search(match, rxb):
-                    return rxb
-
-                timeout = time() + self.READ_PROMPT_DELAY
+        # the :timeout: of telnetlib read_until() is not used, the text is
+        # read until :match: or for as long as the console keeps sending
+        rxb, found = self._expect(re.compile(match), self.READ_PROMPT_DELAY, idle=True)
+        if found is not None:
+            return rxb
@@ -1,4 +1,5 @@
 import logging
+import select
 import sys
 from time import sleep
 
@@ -105,11 +106,19 @@ class Telnet(Terminal):
         """read a single line"""
         return self._tn.read_until(PY6.NEW_LINE, self.EXPECT_TIMEOUT)
 
-    def read_prompt(self):
-        _RE_PAT = [six.b(i) for i in Terminal._RE_PAT]
-        got = self._tn.expect(_RE_PAT, self.EXPECT_TIMEOUT)
-        if PY6.IN_USE in got[2]:
+    def _tty_recv(self, timeout):
+        try:
+            # text already received and buffered by telnetlib comes first
+            data = self._tn.read_very_eager()
+            if not data:
+                rd, _, _ = select.select([self._tn], [], [], timeout)
+                if rd:
+                    data = self._tn.read_very_eager()
+        except EOFError:
+            return None
+        return data
+
+    def _prompt_found(self, rxb, found):
+        if PY6.IN_USE in rxb:
             raise RuntimeError("open_fail: port already in use")
-        if len(got) >= 3:
-            logger.debug("Got: %s" % got[2])
-        return (None, None) if not got[1] else (got[2], got[1].lastgroup)
+        return Terminal._prompt_found(self, rxb, found)
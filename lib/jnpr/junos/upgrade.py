@@ -0,0 +1,482 @@
+"""
+Staged software upgrade of many Junos devices, built on
+:class:`jnpr.junos.utils.sw.SW`.
+
+:meth:`jnpr.junos.utils.sw.SW.install` upgrades one device at a time. A
+:class:`FleetUpgrade` runs the stages of the upgrade across the devices,
+each stage with its own parallelism:
+
+1. ``copy``: the checksum of the package is computed once, on the local
+   host, and the package is copied to **copy_workers** devices at a time.
+   The copies share an optional **bandwidth** cap.
+2. ``install``: the package is validated and installed in waves of
+   **wave_size** devices.
+3. ``reboot``: the devices are rebooted in batches of **reboot_batch**
+   devices. A batch must be back up and healthy before the next batch is
+   rebooted.
+
+When a wave or a batch has more than **max_failures** failed devices, the
+upgrade halts and the next waves are not run::
+
+    from jnpr.junos.upgrade import FleetUpgrade
+
+    upgrade = FleetUpgrade(hosts, 'junos-install-mx-x86-64-22.4R1.10.tgz',
+                           user='foo', passwd='bar',
+                           bandwidth=100 * 1000 * 1000 / 8,
+                           validate=True, version='22.4R1.10', progress=True)
+    for host, result in upgrade.run():
+        ...
+"""
+
+import logging
+import time
+from os import path
+
+from jnpr.junos import exception as EzErrors
+from jnpr.junos.fleet import Fleet
+from jnpr.junos.utils.scp import BandwidthLimit
+from jnpr.junos.utils.sw import SW
+
+logger = logging.getLogger("jnpr.junos.upgrade")
+
+
+class FleetUpgrade(object):
+    """
+    A staged software upgrade of a set of Junos devices.
+
+    The result of every device is ``True`` once its stages passed, or the
+    exception which failed it, a :class:`jnpr.junos.exception.SwUpgradeError`
+    when a stage did not pass. A failed device is left out of the next
+    stages, the other devices are not affected.
+
+    The stages are also run one by one with :meth:`copy`, :meth:`install`
+    and :meth:`reboot`, e.g. to copy the package ahead of the maintenance
+    window. The progress of every device is reported through the
+    **progress** callback, as :meth:`jnpr.junos.utils.sw.SW.install` does.
+    """
+
+    def __init__(
+        self,
+        devices,
+        package,
+        remote_path="/var/tmp",
+        copy_workers=4,
+        bandwidth=None,
+        wave_size=10,
+        reboot_batch=5,
+        max_failures=0,
+        validate=False,
+        cleanfs=True,
+        checksum=None,
+        checksum_algorithm="md5",
+        version=None,
+        health_check=None,
+        reboot_wait=60,
+        reboot_poll=30,
+        reboot_timeout=1800,
+        progress=None,
+        install_args=None,
+        **kvargs,
+    ):
+        """
+        FleetUpgrade object constructor.
+
+        :param list devices:
+            **REQUIRED** The devices, each of them either a host-name or a
+            ``dict`` of :class:`jnpr.junos.device.Device` arguments, see
+            :class:`jnpr.junos.fleet.Fleet`.
+
+        :param str package:
+            **REQUIRED** File-path to the package on the local host.
+
+        :param str remote_path:
+            *OPTIONAL* directory on the devices where the package is copied
+            to, default is ``/var/tmp``.
+
+        :param int copy_workers:
+            *OPTIONAL* maximum number of devices copied to at the same time,
+            default is 4.
+
+        :param bandwidth:
+            *OPTIONAL* caps the bandwidth of all of the copies together,
+            either a rate in bytes per second or a
+            :class:`jnpr.junos.utils.scp.BandwidthLimit`. Default is no cap.
+
+        :param int wave_size:
+            *OPTIONAL* number of devices installed at the same time, default
+            is 10.
+
+        :param int reboot_batch:
+            *OPTIONAL* number of devices rebooted at the same time, default
+            is 5.
+
+        :param int max_failures:
+            *OPTIONAL* maximum number of failed devices in a wave or batch
+            before the upgrade halts, default is 0.
+
+        :param bool validate:
+            *OPTIONAL* when ``True``, the package is validated against the
+            configuration before it is installed, default is ``False``.
+
+        :param bool cleanfs:
+            *OPTIONAL* when ``True`` (default), the storage of the devices is
+            cleaned up before the copy.
+
+        :param str checksum:
+            *OPTIONAL* checksum of the package, computed once on the local
+            host when not given.
+
+        :param str checksum_algorithm:
+            *OPTIONAL* 'md5' (default), 'sha1' or 'sha256'.
+
+        :param str version:
+            *OPTIONAL* the Junos version of the package. When given, the
+            devices must run it once rebooted to be healthy.
+
+        :param callable health_check:
+            *OPTIONAL* called with the :class:`jnpr.junos.device.Device` once
+            rebooted, the device is healthy when it returns ``True``.
+
+        :param int reboot_wait:
+            *OPTIONAL* seconds to wait before reconnecting to a rebooted
+            device, default is 60.
+
+        :param int reboot_poll:
+            *OPTIONAL* seconds between the attempts to reconnect to a
+            rebooted device, default is 30.
+
+        :param int reboot_timeout:
+            *OPTIONAL* seconds for a rebooted device to be back, default is
+            1800.
+
+        :param progress:
+            *OPTIONAL* called with ``(dev, report)`` as each device goes
+            through the stages. If set to ``True``, it uses
+            :meth:`jnpr.junos.utils.sw.SW.progress`.
+
+        :param dict install_args:
+            *OPTIONAL* additional arguments of
+            :meth:`jnpr.junos.utils.sw.SW.install`, e.g. ``timeout`` or
+            ``vmhost``. ``vmhost`` and ``all_re`` are given to
+            :meth:`jnpr.junos.utils.sw.SW.reboot` as well.
+
+        :param kvargs:
+            *OPTIONAL* :class:`jnpr.junos.fleet.Fleet` arguments common to
+            all of the devices, e.g. ``user``, ``passwd`` or ``timeout``.
+        """
+        for name, value in (
+            ("copy_workers", copy_workers),
+            ("wave_size", wave_size),
+            ("reboot_batch", reboot_batch),
+        ):
+            if value < 1:
+                raise ValueError("%s must be at least 1" % name)
+        self._devices = [
+            dict(host=device) if isinstance(device, str) else dict(device)
+            for device in devices
+        ]
+        self.package = package
+        self.remote_path = remote_path
+        self.copy_workers = copy_workers
+        if bandwidth is not None and not isinstance(bandwidth, BandwidthLimit):
+            bandwidth = BandwidthLimit(bandwidth)
+        self.bandwidth = bandwidth
+        self.wave_size = wave_size
+        self.reboot_batch = reboot_batch
+        self.max_failures = max_failures
+        self.validate = validate
+        self.cleanfs = cleanfs
+        self.checksum = checksum
+        self.checksum_algorithm = checksum_algorithm
+        self.version = version
+        self.health_check = health_check
+        self.reboot_wait = reboot_wait
+        self.reboot_poll = reboot_poll
+        self.reboot_timeout = reboot_timeout
+        self._progress = progress
+        self._install_args = dict(install_args or {})
+        self._kvargs = kvargs
+        # result of each device by host and port, None until its stages passed
+        self._results = dict((self._key(device), None) for device in self._devices)
+        # set once a stage halted the upgrade
+        self._halted = False
+
+    # -----------------------------------------------------------------------
+    # PROPERTIES
+    # -----------------------------------------------------------------------
+
+    @property
+    def results(self):
+        """
+        :returns: ``list`` of ``(hostname, result)``, in the order of the
+          devices. ``result`` is ``None`` while no stage was run.
+        """
+        return [
+            (device.get("host"), self._results[self._key(device)])
+            for device in self._devices
+        ]
+
+    # -----------------------------------------------------------------------
+    # PUBLIC METHODS
+    # -----------------------------------------------------------------------
+
+    def run(self, reboot=True):
+        """
+        Runs the ``copy``, ``install`` and, if **reboot** is ``True``, the
+        ``reboot`` stages. No device is rebooted when the ``install`` stage
+        halted the upgrade, the result of the devices installed is then a
+        ``reboot`` :class:`jnpr.junos.exception.SwUpgradeError`.
+
+        :returns: ``list`` of ``(hostname, True or exception)``, see
+          :attr:`results`
+        """
+        self.copy()
+        self.install()
+        if self._halted is True:
+            if reboot is True:
+                for device in self._pending():
+                    self._results[self._key(device)] = EzErrors.SwUpgradeError(
+                        "reboot", "installed but not rebooted, the upgrade halted"
+                    )
+            return self.results
+        if reboot is True:
+            self.reboot()
+        return self.results
+
+    def copy(self):
+        """
+        Copies the package to the devices, see
+        :meth:`jnpr.junos.utils.sw.SW.safe_copy`. The copy is skipped on the
+        devices which already have the package.
+
+        :returns: ``list`` of ``(hostname, True or exception)``
+
+        :raises IOError: when the checksum of the package can not be computed
+        """
+        if self.checksum is None:
+            logger.info("computing checksum on local package: %s" % self.package)
+            self.checksum = SW.local_checksum(
+                self.package, algorithm=self.checksum_algorithm
+            )
+
+        def _copy(dev):
+            ok = SW(dev).safe_copy(
+                self.package,
+                remote_path=self.remote_path,
+                progress=self._progress,
+                cleanfs=self.cleanfs,
+                checksum=self.checksum,
+                checksum_algorithm=self.checksum_algorithm,
+                bandwidth=self.bandwidth,
+            )
+            if ok is not True:
+                raise EzErrors.SwUpgradeError(
+                    "copy", "package %s couldn't be copied" % self.package
+                )
+            return True
+
+        self._waves("copy", _copy, self.copy_workers, halt=False)
+        return self.results
+
+    def install(self):
+        """
+        Validates, when **validate** is ``True``, and installs the package
+        copied by :meth:`copy` in waves of **wave_size** devices, see
+        :meth:`jnpr.junos.utils.sw.SW.install`.
+
+        :returns: ``list`` of ``(hostname, True or exception)``
+        """
+
+        def _install(dev):
+            ok = SW(dev).install(
+                package=self.package,
+                remote_path=self.remote_path,
+                progress=self._progress,
+                validate=self.validate,
+                no_copy=True,
+                **self._install_args,
+            )
+            msg = "package %s couldn't be installed" % self.package
+            if isinstance(ok, tuple):
+                ok, msg = ok
+            if ok is not True:
+                raise EzErrors.SwUpgradeError("install", msg)
+            self._report(dev, "installed %s" % path.basename(self.package))
+            return True
+
+        self._waves("install", _install, self.wave_size)
+        return self.results
+
+    def reboot(self):
+        """
+        Reboots the devices in batches of **reboot_batch** devices. The
+        devices of a batch must be back and healthy before the next batch is
+        rebooted, see :meth:`healthy`. The ``vmhost`` and ``all_re``
+        **install_args** apply to the reboot as well.
+
+        :returns: ``list`` of ``(hostname, True or exception)``
+        """
+
+        # the reboot which activates the install
+        reboot_args = dict(
+            (name, self._install_args[name])
+            for name in ("vmhost", "all_re")
+            if name in self._install_args
+        )
+
+        def _reboot(dev):
+            self._report(dev, "rebooting")
+            SW(dev).reboot(**reboot_args)
+            try:
+                dev.close()
+            except Exception as ex:
+                # the device may be going down already
+                logger.debug("close of {} hit exception: {}".format(dev.hostname, ex))
+            return True
+
+        self._waves("reboot", _reboot, self.reboot_batch, self._wait_healthy)
+        return self.results
+
+    def healthy(self, dev):
+        """
+        Checks a device once rebooted: it must run **version**, when given,
+        and pass the **health_check**.
+
+        :raises SwUpgradeError: when the device is not healthy
+        """
+        if self.version is not None:
+            dev.facts_refresh(keys="version")
+            running = dev.facts["version"]
+            if running != self.version:
+                raise EzErrors.SwUpgradeError(
+                    "reboot", "running %s rather than %s" % (running, self.version)
+                )
+        if self.health_check is not None and self.health_check(dev) is not True:
+            raise EzErrors.SwUpgradeError("reboot", "health check failed")
+        self._report(dev, "healthy")
+        return True
+
+    # -----------------------------------------------------------------------
+    # PRIVATE METHODS
+    # -----------------------------------------------------------------------
+
+    @staticmethod
+    def _key(device):
+        # the same host may be reached on several ports
+        return (device.get("host"), device.get("port"))
+
+    def _run(self, devices, max_workers, func):
+        """
+        Runs ``func(dev)`` on **devices**.
+
+        :returns: generator of ``(device, result or exception)``
+        """
+        fleet = Fleet(devices, max_workers=max_workers, ordered=True, **self._kvargs)
+        for device, (_, result) in zip(devices, fleet.run(func)):
+            yield device, result
+
+    def _pending(self):
+        """
+        :returns: ``list`` of the devices not failed by a previous stage
+        """
+        return [
+            device
+            for device in self._devices
+            if not isinstance(self._results[self._key(device)], Exception)
+        ]
+
+    def _waves(self, stage, func, size, after=None, halt=True):
+        """
+        Runs ``func(dev)`` on the pending devices, in waves of **size**
+        devices, and records the results. ``after(wave)`` runs on the
+        devices of a wave which passed **func**.
+
+        :param bool halt: if ``True``, the next waves are not run once a
+          wave has more than **max_failures** failed devices.
+        """
+        devices = self._pending()
+        waves = [devices[i : i + size] for i in range(0, len(devices), size)]
+        if halt is False:
+            # a single wave, the parallelism is bounded by the fleet
+            waves = [devices] if devices else []
+        for index, wave in enumerate(waves):
+            logger.info(
+                "{}: wave {}/{} of {} devices".format(
+                    stage, index + 1, len(waves), len(wave)
+                )
+            )
+            passed = []
+            for device, result in self._run(wave, size, func):
+                self._record(stage, device, result)
+                if not isinstance(result, Exception):
+                    passed.append(device)
+            if after is not None and passed:
+                after(passed)
+            failures = len(
+                [
+                    device
+                    for device in wave
+                    if isinstance(self._results[self._key(device)], Exception)
+                ]
+            )
+            if halt is True and failures > self.max_failures:
+                logger.error(
+                    "{}: {} devices failed, halting the upgrade".format(stage, failures)
+                )
+                self._halted = True
+                for device in sum(waves[index + 1 :], []):
+                    self._results[self._key(device)] = EzErrors.SwUpgradeError(
+                        stage,
+                        "not run, the upgrade halted after %d failures" % failures,
+                    )
+                break
+
+    def _wait_healthy(self, devices):
+        """
+        Waits for the rebooted **devices** to be back, then checks that they
+        are healthy, see :meth:`healthy`.
+        """
+        deadline = time.monotonic() + self.reboot_timeout
+        time.sleep(self.reboot_wait)
+        while True:
+            waiting = []
+            for device, result in self._run(devices, len(devices), self.healthy):
+                if isinstance(result, EzErrors.ConnectError) and not isinstance(
+                    result, EzErrors.ConnectAuthError
+                ):
+                    # not back yet
+                    waiting.append(device)
+                else:
+                    self._record("reboot", device, result)
+            devices = waiting
+            if not devices:
+                return
+            if time.monotonic() + self.reboot_poll > deadline:
+                for device in waiting:
+                    self._results[self._key(device)] = EzErrors.SwUpgradeError(
+                        "reboot",
+                        "not back within %s seconds" % self.reboot_timeout,
+                    )
+                return
+            time.sleep(self.reboot_poll)
+
+    def _record(self, stage, device, result):
+        host = device.get("host")
+        if isinstance(result, Exception):
+            logger.error("{}: {} failed: {}".format(stage, host, result))
+            self._results[self._key(device)] = result
+        else:
+            logger.info("{}: {} done".format(stage, host))
+            self._results[self._key(device)] = True
+
+    def _report(self, dev, report):
+        if self._progress is True:
+            SW.progress(dev, report)
+        elif callable(self._progress):
+            self._progress(dev, report)
+
+    def __repr__(self):
+        return "FleetUpgrade(%d devices, %s)" % (
+            len(self._devices),
+            path.basename(self.package),
+        )
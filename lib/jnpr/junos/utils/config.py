@@ -1,6 +1,9 @@
 # utils/config.py
+import hashlib
+import json
 import os
 import re
+import time
 import warnings
 
 from jnpr.junos import jxml as JXML
@@ -29,9 +32,15 @@ class Config(Util):
     * :meth:`pdiff`: prints the diff string (debug/helper)
     * :meth:`rescue`: controls "rescue configuration"
     * :meth:`rollback`: perform the load rollback command
+    * :meth:`snapshot`: save the committed config, when changed
+    * :meth:`snapshots`: list the saved snapshots
     * :meth:`unlock`: release the exclusive lock
     """
 
+    # file extension of the snapshots per format
+    _SNAPSHOT_EXT = {"text": "conf", "set": "set", "xml": "xml", "json": "json"}
+    _SNAPSHOT_INDEX = "snapshots.json"
+
     # ------------------------------------------------------------------------
     # commit
     # ------------------------------------------------------------------------
@@ -787,6 +796,192 @@ class Config(Util):
 
         return result
 
+    # -------------------------------------------------------------------------
+    # configuration snapshots
+    # -------------------------------------------------------------------------
+
+    def snapshot(self, path, format="text", history=10, force=False):
+        """
+        Saves the committed configuration in the directory **path**, which
+        keeps the snapshots of one device. The last commit of the device is
+        checked first and the configuration is only fetched when it differs
+        from the commit of the latest snapshot.
+
+        .. code-block:: python
+
+           snap = cu.snapshot('/var/backup/router1', format='set')
+           if snap['changed']:
+               print('new configuration in ' + snap['file'])
+
+        :param str path: directory of the snapshots, created when needed.
+
+        :param str format:
+          *OPTIONAL* format of the configuration, "text" (default), "set",
+          "xml" or "json". A change of format fetches the configuration.
+
+        :param int history:
+          *OPTIONAL* number of snapshots kept in **path**, the oldest are
+          removed. default is 10, ``None`` keeps all of them.
+
+        :param bool force:
+          *OPTIONAL* if ``True``, the configuration is fetched even when the
+          device did not commit since the latest snapshot.
+
+        :returns: ``dict`` of the latest snapshot, see :meth:`snapshots`,
+          with ``changed`` set to ``True`` when a new snapshot was saved.
+          A configuration which was fetched but is identical to the latest
+          snapshot (e.g. after an empty commit) is not saved again.
+
+        :raises ValueError: When **format** is not supported
+        """
+        ext = self._SNAPSHOT_EXT.get(format)
+        if ext is None:
+            raise ValueError("unsupported snapshot format: {}".format(format))
+
+        # the commit is checked before the configuration is fetched, a commit
+        # in between is then detected by the next snapshot
+        commit = self._last_commit()
+        snapshots = self._read_snapshots(path)
+        latest = snapshots[-1] if snapshots else None
+        if (
+            latest is not None
+            and not force
+            and commit is not None
+            and latest["commit"] == commit
+            and latest["format"] == format
+            and os.path.isfile(os.path.join(path, latest["file"]))
+        ):
+            return self._snapshot_result(path, latest, changed=False)
+
+        config = self._fetch_config(format)
+        digest = hashlib.sha256(config.encode("utf-8")).hexdigest()
+        now = time.time()
+        if (
+            latest is not None
+            and latest["digest"] == digest
+            and latest["format"] == format
+            and os.path.isfile(os.path.join(path, latest["file"]))
+        ):
+            latest["commit"] = commit
+            latest["checked"] = now
+            self._write_snapshots(path, snapshots)
+            return self._snapshot_result(path, latest, changed=False)
+
+        # the serial keeps the file names unique, even within a second
+        serial = latest["serial"] + 1 if latest is not None else 1
+        fname = "config-%s-%d.%s" % (
+            time.strftime("%Y%m%d-%H%M%S", time.gmtime(now)),
+            serial,
+            ext,
+        )
+        self._write_file(os.path.join(path, fname), config)
+
+        snapshot = dict(
+            serial=serial,
+            file=fname,
+            format=format,
+            commit=commit,
+            digest=digest,
+            time=now,
+            checked=now,
+        )
+        snapshots.append(snapshot)
+        if history is not None:
+            while len(snapshots) > max(history, 1):
+                old = snapshots.pop(0)
+                try:
+                    os.remove(os.path.join(path, old["file"]))
+                except OSError:
+                    pass
+        self._write_snapshots(path, snapshots)
+        return self._snapshot_result(path, snapshot, changed=True)
+
+    def snapshots(self, path):
+        """
+        Lists the snapshots saved by :meth:`snapshot` in the directory
+        **path**, the oldest first.
+
+        :returns: ``list`` of ``dict``:
+
+          * ``serial``: number of the snapshot, from 1
+          * ``file``: path of the configuration file
+          * ``format``: format of the configuration
+          * ``commit``: ``dict`` of the last commit of the device when the
+            snapshot was checked (``sequence-number``, ``user``, ``client``,
+            ``date-time``, ``seconds`` and ``log``), ``None`` when the device
+            returned no commit history
+          * ``digest``: SHA-256 of the configuration
+          * ``time``: time the configuration was saved, ``checked`` the
+            time it was last found unchanged, in seconds since the epoch
+        """
+        return [
+            self._snapshot_result(path, snapshot)
+            for snapshot in self._read_snapshots(path)
+        ]
+
+    def _last_commit(self):
+        """
+        :returns: ``dict`` of the latest entry of the commit history, or
+          ``None`` when there is none
+        """
+        try:
+            rsp = self.rpc.get_commit_information()
+        except (RpcTimeoutError, ConnectClosedError) as err:
+            raise err
+        except RpcError:
+            return None
+        entry = rsp.find("commit-history")
+        if entry is None:
+            return None
+        commit = dict(
+            (tag, entry.findtext(tag))
+            for tag in ("sequence-number", "user", "client", "date-time", "log")
+        )
+        date_time = entry.find("date-time")
+        commit["seconds"] = date_time.get("seconds") if date_time is not None else None
+        return commit
+
+    def _fetch_config(self, format):
+        """
+        :returns: the committed configuration in **format**, as a string
+        """
+        rsp = self.rpc.get_config(options={"database": "committed", "format": format})
+        if format == "json":
+            return json.dumps(rsp, indent=2)
+        if format == "xml":
+            return etree.tostring(rsp, encoding="unicode", pretty_print=True)
+        return rsp.text or ""
+
+    def _read_snapshots(self, path):
+        try:
+            with open(os.path.join(path, self._SNAPSHOT_INDEX)) as fp:
+                return json.load(fp)["snapshots"]
+        except FileNotFoundError:
+            return []
+
+    def _write_snapshots(self, path, snapshots):
+        self._write_file(
+            os.path.join(path, self._SNAPSHOT_INDEX),
+            json.dumps({"snapshots": snapshots}, indent=2),
+        )
+
+    @staticmethod
+    def _write_file(fpath, content):
+        # written aside then renamed, so that an interrupted snapshot leaves
+        # the previous files intact
+        os.makedirs(os.path.dirname(fpath) or ".", exist_ok=True)
+        tmp = fpath + ".tmp"
+        with open(tmp, "w") as fp:
+            fp.write(content)
+        os.replace(tmp, fpath)
+
+    @staticmethod
+    def _snapshot_result(path, snapshot, **kvargs):
+        result = dict(snapshot)
+        result["file"] = os.path.join(path, snapshot["file"])
+        result.update(kvargs)
+        return result
+
     def __init__(self, dev, mode=None, **kwargs):
         """
         :param str mode: Can be used *only* when creating Config object using
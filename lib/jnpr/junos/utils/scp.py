@@ -1,6 +1,8 @@
 from __future__ import absolute_import
 
 import inspect
+import threading
+import time
 
 from jnpr.junos.utils.ssh_client import open_ssh_client
 
@@ -9,6 +11,43 @@ Secure Copy Utility
 """
 
 
+class BandwidthLimit(object):
+    """
+    Caps the bandwidth of the :class:`SCP` transfers sharing it, e.g. the
+    copies of an image to many devices at once::
+
+        limit = BandwidthLimit(50 * 1000 * 1000 / 8)  # 50 Mbit/s
+
+        with SCP(dev, bandwidth=limit) as scp:
+            scp.put(package, remote_path)
+
+    A transfer which gets ahead of the rate waits, so that the transfers
+    together do not exceed it.
+    """
+
+    def __init__(self, rate):
+        """
+        :param int rate: maximum rate, in bytes per second
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self._lock = threading.Lock()
+        # time at which the bytes accounted for so far are sent at the rate
+        self._until = time.monotonic()
+
+    def consume(self, nbytes):
+        """
+        Accounts for **nbytes** sent and waits until they fit in the rate.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._until = max(self._until, now) + nbytes / self.rate
+            delay = self._until - now
+        if delay > 0:
+            time.sleep(delay)
+
+
 class SCP(object):
     """
     The SCP utility is used to conjunction with :class:`jnpr.junos.utils.sw.SW`
@@ -28,6 +67,10 @@ class SCP(object):
         Constructor that wraps :py:mod:`paramiko` and :py:mod:`scp` objects.
 
         :param Device junos: the Device object
+        :param bandwidth:
+          *OPTIONAL* caps the bandwidth of the transfers, either a rate in
+          bytes per second or a :class:`BandwidthLimit` shared with other
+          transfers.
         :param kvargs scpargs: any additional args to be passed to paramiko SCP
         """
         self._junos = junos
@@ -53,6 +96,29 @@ class SCP(object):
                 # class to use progress provided by user.
                 self._progress = lambda report: self._user_progress(self._junos, report)
                 self._scpargs["progress"] = self._scp_progress
+        bandwidth = self._scpargs.pop("bandwidth", None)
+        if bandwidth is not None:
+            if not isinstance(bandwidth, BandwidthLimit):
+                bandwidth = BandwidthLimit(bandwidth)
+            self._scpargs["progress"] = self._throttle(
+                bandwidth, self._scpargs.get("progress")
+            )
+
+    @staticmethod
+    def _throttle(bandwidth, progress=None):
+        """
+        :returns: the scp progress function accounting the bytes sent to
+          **bandwidth** before calling **progress**
+        """
+        sent = {}
+
+        def _progress(_path, _total, _xfrd):
+            bandwidth.consume(_xfrd - sent.get(_path, 0))
+            sent[_path] = _xfrd
+            if progress is not None:
+                progress(_path, _total, _xfrd)
+
+        return _progress
 
     def _progress(self, report):
         """simple progress report function"""
@@ -1,7 +1,8 @@
-import datetime
+import codecs
 import re
 import subprocess
 import time
+from functools import lru_cache
 from select import select
 from threading import Thread
 
@@ -12,6 +13,19 @@ _JUNOS_PROMPT = "> "
 _SHELL_PROMPT = r"(%|#|\$)\s"
 _SELECT_WAIT = 0.1
 _RECVSZ = 1024
+# the prompt is searched for in the last _PROMPT_TAIL characters of output
+_PROMPT_TAIL = 1024
+# interrupts the running command
+_CTRL_C = "\x03"
+
+
+@lru_cache(maxsize=64)
+def _prompt_re(this):
+    """
+    :returns: the compiled regular-expression matching the prompt **this**
+      at the end of the output
+    """
+    return re.compile(r"{}\s?$".format(this))
 
 
 class StartShell(object):
@@ -66,11 +80,34 @@ class StartShell(object):
 
         .. warning:: need to add a timeout safeguard
         """
-        chan = self._chan
         got = []
-        timeout = timeout or self.timeout
-        timeout = datetime.datetime.now() + datetime.timedelta(seconds=timeout)
-        while timeout > datetime.datetime.now():
+        pattern = None if this is None else _prompt_re(this)
+        tail = ""
+        for data in self._recv(timeout or self.timeout, sleep=sleep):
+            got.append(data)
+            if pattern is not None:
+                tail = (tail + data)[-_PROMPT_TAIL:]
+                if pattern.search(tail) is not None:
+                    break
+        return got
+
+    def _recv(self, timeout, sleep=0, idle=False):
+        """
+        Reads the output of the shell as it arrives.
+
+        :param int timeout: seconds to read for.
+        :param seconds sleep: time to wait after each read, see
+          :meth:`wait_for`.
+        :param bool idle: if ``True``, **timeout** is counted from the last
+          output rather than from the call.
+
+        :returns: generator of the output, as ``str`` chunks. It ends on
+          timeout or once the shell is closed.
+        """
+        chan = self._chan
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        deadline = time.monotonic() + timeout
+        while deadline > time.monotonic():
             if self.ON_JUNOS is True:
                 data = chan.stdout.readline()
             else:
@@ -79,15 +116,15 @@ class StartShell(object):
                     data = chan.recv(_RECVSZ)
                 else:
                     continue
+            if not data:
+                return
             if sleep:
                 time.sleep(sleep)
             if isinstance(data, bytes):
-                data = data.decode("utf-8", "replace")
-            got.append(data)
-
-            if this is not None and re.search(r"{}\s?$".format(this), str(data)):
-                break
-        return got
+                data = decoder.decode(data)
+            if idle:
+                deadline = time.monotonic() + timeout
+            yield data
 
     def send(self, data):
         """
@@ -184,22 +221,104 @@ class StartShell(object):
         self.send(command)
         if self.ON_JUNOS is True:
             got = "".join(self.wait_for(this="]]>]]>", timeout=timeout))
+            found = True
+        else:
+            got = "".join(self.wait_for(this, timeout, sleep=sleep))
+            found = this is not None and _prompt_re(this).search(got) is not None
+        self._set_last_ok(this, found, got != "")
+        return (self.last_ok, got)
+
+    def run_iter(self, command, this=_SHELL_PROMPT, timeout=0):
+        """
+        Run shell command(s) and yield the output line by line as it arrives,
+        rather than all of it once the prompt is back like :meth:`run`. The
+        output of commands like ``tcpdump``, or of ``cat`` of large log
+        files, is then never held in memory.
+
+        :param command: the shell command to execute, or a ``list`` of
+          commands. The commands of a ``list`` are run one after the other
+          from a single command line, so that the prompt is waited for once
+          for the whole batch.
+        :param str this: the expected shell-prompt to wait for, see
+          :meth:`run`.
+        :param int timeout:
+          Timeout value in seconds to wait for output. If not specified
+          defaults to self.timeout. Unlike :meth:`run`, the timeout starts
+          over with each output received, so that a long output is not cut
+          short.
+
+        :returns: generator of the lines of output, each ending with its
+          line terminator but the last one, which ends with the prompt.
+
+        .. code-block:: python
+
+           with StartShell(dev) as ss:
+               with open('messages', 'w') as out:
+                   for line in ss.run_iter('cat /var/log/messages'):
+                       out.write(line)
+               print(ss.last_ok)
+
+        .. note:: ``self.last_ok`` is set as by :meth:`run` once the
+                  generator is exhausted. When the generator is closed
+                  before the prompt, e.g. by a ``break`` out of the loop,
+                  the command is interrupted with ``Ctrl-C`` and
+                  ``self.last_ok`` is False.
+        """
+        if not isinstance(command, six.string_types):
+            command = "; ".join(command)
+        timeout = timeout or self.timeout
+        self.send(command)
+        if self.ON_JUNOS is True:
+            this = "]]>]]>"
+        pattern = None if this is None else _prompt_re(this)
+        line = tail = ""
+        found = received = False
+        try:
+            for data in self._recv(timeout, idle=True):
+                received = True
+                if pattern is not None:
+                    tail = (tail + data)[-_PROMPT_TAIL:]
+                    found = pattern.search(tail) is not None
+                lines = (line + data).split("\n")
+                line = lines.pop()
+                for text in lines:
+                    yield text + "\n"
+                if found:
+                    break
+            if line:
+                yield line
+        except GeneratorExit:
+            self.last_ok = False
+            if self.ON_JUNOS is not True and this is not None and not found:
+                self._chan.send(_CTRL_C)
+                self.wait_for(this)
+            raise
+        self._set_last_ok(this, found, received)
+
+    def _set_last_ok(self, this, found, received):
+        """
+        Sets ``self.last_ok`` once the output of a command was read.
+
+        :param str this: the expected shell-prompt of the command.
+        :param bool found: if the prompt ended the output.
+        :param bool received: if there was any output.
+
+        :returns: ``self.last_ok``
+        """
+        if self.ON_JUNOS is True:
             self.send("echo $?")
             rc = "".join(self.wait_for(this="]]>]]>"))
             self.last_ok = rc.find("0") > 0
+        elif this is None:
+            self.last_ok = received
+        elif this != _SHELL_PROMPT or not found:
+            self.last_ok = found
         else:
-            got = "".join(self.wait_for(this, timeout, sleep=sleep))
-            self.last_ok = False
-            if this is None:
-                self.last_ok = got != ""
-            elif this != _SHELL_PROMPT:
-                self.last_ok = re.search(r"{}\s?$".format(this), got) is not None
-            elif re.search(r"{}\s?$".format(_SHELL_PROMPT), got) is not None:
-                # use $? to get the exit code of the command
-                self.send("echo $?")
-                rc = "".join(self.wait_for(_SHELL_PROMPT))
-                self.last_ok = rc.find("\r\n0\r\n") > 0
-        return (self.last_ok, got)
+            # use $? to get the exit code of the command
+            self.send("echo $?")
+            rc = "".join(self.wait_for(_SHELL_PROMPT))
+            self.last_ok = rc.find("\r\n0\r\n") > 0
+        return self.last_ok
 
     # -------------------------------------------------------------------------
     # CONTEXT MANAGER
@@ -226,7 +226,7 @@ class SW(Util):
     # put - Copy the image onto the device
     # -------------------------------------------------------------------------
 
-    def put(self, package, remote_path="/var/tmp", progress=None):
+    def put(self, package, remote_path="/var/tmp", progress=None, bandwidth=None):
         """
         SCP or FTP 'put' the package file from the local server to the remote
         device.
@@ -241,6 +241,11 @@ class SW(Util):
           Callback function to indicate progress.  If set to ``True``
           uses :meth:`scp._scp_progress` for basic reporting by default.
           See that class method for details.
+
+        :param bandwidth:
+          *OPTIONAL* caps the bandwidth of the secure-copy, either a rate in
+          bytes per second or a :class:`jnpr.junos.utils.scp.BandwidthLimit`
+          shared with other copies. Not applied to FTP.
         """
         # execute FTP when connection mode if telnet
         if hasattr(self._dev, "_mode") and self._dev._mode == "telnet":
@@ -248,7 +253,10 @@ class SW(Util):
                 ftp.put(package, remote_path)
         else:
             # execute the secure-copy with the Python SCP module
-            with SCP(self._dev, progress=progress) as scp:
+            scpargs = dict(progress=progress)
+            if bandwidth is not None:
+                scpargs["bandwidth"] = bandwidth
+            with SCP(self._dev, **scpargs) as scp:
                 scp.put(package, remote_path)
 
     # -------------------------------------------------------------------------
@@ -654,6 +662,7 @@ class SW(Util):
         checksum_timeout=300,
         checksum_algorithm="md5",
         force_copy=False,
+        bandwidth=None,
     ):
         """
         Copy the install package safely to the remote device.  By default
@@ -689,6 +698,8 @@ class SW(Util):
             if the package is already present at the remote_path, and the local
             checksum matches the remote checksum, then skip the copy to
             optimize time.
+        :param bandwidth:
+            caps the bandwidth of the copy, see :meth:`put`.
 
         :returns:
             * ``True`` when the copy was successful
@@ -742,7 +753,9 @@ class SW(Util):
 
         if remote_checksum != checksum:
             # Need to copy the file.
-            self.put(package, remote_path=remote_path, progress=progress)
+            self.put(
+                package, remote_path=remote_path, progress=progress, bandwidth=bandwidth
+            )
 
             # Now validate checksum of the recently copied file.
             _progress(
@@ -0,0 +1,94 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import nose2
+import yaml
+from jnpr.junos.factory.catalog import _PACKAGE_DIR, _cached, load_catalog
+
+
+class TestCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmpdir, "foo.yml")
+        self._write("FooTable:\n  rpc: get-foo\n")
+        patcher = patch.object(sys, "dont_write_bytecode", False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # as if the YAML file was part of the package
+        patcher = patch(
+            "jnpr.junos.factory.catalog._PACKAGE_DIR", os.path.realpath(self.tmpdir)
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def _write(self, data):
+        with open(self.path, "w") as fp:
+            fp.write(data)
+
+    def _cache_files(self):
+        cache_dir = os.path.join(self.tmpdir, "__pycache__")
+        if not os.path.isdir(cache_dir):
+            return []
+        return os.listdir(cache_dir)
+
+    def test_catalog_cached(self):
+        self.assertEqual(load_catalog(self.path), {"FooTable": {"rpc": "get-foo"}})
+        self.assertEqual(len(self._cache_files()), 1)
+        with patch("jnpr.junos.factory.catalog.yaml.load") as mock_load:
+            self.assertEqual(load_catalog(self.path), {"FooTable": {"rpc": "get-foo"}})
+            mock_load.assert_not_called()
+
+    def test_catalog_loader(self):
+        with patch("jnpr.junos.factory.catalog.yaml.load") as mock_load:
+            mock_load.return_value = {}
+            load_catalog(self.path, yaml.SafeLoader)
+            self.assertEqual(mock_load.call_args.kwargs["Loader"], yaml.SafeLoader)
+        # a cache per loader
+        load_catalog(self.path, yaml.FullLoader)
+        self.assertEqual(len(self._cache_files()), 2)
+
+    def test_catalog_modified(self):
+        load_catalog(self.path)
+        self._write("BarTable:\n  rpc: get-bar-information\n")
+        self.assertEqual(
+            load_catalog(self.path), {"BarTable": {"rpc": "get-bar-information"}}
+        )
+
+    def test_catalog_corrupted_cache(self):
+        load_catalog(self.path)
+        (cache,) = self._cache_files()
+        with open(os.path.join(self.tmpdir, "__pycache__", cache), "wb") as fp:
+            fp.write(b"foo")
+        self.assertEqual(load_catalog(self.path), {"FooTable": {"rpc": "get-foo"}})
+
+    @patch.object(sys, "dont_write_bytecode", True)
+    def test_catalog_dont_write_bytecode(self):
+        self.assertEqual(load_catalog(self.path), {"FooTable": {"rpc": "get-foo"}})
+        self.assertEqual(self._cache_files(), [])
+
+    def test_catalog_user_path_not_cached(self):
+        with patch("jnpr.junos.factory.catalog._PACKAGE_DIR", "/nonexistent"):
+            self.assertEqual(load_catalog(self.path), {"FooTable": {"rpc": "get-foo"}})
+            with patch("jnpr.junos.factory.catalog.pickle") as mock_pickle:
+                self.assertEqual(
+                    load_catalog(self.path), {"FooTable": {"rpc": "get-foo"}}
+                )
+            self.assertFalse(mock_pickle.load.called)
+        self.assertFalse(os.path.exists(os.path.join(self.tmpdir, "__pycache__")))
+
+    def test_catalog_package_cached(self):
+        # the catalogs of the package are cached below the package directory
+        with patch("jnpr.junos.factory.catalog._PACKAGE_DIR", _PACKAGE_DIR):
+            self.assertTrue(_cached(os.path.join(_PACKAGE_DIR, "op", "routes.yml")))
+            self.assertFalse(_cached(self.path))
+
+    def test_catalog_yaml_error(self):
+        self._write("FooTable: [\n")
+        self.assertRaises(yaml.YAMLError, load_catalog, self.path)
@@ -4,6 +4,7 @@ __credits__ = "Jeremy Schulman"
 import unittest
 
 import nose2
+from jnpr.junos import jxml
 from jnpr.junos.factory.factory_cls import (
     FactoryCfgTable,
     FactoryOpTable,
@@ -31,3 +32,17 @@ class TestFactoryCls(unittest.TestCase):
         x.GROUPS = x.FIELDS
         t = FactoryView(x.FIELDS, extends=x, groups=x.FIELDS)
         self.assertEqual(t.__module__, "jnpr.junos.factory.View")
+
+    def test_factory_cls_compiles_xpaths(self):
+        FactoryOpTable("get-foo", item="foo-entry", key="foo-name")
+        FactoryView({"bar": {"xpath": "foo-bar"}}, groups={"baz": "foo-baz"})
+        misses = jxml.compiled_xpath.cache_info().misses
+        for expr in (
+            "foo-entry",
+            "foo-name",
+            "foo-entry/foo-name",
+            "foo-bar",
+            "foo-baz",
+        ):
+            jxml.compiled_xpath(expr)
+        self.assertEqual(jxml.compiled_xpath.cache_info().misses, misses)
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import mock_open, patch
+from unittest.mock import patch
 
 import yaml
 
@@ -8,17 +8,14 @@ from jnpr.junos.factory import loadyaml
 
 class TestFactoryInit(unittest.TestCase):
     @patch("jnpr.junos.factory.FactoryLoader")
-    @patch("jnpr.junos.factory.yaml.load")
-    @patch("jnpr.junos.factory.open", new_callable=mock_open, read_data="---\nA: {}\n")
-    def test_loadyaml_uses_yaml_safeloader(
-        self, mock_file, mock_yaml_load, mock_loader
-    ):
-        mock_yaml_load.return_value = {}
+    @patch("jnpr.junos.factory.load_catalog")
+    def test_loadyaml_uses_yaml_safeloader(self, mock_load_catalog, mock_loader):
+        mock_load_catalog.return_value = {}
         mock_loader.return_value.load.return_value = {}
 
         loadyaml("dummy.yml")
 
-        self.assertEqual(mock_yaml_load.call_args.kwargs["Loader"], yaml.SafeLoader)
+        mock_load_catalog.assert_called_once_with("dummy.yml", yaml.SafeLoader)
 
 
 if __name__ == "__main__":
@@ -3,6 +3,7 @@ __credits__ = "Jeremy Schulman"
 
 import json
 import os
+import re
 import unittest
 from unittest.mock import patch
 
@@ -10,7 +11,8 @@ import nose2
 import yaml
 from jnpr.junos import Device
 from jnpr.junos.factory.factory_loader import FactoryLoader
-from jnpr.junos.factory.optable import generate_sax_parser_input
+from jnpr.junos.exception import RpcError
+from jnpr.junos.factory.optable import _stream_item_path, generate_sax_parser_input
 from jnpr.junos.op.ethport import EthPortTable
 from jnpr.junos.op.phyport import PhyPortStatsTable
 from lxml import etree
@@ -312,6 +314,90 @@ UTMStatusView:
         data = tbl.get()
         self.assertEqual(json.loads(data.to_json()), {"running": True})
 
+    def test_optable_stream(self):
+        self._mock_send_setup()
+        views = list(self.ppt.stream())
+        self.assertEqual([v.name for v in views], ["ge-0/0/0", "ge-0/0/1"])
+        self.assertEqual(views[0]["rx_packets"], 1207)
+        # the items are detached from the reply and the table stays empty
+        self.assertIsNone(views[0]._xml.getparent())
+        self.assertIsNone(self.ppt.xml)
+        rpc = etree.XML(self.sent[0].encode())
+        self.assertEqual(rpc[0].tag, "get-interface-information")
+        self.assertEqual(rpc[0].findtext("interface-name"), "[efgx][et]-*")
+
+    def test_optable_stream_key(self):
+        self._mock_send_setup()
+        list(self.ppt.stream("ge-0/0/0"))
+        rpc = etree.XML(self.sent[0].encode())
+        self.assertEqual(rpc[0].findtext("interface-name"), "ge-0/0/0")
+
+    def test_optable_stream_no_view(self):
+        self._mock_send_setup()
+        self.ppt.view = None
+        items = list(self.ppt.stream())
+        self.assertEqual(items[1].findtext("name"), "ge-0/0/1")
+
+    def test_optable_stream_chunks(self):
+        self._mock_send_setup()
+        with patch("jnpr.junos.factory.optable._STREAM_CHUNK", 7):
+            views = list(self.ppt.stream())
+        self.assertEqual([v.name for v in views], ["ge-0/0/0", "ge-0/0/1"])
+
+    def test_optable_stream_rpc_error(self):
+        self._mock_send_setup(
+            '<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">'
+            "<rpc-error><error-severity>error</error-severity>"
+            "<error-message>syntax error</error-message></rpc-error>"
+            "</rpc-reply>"
+        )
+        self.assertRaises(RpcError, list, self.ppt.stream())
+
+    def test_optable_stream_path(self):
+        fname = "local-get-interface-information.xml"
+        path = os.path.join(os.path.dirname(__file__), "rpc-reply", fname)
+        views = list(PhyPortStatsTable(path=path).stream())
+        self.assertEqual(len(views), 2)
+
+    def test_optable_stream_item_path(self):
+        self.assertTrue(
+            _stream_item_path("route-table/rt")[0].match("ri/route-table/rt")
+        )
+        self.assertFalse(
+            _stream_item_path("route-table/rt")[0].match("ri/x/route-table/rt")
+        )
+        self.assertTrue(_stream_item_path("//rt")[0].match("ri/x/route-table/rt"))
+        self.assertTrue(_stream_item_path("a//b")[0].match("r/a/x/y/b"))
+        self.assertEqual(_stream_item_path("a/*")[1], None)
+        self.assertIsNone(_stream_item_path("rt[rt-entry]"))
+        self.assertIsNone(_stream_item_path("/rt"))
+        self.assertIsNone(_stream_item_path("a | b"))
+
+    def _mock_send_setup(self, reply=None):
+        self.sent = []
+
+        def _send(message):
+            self.sent.append(message)
+            rpc = etree.XML(message.encode())
+            if reply is None:
+                fpath = os.path.join(
+                    os.path.dirname(__file__), "rpc-reply", rpc[0].tag + ".xml"
+                )
+                with open(fpath) as fp:
+                    foo = fp.read()
+            else:
+                foo = reply
+            foo = re.sub(
+                "<rpc-reply",
+                '<rpc-reply message-id="%s"' % rpc.get("message-id"),
+                foo,
+                1,
+            )
+            session._dispatch_message(foo)
+
+        session = self.dev._conn._session
+        session.send = _send
+
     def _read_file(self, fname):
         from ncclient.xml_ import NCElement
 
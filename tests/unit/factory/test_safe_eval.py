@@ -1,5 +1,7 @@
 import unittest
+from unittest.mock import patch
 
+from jnpr.junos.factory import safe_eval
 from jnpr.junos.factory.safe_eval import (
     UnsafeExpressionError,
     eval_expression,
@@ -28,6 +30,42 @@ class TestSafeEval(unittest.TestCase):
         data = {"wan_0": {"n": 3}, "fab_1": {"n": 8}, "fab_0": {"n": 4}}
         self.assertEqual(eval_jinja_expression(expr, {"data": data}), 7)
 
+    def test_eval_expression_names_validated_per_call(self):
+        self.assertEqual(eval_expression("a + 1", {"a": 1}), 2)
+        with self.assertRaises(UnsafeExpressionError):
+            eval_expression("a + 1")
+
+    def test_eval_expression_unsafe_not_cached(self):
+        for _ in range(2):
+            with self.assertRaises(UnsafeExpressionError):
+                eval_expression("open('/etc/passwd')")
+
+    def test_eval_jinja_expression_compiled_once(self):
+        expr = "{{ rx }} + {{ tx }} + 10"
+        with patch(
+            "jnpr.junos.factory.safe_eval.Template", wraps=safe_eval.Template
+        ) as mock_template:
+            for count in range(5):
+                self.assertEqual(
+                    eval_jinja_expression(expr, {"rx": str(count), "tx": "1"}),
+                    count + 11,
+                )
+        self.assertEqual(mock_template.call_count, 1)
+
+    def test_eval_jinja_expression_template_node_compiled_once(self):
+        expr = safe_eval.Template("").environment.parse("{{ rx }} * 2")
+        with patch(
+            "jnpr.junos.factory.safe_eval.Template", wraps=safe_eval.Template
+        ) as mock_template:
+            for count in range(5):
+                self.assertEqual(eval_jinja_expression(expr, {"rx": count}), count * 2)
+        self.assertEqual(mock_template.call_count, 1)
+
+    def test_eval_jinja_expression_quoted_placeholder(self):
+        expr = "'{{ cpu }}'[:-1]"
+        self.assertEqual(eval_jinja_expression(expr, {"cpu": "12%"}), "12")
+        self.assertEqual(eval_jinja_expression(expr, {"cpu": "7%"}), "7")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -6,9 +6,12 @@ import pyparsing as pp
 from jnpr.junos.factory.state_machine import (
     Identifiers,
     StateMachine,
+    _columns_parser,
+    _regex_parser,
     convert_to_data_type,
     data_type,
 )
+from transitions import MachineError
 
 
 class TestIdentifiersNumbers(unittest.TestCase):
@@ -96,6 +99,21 @@ class TestDataType(unittest.TestCase):
     def test_data_type_plain_string(self):
         self.assertEqual(data_type("hello"), str)
 
+    def test_data_type_matches_identifiers_numbers(self):
+        # same tokens as Identifiers.numbers parsed with parseAll=True
+        for item, typ in [
+            (" 12 ", int),
+            ("1 . 5", float),
+            ("\t7\n", int),
+            ("1.", str),
+            (".5", str),
+            ("1.5.2", str),
+            ("-1", str),
+            ("", str),
+            ("12 34", str),
+        ]:
+            self.assertEqual(data_type(item), typ, repr(item))
+
 
 class TestConvertToDataType(unittest.TestCase):
     """Tests for convert_to_data_type() which uses data_type() internally."""
@@ -144,5 +162,110 @@ class TestStateMachineEval(unittest.TestCase):
         self.assertEqual(sm._data["pwn"], None)
 
 
+class _ColumnsView:
+    TITLE = None
+    REGEX = {}
+    COLUMNS = {"module": "Module", "name": "Name", "errors": "Active Errors"}
+    EXISTS = {}
+    FIELDS = {}
+    FILTERS = None
+    EVAL = {}
+
+
+class _ColumnsTable:
+    VIEW = _ColumnsView
+    TITLE = None
+    KEY = "module"
+    KEY_ITEMS = None
+    ITEM = None
+    DELIMITER = None
+    EVAL = {}
+
+
+class _RegexView(_ColumnsView):
+    REGEX = {"pid": "numbers", "user": r"\w+", "wcpu": r"(\d+\.\d+)%"}
+    COLUMNS = {}
+
+
+class _RegexTable(_ColumnsTable):
+    VIEW = _RegexView
+    KEY = "pid"
+
+
+class TestStateMachine(unittest.TestCase):
+    def test_parse_columns(self):
+        lines = [
+            "",
+            "---------------------------------------",
+            "Module  Name              Active Errors",
+            "---------------------------------------",
+            "1       PQ3 Chip          0",
+            "2       Host Loopback     3",
+        ]
+        sm = StateMachine(_ColumnsTable())
+        self.assertEqual(
+            sm.parse(lines),
+            {
+                1: {"module": 1, "name": "PQ3 Chip", "errors": 0},
+                2: {"module": 2, "name": "Host Loopback", "errors": 3},
+            },
+        )
+        self.assertEqual(sm.state, "row_column")
+        self.assertTrue(sm.is_row_column())
+        self.assertFalse(sm.is_regex_data())
+        # parse() works on a copy of the lines
+        self.assertEqual(len(lines), 6)
+
+    def test_parse_regex(self):
+        lines = [
+            "PID USERNAME WCPU",
+            "11 root 191.31%",
+            "19542 root 3.86%",
+        ]
+        sm = StateMachine(_RegexTable())
+        self.assertEqual(
+            sm.parse(lines),
+            {
+                11: {"pid": 11, "user": "root", "wcpu": "191.31"},
+                19542: {"pid": 19542, "user": "root", "wcpu": "3.86"},
+            },
+        )
+        self.assertTrue(sm.is_regex_data())
+
+    def test_parsers_built_once(self):
+        lines = ["Module  Name  Active Errors", "1  foo  0"]
+        StateMachine(_ColumnsTable()).parse(lines)
+        StateMachine(_RegexTable()).parse(lines)
+        columns = _columns_parser.cache_info()
+        regex = _regex_parser.cache_info()
+        StateMachine(_ColumnsTable()).parse(lines)
+        StateMachine(_RegexTable()).parse(lines)
+        self.assertEqual(_columns_parser.cache_info().misses, columns.misses)
+        self.assertEqual(_regex_parser.cache_info().misses, regex.misses)
+
+    def test_check_header_bar(self):
+        sm = StateMachine(_ColumnsTable())
+        sm._lines = ["title", " ---- -- ", "data"]
+        self.assertTrue(sm.check_header_bar(None))
+        self.assertEqual(sm._lines, ["title", "data"])
+        sm._lines = ["title", "==== ==", "data"]
+        self.assertTrue(sm.check_header_bar(None))
+        sm._lines = ["title", "--==", "data"]
+        self.assertFalse(sm.check_header_bar(None))
+        self.assertEqual(len(sm._lines), 3)
+
+    def test_trigger_invalid_state(self):
+        sm = StateMachine(_ColumnsTable())
+        self.assertRaises(MachineError, sm.regex_provided)
+        self.assertEqual(sm.state, "start")
+
+    def test_trigger_conditions_not_met(self):
+        sm = StateMachine(_ColumnsTable())
+        sm._lines = ["nothing to see", "here"]
+        self.assertFalse(sm.column_provided())
+        self.assertEqual(sm.state, "start")
+        self.assertEqual(sm._data, {})
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -7,7 +7,9 @@ import unittest
 from unittest.mock import patch
 
 import nose2
+import yaml
 from jnpr.junos import Device
+from jnpr.junos.factory.factory_loader import FactoryLoader
 from jnpr.junos.factory.table import Table
 from jnpr.junos.op.phyport import PhyPortTable
 from lxml import etree
@@ -119,12 +121,117 @@ class TestFactoryTable(unittest.TestCase):
         self.ppt.get("ge-0/0/0")
         self.assertTrue("ge-0/0/0" in self.ppt)
 
+    @patch("jnpr.junos.Device.execute")
+    def test_table__getitem__index(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        self.ppt.get("ge-0/0/0")
+        self.assertEqual(self.ppt["ge-0/0/1"].name, "ge-0/0/1")
+        index = self.ppt._key_index
+        self.assertEqual(self.ppt["ge-0/0/0"].name, "ge-0/0/0")
+        self.assertEqual(self.ppt["ge-0/0/9"], None)
+        self.assertTrue("ge-0/0/1" in self.ppt)
+        self.assertFalse("ge-0/0/9" in self.ppt)
+        # the index is built once for the table XML
+        self.assertIs(self.ppt._key_index, index)
+
+    @patch("jnpr.junos.Device.execute")
+    def test_table__getitem__index_composite(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        self.ppt.get("ge-0/0/0")
+        self.ppt.ITEM_NAME_XPATH = ["name", "mtu"]
+        self.assertEqual(self.ppt[("ge-0/0/1", "1514")].name, ("ge-0/0/1", "1514"))
+        self.assertEqual(self.ppt[("ge-0/0/1", "9192")], None)
+        self.assertTrue(("ge-0/0/0", "1514") in self.ppt)
+        # partial keys are still looked up with XPath
+        self.assertEqual(self.ppt[("ge-0/0/1", None)].name, ("ge-0/0/1", "1514"))
+
+    @patch("jnpr.junos.Device.execute")
+    def test_table__getitem__index_refresh(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        self.ppt.get("ge-0/0/0")
+        self.assertTrue("ge-0/0/1" in self.ppt)
+        self.ppt.get("ge-0/0/0")
+        self.assertIsNone(self.ppt._key_index)
+        self.ppt.xml = etree.XML("<interface-information/>")
+        self.assertFalse("ge-0/0/1" in self.ppt)
+
     @patch("jnpr.junos.Device.execute")
     def test_table_items(self, mock_execute):
         mock_execute.side_effect = self._mock_manager
         self.ppt.get("ge-0/0/0")
         self.assertEqual(len(self.ppt.items()[1][1]), 8)
 
+    @patch("jnpr.junos.Device.execute")
+    def test_table_to_records(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        self.ppt.get("ge-0/0/0")
+        self.assertEqual(
+            self.ppt.to_records(), [dict(view.items()) for view in self.ppt]
+        )
+
+    @patch("jnpr.junos.Device.execute")
+    def test_table_to_columns_fields(self, mock_execute):
+        mock_execute.side_effect = self._mock_manager
+        self.ppt.get("ge-0/0/0")
+        columns = self.ppt.to_columns(["oper", "mtu"])
+        self.assertEqual(list(columns), ["oper", "mtu"])
+        self.assertEqual(columns["oper"], [view.oper for view in self.ppt])
+        self.assertEqual(columns["mtu"], [view.mtu for view in self.ppt])
+        self.assertRaises(ValueError, self.ppt.to_columns, ["foo"])
+
+    def test_table_to_columns_no_view(self):
+        self.table.xml = etree.XML("<root/>")
+        self.assertRaises(ValueError, self.table.to_columns)
+
+    def test_table_to_columns_groups_flags_eval(self):
+        yaml_data = """
+---
+FooTable:
+  rpc: get-foo-information
+  item: foo
+  key: name
+  view: FooView
+FooView:
+  groups:
+    stats: stats
+    errors: errors
+  fields:
+    descr: description
+    up: { up: flag }
+    mtu: { mtu: int }
+  fields_stats:
+    packets: { packets: int }
+  fields_errors:
+    drops: { drops: int }
+  eval:
+    double: "{{ packets }} * 2"
+"""
+        tables = FactoryLoader().load(yaml.safe_load(yaml_data))
+        tbl = tables["FooTable"](
+            xml=etree.XML(
+                "<foo-information>"
+                "<foo><name>a</name><up/><mtu>1500</mtu>"
+                "<stats><packets>2</packets></stats></foo>"
+                "<foo><name>b</name><description> bar </description>"
+                "<stats><packets>3</packets></stats></foo>"
+                "</foo-information>"
+            )
+        )
+        records = tbl.to_records()
+        self.assertEqual(records, [dict(view.items()) for view in tbl])
+        self.assertEqual(
+            records[1],
+            {
+                "descr": "bar",
+                "up": False,
+                "mtu": None,
+                "packets": 3,
+                "drops": None,
+                "double": 6,
+            },
+        )
+        self.assertEqual(tbl.to_columns(["double"]), {"double": [4, 6]})
+
     def test_table_get_return_none(self):
         self.assertEqual(self.table.get("ge-0/0/0"), None)
 
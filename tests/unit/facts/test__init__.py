@@ -8,6 +8,7 @@ except ImportError:
 
 import importlib
 import sys
+import types
 
 import jnpr.junos.facts
 import nose2
@@ -21,3 +22,41 @@ class TestFactInitialization(unittest.TestCase):
         sys.modules["jnpr.junos.facts.dupe_foo2"] = module
         with self.assertRaises(RuntimeError):
             jnpr.junos.facts._build_fact_callbacks_and_doc_strings()
+
+    def test_dependencies(self):
+        deps = jnpr.junos.facts._dependencies
+        callbacks = jnpr.junos.facts._callbacks
+        self.assertEqual(
+            deps[callbacks["personality"]],
+            set([callbacks["model"], callbacks["re_info"]]),
+        )
+        self.assertEqual(deps[callbacks["serialnumber"]], set())
+
+    def test_dependencies_unknown_fact(self):
+        callbacks = self._callbacks(foo=("bar",))
+        with self.assertRaises(RuntimeError):
+            jnpr.junos.facts._build_fact_dependencies(callbacks)
+
+    def test_dependencies_loop(self):
+        callbacks = self._callbacks(foo=("bar",), bar=("baz",), baz=("foo",))
+        with self.assertRaises(RuntimeError):
+            jnpr.junos.facts._build_fact_dependencies(callbacks)
+
+    def test_dependencies_chain(self):
+        callbacks = self._callbacks(foo=("bar",), bar=("baz",), baz=())
+        deps = jnpr.junos.facts._build_fact_dependencies(callbacks)
+        self.assertEqual(deps[callbacks["foo"]], set([callbacks["bar"]]))
+        self.assertEqual(deps[callbacks["baz"]], set())
+
+    def _callbacks(self, **requires):
+        # A fake fact module providing each fact
+        callbacks = {}
+        for key, required in requires.items():
+            module = types.ModuleType("tests.unit.facts.fake_%s" % key)
+            module.requires_facts = lambda required=required: required
+            module.get_facts = lambda device: {}
+            module.get_facts.__module__ = module.__name__
+            sys.modules[module.__name__] = module
+            self.addCleanup(sys.modules.pop, module.__name__)
+            callbacks[key] = module.get_facts
+        return callbacks
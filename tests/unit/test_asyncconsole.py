@@ -0,0 +1,227 @@
+import asyncio
+import unittest
+from unittest.mock import patch
+
+import nose2
+from jnpr.junos import exception as EzErrors
+from jnpr.junos.asyncconsole import AsyncConsole, ConsoleGroup
+
+_HELLO = """<!-- No zombies were killed during the creation of this user interface -->
+<!-- user root, class super-user -->
+<hello xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+  <capabilities>
+    <capability>urn:ietf:params:netconf:base:1.0</capability>
+  </capabilities>
+  <session-id>%d</session-id>
+</hello>
+]]>]]>
+"""
+
+_SOFTWARE = """<rpc-reply xmlns:junos="http://xml.juniper.net/junos/15.1X49/junos">
+<software-information>
+<host-name>r%d</host-name>
+</software-information>
+</rpc-reply>
+]]>]]>
+"""
+
+
+class _ConsoleServer(object):
+    """
+    terminal server of which every port is the console of a Junos device,
+    logged out and with the password 'password123'
+    """
+
+    def __init__(self):
+        self.sessions = 0
+        self.max_sessions = 0
+        self.received = []
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._session, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    def close(self):
+        self._server.close()
+
+    async def _session(self, reader, writer):
+        self.sessions += 1
+        self.max_sessions = max(self.max_sessions, self.sessions)
+        session_id = self.sessions
+        writer.write(b"\r\nAmnesiac (ttyu0)\r\n\r\nlogin: ")
+        rxb = b""
+        try:
+            while True:
+                data = await reader.read(1024)
+                if not data:
+                    break
+                rxb += data
+                while True:
+                    if rxb.startswith(b"<rpc>"):
+                        if b"</rpc>" not in rxb:
+                            break
+                        line, rxb = rxb.split(b"</rpc>", 1)
+                        line += b"</rpc>"
+                    elif b"\n" in rxb:
+                        line, rxb = rxb.split(b"\n", 1)
+                    else:
+                        break
+                    self.received.append(line)
+                    await self._reply(writer, line.strip(), session_id)
+                await writer.drain()
+        finally:
+            self.sessions -= 1
+            writer.close()
+
+    async def _reply(self, writer, line, session_id):
+        if line == b"root":
+            writer.write(b"Password:")
+        elif line == b"password123":
+            writer.write(b"\r\nroot@r1% ")
+        elif line == b"badpassword":
+            writer.write(b"\r\nLogin incorrect\r\nlogin: ")
+        elif line == b"xml-mode netconf need-trailer":
+            writer.write((_HELLO % session_id).encode())
+        elif line == b"<rpc><get-software-information/></rpc>":
+            writer.write((_SOFTWARE % session_id).encode())
+        elif line == b"<rpc><close-session/></rpc>":
+            writer.write(b"<rpc-reply><ok/></rpc-reply>\n]]>]]>\n")
+            await writer.drain()
+            await asyncio.sleep(0.05)
+            writer.write(b"<!-- session end at 2020-03-18 08:48:25 CDT -->\r\n")
+            writer.write(b"root@r1% ")
+        elif line == b"exit":
+            writer.write(b"\r\nlogin: ")
+
+
+class TestAsyncConsole(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = _ConsoleServer()
+        self.port = await self.server.start()
+
+    async def asyncTearDown(self):
+        self.server.close()
+
+    def _console(self, **kvargs):
+        params = dict(
+            host="127.0.0.1", port=self.port, user="root", password="password123"
+        )
+        params.update(kvargs)
+        return AsyncConsole(baud=0, **params)
+
+    async def test_asyncconsole_open_close(self):
+        async with self._console() as dev:
+            self.assertTrue(dev.connected)
+            self.assertEqual(dev.console._tty.nc._session_id, "1")
+            self.assertTrue(dev.console._tty.at_shell)
+            host = await dev.run(
+                lambda console: console.rpc.get_software_information().findtext(
+                    "host-name"
+                )
+            )
+        self.assertEqual(host, "r1")
+        self.assertFalse(dev.connected)
+        self.assertIn(b"exit", self.server.received)
+
+    async def test_asyncconsole_bad_password(self):
+        dev = self._console(password="badpassword")
+        with self.assertRaises(EzErrors.ConnectAuthError):
+            await dev.open()
+        self.assertFalse(dev.connected)
+
+    async def test_asyncconsole_repr(self):
+        self.assertEqual(
+            repr(self._console()), "AsyncConsole(127.0.0.1:%d)" % self.port
+        )
+        self.assertEqual(
+            repr(AsyncConsole(port="/dev/ttyUSB0", mode="serial")),
+            "AsyncConsole(/dev/ttyUSB0)",
+        )
+
+    async def test_asyncconsole_close_not_connected(self):
+        dev = self._console()
+        await dev.close()
+        self.assertEqual(self.server.received, [])
+
+
+class TestConsoleGroup(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = _ConsoleServer()
+        self.port = await self.server.start()
+
+    async def asyncTearDown(self):
+        self.server.close()
+
+    def _group(self, consoles, **kvargs):
+        return ConsoleGroup(
+            consoles,
+            host="127.0.0.1",
+            user="root",
+            password="password123",
+            baud=0,
+            **kvargs,
+        )
+
+    async def test_console_group_run(self):
+        progress = []
+        group = self._group(
+            [self.port] * 3,
+            max_workers=2,
+            progress=lambda name, state: progress.append(state),
+        )
+        self.assertEqual(group.names, ["127.0.0.1:%d" % self.port] * 3)
+        results = await group.run_async(
+            lambda dev, tag: dev.rpc.get_software_information().findtext(tag),
+            "host-name",
+        )
+        self.assertEqual(
+            [name for name, _ in results], ["127.0.0.1:%d" % self.port] * 3
+        )
+        self.assertEqual(sorted(result for _, result in results), ["r1", "r1", "r2"])
+        # no more than max_workers ports of the terminal server in use
+        self.assertEqual(self.server.max_sessions, 2)
+        self.assertEqual(progress.count("open"), 3)
+        self.assertEqual(progress.count("done"), 3)
+        self.assertEqual(progress[-1], "done")
+        self.assertEqual(repr(group), "ConsoleGroup(3 consoles)")
+
+    async def test_console_group_failures(self):
+        progress = []
+
+        def _report(name, state):
+            progress.append((name, state))
+            raise ValueError("progress failure is not fatal")
+
+        def _func(dev):
+            raise RuntimeError("oops")
+
+        group = self._group(
+            [dict(port=self.port, password="badpassword"), self.port],
+            progress=_report,
+        )
+        with patch("jnpr.junos.asyncconsole.logger") as mock_logger:
+            results = await group.run_async(_func)
+        self.assertIsInstance(results[0][1], EzErrors.ConnectAuthError)
+        self.assertIsInstance(results[1][1], RuntimeError)
+        # the console is logged out of after the failure
+        self.assertIn(b"exit", self.server.received)
+        self.assertEqual(
+            [state for _, state in progress if state in ("done", "failed")],
+            ["failed", "failed"],
+        )
+        self.assertTrue(mock_logger.error.called)
+
+    async def test_console_group_max_workers_invalid(self):
+        self.assertRaises(ValueError, ConsoleGroup, [], max_workers=0)
+
+
+class TestConsoleGroupRun(unittest.TestCase):
+    @patch("jnpr.junos.asyncconsole.ConsoleGroup.run_async")
+    def test_console_group_run_sync(self, mock_run):
+        async def _run(func, *vargs, **kvargs):
+            return [("/dev/ttyUSB0", func(*vargs, **kvargs))]
+
+        mock_run.side_effect = _run
+        group = ConsoleGroup(["/dev/ttyUSB0"], mode="serial")
+        self.assertEqual(group.names, ["/dev/ttyUSB0"])
+        self.assertEqual(group.run(lambda x: x + 1, 1), [("/dev/ttyUSB0", 2)])
@@ -0,0 +1,198 @@
+import asyncio
+import os
+import re
+import unittest
+from unittest.mock import MagicMock, patch
+
+import nose2
+from jnpr.junos import AsyncDevice
+from jnpr.junos import exception as EzErrors
+from lxml import etree
+from ncclient.manager import Manager, make_device_handler
+from ncclient.transport import SSHSession
+
+__author__ = "Stacy Smith"
+__credits__ = "Jeremy Schulman, Nitin Kumar"
+
+_RPC_ERROR = """
+<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+  <rpc-error>
+    <error-type>protocol</error-type>
+    <error-tag>operation-failed</error-tag>
+    <error-severity>%s</error-severity>
+    <error-message>%s</error-message>
+  </rpc-error>
+  <bgp-information/>
+</rpc-reply>
+"""
+
+
+class TestAsyncDevice(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.replies = {}
+        with patch("ncclient.manager.connect") as mock_connect:
+            mock_connect.side_effect = self._mock_manager
+            self.dev = AsyncDevice(
+                host="1.1.1.1", user="test", password="password123", gather_facts=False
+            )
+            await self.dev.open()
+        self.session = self.dev.device._conn._session
+        self.session.send = MagicMock(side_effect=self._mock_send)
+
+    async def test_asyncdevice_console_not_supported(self):
+        self.assertRaises(ValueError, AsyncDevice, host="1.1.1.1", port=23)
+
+    async def test_asyncdevice_repr(self):
+        self.assertEqual(repr(self.dev), "AsyncDevice(1.1.1.1)")
+
+    async def test_asyncdevice_rpc(self):
+        rsp = await self.dev.rpc.get_system_uptime_information()
+        self.assertEqual(rsp.tag, "system-uptime-information")
+
+    async def test_asyncdevice_rpc_args(self):
+        await self.dev.rpc.get_system_uptime_information(detail=True)
+        rpc = etree.XML(self.session.send.call_args[0][0].encode())
+        self.assertEqual(rpc[0][0].tag, "detail")
+
+    async def test_asyncdevice_execute_concurrent(self):
+        rsps = await asyncio.gather(
+            self.dev.rpc.get_system_uptime_information(),
+            self.dev.rpc.get_software_information(),
+            self.dev.execute("<get-route-engine-information/>"),
+        )
+        self.assertEqual(
+            [rsp.tag for rsp in rsps],
+            [
+                "system-uptime-information",
+                "software-information",
+                "route-engine-information",
+            ],
+        )
+
+    async def test_asyncdevice_execute_topy(self):
+        rsp = await self.dev.execute(
+            "<get-system-uptime-information/>", to_py=lambda dev, rsp, **kvargs: rsp.tag
+        )
+        self.assertEqual(rsp, "system-uptime-information")
+
+    async def test_asyncdevice_execute_normalize(self):
+        rsp = await self.dev.rpc.get_system_uptime_information(normalize=True)
+        self.assertEqual(rsp.findtext(".//time-source"), "NTP CLOCK")
+        rsp = await self.dev.rpc.get_system_uptime_information()
+        self.assertEqual(rsp.findtext(".//time-source"), " NTP CLOCK ")
+
+    async def test_asyncdevice_execute_rpc_error(self):
+        self.replies["get-bgp-summary-information"] = _RPC_ERROR % (
+            "error",
+            "syntax error",
+        )
+        with self.assertRaises(EzErrors.RpcError) as cm:
+            await self.dev.rpc.get_bgp_summary_information()
+        self.assertEqual(cm.exception.message, "syntax error")
+
+    async def test_asyncdevice_execute_permission_error(self):
+        self.replies["get-bgp-summary-information"] = _RPC_ERROR % (
+            "error",
+            "permission denied",
+        )
+        with self.assertRaises(EzErrors.PermissionError):
+            await self.dev.rpc.get_bgp_summary_information()
+
+    async def test_asyncdevice_execute_ignore_warning(self):
+        self.replies["get-bgp-summary-information"] = _RPC_ERROR % (
+            "warning",
+            "bgp subsystem not running",
+        )
+        with self.assertRaises(EzErrors.RpcError):
+            await self.dev.rpc.get_bgp_summary_information()
+        rsp = await self.dev.rpc.get_bgp_summary_information(
+            ignore_warning="subsystem not running"
+        )
+        self.assertEqual(rsp.tag, "bgp-information")
+
+    async def test_asyncdevice_execute_timeout(self):
+        self.session.send = MagicMock()
+        with self.assertRaises(EzErrors.RpcTimeoutError) as cm:
+            await self.dev.rpc.get_system_uptime_information(dev_timeout=0.01)
+        self.assertEqual(cm.exception.timeout, 0.01)
+
+    async def test_asyncdevice_execute_raw(self):
+        rsp = await self.dev.rpc.get_system_uptime_information(raw=True)
+        self.assertIsInstance(rsp, str)
+        self.assertTrue(rsp.startswith("<rpc-reply"))
+
+    async def test_asyncdevice_execute_observed(self):
+        samples = []
+        self.dev.device.add_rpc_observer(samples.append)
+        await self.dev.rpc.get_system_uptime_information()
+        self.session.send = MagicMock()
+        with self.assertRaises(EzErrors.RpcTimeoutError):
+            await self.dev.rpc.get_system_uptime_information(dev_timeout=0.01)
+        self.assertEqual([sample.outcome for sample in samples], ["ok", "timeout"])
+        self.assertGreater(samples[0].reply_bytes, 0)
+        self.assertGreaterEqual(samples[0].transform_time, 0)
+
+    async def test_asyncdevice_execute_closed(self):
+        self.dev.device.connected = False
+        with self.assertRaises(EzErrors.ConnectClosedError):
+            await self.dev.rpc.get_system_uptime_information()
+
+    async def test_asyncdevice_get_config(self):
+        rsp = await self.dev.rpc.get_config()
+        self.assertEqual(rsp.tag, "configuration")
+        rpc = etree.XML(self.session.send.call_args[0][0].encode())
+        self.assertEqual(rpc[0].tag, "get-configuration")
+
+    async def test_asyncdevice_pipeline(self):
+        self.replies["get-bgp-summary-information"] = _RPC_ERROR % (
+            "error",
+            "syntax error",
+        )
+        rsps = await self.dev.rpc.pipeline(
+            [
+                "<get-software-information/>",
+                "<get-bgp-summary-information/>",
+            ],
+            return_exceptions=True,
+        )
+        self.assertEqual(rsps[0].tag, "software-information")
+        self.assertIsInstance(rsps[1], EzErrors.RpcError)
+
+    async def test_asyncdevice_cli(self):
+        self.replies["command"] = "<rpc-reply><output>\nfoo bar\n</output></rpc-reply>"
+        self.assertEqual(await self.dev.cli("show foo", warning=False), "\nfoo bar\n")
+
+    async def test_asyncdevice_close(self):
+        with patch("ncclient.operations.session.CloseSession.request"):
+            await self.dev.close()
+        self.assertFalse(self.dev.connected)
+        self.assertIsNone(self.dev._listener)
+
+    @patch("jnpr.junos.device.Device.facts_refresh")
+    async def test_asyncdevice_facts_refresh(self, mock_refresh):
+        self.dev.device.facts._cache = {"hostname": "foo"}
+        self.dev.device.facts._callbacks = {"hostname": None}
+        await self.dev.facts_refresh(keys="hostname")
+        mock_refresh.assert_called_once_with(
+            exception_on_failure=False, warnings_on_failure=None, keys="hostname"
+        )
+
+    def _mock_send(self, message):
+        rpc = etree.XML(message.encode())
+        tag = etree.QName(rpc[0]).localname
+        if tag in self.replies:
+            foo = self.replies[tag]
+        else:
+            fpath = os.path.join(os.path.dirname(__file__), "rpc-reply", tag + ".xml")
+            with open(fpath) as fp:
+                foo = fp.read()
+        foo = re.sub(
+            "<rpc-reply", '<rpc-reply message-id="%s"' % rpc.get("message-id"), foo, 1
+        )
+        self.session._dispatch_message(foo)
+
+    def _mock_manager(self, *args, **kwargs):
+        device_params = kwargs["device_params"]
+        device_handler = make_device_handler(device_params)
+        session = SSHSession(device_handler)
+        return Manager(session, device_handler)
@@ -4,7 +4,6 @@ except ImportError:
     import unittest
 
 import os
-import re
 import socket
 import sys
 from unittest.mock import MagicMock, call, patch
@@ -35,22 +34,14 @@ class TestConsole(unittest.TestCase):
         tty_netconf.open = cls.open
 
     @patch("jnpr.junos.transport.tty_telnet.Telnet._tty_open")
-    @patch("jnpr.junos.transport.tty_telnet.telnetlib.Telnet.expect")
+    @patch("jnpr.junos.transport.tty_telnet.Telnet._tty_recv")
     @patch("jnpr.junos.transport.tty_telnet.Telnet.write")
     def setUp(self, mock_write, mock_expect, mock_open):
         tty_netconf.open = MagicMock()
         mock_expect.side_effect = [
-            (1, re.search(r"(?P<login>ogin:\s*$)", "login: "), six.b("\r\r\n ogin:")),
-            (
-                2,
-                re.search(r"(?P<passwd>assword:\s*$)", "password: "),
-                six.b("\r\r\n password:"),
-            ),
-            (
-                3,
-                re.search(r"(?P<shell>%|#\s*$)", "junos % "),
-                six.b("\r\r\nroot@device:~ # "),
-            ),
+            six.b("\r\r\n ogin:"),
+            six.b("\r\r\n password:"),
+            six.b("\r\r\nroot@device:~ # "),
         ]
         self.dev = Console(host="1.1.1.1", user="lab", password="lab123", mode="Telnet")
         self.dev.open()
@@ -82,45 +73,29 @@ class TestConsole(unittest.TestCase):
         )
 
     @patch("jnpr.junos.transport.tty_telnet.Telnet._tty_open")
-    @patch("jnpr.junos.transport.tty_telnet.telnetlib.Telnet.expect")
+    @patch("jnpr.junos.transport.tty_telnet.Telnet._tty_recv")
     @patch("jnpr.junos.transport.tty_telnet.Telnet.write")
     def test_login_bad_password(self, mock_write, mock_expect, mock_open):
         tty_netconf.open = MagicMock()
         mock_expect.side_effect = [
-            (1, re.search(r"(?P<login>ogin:\s*$)", "login: "), six.b("\r\r\n ogin:")),
-            (
-                2,
-                re.search(r"(?P<passwd>assword:\s*$)", "password: "),
-                six.b("\r\r\n password:"),
-            ),
-            (
-                3,
-                re.search("(?P<badpasswd>ogin incorrect)", "login incorrect"),
-                six.b("\r\r\nlogin incorrect"),
-            ),
+            six.b("\r\r\n ogin:"),
+            six.b("\r\r\n password:"),
+            six.b("\r\r\nlogin incorrect"),
         ]
         self.dev = Console(host="1.1.1.1", user="lab", password="lab123", mode="Telnet")
         self.assertRaises(StopIteration, self.dev.open)
 
     @patch("jnpr.junos.console.Console._tty_logout")
     @patch("jnpr.junos.transport.tty_telnet.Telnet._tty_open")
-    @patch("jnpr.junos.transport.tty_telnet.telnetlib.Telnet.expect")
+    @patch("jnpr.junos.transport.tty_telnet.Telnet._tty_recv")
     @patch("jnpr.junos.transport.tty_telnet.Telnet.write")
     def test_with_context(self, mock_write, mock_expect, mock_open, mock_logout):
         tty_netconf.open = MagicMock()
 
         mock_expect.side_effect = [
-            (1, re.search(r"(?P<login>ogin:\s*$)", "login: "), six.b("\r\r\n ogin:")),
-            (
-                2,
-                re.search(r"(?P<passwd>assword:\s*$)", "password: "),
-                six.b("\r\r\n password:"),
-            ),
-            (
-                3,
-                re.search(r"(?P<shell>%|#\s*$)", "junos % "),
-                six.b("\r\r\nroot@device:~ # "),
-            ),
+            six.b("\r\r\n ogin:"),
+            six.b("\r\r\n password:"),
+            six.b("\r\r\nroot@device:~ # "),
         ]
         with Console(
             host="1.1.1.1", user="lab", password="lab123", mode="Telnet"
@@ -170,7 +145,7 @@ class TestConsole(unittest.TestCase):
             self.assertRaises(ValueError, self.dev.open)
 
     @patch("jnpr.junos.transport.tty_serial.Serial._tty_open")
-    @patch("jnpr.junos.transport.tty_serial.serial.Serial.readline")
+    @patch("jnpr.junos.transport.tty_serial.Serial._tty_recv")
     @patch("jnpr.junos.transport.tty_serial.Serial.write")
     def test_console_serial(self, mock_write, mock_expect, mock_open):
         tty_netconf.open = MagicMock()
@@ -198,7 +173,7 @@ class TestConsole(unittest.TestCase):
         self.dev.zeroize()
         self.assertTrue(mock_zeroize.called)
 
-    @patch("jnpr.junos.transport.tty_netconf.tty_netconf.rpc")
+    @patch("jnpr.junos.transport.tty_netconf.tty_netconf.rpc_reply")
     @patch("jnpr.junos.console.FACT_LIST")
     @patch("jnpr.junos.device.warnings")
     def test_console_gather_facts(self, mock_warnings, mock_fact_list, mock_rpc):
@@ -235,14 +210,9 @@ class TestConsole(unittest.TestCase):
         )
 
     @patch("jnpr.junos.transport.tty.sleep")
-    @patch("ncclient.operations.rpc.RPCReply.parse")
     @patch("jnpr.junos.transport.tty_telnet.telnetlib.Telnet.write")
-    @patch("jnpr.junos.transport.tty_netconf.select.select")
-    @patch("jnpr.junos.transport.tty_telnet.telnetlib.Telnet.read_until")
-    def test_load_console(
-        self, mock_read_until, mock_select, mock_write, mock_parse, mock_sleep
-    ):
-        mock_select.return_value = ([self.dev._tty._rx], [], [])
+    @patch("jnpr.junos.transport.tty_telnet.Telnet._tty_recv")
+    def test_load_console(self, mock_recv, mock_write, mock_sleep):
         xml = """<policy-options>
                   <policy-statement>
                     <name>F5-in</name>
@@ -258,7 +228,7 @@ class TestConsole(unittest.TestCase):
                 </policy-statement>
                 </policy-options>"""
 
-        mock_read_until.return_value = six.b(
+        mock_recv.return_value = six.b(
             """
         <rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" xmlns:junos="http://xml.juniper.net/junos/15.2I0/junos">
             <load-configuration-results>
@@ -271,19 +241,52 @@ class TestConsole(unittest.TestCase):
         op = cu.load(xml, format="xml")
         cu.commit()
 
-    @patch("ncclient.operations.rpc.RPCReply.parse")
-    @patch("jnpr.junos.transport.tty_netconf.tty_netconf._receive")
-    @patch("jnpr.junos.transport.tty_telnet.Telnet.rawwrite")
-    def test_console_rpc_call(self, mock_write, mock_rcv, mock_parse):
-        self.dev._tty.nc.rpc = MagicMock(side_effect=self._mock_manager)
+    def test_console_rpc_call(self):
+        self.dev._tty.nc.rpc_reply = MagicMock(side_effect=self._mock_manager)
         op = self.dev.rpc.get_chassis_inventory()
         self.assertEqual(op.tag, "chassis-inventory")
 
-    @patch("ncclient.operations.rpc.RPCReply.parse")
-    @patch("jnpr.junos.transport.tty_netconf.tty_netconf._receive")
+    def test_console_rpc_raw(self):
+        self.dev._tty.nc.rpc_reply = MagicMock(side_effect=self._mock_manager)
+        rsp = self.dev.rpc.get_chassis_inventory(raw=True)
+        self.assertEqual(rsp, self._read_file("get-chassis-inventory.xml"))
+
+    def test_console_rpc_xslt_cached(self):
+        self.dev._tty.nc.rpc_reply = MagicMock(side_effect=self._mock_manager)
+        with patch("jnpr.junos.console.etree.XSLT", wraps=etree.XSLT) as mock_xslt:
+            self.dev.rpc.get_chassis_inventory()
+            op = self.dev.rpc.get_chassis_inventory()
+        self.assertEqual(mock_xslt.call_count, 1)
+        self.assertEqual(op.tag, "chassis-inventory")
+
+    def test_console_rpc_transform_function(self):
+        self.dev._tty.nc.rpc_reply = MagicMock(side_effect=self._mock_manager)
+        # the reply is handed over parsed, namespaces untouched
+        self.dev.transform = lambda: lambda rsp: rsp
+        op = self.dev.rpc.get_chassis_inventory()
+        self.assertEqual(
+            op.tag,
+            "{http://xml.juniper.net/junos/12.1X46/junos-chassis}chassis-inventory",
+        )
+
+    def test_console_rpc_observed(self):
+        samples = []
+        self.dev.add_rpc_observer(samples.append)
+        self.dev._tty.nc.rpc_reply = MagicMock(side_effect=self._mock_manager)
+        self.dev.rpc.get_chassis_inventory()
+        (sample,) = samples
+        self.assertEqual(sample.rpc, "get-chassis-inventory")
+        self.assertEqual(sample.outcome, "ok")
+        self.assertEqual(
+            sample.reply_bytes, len(self._read_file("get-chassis-inventory.xml"))
+        )
+        self.assertGreaterEqual(sample.transform_time, 0)
+        self.assertIsNone(sample.parse_time)
+
+    @patch("jnpr.junos.transport.tty_netconf.tty_netconf._read_message")
     @patch("jnpr.junos.transport.tty_telnet.Telnet.rawwrite")
-    def test_console_rpc_call_exception(self, mock_write, mock_rcv, mock_parse):
-        mock_rcv.return_value = "<output>testing</output>"
+    def test_console_rpc_call_exception(self, mock_write, mock_rcv):
+        mock_rcv.return_value = six.b("<output>testing</output>")
         op = self.dev.rpc.get_chassis_inventory()
         self.assertEqual(op.tag, "output")
 
@@ -294,7 +297,9 @@ class TestConsole(unittest.TestCase):
     # below 2 function will be used in future.
     def _mock_manager(self, *args, **kwargs):
         if args:
-            return self._read_file(etree.XML(args[0]).tag + ".xml")
+            rsp = self._read_file(etree.XML(args[0]).tag + ".xml")
+            parser = etree.XMLParser(remove_blank_text=True)
+            return rsp, etree.XML(rsp.encode(), parser)
 
     def _read_file(self, fname):
         from ncclient.xml_ import NCElement
@@ -16,6 +16,7 @@ from jnpr.junos.exception import ConfigLoadError, RpcError
 from jnpr.junos.utils.config import Config
 from lxml.etree import XML
 from ncclient.manager import Manager, make_device_handler
+from ncclient.operations import RaiseMode
 from ncclient.operations.rpc import RPCError
 from ncclient.transport import SSHSession
 from ncclient.xml_ import qualify
@@ -174,6 +175,22 @@ class Test_Decorators(unittest.TestCase):
             decorator(self.dev, normalize=False)
             self.assertFalse(mock_transform.called)
 
+    # Test passing true keyword to a function taking the transform
+    def test_normalize_false_true_transform(self):
+        with patch(
+            "jnpr.junos.Device.transform", new_callable=PropertyMock
+        ) as mock_transform:
+            self.dev._normalize = False
+
+            def function(x, transform=None):
+                return transform
+
+            decorator = normalizeDecorator(function)
+            self.assertEqual(
+                decorator(self.dev, normalize=True), self.dev._norm_transform
+            )
+            self.assertFalse(mock_transform.called)
+
     # Test default with ignore_warning not present.
     def test_ignore_warning_missing(self):
         def method(self, x):
@@ -263,6 +280,42 @@ class Test_Decorators(unittest.TestCase):
         with self.assertRaises(ConfigLoadError):
             cu.load(config, ignore_warning="foo")
 
+    # Test with ignore_warning=True and the transform of normalize=True.
+    def test_ignore_warning_transform(self):
+        def method(dev, x, transform=None):
+            self._mock_manager_spaced_warning()
+
+        decorator = ignoreWarnDecorator(method)
+        for kwargs in (
+            dict(transform=self.dev._norm_transform),
+            dict(),
+        ):
+            rsp = decorator(self.dev, "foo", ignore_warning=True, **kwargs)
+            self.assertEqual(rsp.tag, "rpc-reply")
+            self.assertIsNone(rsp.find(".//rpc-error"))
+            self.assertEqual(
+                rsp.findtext(".//name"),
+                "spaced" if kwargs else "\n   spaced\n",
+            )
+        # as passed by _RpcBatch and AsyncDevice to _rpc_collect()
+        rsp = decorator(self.dev, "foo", self.dev._norm_transform, ignore_warning=True)
+        self.assertEqual(rsp.findtext(".//name"), "spaced")
+
+    # Test with normalize=True and ignore_warning=True executing an RPC.
+    def test_ignore_warning_normalize(self):
+        op = MagicMock()
+        op.error = None
+        try:
+            self._mock_manager_spaced_warning()
+        except RPCError as ex:
+            op.reply.error = ex
+            op.reply.errors = ex.errors
+        op.reply._raw = "<rpc-error/>"
+        self.dev._conn.raise_mode = RaiseMode.ALL
+        with patch.object(self.dev, "_rpc_send", return_value=op):
+            rsp = self.dev.rpc.get_vrrp_information(normalize=True, ignore_warning=True)
+        self.assertEqual(rsp.findtext("name"), "spaced")
+
     # Test with ignore_warning=['foo', 'bar], and
     # three statement not found warnings.
     def test_ignore_warning_list_3snf_no_match(self):
@@ -308,6 +361,16 @@ class Test_Decorators(unittest.TestCase):
             session = SSHSession(device_handler)
             return Manager(session, device_handler)
 
+    def _mock_manager_spaced_warning(self, *args, **kwargs):
+        rsp = XML(
+            '<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">'
+            "<rpc-error><error-severity>warning</error-severity>"
+            "<error-message>vrrp subsystem not running</error-message>"
+            "</rpc-error><vrrp-information><name>\n   spaced\n</name>"
+            "</vrrp-information></rpc-reply>"
+        )
+        raise RPCError(rsp, errs=[RPCError(rsp.find(qualify("rpc-error")))])
+
     def _mock_manager_3snf_warnings(self, *args, **kwargs):
         cmd = """
         <load-configuration action="set" format="text">
@@ -6,10 +6,12 @@ from jnpr.junos.exception import (
     CommitError,
     ConfigLoadError,
     ConnectError,
+    FleetTimeoutError,
     JSONLoadError,
     RpcError,
     RpcTimeoutError,
     SwRollbackError,
+    SwUpgradeError,
 )
 from lxml import etree
 
@@ -147,6 +149,19 @@ class Test_RpcError(unittest.TestCase):
         err = "SwRollbackError(re: test1, output: Multi RE exception)"
         self.assertEqual(obj.__repr__(), err)
 
+    def test_SwUpgradeError(self):
+        obj = SwUpgradeError("copy", "package junos.tgz couldn't be copied")
+        self.assertEqual(str(obj), "copy: package junos.tgz couldn't be copied")
+        self.assertEqual(
+            repr(obj),
+            "SwUpgradeError(stage: copy, msg: package junos.tgz couldn't be copied)",
+        )
+
+    def test_FleetTimeoutError(self):
+        obj = FleetTimeoutError("r1", 30)
+        self.assertEqual(str(obj), "r1: no result within 30 seconds")
+        self.assertEqual(repr(obj), "FleetTimeoutError(host: r1, deadline: 30)")
+
     def test_repr_multi_warning(self):
         rsp = etree.XML(multi_warning_xml)
         from ncclient.operations import RPCError
@@ -3,11 +3,14 @@ try:
 except ImportError:
     import unittest
 
+import threading
+import time
 from unittest.mock import MagicMock, call, patch
 
 import nose2
 from jnpr.junos import Device
 from jnpr.junos.exception import FactLoopError
+from lxml import etree
 from ncclient.manager import Manager, make_device_handler
 from ncclient.transport import SSHSession
 
@@ -255,6 +258,224 @@ class TestFactCache(unittest.TestCase):
         #                              'exception_on_failure=True)"',
         #                              RuntimeWarning)
 
+    def test_factcache_gather_dependencies(self):
+        lock = threading.Lock()
+        events = []
+
+        def callback(key, value):
+            def get_facts(device):
+                with lock:
+                    events.append("start " + key)
+                time.sleep(0.01)
+                with lock:
+                    events.append("end " + key)
+                return {key: value(device)}
+
+            return get_facts
+
+        callbacks = {
+            "foo": callback("foo", lambda dev: "foo"),
+            "bar": callback("bar", lambda dev: "bar"),
+            "foobar": callback(
+                "foobar", lambda dev: dev.facts["foo"] + dev.facts["bar"]
+            ),
+        }
+        self.dev.facts._callbacks = callbacks
+        self.dev.facts._dependencies = {
+            callbacks["foobar"]: set([callbacks["foo"], callbacks["bar"]])
+        }
+        self.dev.facts._refresh()
+        self.assertEqual(
+            str(self.dev.facts), "{'bar': 'bar', 'foo': 'foo', 'foobar': 'foobar'}"
+        )
+        # foo and bar are gathered concurrently, before foobar
+        self.assertEqual(set(events[:2]), set(["start foo", "start bar"]))
+        self.assertEqual(events[-2:], ["start foobar", "end foobar"])
+
+    def test_factcache_gather_normalize(self):
+        # A normalized fact does not swap the transform of the device under
+        # the RPCs of the facts gathered concurrently.
+        transform = self.dev.transform
+        barrier = threading.Barrier(2, timeout=5)
+        transforms = {}
+
+        def rpc_reply(rpc_cmd_e, **kwargs):
+            barrier.wait()
+            transforms[rpc_cmd_e.tag] = (kwargs.get("transform"), self.dev.transform)
+            return etree.XML("<rpc-reply><output/></rpc-reply>")
+
+        def get_normalized_fact(device):
+            device.rpc.get_foo_information(normalize=True)
+            return {"foo": "foo"}
+
+        def get_raw_fact(device):
+            device.rpc.get_bar_information()
+            return {"bar": "bar"}
+
+        self.dev.facts._callbacks = {"foo": get_normalized_fact, "bar": get_raw_fact}
+        self.dev.facts._dependencies = {}
+        self.dev.facts._refresh()
+        with patch.object(self.dev, "_rpc_reply", side_effect=rpc_reply):
+            self.assertEqual(str(self.dev.facts), "{'bar': 'bar', 'foo': 'foo'}")
+        self.assertEqual(
+            transforms,
+            {
+                "get-foo-information": (self.dev._norm_transform, transform),
+                "get-bar-information": (None, transform),
+            },
+        )
+        self.assertEqual(self.dev.transform, transform)
+
+    def test_factcache_gather_exception_on_failure(self):
+        self.dev.facts._callbacks = {
+            "foo": get_foo_fact,
+            "bar": get_foo_raise_error,
+        }
+        self.dev.facts._dependencies = {}
+        with self.assertRaises(ValueError):
+            self.dev.facts._refresh(exception_on_failure=True)
+        self.assertFalse(self.dev.facts._exception_on_failure)
+
+    def test_factcache_gather_console(self):
+        # devices without concurrent RPCs gather on demand
+        self.dev.facts._device = MagicMock(spec=["facts", "_fact_style"])
+        self.dev.facts._callbacks = {"foo": get_foo_fact, "bar": get_bar_fact}
+        self.dev.facts._device._fact_style = "new"
+        self.dev.facts._refresh()
+        with patch("jnpr.junos.factcache.ThreadPoolExecutor") as mock_pool:
+            self.assertEqual(str(self.dev.facts), "{'bar': 'bar', 'foo': 'foo'}")
+        mock_pool.assert_not_called()
+
+    def test_factcache_store_saved_on_close(self):
+        store = self._store_setup()
+        self.assertEqual(self.dev.facts["foo"], "foo")
+        self.assertEqual(self.dev.facts["bar"], "bar")
+        store.set.assert_not_called()
+        with patch.object(self.dev, "_conn"):
+            self.dev.close()
+        store.set.assert_called_once_with(
+            "1.1.1.1:830",
+            {
+                "fingerprint": ["booted", "commit"],
+                "facts": {"foo": "foo", "bar": "bar"},
+            },
+        )
+
+    def test_factcache_store_saved_once_per_gather(self):
+        store = self._store_setup()
+        self.dev.facts._refresh(warnings_on_failure=True)
+        store.set.assert_called_once()
+        self.assertEqual(
+            store.set.call_args[0][1]["facts"], {"foo": "foo", "bar": "bar"}
+        )
+        # Nothing left to write
+        self.dev.facts._flush()
+        store.set.assert_called_once()
+
+    def test_factcache_store_hit(self):
+        store = self._store_setup()
+        store.get.return_value = {
+            "fingerprint": ["booted", "commit"],
+            "facts": {"foo": "stored", "bar": "stored"},
+        }
+        self.assertEqual(self.dev.facts["foo"], "stored")
+        self.assertEqual(self.dev.facts["bar"], "stored")
+        store.get.assert_called_once_with("1.1.1.1:830")
+        store.set.assert_not_called()
+        self.dev.rpc.get_system_uptime_information.assert_called_once_with(
+            normalize=True
+        )
+
+    def test_factcache_store_outdated(self):
+        store = self._store_setup()
+        store.get.return_value = {
+            "fingerprint": ["rebooted", "commit"],
+            "facts": {"foo": "stored"},
+        }
+        self.assertEqual(self.dev.facts["foo"], "foo")
+        self.dev.facts._flush()
+        store.set.assert_called_once()
+
+    def test_factcache_store_failed_fact_not_saved(self):
+        store = self._store_setup()
+        self.dev.facts._callbacks["bar"] = get_foo_raise_error
+        self.assertIsNone(self.dev.facts["bar"])
+        self.assertEqual(self.dev.facts["foo"], "foo")
+        self.dev.facts._flush()
+        self.assertEqual(store.set.call_args[0][1]["facts"], {"foo": "foo"})
+
+    def test_factcache_store_unavailable(self):
+        store = self._store_setup()
+        store.get.side_effect = IOError("disk full")
+        self.assertEqual(self.dev.facts["foo"], "foo")
+        self.dev.facts._flush()
+        store.set.assert_not_called()
+
+    def test_factcache_store_refresh(self):
+        store = self._store_setup()
+        store.get.return_value = {
+            "fingerprint": ["booted", "commit"],
+            "facts": {"foo": "stored", "bar": "stored"},
+        }
+        self.assertEqual(self.dev.facts["foo"], "stored")
+        # Refreshing a single fact gathers it from the device
+        self.dev.facts._refresh(keys="foo")
+        self.assertEqual(self.dev.facts["foo"], "foo")
+        self.assertEqual(store.get.call_count, 1)
+        # Refreshing all of the facts consults the store again
+        self.dev.facts._refresh()
+        self.assertEqual(self.dev.facts["foo"], "stored")
+        self.assertEqual(store.get.call_count, 2)
+
+    @patch("ncclient.manager.connect")
+    def test_factcache_store_key_port(self, mock_connect):
+        # two devices behind the same address do not share their facts
+        store = self._store_setup()
+        store.get.return_value = {
+            "fingerprint": ["booted", "commit"],
+            "facts": {"foo": "stored"},
+        }
+        self.assertEqual(self.dev.facts["foo"], "stored")
+        mock_connect.side_effect = self._mock_manager_setup
+        dev = Device(
+            host="1.1.1.1",
+            port=2201,
+            user="rick",
+            password="password123",
+            fact_store=store,
+        )
+        dev.open()
+        dev.facts._callbacks = {"foo": get_foo_fact}
+        dev.rpc = self.dev.rpc
+        store.get.side_effect = lambda key: (
+            None if key == "1.1.1.1:2201" else store.get.return_value
+        )
+        self.assertEqual(dev.facts["foo"], "foo")
+        dev.facts._flush()
+        store.set.assert_called_once_with(
+            "1.1.1.1:2201",
+            {"fingerprint": ["booted", "commit"], "facts": {"foo": "foo"}},
+        )
+        self.assertEqual(
+            [c[0][0] for c in store.get.call_args_list], ["1.1.1.1:830", "1.1.1.1:2201"]
+        )
+
+    def _store_setup(self):
+        store = MagicMock()
+        store.get.return_value = None
+        self.dev.facts._store = store
+        self.dev.facts._refresh()
+        self.dev.facts._callbacks = {"foo": get_foo_fact, "bar": get_bar_fact}
+        self.dev.rpc = MagicMock()
+        self.dev.rpc.get_system_uptime_information.return_value = etree.XML(
+            "<system-uptime-information>"
+            "<system-booted-time><date-time>booted</date-time></system-booted-time>"
+            "<last-configured-time><date-time>commit</date-time>"
+            "</last-configured-time>"
+            "</system-uptime-information>"
+        )
+        return store
+
     def _mock_manager_setup(self, *args, **kwargs):
         if kwargs:
             device_params = kwargs["device_params"]
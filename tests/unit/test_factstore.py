@@ -0,0 +1,80 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import nose2
+from jnpr.junos.facts.swver import version_info
+from jnpr.junos.factstore import JsonFactStore, SqliteFactStore
+
+__author__ = "Stacy Smith"
+__credits__ = "Jeremy Schulman, Nitin Kumar"
+
+
+class _FactStoreTests(object):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.store = self._store()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_factstore_missing(self):
+        self.assertIsNone(self.store.get("1.1.1.1"))
+
+    def test_factstore_roundtrip(self):
+        facts = {
+            "version": "15.1R1.9",
+            "version_info": version_info("15.1R1.9"),
+            "current_re": ["re0", "master"],
+            "RE0": {"up_time": "3 hours", "model": "RE-VMX"},
+            "2RE": False,
+            "domain": None,
+        }
+        self.store.set("1.1.1.1", {"fingerprint": ["a", "b"], "facts": facts})
+        record = self.store.get("1.1.1.1")
+        self.assertEqual(record["fingerprint"], ["a", "b"])
+        self.assertEqual(record["facts"]["RE0"], facts["RE0"])
+        self.assertEqual(record["facts"]["current_re"], ["re0", "master"])
+        ver = record["facts"]["version_info"]
+        self.assertEqual(ver.major, (15, 1))
+        self.assertTrue(ver >= (15, 1))
+        self.assertEqual(repr(ver), repr(facts["version_info"]))
+
+    def test_factstore_overwrite_delete(self):
+        self.store.set("1.1.1.1", {"facts": {"foo": 1}})
+        self.store.set("1.1.1.1", {"facts": {"foo": 2}})
+        self.assertEqual(self.store.get("1.1.1.1")["facts"], {"foo": 2})
+        self.store.delete("1.1.1.1")
+        self.assertIsNone(self.store.get("1.1.1.1"))
+        self.store.delete("1.1.1.1")
+
+    def test_factstore_ttl(self):
+        self.store.set("1.1.1.1", {"facts": {}})
+        with patch("jnpr.junos.factstore.time.time", return_value=time.time() + 60):
+            self.assertIsNotNone(self.store.get("1.1.1.1"))
+            self.store.ttl = 30
+            self.assertIsNone(self.store.get("1.1.1.1"))
+            self.store.ttl = None
+            self.assertIsNotNone(self.store.get("1.1.1.1"))
+
+
+class TestJsonFactStore(_FactStoreTests, unittest.TestCase):
+    def _store(self):
+        return JsonFactStore(os.path.join(self.tmpdir, "facts"))
+
+    def test_factstore_json_file_name(self):
+        self.store.set("fe80::1%eth0", {"facts": {}})
+        self.assertEqual(os.listdir(self.store.path), ["fe80__1_eth0.json"])
+
+
+class TestSqliteFactStore(_FactStoreTests, unittest.TestCase):
+    def _store(self):
+        return SqliteFactStore(os.path.join(self.tmpdir, "facts.db"))
+
+    def test_factstore_sqlite_shared(self):
+        self.store.set("1.1.1.1", {"facts": {"foo": 1}})
+        other = SqliteFactStore(self.store.path)
+        self.assertEqual(other.get("1.1.1.1")["facts"], {"foo": 1})
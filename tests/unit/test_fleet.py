@@ -0,0 +1,205 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, call, patch
+
+import nose2
+from jnpr.junos.exception import ConnectAuthError, FleetTimeoutError, RpcError
+from jnpr.junos.fleet import Fleet
+
+__author__ = "Nitin Kumar"
+__credits__ = "Jeremy Schulman"
+
+
+class TestFleet(unittest.TestCase):
+    def setUp(self):
+        self.hosts = ["r%d" % i for i in range(20)]
+        self.fleet = Fleet(self.hosts, user="test", passwd="password123")
+
+    def _mock_device(self, **kvargs):
+        dev = MagicMock(name=kvargs["host"])
+        dev.hostname = kvargs["host"]
+        dev.kvargs = kvargs
+        dev.connected = True
+        dev.rpc.get_software_information.return_value = kvargs["host"]
+        return dev
+
+    def test_fleet_hostnames(self):
+        fleet = Fleet(["r1", {"host": "r2", "port": 22}])
+        self.assertEqual(fleet.hostnames, ["r1", "r2"])
+        self.assertEqual(repr(fleet), "Fleet(2 devices)")
+
+    def test_fleet_max_workers_invalid(self):
+        self.assertRaises(ValueError, Fleet, self.hosts, max_workers=0)
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_rpc(self, mock_device):
+        mock_device.side_effect = self._mock_device
+        results = dict(self.fleet.rpc.get_software_information())
+        self.assertEqual(results, dict((host, host) for host in self.hosts))
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_rpc_opens_and_closes(self, mock_device):
+        devices = []
+
+        def _device(**kvargs):
+            dev = self._mock_device(**kvargs)
+            devices.append(dev)
+            return dev
+
+        mock_device.side_effect = _device
+        list(self.fleet.rpc.get_software_information(normalize=True))
+        self.assertEqual(len(devices), 20)
+        for dev in devices:
+            dev.open.assert_called_once_with(gather_facts=False)
+            dev.rpc.get_software_information.assert_called_once_with(normalize=True)
+            dev.close.assert_called_once_with()
+            self.assertEqual(dev.kvargs["user"], "test")
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_device_kvargs_override(self, mock_device):
+        mock_device.side_effect = self._mock_device
+        fleet = Fleet([{"host": "r1", "user": "other"}], user="test", timeout=5)
+        ((host, dev),) = list(fleet.open())
+        self.assertEqual(dev.kvargs["user"], "other")
+        self.assertEqual(dev.kvargs["conn_open_timeout"], 5)
+        self.assertEqual(dev.timeout, 5)
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_exceptions_returned(self, mock_device):
+        def _device(**kvargs):
+            dev = self._mock_device(**kvargs)
+            if kvargs["host"] == "r3":
+                dev.open.side_effect = ConnectAuthError(dev)
+            if kvargs["host"] == "r4":
+                dev.rpc.get_software_information.side_effect = RpcError()
+            return dev
+
+        mock_device.side_effect = _device
+        results = dict(self.fleet.rpc.get_software_information())
+        self.assertEqual(len(results), 20)
+        self.assertIsInstance(results["r3"], ConnectAuthError)
+        self.assertIsInstance(results["r4"], RpcError)
+        self.assertEqual(results["r5"], "r5")
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_ordered(self, mock_device):
+        def _device(**kvargs):
+            dev = self._mock_device(**kvargs)
+            # the first devices are the slowest ones
+            delay = (20 - int(kvargs["host"][1:])) * 0.001
+            dev.rpc.get_software_information.side_effect = lambda: (
+                time.sleep(delay) or kvargs["host"]
+            )
+            return dev
+
+        mock_device.side_effect = _device
+        fleet = Fleet(self.hosts, max_workers=5, ordered=True)
+        hosts = [host for host, _ in fleet.rpc.get_software_information()]
+        self.assertEqual(hosts, self.hosts)
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_max_workers(self, mock_device):
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def _rpc():
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+
+        def _device(**kvargs):
+            dev = self._mock_device(**kvargs)
+            dev.rpc.get_software_information.side_effect = _rpc
+            return dev
+
+        mock_device.side_effect = _device
+        fleet = Fleet(self.hosts, max_workers=3)
+        self.assertEqual(len(list(fleet.rpc.get_software_information())), 20)
+        self.assertLessEqual(running[1], 3)
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_stop_early(self, mock_device):
+        mock_device.side_effect = self._mock_device
+        results = self.fleet.rpc.get_software_information()
+        next(results)
+        results.close()
+        self.assertLess(mock_device.call_count, 20)
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_open_reuse_close(self, mock_device):
+        mock_device.side_effect = self._mock_device
+        with self.fleet as fleet:
+            opened = dict(fleet.open())
+            self.assertEqual(sorted(fleet.devices), sorted(self.hosts))
+            list(fleet.rpc.get_software_information())
+            self.assertEqual(mock_device.call_count, 20)
+            for dev in opened.values():
+                dev.close.assert_not_called()
+        for dev in opened.values():
+            dev.close.assert_called_once_with()
+        self.assertEqual(self.fleet.devices, {})
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_deadline(self, mock_device):
+        hung = threading.Event()
+        self.addCleanup(hung.set)
+
+        def _device(**kvargs):
+            dev = self._mock_device(**kvargs)
+            if kvargs["host"] == "r0":
+                dev.rpc.get_software_information.side_effect = hung.wait
+            return dev
+
+        mock_device.side_effect = _device
+        fleet = Fleet(self.hosts, max_workers=2, ordered=True, deadline=0.1)
+        start = time.monotonic()
+        results = list(fleet.rpc.get_software_information())
+        self.assertLess(time.monotonic() - start, 5)
+        # the late device does not hold the next ones
+        self.assertEqual([host for host, _ in results], self.hosts)
+        self.assertIsInstance(results[0][1], FleetTimeoutError)
+        self.assertEqual(results[0][1].host, "r0")
+        self.assertEqual(
+            dict(results[1:]), dict((host, host) for host in self.hosts[1:])
+        )
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_open_same_host_ports(self, mock_device):
+        mock_device.side_effect = self._mock_device
+        fleet = Fleet([{"host": "r1", "port": 2201}, {"host": "r1", "port": 2202}])
+        opened = [dev for _, dev in fleet.open()]
+        self.assertEqual(sorted(dev.kvargs["port"] for dev in opened), [2201, 2202])
+        self.assertEqual(
+            dict((name, dev.kvargs["port"]) for name, dev in fleet.devices.items()),
+            {"r1:2201": 2201, "r1:2202": 2202},
+        )
+        ports = []
+        list(fleet.run(lambda dev: ports.append(dev.kvargs["port"])))
+        self.assertEqual(sorted(ports), [2201, 2202])
+        self.assertEqual(mock_device.call_count, 2)
+        fleet.close()
+        for dev in opened:
+            dev.close.assert_called_once_with()
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_get(self, mock_device):
+        mock_device.side_effect = self._mock_device
+        table_cls = MagicMock()
+        table_cls.return_value.get.side_effect = lambda *vargs, **kvargs: kvargs
+        results = dict(Fleet(["r1"]).get(table_cls, table="inet.0"))
+        self.assertEqual(results, {"r1": {"table": "inet.0"}})
+
+    @patch("jnpr.junos.fleet.Device")
+    def test_fleet_facts_refresh(self, mock_device):
+        def _device(**kvargs):
+            dev = self._mock_device(**kvargs)
+            dev.facts = {"hostname": kvargs["host"]}
+            return dev
+
+        mock_device.side_effect = _device
+        results = dict(Fleet(["r1"]).facts_refresh(keys="hostname"))
+        self.assertEqual(results, {"r1": {"hostname": "r1"}})
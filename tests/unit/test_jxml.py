@@ -7,9 +7,12 @@ import nose2
 from jnpr.junos.jxml import (
     INSERT,
     NAME,
+    compiled_xpath,
     cscript_conf,
     normalize_xslt,
     remove_namespaces,
+    remove_namespaces_and_spaces,
+    xpath,
 )
 from lxml import etree
 from ncclient.xml_ import NCElement
@@ -46,6 +49,25 @@ class Test_JXML(unittest.TestCase):
                 i = i + 1
         self.assertTrue(i <= 0)
 
+    def test_remove_namespaces_and_spaces(self):
+        root = etree.XML(
+            '<rpc-reply xmlns:junos="http://xml.juniper.net/junos/17.3R1/junos">'
+            '<route-information xmlns="http://xml.juniper.net/junos/17.3R1/junos-routing">'
+            '<rt junos:style="brief">\n<rt-destination>\n10.0.0.0/24\n</rt-destination>\n'
+            '<!-- comment -->\n<age junos:seconds="10"> 10s </age>\n</rt>'
+            "</route-information></rpc-reply>"
+        )
+        rsp = remove_namespaces_and_spaces(root)
+        self.assertIs(rsp, root)
+        rt = rsp.find("route-information/rt")
+        self.assertEqual(rt.attrib, {"style": "brief"})
+        self.assertEqual(rt.text, "")
+        self.assertEqual(rt.findtext("rt-destination"), "10.0.0.0/24")
+        self.assertEqual(rt.find("rt-destination").tail, "\n")
+        self.assertEqual(rt[1].text, " comment ")
+        self.assertEqual(rt.find("age").attrib, {"seconds": "10"})
+        self.assertEqual(rt.findtext("age"), "10s")
+
     def test_cscript_conf(self):
         op = cscript_conf(self._read_file("get-configuration.xml"))
         self.assertTrue(isinstance(op, etree._Element))
@@ -93,6 +115,25 @@ class Test_JXML(unittest.TestCase):
         rpc_reply = NCElement(xmldata, normalize_xslt.encode("UTF-8"))
         self.assertEqual(str(rpc_reply), xmldata_without_ns)
 
+    def test_compiled_xpath_cached(self):
+        find = compiled_xpath("a/b[c='1']")
+        self.assertIs(compiled_xpath("a/b[c='1']"), find)
+        self.assertEqual(compiled_xpath.cache_info().maxsize, 4096)
+        root = etree.XML("<x><a><b><c>1</c></b><b><c>2</c></b></a></x>")
+        self.assertEqual(len(find(root)), 1)
+
+    def test_compiled_xpath_invalid(self):
+        size = compiled_xpath.cache_info().currsize
+        self.assertRaises(etree.XPathSyntaxError, compiled_xpath, "a/[")
+        self.assertEqual(compiled_xpath.cache_info().currsize, size)
+
+    def test_xpath(self):
+        root = etree.XML("<x><a>1</a><a>2</a></x>")
+        self.assertEqual([a.text for a in xpath(root, "a")], ["1", "2"])
+        self.assertEqual(
+            [a.text for a in xpath(etree.ElementTree(root), "a")], ["1", "2"]
+        )
+
     def _read_file(self, fname):
         fpath = os.path.join(os.path.dirname(__file__), "rpc-reply", fname)
         with open(fpath) as fp:
@@ -0,0 +1,253 @@
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+import nose2
+from jnpr.junos.exception import (
+    ConnectAuthError,
+    ConnectClosedError,
+    ConnectTimeoutError,
+    RpcError,
+)
+from jnpr.junos.pool import DevicePool
+
+
+class TestDevicePool(unittest.TestCase):
+    def setUp(self):
+        self.devices = []
+        patcher = patch("jnpr.junos.pool.Device")
+        self.mock_device = patcher.start()
+        self.mock_device.side_effect = self._mock_device
+        self.addCleanup(patcher.stop)
+        self.pool = DevicePool(user="test", passwd="password123")
+
+    def _mock_device(self, **kvargs):
+        dev = MagicMock(name=kvargs.get("host"))
+        dev.hostname = kvargs.get("host")
+        dev.kvargs = kvargs
+        dev.connected = True
+        self.devices.append(dev)
+        return dev
+
+    def _age(self, seconds):
+        # makes every session of the pool older by :seconds:
+        for idle in self.pool._idle.values():
+            for session in idle:
+                session.released -= seconds
+                session.created -= seconds
+
+    def test_pool_max_sessions_invalid(self):
+        self.assertRaises(ValueError, DevicePool, max_sessions=0)
+
+    def test_pool_reuse(self):
+        with self.pool.device("r1") as dev:
+            dev.rpc.get_software_information()
+        with self.pool.device("r1") as dev2:
+            self.assertIs(dev2, dev)
+        self.assertEqual(len(self.devices), 1)
+        dev.open.assert_called_once_with()
+        self.assertFalse(dev.close.called)
+        self.assertEqual(dev.kvargs["user"], "test")
+        stats = self.pool.stats
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["sessions"], 1)
+        self.assertEqual(stats["idle"], 1)
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(repr(self.pool), "DevicePool(1 sessions, 1 idle)")
+
+    def test_pool_keyed_by_credentials(self):
+        with self.pool.device("r1") as dev1:
+            pass
+        with self.pool.device("r1", user="other") as dev2:
+            self.assertEqual(dev2.kvargs["user"], "other")
+        with self.pool.device("r2") as dev3:
+            pass
+        self.assertEqual(len(set([id(dev1), id(dev2), id(dev3)])), 3)
+
+    def test_pool_concurrent_sessions(self):
+        with self.pool.device("r1") as dev1:
+            with self.pool.device("r1") as dev2:
+                self.assertIsNot(dev1, dev2)
+                self.assertEqual(self.pool.stats["in_use"], 2)
+        self.assertEqual(self.pool.stats["idle"], 2)
+
+    def test_pool_wait_for_session(self):
+        pool = DevicePool(max_sessions=1)
+        dev = pool.acquire("r1")
+        acquired = []
+
+        def _acquire():
+            acquired.append(pool.acquire("r1"))
+
+        thread = threading.Thread(target=_acquire)
+        thread.start()
+        time.sleep(0.05)
+        self.assertEqual(acquired, [])
+        pool.release(dev)
+        thread.join()
+        self.assertEqual(acquired, [dev])
+        stats = pool.stats
+        self.assertEqual(stats["waits"], 1)
+        self.assertGreater(stats["wait_time"], 0.04)
+
+    def test_pool_wait_for_session_other_host(self):
+        # a session released for a host wakes up its waiter, even when a
+        # waiter of another host waits as well
+        pool = DevicePool(max_sessions=1)
+        dev1 = pool.acquire("r1")
+        dev2 = pool.acquire("r2")
+        acquired = {}
+
+        def _acquire(host):
+            acquired[host] = pool.acquire(host)
+
+        threads = dict(
+            (host, threading.Thread(target=_acquire, args=(host,), daemon=True))
+            for host in ("r1", "r2")
+        )
+        for thread in threads.values():
+            thread.start()
+        while pool.stats["waits"] < 2:
+            time.sleep(0.01)
+        pool.release(dev2)
+        threads["r2"].join(5)
+        self.assertIs(acquired.get("r2"), dev2)
+        pool.release(dev1)
+        threads["r1"].join(5)
+        self.assertIs(acquired.get("r1"), dev1)
+
+    def test_pool_wait_timeout(self):
+        pool = DevicePool(max_sessions=1, wait_timeout=0.01)
+        pool.acquire("r1")
+        self.assertRaises(ConnectTimeoutError, pool.acquire, "r1")
+        # another host is not affected
+        pool.acquire("r2")
+
+    def test_pool_max_idle(self):
+        pool = self.pool
+        with pool.device("r1") as dev:
+            pass
+        self._age(pool.max_idle + 1)
+        with pool.device("r1") as dev2:
+            self.assertIsNot(dev2, dev)
+        dev.close.assert_called_once_with()
+        self.assertEqual(pool.stats["evictions"], 1)
+        self.assertEqual(pool.stats["sessions"], 1)
+
+    def test_pool_max_lifetime(self):
+        pool = DevicePool(max_lifetime=10, keepalive=None)
+        dev = pool.acquire("r1")
+        pool._in_use[id(dev)].created -= 11
+        pool.release(dev)
+        dev.close.assert_called_once_with()
+        self.assertEqual(pool.stats["sessions"], 0)
+
+    def test_pool_prune(self):
+        with self.pool.device("r1") as dev:
+            pass
+        self.pool.prune()
+        self.assertFalse(dev.close.called)
+        self._age(self.pool.max_idle + 1)
+        self.pool.prune()
+        dev.close.assert_called_once_with()
+        self.assertEqual(self.pool.stats["idle"], 0)
+
+    def test_pool_keepalive(self):
+        with self.pool.device("r1") as dev:
+            pass
+        # not checked while recently used
+        with self.pool.device("r1"):
+            self.assertFalse(dev.execute.called)
+        self._age(self.pool.keepalive + 1)
+        with self.pool.device("r1") as dev2:
+            self.assertIs(dev2, dev)
+        dev.probe.assert_called_once_with(timeout=5)
+        dev.execute.assert_called_once_with("<get-system-uptime-information/>")
+
+    def test_pool_keepalive_probe_failed(self):
+        with self.pool.device("r1") as dev:
+            pass
+        dev.probe.return_value = False
+        self._age(self.pool.keepalive + 1)
+        with self.pool.device("r1") as dev2:
+            self.assertIsNot(dev2, dev)
+        self.assertFalse(dev.execute.called)
+        dev.close.assert_called_once_with()
+
+    def test_pool_keepalive_no_probe(self):
+        pool = DevicePool(probe_timeout=None)
+        with pool.device("r1") as dev:
+            pass
+        for session in pool._idle[pool._key(dict(host="r1"))]:
+            session.released -= pool.keepalive + 1
+        with pool.device("r1") as dev2:
+            self.assertIs(dev2, dev)
+        self.assertFalse(dev.probe.called)
+        dev.execute.assert_called_once_with("<get-system-uptime-information/>")
+
+    def test_pool_keepalive_failed(self):
+        with self.pool.device("r1") as dev:
+            pass
+        dev.execute.side_effect = ConnectClosedError(dev)
+        self._age(self.pool.keepalive + 1)
+        with self.pool.device("r1") as dev2:
+            self.assertIsNot(dev2, dev)
+        dev.close.assert_called_once_with()
+        self.assertEqual(self.pool.stats["evictions"], 1)
+
+    def test_pool_disconnected_session(self):
+        with self.pool.device("r1") as dev:
+            pass
+        dev.connected = False
+        with self.pool.device("r1") as dev2:
+            self.assertIsNot(dev2, dev)
+
+    def test_pool_connect_error_discards(self):
+        with self.assertRaises(ConnectClosedError):
+            with self.pool.device("r1") as dev:
+                raise ConnectClosedError(dev)
+        dev.close.assert_called_once_with()
+        self.assertEqual(self.pool.stats["sessions"], 0)
+
+    def test_pool_rpc_error_keeps(self):
+        with self.assertRaises(RpcError):
+            with self.pool.device("r1") as dev:
+                raise RpcError()
+        self.assertFalse(dev.close.called)
+        self.assertEqual(self.pool.stats["idle"], 1)
+
+    def test_pool_open_error(self):
+        pool = DevicePool(max_sessions=1)
+
+        def _device(**kvargs):
+            dev = self._mock_device(**kvargs)
+            if len(self.devices) == 1:
+                dev.open.side_effect = ConnectAuthError(dev)
+            return dev
+
+        self.mock_device.side_effect = _device
+        self.assertRaises(ConnectAuthError, pool.acquire, "r1")
+        # the failed session does not count against max_sessions
+        pool.acquire("r1")
+        self.assertEqual(pool.stats["sessions"], 1)
+
+    def test_pool_close(self):
+        with self.pool as pool:
+            with pool.device("r1") as dev1:
+                pass
+            dev2 = pool.acquire("r2")
+        dev1.close.assert_called_once_with()
+        self.assertFalse(dev2.close.called)
+        pool.release(dev2)
+        dev2.close.assert_called_once_with()
+        self.assertRaises(ValueError, pool.acquire, "r1")
+
+    @patch("jnpr.junos.pool.logger")
+    def test_pool_close_error_logged(self, mock_logger):
+        with self.pool.device("r1") as dev:
+            pass
+        dev.close.side_effect = ConnectClosedError(dev)
+        self.pool.close()
+        self.assertTrue(mock_logger.error.called)
@@ -5,9 +5,14 @@ from unittest.mock import MagicMock, call, patch
 
 import nose2
 from jnpr.junos.device import Device
-from jnpr.junos.exception import JSONLoadError
+from jnpr.junos.exception import (
+    ConnectClosedError,
+    JSONLoadError,
+    RpcError,
+    RpcTimeoutError,
+)
 from jnpr.junos.facts.swver import version_info
-from jnpr.junos.rpcmeta import _RpcMetaExec
+from jnpr.junos.rpcmeta import _RpcBatch, _RpcMetaExec
 from lxml import etree
 from ncclient.manager import Manager, make_device_handler
 from ncclient.transport import SSHSession
@@ -122,6 +127,58 @@ class Test_RpcMetaExec(unittest.TestCase):
         self.rpc.get_config(root)
         self.assertEqual(mock_execute_fn.call_args[0][0].tag, "get-configuration")
 
+    def test_rpcmeta_memoized(self):
+        fn = self.rpc.get_software_information
+        self.assertIs(self.rpc.get_software_information, fn)
+        self.assertEqual(fn.__name__, "get_software_information")
+        self.assertEqual(fn.__doc__, "get-software-information")
+
+    @patch("jnpr.junos.device.Device.execute")
+    def test_rpcmeta_prepare(self, mock_execute_fn):
+        get_intf = self.rpc.prepare(
+            "get_interface_information",
+            dict(format="text"),
+            interface_name="ge-0/0/0",
+            terse=True,
+        )
+        self.assertEqual(get_intf.__name__, "get_interface_information")
+        get_intf(interface_name="ge-0/0/1")
+        get_intf(interface_name=("ge-0/0/2", "ge-0/0/3"), terse=False)
+        first = mock_execute_fn.call_args_list[0][0][0]
+        second = mock_execute_fn.call_args_list[1][0][0]
+        self.assertEqual(first.tag, "get-interface-information")
+        self.assertEqual(first.get("format"), "text")
+        self.assertEqual(first.findtext("interface-name"), "ge-0/0/1")
+        self.assertIsNotNone(first.find("terse"))
+        self.assertEqual(
+            [e.text for e in second.findall("interface-name")],
+            ["ge-0/0/2", "ge-0/0/3"],
+        )
+        self.assertIsNone(second.find("terse"))
+        # the template is not modified by the calls
+        get_intf()
+        third = mock_execute_fn.call_args_list[2][0][0]
+        self.assertEqual(third.findtext("interface-name"), "ge-0/0/0")
+
+    @patch("jnpr.junos.device.Device.execute")
+    def test_rpcmeta_prepare_new_arg(self, mock_execute_fn):
+        get_route = self.rpc.prepare("get_route_information")
+        get_route(destination="10.0.0.0/8")
+        self.assertEqual(
+            mock_execute_fn.call_args[0][0].findtext("destination"), "10.0.0.0/8"
+        )
+        self.assertRaises(TypeError, get_route, destination=10)
+
+    @patch("jnpr.junos.device.Device.execute")
+    def test_rpcmeta_prepare_dec_args(self, mock_execute_fn):
+        get_sw = self.rpc.prepare("get_software_information", normalize=True)
+        get_sw(dev_timeout=10)
+        self.assertEqual(
+            mock_execute_fn.call_args[1], {"normalize": True, "dev_timeout": 10}
+        )
+        get_sw(normalize=False)
+        self.assertEqual(mock_execute_fn.call_args[1], {"normalize": False})
+
     def test_rpcmeta_exec_rpc_format_json_14_2(self):
         self.dev._conn.rpc = MagicMock(side_effect=self._mock_manager)
         self.dev.facts._cache["version_info"] = version_info("14.2X46-D15.3")
@@ -245,3 +302,199 @@ class Test_RpcMetaExec(unittest.TestCase):
         with open(fpath) as fp:
             foo = fp.read()
         return NCElement(foo, self.dev._conn._device_handler.transform_reply())
+
+
+_RPC_ERROR = """
+<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+  <rpc-error>
+    <error-type>protocol</error-type>
+    <error-tag>operation-failed</error-tag>
+    <error-severity>%s</error-severity>
+    <error-message>%s</error-message>
+  </rpc-error>
+  <bgp-information/>
+</rpc-reply>
+"""
+
+
+class Test_RpcBatch(unittest.TestCase):
+    @patch("ncclient.manager.connect")
+    def setUp(self, mock_connect):
+        mock_connect.side_effect = self._mock_manager
+        self.dev = Device(
+            host="1.1.1.1", user="rick", password="password123", gather_facts=False
+        )
+        self.dev.open()
+        self.replies = {}
+        self.sent = []
+        self.session = self.dev._conn._session
+        self.session.send = MagicMock(side_effect=self.sent.append)
+
+    def test_batch_sends_before_replies(self):
+        with self.dev.batch() as batch:
+            sw = batch.rpc.get_software_information()
+            up = batch.rpc.get_system_uptime_information()
+            # both RPCs are on the wire before any reply is received
+            self.assertEqual(len(self.sent), 2)
+            self._reply_all(reverse=True)
+        self.assertEqual(sw.result().tag, "software-information")
+        self.assertEqual(up.result().tag, "system-uptime-information")
+        self.assertEqual(
+            [rsp.tag for rsp in batch.results()],
+            ["software-information", "system-uptime-information"],
+        )
+
+    def test_batch_rpc_args(self):
+        with self.dev.batch() as batch:
+            batch.rpc.get_system_uptime_information(detail=True)
+            self._reply_all()
+        rpc = etree.XML(self.sent[0].encode())
+        self.assertEqual(rpc[0][0].tag, "detail")
+
+    def test_batch_normalize(self):
+        with self.dev.batch() as batch:
+            norm = batch.rpc.get_system_uptime_information(normalize=True)
+            raw = batch.rpc.get_system_uptime_information()
+            self._reply_all()
+        self.assertEqual(norm.result().findtext(".//time-source"), "NTP CLOCK")
+        self.assertEqual(raw.result().findtext(".//time-source"), " NTP CLOCK ")
+
+    def test_batch_get_config_model(self):
+        with self.dev.batch() as batch:
+            data = batch.rpc.get_config(model=True)
+            self._reply_all()
+        self.assertEqual(data.result().tag, "data")
+
+    def test_batch_rpc_error(self):
+        self.replies["get-bgp-summary-information"] = _RPC_ERROR % (
+            "error",
+            "syntax error",
+        )
+        with self.dev.batch() as batch:
+            bgp = batch.rpc.get_bgp_summary_information()
+            sw = batch.rpc.get_software_information()
+            self._reply_all()
+        self.assertRaises(RpcError, bgp.result)
+        self.assertIsInstance(bgp.exception(), RpcError)
+        self.assertEqual(sw.result().tag, "software-information")
+        self.assertRaises(RpcError, batch.results)
+        results = batch.results(return_exceptions=True)
+        self.assertIsInstance(results[0], RpcError)
+        self.assertEqual(results[1].tag, "software-information")
+
+    def test_batch_ignore_warning(self):
+        self.replies["get-bgp-summary-information"] = _RPC_ERROR % (
+            "warning",
+            "bgp subsystem not running",
+        )
+        with self.dev.batch() as batch:
+            bgp = batch.rpc.get_bgp_summary_information(ignore_warning=True)
+            self._reply_all()
+        self.assertEqual(bgp.result().tag, "bgp-information")
+
+    def test_batch_timeout(self):
+        with self.dev.batch() as batch:
+            up = batch.rpc.get_system_uptime_information(dev_timeout=0.01)
+        self.assertIsInstance(up.exception(), RpcTimeoutError)
+
+    def test_batch_closed(self):
+        self.dev.connected = False
+        batch = self.dev.batch()
+        self.assertRaises(ConnectClosedError, batch.rpc.get_system_uptime_information)
+
+    def test_rpc_raw(self):
+        self.session.send = MagicMock(side_effect=self._reply)
+        rsp = self.dev.rpc.get_system_uptime_information(raw=True, normalize=True)
+        self.assertIsInstance(rsp, str)
+        self.assertTrue(rsp.startswith("<rpc-reply"))
+        # as received, not normalized
+        self.assertIn("<time-source> NTP CLOCK </time-source>", rsp)
+
+    def test_rpc_raw_get_config(self):
+        self.session.send = MagicMock(side_effect=self._reply)
+        rsp = self.dev.rpc.get_config(model=True, raw=True)
+        # as received, the top level is not renamed to <data>
+        self.assertTrue(rsp.startswith("<rpc-reply"))
+        self.assertIn("<configuration", rsp)
+
+    def test_rpc_raw_rpc_error(self):
+        self.session.send = MagicMock(side_effect=self._reply)
+        self.replies["get-bgp-summary-information"] = _RPC_ERROR % (
+            "error",
+            "syntax error",
+        )
+        self.assertRaises(RpcError, self.dev.rpc.get_bgp_summary_information, raw=True)
+
+    def test_rpc_raw_ignore_warning(self):
+        self.session.send = MagicMock(side_effect=self._reply)
+        self.replies["get-bgp-summary-information"] = _RPC_ERROR % (
+            "warning",
+            "bgp subsystem not running",
+        )
+        rsp = self.dev.rpc.get_bgp_summary_information(raw=True, ignore_warning=True)
+        self.assertIsInstance(rsp, str)
+        self.assertIn("<bgp-information/>", rsp)
+        self.assertNotIn("rpc-error", rsp)
+
+    def test_rpc_raw_timeout(self):
+        self.assertRaises(
+            RpcTimeoutError,
+            self.dev.rpc.get_system_uptime_information,
+            raw=True,
+            dev_timeout=0.01,
+        )
+
+    def test_batch_raw(self):
+        with self.dev.batch() as batch:
+            raw = batch.rpc.get_software_information(raw=True)
+            rsp = batch.rpc.get_software_information()
+            self._reply_all()
+        self.assertTrue(raw.result().startswith("<rpc-reply"))
+        self.assertEqual(rsp.result().tag, "software-information")
+
+    def test_pipeline(self):
+        self.session.send = MagicMock(side_effect=self._reply)
+        results = self.dev.rpc.pipeline(
+            [
+                "<get-software-information/>",
+                etree.Element("get-system-uptime-information"),
+            ],
+            normalize=True,
+        )
+        self.assertEqual(
+            [rsp.tag for rsp in results],
+            ["software-information", "system-uptime-information"],
+        )
+        self.assertEqual(results[1].findtext(".//time-source"), "NTP CLOCK")
+
+    def test_pipeline_no_rpc_send(self):
+        junos = MagicMock(spec=["execute", "batch"])
+        junos.batch.side_effect = lambda: _RpcBatch(junos)
+        junos.execute.side_effect = lambda rpc_cmd, **kvargs: rpc_cmd
+        results = _RpcMetaExec(junos).pipeline(["a", "b"], ignore_warning=True)
+        self.assertEqual(results, ["a", "b"])
+        junos.execute.assert_called_with("b", ignore_warning=True)
+
+    def _reply_all(self, reverse=False):
+        for message in reversed(self.sent) if reverse else list(self.sent):
+            self._reply(message)
+
+    def _reply(self, message):
+        rpc = etree.XML(message.encode())
+        tag = etree.QName(rpc[0]).localname
+        if tag in self.replies:
+            foo = self.replies[tag]
+        else:
+            fpath = os.path.join(os.path.dirname(__file__), "rpc-reply", tag + ".xml")
+            with open(fpath) as fp:
+                foo = fp.read()
+        foo = re.sub(
+            "<rpc-reply", '<rpc-reply message-id="%s"' % rpc.get("message-id"), foo, 1
+        )
+        self.session._dispatch_message(foo)
+
+    def _mock_manager(self, *args, **kwargs):
+        device_params = kwargs["device_params"]
+        device_handler = make_device_handler(device_params)
+        session = SSHSession(device_handler)
+        return Manager(session, device_handler)
@@ -0,0 +1,263 @@
+import os
+import re
+import unittest
+from unittest.mock import MagicMock, patch
+
+import nose2
+from jnpr.junos.device import Device
+from jnpr.junos.exception import (
+    ConnectClosedError,
+    RpcError,
+    RpcTimeoutError,
+)
+from jnpr.junos.rpcstats import RpcSample, RpcStatsCollector
+from lxml import etree
+from ncclient.manager import Manager, make_device_handler
+from ncclient.transport import SSHSession
+
+_RPC_ERROR = """
+<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
+  <rpc-error>
+    <error-type>protocol</error-type>
+    <error-tag>operation-failed</error-tag>
+    <error-severity>%s</error-severity>
+    <error-message>%s</error-message>
+  </rpc-error>
+  <bgp-information/>
+</rpc-reply>
+"""
+
+
+def _sample(rpc="get-software-information", device="r1", **values):
+    sample = RpcSample(device, etree.Element(rpc))
+    for name, value in values.items():
+        setattr(sample, name, value)
+    sample.finish(values.get("error"))
+    for name, value in values.items():
+        setattr(sample, name, value)
+    return sample
+
+
+class TestRpcSample(unittest.TestCase):
+    def test_sample(self):
+        sample = RpcSample(
+            "r1",
+            etree.XML("<get-route-information><table/></get-route-information>"),
+        )
+        self.assertEqual(sample.device, "r1")
+        self.assertEqual(sample.rpc, "get-route-information")
+        self.assertEqual(
+            sample.request_bytes,
+            len(b"<get-route-information><table/></get-route-information>"),
+        )
+        self.assertIsNone(sample.elapsed)
+        sample.finish()
+        self.assertEqual(sample.outcome, "ok")
+        self.assertGreaterEqual(sample.elapsed, 0)
+        self.assertNotIn("error", sample.to_dict())
+        self.assertEqual(sample.to_dict()["rpc"], "get-route-information")
+
+    def test_sample_outcomes(self):
+        dev = MagicMock()
+        for error, outcome in (
+            (RpcTimeoutError(dev, "get-software-information", 30), "timeout"),
+            (ConnectClosedError(dev), "closed"),
+            (RpcError(), "rpc-error"),
+            (ValueError(), "error"),
+        ):
+            sample = RpcSample("r1", etree.Element("get-software-information"))
+            sample.finish(error)
+            self.assertEqual(sample.outcome, outcome)
+            self.assertIs(sample.error, error)
+
+
+class TestRpcStatsCollector(unittest.TestCase):
+    def test_to_dict(self):
+        stats = RpcStatsCollector()
+        stats(_sample(elapsed=0.2, ttfb=0.15, reply_bytes=2000))
+        stats(_sample(elapsed=0.3, ttfb=0.25, reply_bytes=3000))
+        stats(_sample(device="r2", error=RpcError()))
+        stats(_sample(rpc="get-system-uptime-information", elapsed=0.001))
+        result = stats.to_dict()
+        self.assertEqual(
+            sorted(result),
+            ["get-software-information", "get-system-uptime-information"],
+        )
+        sw = result["get-software-information"]
+        self.assertEqual(sw["count"], 3)
+        self.assertEqual(sw["outcomes"], {"ok": 2, "rpc-error": 1})
+        self.assertEqual(sw["seconds"]["count"], 3)
+        # the reply of the RPC error was not measured
+        self.assertEqual(sw["reply_bytes"]["count"], 2)
+        self.assertEqual(sw["reply_bytes"]["sum"], 5000)
+        self.assertIn((1024, 0), sw["reply_bytes"]["buckets"])
+        self.assertIn((4096, 2), sw["reply_bytes"]["buckets"])
+        self.assertEqual(sw["ttfb_seconds"]["buckets"][-1], (float("inf"), 2))
+        self.assertIn((0.25, 2), sw["ttfb_seconds"]["buckets"])
+        self.assertIn((0.1, 0), sw["ttfb_seconds"]["buckets"])
+
+    def test_per_device(self):
+        stats = RpcStatsCollector(per_device=True)
+        stats(_sample(device="r1"))
+        stats(_sample(device="r2"))
+        stats(_sample(device="r2"))
+        result = stats.to_dict()
+        self.assertEqual(result["r1"]["get-software-information"]["count"], 1)
+        self.assertEqual(result["r2"]["get-software-information"]["count"], 2)
+
+    def test_reset(self):
+        stats = RpcStatsCollector()
+        stats(_sample())
+        stats.reset()
+        self.assertEqual(stats.to_dict(), {})
+
+    def test_to_prometheus(self):
+        stats = RpcStatsCollector(per_device=True, prefix="pyez")
+        stats(_sample(device='r"1', elapsed=0.02, reply_bytes=100))
+        # measured in no time
+        stats(_sample(device='r"1', error=ValueError()))
+        text = stats.to_prometheus()
+        labels = 'device="r\\"1",rpc="get-software-information"'
+        self.assertIn("# TYPE pyez_total counter\n", text)
+        self.assertIn('pyez_total{%s,outcome="ok"} 1\n' % labels, text)
+        self.assertIn('pyez_total{%s,outcome="error"} 1\n' % labels, text)
+        self.assertIn("# TYPE pyez_seconds histogram\n", text)
+        self.assertIn('pyez_seconds_bucket{%s,le="0.01"} 1\n' % labels, text)
+        self.assertIn('pyez_seconds_bucket{%s,le="0.025"} 2\n' % labels, text)
+        self.assertIn('pyez_seconds_bucket{%s,le="+Inf"} 2\n' % labels, text)
+        self.assertIn("pyez_seconds_count{%s} 2\n" % labels, text)
+        self.assertIn("pyez_reply_bytes_sum{%s} 100\n" % labels, text)
+        self.assertIn("pyez_reply_bytes_count{%s} 1\n" % labels, text)
+        self.assertTrue(text.endswith("\n"))
+
+
+class TestDeviceRpcObservers(unittest.TestCase):
+    @patch("ncclient.manager.connect")
+    def setUp(self, mock_connect):
+        mock_connect.side_effect = self._mock_manager
+        self.samples = []
+        self.dev = Device(
+            host="1.1.1.1",
+            user="rick",
+            password="password123",
+            gather_facts=False,
+            rpc_observers=[self.samples.append],
+        )
+        self.dev.open()
+        self.replies = {}
+        self.dispatched = []
+        self.session = self.dev._conn._session
+        self.session.send = MagicMock(side_effect=self._reply)
+
+    def test_execute_observed(self):
+        rsp = self.dev.rpc.get_system_uptime_information(normalize=True)
+        self.assertEqual(rsp.findtext(".//time-source"), "NTP CLOCK")
+        (sample,) = self.samples
+        self.assertEqual(sample.device, "1.1.1.1")
+        self.assertEqual(sample.rpc, "get-system-uptime-information")
+        self.assertEqual(sample.outcome, "ok")
+        self.assertGreater(sample.request_bytes, 0)
+        self.assertEqual(sample.reply_bytes, len(self.dispatched[0]))
+        for value in (sample.ttfb, sample.parse_time, sample.transform_time):
+            self.assertGreaterEqual(value, 0)
+        self.assertGreaterEqual(sample.elapsed, sample.ttfb)
+
+    def test_execute_rpc_error(self):
+        self.replies["get-bgp-summary-information"] = _RPC_ERROR % (
+            "error",
+            "syntax error",
+        )
+        self.assertRaises(RpcError, self.dev.rpc.get_bgp_summary_information)
+        (sample,) = self.samples
+        self.assertEqual(sample.outcome, "rpc-error")
+        self.assertIsInstance(sample.error, RpcError)
+
+    def test_execute_ignore_warning(self):
+        self.replies["get-bgp-summary-information"] = _RPC_ERROR % (
+            "warning",
+            "bgp subsystem not running",
+        )
+        rsp = self.dev.rpc.get_bgp_summary_information(ignore_warning=True)
+        self.assertEqual(rsp.tag, "bgp-information")
+        self.assertEqual(self.samples[0].outcome, "ok")
+
+    def test_execute_timeout(self):
+        self.session.send = MagicMock()
+        self.assertRaises(
+            RpcTimeoutError,
+            self.dev.rpc.get_system_uptime_information,
+            dev_timeout=0.01,
+        )
+        (sample,) = self.samples
+        self.assertEqual(sample.outcome, "timeout")
+        self.assertIsNone(sample.reply_bytes)
+
+    def test_rpc_raw_observed(self):
+        rsp = self.dev._rpc_raw(etree.Element("get-software-information"))
+        self.assertTrue(rsp.startswith("<rpc-reply"))
+        (sample,) = self.samples
+        self.assertEqual(sample.reply_bytes, len(rsp))
+        self.assertIsNone(sample.parse_time)
+
+    def test_batch_observed(self):
+        with self.dev.batch() as batch:
+            batch.rpc.get_software_information()
+            batch.rpc.get_system_uptime_information()
+        self.assertEqual(
+            [(sample.rpc, sample.outcome) for sample in self.samples],
+            [
+                ("get-software-information", "ok"),
+                ("get-system-uptime-information", "ok"),
+            ],
+        )
+
+    def test_add_remove_observer(self):
+        stats = RpcStatsCollector()
+        self.dev.add_rpc_observer(stats)
+        self.dev.rpc.get_software_information()
+        self.dev.remove_rpc_observer(self.samples.append)
+        self.dev.rpc.get_software_information()
+        self.assertEqual(len(self.samples), 1)
+        self.assertEqual(stats.to_dict()["get-software-information"]["count"], 2)
+        self.dev.remove_rpc_observer(stats)
+        self.assertIsNone(self.dev._rpc_sample(etree.Element("foo")))
+
+    @patch("jnpr.junos.device.logger")
+    def test_observer_error(self, mock_logger):
+        self.dev.add_rpc_observer(MagicMock(side_effect=ValueError("oops")))
+        rsp = self.dev.rpc.get_software_information()
+        self.assertEqual(rsp.tag, "software-information")
+        self.assertEqual(len(self.samples), 1)
+        self.assertTrue(mock_logger.error.called)
+
+    def test_not_observed(self):
+        self.dev.remove_rpc_observer(self.samples.append)
+        with patch.object(self.dev, "_rpc_send") as mock_send:
+            self.dev.rpc.get_software_information()
+        # the synchronous ncclient RPC is used
+        self.assertFalse(mock_send.called)
+        self.assertEqual(self.samples, [])
+
+    def _reply(self, message):
+        rpc = etree.XML(message.encode())
+        tag = etree.QName(rpc[0]).localname
+        if tag in self.replies:
+            foo = self.replies[tag]
+        else:
+            foo = self._read_file(tag + ".xml")
+        foo = re.sub(
+            "<rpc-reply", '<rpc-reply message-id="%s"' % rpc.get("message-id"), foo, 1
+        )
+        self.dispatched.append(foo)
+        self.session._dispatch_message(foo)
+
+    def _read_file(self, fname):
+        fpath = os.path.join(os.path.dirname(__file__), "rpc-reply", fname)
+        with open(fpath) as fp:
+            return fp.read()
+
+    def _mock_manager(self, *args, **kwargs):
+        device_params = kwargs["device_params"]
+        device_handler = make_device_handler(device_params)
+        session = SSHSession(device_handler)
+        return Manager(session, device_handler)
@@ -0,0 +1,218 @@
+import unittest
+from unittest.mock import ANY, MagicMock, patch
+
+import nose2
+from jnpr.junos.exception import (
+    ConnectAuthError,
+    ConnectTimeoutError,
+    RpcError,
+    SwUpgradeError,
+)
+from jnpr.junos.upgrade import FleetUpgrade
+from jnpr.junos.utils.scp import BandwidthLimit
+
+
+class TestFleetUpgrade(unittest.TestCase):
+    def setUp(self):
+        self.hosts = ["r%d" % i for i in range(5)]
+        # number of failed connections of a device once rebooted
+        self.down = {}
+        self.rebooted = []
+        self.version = {}
+        self.sws = {}
+        self.reports = []
+
+        patcher = patch("jnpr.junos.fleet.Device")
+        patcher.start().side_effect = self._mock_device
+        self.addCleanup(patcher.stop)
+        patcher = patch("jnpr.junos.upgrade.SW")
+        self.mock_sw = patcher.start()
+        self.mock_sw.side_effect = self._mock_sw
+        self.mock_sw.local_checksum.return_value = "96a35ab371e1ca10408c3caecdbd8a67"
+        self.addCleanup(patcher.stop)
+        patcher = patch("jnpr.junos.upgrade.time")
+        self.mock_time = patcher.start()
+        self.mock_time.monotonic.return_value = 0
+        self.addCleanup(patcher.stop)
+
+    def _mock_device(self, **kvargs):
+        host = kvargs["host"]
+        dev = MagicMock(name=host)
+        dev.hostname = host
+        dev.kvargs = kvargs
+        dev.facts = dict(version=self.version.get(host, "22.4R1.10"))
+        if host in self.rebooted and self.down.get(host):
+            self.down[host] -= 1
+            dev.open.side_effect = ConnectTimeoutError(dev)
+        return dev
+
+    def _mock_sw(self, dev):
+        sw = self.sws.get(dev.hostname)
+        if sw is None:
+            sw = self.sws[dev.hostname] = MagicMock(name="SW(%s)" % dev.hostname)
+            sw.safe_copy.return_value = True
+            sw.install.return_value = (True, "installed")
+            sw.reboot.side_effect = lambda **kvargs: self.rebooted.append(dev.hostname)
+        return sw
+
+    def _upgrade(self, **kvargs):
+        params = dict(
+            user="test",
+            passwd="password123",
+            wave_size=2,
+            reboot_batch=2,
+            version="22.4R1.10",
+            progress=lambda dev, report: self.reports.append((dev.hostname, report)),
+        )
+        params.update(kvargs)
+        return FleetUpgrade(self.hosts, "/tmp/junos-22.4R1.10.tgz", **params)
+
+    def test_upgrade_run(self):
+        upgrade = self._upgrade(bandwidth=1000000)
+        self.assertEqual(upgrade.results, [(host, None) for host in self.hosts])
+        self.assertEqual(upgrade.run(), [(host, True) for host in self.hosts])
+        # the checksum of the package is computed once
+        self.mock_sw.local_checksum.assert_called_once_with(
+            "/tmp/junos-22.4R1.10.tgz", algorithm="md5"
+        )
+        limits = set()
+        for host in self.hosts:
+            sw = self.sws[host]
+            kvargs = sw.safe_copy.call_args[1]
+            self.assertEqual(kvargs["checksum"], "96a35ab371e1ca10408c3caecdbd8a67")
+            self.assertIsInstance(kvargs["bandwidth"], BandwidthLimit)
+            limits.add(id(kvargs["bandwidth"]))
+            kvargs = sw.install.call_args[1]
+            self.assertTrue(kvargs["no_copy"])
+            self.assertEqual(kvargs["remote_path"], "/var/tmp")
+            sw.reboot.assert_called_once_with()
+            self.assertIn((host, "healthy"), self.reports)
+        # the copies share the bandwidth cap
+        self.assertEqual(len(limits), 1)
+        self.assertEqual(sorted(self.rebooted), self.hosts)
+        self.assertEqual(repr(upgrade), "FleetUpgrade(5 devices, junos-22.4R1.10.tgz)")
+
+    def test_upgrade_copy_failure(self):
+        self._mock_sw(MagicMock(hostname="r1")).safe_copy.return_value = False
+        results = dict(self._upgrade().run(reboot=False))
+        self.assertIsInstance(results["r1"], SwUpgradeError)
+        self.assertEqual(results["r1"].stage, "copy")
+        # the device is left out of the next stages, the others go on
+        self.assertFalse(self.sws["r1"].install.called)
+        self.assertEqual(
+            [host for host, ok in results.items() if ok is True],
+            ["r0", "r2", "r3", "r4"],
+        )
+        self.assertEqual(self.rebooted, [])
+
+    def test_upgrade_install_halts(self):
+        self._mock_sw(MagicMock(hostname="r0")).install.return_value = (
+            False,
+            "ERROR: validation failed",
+        )
+        results = dict(self._upgrade().install())
+        self.assertEqual(str(results["r0"]), "install: ERROR: validation failed")
+        self.assertIs(results["r1"], True)
+        # the next waves are not run
+        for host in ["r2", "r3", "r4"]:
+            self.assertEqual(results[host].stage, "install")
+            self.assertNotIn(host, self.sws)
+
+    def test_upgrade_run_install_halts(self):
+        self._mock_sw(MagicMock(hostname="r2")).install.return_value = False
+        results = dict(self._upgrade().run())
+        self.assertEqual(results["r2"].stage, "install")
+        # the devices installed before the halt are not rebooted either
+        for host in ["r0", "r1"]:
+            self.assertEqual(
+                str(results[host]),
+                "reboot: installed but not rebooted, the upgrade halted",
+            )
+        self.assertEqual(self.rebooted, [])
+        for sw in self.sws.values():
+            sw.reboot.assert_not_called()
+
+    def test_upgrade_reboot_vmhost(self):
+        upgrade = self._upgrade(install_args={"vmhost": True, "all_re": False})
+        upgrade.run()
+        for host in self.hosts:
+            sw = self.sws[host]
+            self.assertTrue(sw.install.call_args[1]["vmhost"])
+            sw.reboot.assert_called_once_with(vmhost=True, all_re=False)
+
+    def test_upgrade_same_host_ports(self):
+        self.hosts = [{"host": "r0", "port": 2201}, {"host": "r0", "port": 2202}]
+        self._mock_sw(MagicMock(hostname="r0")).install.side_effect = [
+            (True, "installed"),
+            (False, "ERROR: validation failed"),
+        ]
+        results = self._upgrade(wave_size=1, max_failures=1).run(reboot=False)
+        self.assertEqual(results[0], ("r0", True))
+        self.assertEqual(str(results[1][1]), "install: ERROR: validation failed")
+
+    def test_upgrade_install_max_failures(self):
+        self._mock_sw(MagicMock(hostname="r0")).install.side_effect = RpcError()
+        results = dict(self._upgrade(max_failures=1).install())
+        self.assertIsInstance(results["r0"], RpcError)
+        self.assertEqual(
+            [host for host, ok in results.items() if ok is True],
+            ["r1", "r2", "r3", "r4"],
+        )
+
+    def test_upgrade_reboot_wait(self):
+        self.down["r0"] = 2
+        upgrade = self._upgrade(reboot_wait=60, reboot_poll=30)
+        self.assertEqual(upgrade.reboot(), [(host, True) for host in self.hosts])
+        # the first batch was polled until r0 was back
+        self.assertEqual(
+            [c[0][0] for c in self.mock_time.sleep.call_args_list],
+            [60, 30, 30, 60, 60],
+        )
+
+    def test_upgrade_reboot_timeout(self):
+        self.down["r2"] = 100
+        self.mock_time.monotonic.side_effect = [0, 0, 2000]
+        results = dict(self._upgrade(reboot_timeout=1800).reboot())
+        self.assertEqual(results["r2"].msg, "not back within 1800 seconds")
+        self.assertIs(results["r3"], True)
+        # the batches after the failure are not rebooted
+        self.assertEqual(results["r4"].stage, "reboot")
+        self.assertNotIn("r4", self.rebooted)
+
+    def test_upgrade_reboot_unhealthy(self):
+        self.version["r1"] = "21.4R3.15"
+        health_check = MagicMock(return_value=True)
+        results = dict(
+            self._upgrade(health_check=health_check, max_failures=1).reboot()
+        )
+        self.assertEqual(results["r1"].msg, "running 21.4R3.15 rather than 22.4R1.10")
+        self.assertEqual(health_check.call_count, 4)
+        self.assertIs(results["r4"], True)
+
+    def test_upgrade_reboot_auth_error(self):
+        # no waiting for a device refusing the credentials
+        def _device(**kvargs):
+            dev = self._mock_device(**kvargs)
+            if kvargs["host"] in self.rebooted:
+                dev.open.side_effect = ConnectAuthError(dev)
+            return dev
+
+        with patch("jnpr.junos.fleet.Device") as mock_device:
+            mock_device.side_effect = _device
+            results = dict(self._upgrade(max_failures=5).reboot())
+        self.assertIsInstance(results["r0"], ConnectAuthError)
+        self.assertEqual(self.mock_time.sleep.call_count, 3)
+
+    def test_upgrade_progress_true(self):
+        self._upgrade(progress=True).install()
+        self.mock_sw.progress.assert_any_call(ANY, "installed junos-22.4R1.10.tgz")
+
+    def test_upgrade_checksum_error(self):
+        self.mock_sw.local_checksum.side_effect = IOError()
+        self.assertRaises(IOError, self._upgrade().copy)
+
+    def test_upgrade_invalid(self):
+        for name in ["copy_workers", "wave_size", "reboot_batch"]:
+            self.assertRaises(
+                ValueError, FleetUpgrade, self.hosts, "junos.tgz", **{name: 0}
+            )
@@ -4,7 +4,7 @@ except ImportError:
     import unittest
 
 import sys
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
 import nose2
 import six
@@ -73,17 +73,37 @@ class TestSerial(unittest.TestCase):
     def test_tty_serial_read_prompt(self):
         self.dev._tty._ser = MagicMock()
         self.dev._tty.EXPECT_TIMEOUT = 0.1
-        self.dev._tty._ser.readline.side_effect = ["", "test"]
+        self.dev._tty._ser.read.side_effect = lambda size: six.b("")
         self.assertEqual(self.dev._tty.read_prompt()[0], None)
 
+    def test_tty_serial_read_prompt_found(self):
+        self.dev._tty._ser = MagicMock()
+        self.dev._tty._ser.read.side_effect = [six.b("\r\nr"), six.b("oot@r1% ")]
+        self.dev._tty._ser.in_waiting = 8
+        self.assertEqual(self.dev._tty.read_prompt(), (six.b("\r\nroot@r1%"), "shell"))
+        self.dev._tty._ser.read.assert_called_with(8)
+
 
 class TestSerialWin(unittest.TestCase):
     @patch("jnpr.junos.transport.tty_serial.serial.Serial.open")
     @patch("jnpr.junos.transport.tty_serial.serial.Serial.read")
+    @patch(
+        "jnpr.junos.transport.tty_serial.serial.Serial.in_waiting",
+        new_callable=PropertyMock,
+        return_value=0,
+    )
     @patch("jnpr.junos.transport.tty_serial.serial.Serial.write")
     @patch("jnpr.junos.transport.tty_serial.serial.Serial.flush")
     @patch("jnpr.junos.transport.tty_serial.Serial.read_prompt")
-    def setUp(self, mock_read, mock_flush, mock_write, mock_serial_read, mock_open):
+    def setUp(
+        self,
+        mock_read,
+        mock_flush,
+        mock_write,
+        mock_in_waiting,
+        mock_serial_read,
+        mock_open,
+    ):
         self.dev = Console(port="COM4", baud=9600, mode="Serial")
         mock_read.side_effect = [
             ("login", "login"),
@@ -95,8 +115,7 @@ class TestSerialWin(unittest.TestCase):
                 "<!-- No zombies were killed during the creation of this user interface -->"
             ),
             six.b(""),
-            six.b(
-                """<!-- user root, class super-user -->
+            six.b("""<!-- user root, class super-user -->
 <hello xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
   <capabilities>
     <capability>urn:ietf:params:netconf:base:1.0</capability>
@@ -115,8 +134,7 @@ class TestSerialWin(unittest.TestCase):
   </capabilities>
   <session-id>7478</session-id>
 </hello>
-]]>]]>"""
-            ),
+]]>]]>"""),
             six.b(""),
         ]
         self.dev.open()
@@ -142,9 +160,9 @@ class TestSerialWin(unittest.TestCase):
     @patch("jnpr.junos.transport.tty.tty_netconf.close")
     @patch("jnpr.junos.transport.tty_serial.Serial._tty_close")
     def test_tty_serial_win_rpc_call(self, mock_serial_close, mock_close):
-        self.dev._tty.read = MagicMock()
+        self.dev._tty._tty_recv = MagicMock()
         self.dev._tty.rawwrite = MagicMock()
-        self.dev._tty.read.side_effect = [
+        self.dev._tty._tty_recv.side_effect = [
             six.b(
                 '<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0"'
                 ' xmlns:junos="http://xml.juniper.net/junos/15.1X49/junos">'
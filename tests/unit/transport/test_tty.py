@@ -1,4 +1,5 @@
 import logging
+import re
 
 try:
     import unittest2 as unittest
@@ -146,3 +147,56 @@ class TestTTY(unittest.TestCase):
             self.terminal._logout_state_machine()
         except RuntimeError as ex:
             self.assertEqual(str(ex), "logout_sm_failure")
+
+    def _recv(self, *chunks):
+        self.terminal._tty_recv = MagicMock(side_effect=list(chunks))
+
+    def test_tty_read_prompt(self):
+        self._recv(b"\r\nAmnesiac (ttyu0)\r\n\r\nlo", b"gin: ")
+        self.assertEqual(
+            self.terminal.read_prompt(),
+            (b"\r\nAmnesiac (ttyu0)\r\n\r\nlogin: ", "login"),
+        )
+
+    def test_tty_read_prompt_timeout(self):
+        self.terminal.EXPECT_TIMEOUT = 0.05
+        self.terminal._tty_recv = MagicMock(return_value=b"")
+        self.assertEqual(self.terminal.read_prompt(), (None, None))
+        # the remaining time is waited for
+        self.assertLessEqual(self.terminal._tty_recv.call_args[0][0], 0.05)
+
+    def test_tty_read_prompt_closed(self):
+        self._recv(b"logout", None)
+        self.assertEqual(self.terminal.read_prompt(), (None, None))
+
+    def test_tty_expect_lookback(self):
+        self.terminal._EXPECT_LOOKBACK = 4
+        pattern = re.compile(b"]]>]]>")
+        self._recv(b"x" * 100 + b"]]", b">]", b"]>", b"tail")
+        rxb, found = self.terminal._expect(pattern, 1)
+        self.assertEqual(rxb, b"x" * 100 + b"]]>]]>")
+        self.assertEqual(found.start(), 100)
+        # a match starting before the lookback is not searched again
+        self._recv(b"ab" + b"x" * 10, b"y", None)
+        pattern = re.compile(b"abx*y")
+        self.assertEqual(
+            self.terminal._expect(pattern, 1), (b"ab" + b"x" * 10 + b"y", None)
+        )
+
+    def test_tty_expect_unread(self):
+        pattern = re.compile(b"]]>]]>")
+        self._recv(b"<ok/>]]>]]>\r\nroot@r1% ")
+        self.assertEqual(self.terminal._expect(pattern, 1)[0], b"<ok/>]]>]]>")
+        # the text read after the match is read first by the next _expect()
+        self._recv(None)
+        self.assertEqual(self.terminal.read_prompt(), (b"\r\nroot@r1%", "shell"))
+        self.assertEqual(self.terminal._rx_pending, b" ")
+
+    @patch("jnpr.junos.transport.tty.monotonic")
+    def test_tty_expect_idle(self, mock_monotonic):
+        mock_monotonic.side_effect = [0, 0, 0.5, 0.6, 1.2, 1.5, 2.3]
+        self._recv(b"a", b"b", b"")
+        pattern = re.compile(b"c")
+        # each data read extends the timeout of 1 second
+        self.assertEqual(self.terminal._expect(pattern, 1, idle=True), (b"ab", None))
+        self.assertEqual(self.terminal._tty_recv.call_count, 3)
@@ -4,12 +4,13 @@ except ImportError:
     import unittest
 
 import os
-import select
+import re
 import socket
 from unittest.mock import MagicMock, patch
 
 import nose2
 import six
+from jnpr.junos.transport.tty import Terminal
 from jnpr.junos.transport.tty_netconf import tty_netconf
 from ncclient.operations import RPCError
 
@@ -18,12 +19,22 @@ class TestTTYNetconf(unittest.TestCase):
     def setUp(self):
         self.tty_net = tty_netconf(MagicMock())
         self.tty_net._tty.port = "/dev/tty"
-
-    @patch("jnpr.junos.transport.tty_netconf.tty_netconf._receive")
-    def test_open_at_shell_true(self, mock_rcv):
-        mock_rcv.return_value = (
-            b""
-            b"<!-- user lab, class j-superuser -->"
+        self.tty_net._tty._run_events = self._run_events
+        self.tty_net._tty._rx_unread.return_value = b""
+
+    def _run_events(self, events):
+        # the state-machines run with the _expect() of the mocked TTY
+        return Terminal._run_events(self.tty_net._tty, events)
+
+    def _expect(self, text):
+        found = re.search(six.b(r"\]\]>\]\]>"), text)
+        self.tty_net._tty._expect.return_value = (text, found)
+
+    def test_open_at_shell_true(self):
+        self._expect(
+            b"xml-mode netconf need-trailer\r\n"
+            b"<!-- No zombies were killed during the creation of this user interface -->\n"
+            b"<!-- user lab, class j-superuser -->\n"
             b'<hello xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">'
             b"<capabilities>"
             b"<capability>urn:ietf:params:netconf:base:1.0</capability>"
@@ -34,125 +45,138 @@ class TestTTYNetconf(unittest.TestCase):
             b"<capability>http://xml.juniper.net/dmi/system/1.0</capability>"
             b"</capabilities>"
             b"<session-id>82697</session-id>"
-            b"</hello>"
+            b"</hello>\n]]>]]>"
         )
         self.tty_net.open(True)
         self.tty_net._tty.write.assert_called_with("xml-mode netconf need-trailer")
+        self.assertEqual(self.tty_net._session_id, "82697")
+        self.assertTrue(self.tty_net.hello.startswith(six.b("<!-- No zombies")))
 
-    @patch("jnpr.junos.transport.tty_netconf.tty_netconf._receive")
-    @patch("jnpr.junos.transport.tty_netconf.timedelta")
-    def test_open_RuntimeError(self, mock_delta, mock_rcv):
-        mock_rcv.return_value = "]]>]]>"
-        self.tty_net._tty.read.return_value = six.b("testing")
-        from datetime import timedelta
-
-        mock_delta.return_value = timedelta(seconds=0.5)
+    def test_open_RuntimeError(self):
+        self._expect(six.b("testing"))
         self.assertRaises(RuntimeError, self.tty_net.open, False)
         self.tty_net._tty.write.assert_called_with("junoscript netconf need-trailer")
 
-    @patch("ncclient.operations.rpc.RPCReply.parse")
-    @patch("jnpr.junos.transport.tty_netconf.tty_netconf._receive")
-    def test_rpc(self, mock_rcv, mock_parse):
-        mock_rcv.return_value = "]]>]]>"
-        self.tty_net.rpc("get-interface-information")
+    def test_open_no_banner_RuntimeError(self):
+        self._expect(six.b("junoscript netconf need-trailer\r\nerror\r\n]]>]]>"))
+        self.assertRaises(RuntimeError, self.tty_net.open, False)
+
+    def test_rpc(self):
+        self.tty_net._tty._tty_recv.side_effect = [
+            six.b('<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">\r\n'),
+            six.b("  <ok/>\r\n</rpc-reply>\r\n]]>]]>"),
+        ]
+        rsp, root = self.tty_net.rpc_reply("get-interface-information")
         self.tty_net._tty.rawwrite.assert_called_with(
             six.b("<rpc><get-interface-information/></rpc>")
         )
+        self.assertEqual(
+            rsp,
+            '<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">'
+            "\n<ok/>\n</rpc-reply>",
+        )
+        self.assertEqual(root.tag, "{urn:ietf:params:xml:ns:netconf:base:1.0}rpc-reply")
 
-    @patch("jnpr.junos.transport.tty_netconf.tty_netconf._receive")
+    @patch("jnpr.junos.transport.tty_netconf.tty_netconf._read_message")
     def test_tty_netconf_single_rpc_error(self, mock_rcv):
-        mock_rcv.return_value = """
+        mock_rcv.return_value = six.b("""
         <rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">
         <rpc-error><error-type>protocol</error-type>
         <error-tag>operation-failed</error-tag>
         <error-severity>error</error-severity>
         <error-message>interface-ranges expansion failed
-        </error-message></rpc-error></rpc-reply>"""
+        </error-message></rpc-error></rpc-reply>""")
         self.assertRaises(RPCError, self.tty_net.rpc, "commit-configuration")
 
-    @patch("jnpr.junos.transport.tty_netconf.tty_netconf._receive")
+    @patch("jnpr.junos.transport.tty_netconf.tty_netconf._read_message")
     def test_tty_netconf_multi_rpc_error(self, mock_rcv):
-        mock_rcv.return_value = self._read_file("commit-configuration.xml")
-        self.assertRaises(RPCError, self.tty_net.rpc, "commit-configuration")
+        mock_rcv.return_value = six.b(self._read_file("commit-configuration.xml"))
+        with self.assertRaises(RPCError) as cm:
+            self.tty_net.rpc("commit-configuration")
+        self.assertEqual(len(cm.exception.errors), 2)
 
-    @patch("jnpr.junos.transport.tty_netconf.tty_netconf.rpc")
-    def test_close_force_true(self, mock_rpc):
+    def test_close_force_true(self):
+        self._expect(six.b("<rpc-reply><ok/></rpc-reply>\n]]>]]>"))
         self.tty_net.close(True)
-        mock_rpc.assert_called_with("close-session")
+        self.tty_net._tty.rawwrite.assert_called_with(
+            six.b("<rpc><close-session/></rpc>")
+        )
 
-    @patch("jnpr.junos.transport.tty_netconf.tty_netconf.rpc")
-    def test_close_force_false(self, mock_rpc):
+    def test_close_force_false(self):
         self.tty_net.close(False)
-        self.assertTrue("close-session" not in mock_rpc.call_args_list)
+        self.assertFalse(self.tty_net._tty.rawwrite.called)
+
+    def test_close_rpc_error(self):
+        self.tty_net.hello = six.b("<hello/>")
+        self._expect(
+            six.b(
+                '<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">'
+                "<rpc-error><error-severity>error</error-severity>"
+                "<error-message>oops</error-message></rpc-error>"
+                "</rpc-reply>]]>]]>"
+            )
+        )
+        self.assertRaises(RPCError, self.tty_net.close)
+
+    @patch("jnpr.junos.transport.tty_netconf.logger")
+    def test_close_no_reply(self, mock_logger):
+        self.tty_net.hello = six.b("<hello/>")
+        self._expect(six.b(""))
+        self.tty_net.close()
+        self.assertTrue(mock_logger.warning.called)
 
     @patch("jnpr.junos.transport.tty_netconf.tty_netconf.rpc")
     def test_zeroize_exception(self, mock_rpc):
         mock_rpc.side_effect = ValueError
         self.assertTrue(not self.tty_net.zeroize())
 
-    @patch("jnpr.junos.transport.tty_netconf.select.select")
-    def test_tty_netconf_receive_select_error(self, mock_select):
-        mock_select.side_effect = select.error
-        self.assertRaises(select.error, self.tty_net._receive)
+    def _recv(self, *chunks):
+        self.tty_net._tty._tty_recv.side_effect = [six.b(i) for i in chunks]
 
-    @patch("jnpr.junos.transport.tty_netconf.select.select")
-    def test_tty_netconf_receive_socket_error(self, mock_select):
-        mock_select.side_effect = socket.error
+    def test_tty_netconf_receive_socket_error(self):
+        self.tty_net._tty._tty_recv.side_effect = socket.error
         self.assertRaises(socket.error, self.tty_net._receive)
 
-    @patch("jnpr.junos.transport.tty_netconf.select.select")
-    def test_tty_netconf_receive_empty_line(self, mock_select):
-        rx = MagicMock()
-        rx.read_until.side_effect = iter([six.b(""), six.b("]]>]]>")])
-        mock_select.return_value = ([rx], [], [])
-        self.assertEqual(self.tty_net._receive().tag, "error-in-receive")
+    def test_tty_netconf_receive_closed(self):
+        self.tty_net._tty._tty_recv.side_effect = [six.b("<rpc-reply>"), None]
+        self.assertRaises(EOFError, self.tty_net._receive)
 
-    @patch("jnpr.junos.transport.tty_netconf.select.select")
-    def test_tty_netconf_receive_splited_eom(self, mock_select):
-        rx = MagicMock()
-        rx.read_until.side_effect = iter(["testing]", "]>", "]]>"])
-        mock_select.return_value = ([rx], [], [])
+    def test_tty_netconf_receive_empty_line(self):
+        self._recv("", "]]>]]>")
         self.assertEqual(self.tty_net._receive().tag, "error-in-receive")
 
-    @patch("jnpr.junos.transport.tty_netconf.select.select")
-    def test_tty_netconf_receive_splited_eom(self, mock_select):
-        rx = MagicMock()
-        rx.read_until.side_effect = iter([six.b(i) for i in ["testing]", "]>", "]]>"]])
-        mock_select.return_value = ([rx], [], [])
+    def test_tty_netconf_receive_splited_eom(self):
+        self._recv("testing]", "]>", "]]>")
         self.assertEqual(self.tty_net._receive().tag, "error-in-receive")
 
-    @patch("jnpr.junos.transport.tty_netconf.select.select")
-    def test_tty_netconf_receive_XMLSyntaxError(self, mock_select):
-        rx = MagicMock()
-
-        rx.read_until.side_effect = iter(
-            [six.b("<rpc-reply>ok<dummy></rpc-reply>"), six.b("\n]]>]]>")]
+    def test_tty_netconf_receive_splited_eom_xml(self):
+        self._recv("<rpc-reply>\r\n  <ok/>\r\n</rpc-reply>]]", ">]]", ">\n")
+        self.assertEqual(
+            self.tty_net._receive(), six.b("<rpc-reply>\n<ok/>\n</rpc-reply>")
         )
-        mock_select.return_value = ([rx], [], [])
+
+    def test_tty_netconf_receive_XMLSyntaxError(self):
+        self._recv("<rpc-reply>ok<dummy></rpc-reply>", "\n]]>]]>")
         self.assertEqual(
             self.tty_net._receive(), six.b("<rpc-reply>ok<dummy/></rpc-reply>")
         )
 
-    @patch("jnpr.junos.transport.tty_netconf.select.select")
-    def test_tty_netconf_receive_XMLSyntaxError_eom_in_center(self, mock_select):
-        rx = MagicMock()
-        rx.read_until.side_effect = iter(
-            [six.b("<rpc-reply>ok</rpc-reply>"), six.b("]]>]]>\ndummy")]
-        )
-        mock_select.return_value = ([rx], [], [])
+    def test_tty_netconf_receive_XMLSyntaxError_eom_in_center(self):
+        self._recv("<rpc-reply>ok</rpc-reply>", "]]>]]>\ndummy")
         self.assertEqual(self.tty_net._receive(), six.b("<rpc-reply>ok</rpc-reply>"))
 
-    @patch("jnpr.junos.transport.tty_netconf.select.select")
-    def test_tty_netconf_receive_xmn_error(self, mock_select):
-        rx = MagicMock()
-        rx.read_until.side_effect = iter(
-            [
-                six.b("<message>ok</message>"),
-                six.b("\n</xnm:error>\n"),
-                six.b("]]>]]>\ndummy"),
-            ]
-        )
-        mock_select.return_value = ([rx], [], [])
+    def test_tty_netconf_receive_xmn_error(self):
+        self._recv("<message>ok</message>", "\n</xnm:error>\n", "]]>]]>\ndummy")
+        self.assertEqual(self.tty_net._receive(), six.b("<message>ok</message>"))
+
+    def test_tty_netconf_receive_xnm_error_message(self):
+        self._recv("error\n<message>ok</message>\n</xnm:error>\n", "]]>]]>")
+        rsp = self.tty_net._receive()
+        self.assertEqual(rsp.tag, "error-in-receive")
+        self.assertEqual(rsp.findtext("message"), "ok")
+
+    def test_tty_netconf_receive_not_xml(self):
+        self._recv("error: syntax error\n", "]]>]]>")
         self.assertEqual(self.tty_net._receive().tag, "error-in-receive")
 
     def _read_file(self, fname):
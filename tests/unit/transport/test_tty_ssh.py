@@ -61,3 +61,29 @@ class TestTTYSSH(unittest.TestCase):
             content = MagicMock()
             self.ssh_conn.rawwrite(content)
             content.decode.assert_called_with("utf-8")
+
+    @patch("jnpr.junos.transport.tty_ssh.select.select")
+    def test_read_prompt(self, mock_select):
+        self.ssh_conn._tty_open()
+        mock_select.return_value = ([self.ssh_conn._ssh], [], [])
+        self.ssh_conn._ssh.recv.side_effect = [b"\r\nlogin", b": "]
+        self.assertEqual(self.ssh_conn.read_prompt(), (b"\r\nlogin: ", "login"))
+        self.ssh_conn._ssh.recv.assert_called_with(SSH.MAX_BUFFER)
+
+    @patch("jnpr.junos.transport.tty_ssh.select.select")
+    def test_read_prompt_closed(self, mock_select):
+        self.ssh_conn._tty_open()
+        mock_select.return_value = ([self.ssh_conn._ssh], [], [])
+        self.ssh_conn._ssh.recv.return_value = b""
+        self.assertEqual(self.ssh_conn.read_prompt(), (None, None))
+
+    @patch("jnpr.junos.transport.tty_ssh.select.select")
+    def test_read_until(self, mock_select):
+        self.ssh_conn._tty_open()
+        mock_select.side_effect = [([self.ssh_conn._ssh], [], [])] * 2 + [([], [], [])]
+        self.ssh_conn._ssh.recv.side_effect = [b"<ok/>]]>", b"]]>"]
+        self.assertEqual(self.ssh_conn._rx.read_until(b"]]>]]>", 0.1), b"<ok/>]]>]]>")
+        self.ssh_conn.READ_PROMPT_DELAY = 0.01
+        mock_select.side_effect = None
+        mock_select.return_value = ([], [], [])
+        self.assertIsNone(self.ssh_conn._rx.read_until(b"]]>]]>", 0.1))
@@ -54,20 +54,42 @@ class TestTTYTelnet(unittest.TestCase):
         tel_conn.rawwrite("<rpc>")
         tel_conn._tn.write.assert_called_with("<rpc>")
 
-    def test_read_prompt_RuntimeError(self):
-        self.tel_conn.expect = MagicMock()
-        self.tel_conn.expect = (None, None, "port already in use")
+    @patch("jnpr.junos.transport.tty.sleep")
+    @patch("jnpr.junos.transport.tty_telnet.select.select")
+    def test_read_prompt_RuntimeError(self, mock_select, mock_sleep):
+        self.tel_conn.EXPECT_TIMEOUT = 0.01
+        self.tel_conn._tn.read_very_eager.return_value = six.b("")
+        mock_select.return_value = ([], [], [])
         self.assertRaises(RuntimeError, self.tel_conn._login_state_machine)
 
-    def test_read_prompt_in_use_RuntimeError(self):
-        self.tel_conn.expect = MagicMock()
-        self.tel_conn._tn.expect.return_value = (
-            None,
-            None,
-            six.b("port already in use"),
+    @patch("jnpr.junos.transport.tty_telnet.select.select")
+    def test_read_prompt_in_use_RuntimeError(self, mock_select):
+        self.tel_conn.EXPECT_TIMEOUT = 0.01
+        chunks = [six.b("port already in use")]
+        self.tel_conn._tn.read_very_eager.side_effect = lambda: (
+            chunks.pop() if chunks else six.b("")
         )
+        mock_select.return_value = ([], [], [])
         self.assertRaises(RuntimeError, self.tel_conn._login_state_machine)
 
+    @patch("jnpr.junos.transport.tty_telnet.select.select")
+    def test_read_prompt_select(self, mock_select):
+        # the text buffered by telnetlib is read before waiting on the socket
+        self.tel_conn._tn.read_very_eager.side_effect = [
+            six.b("\r\nlogin: "),
+            six.b(""),
+            six.b("root@r1% "),
+        ]
+        mock_select.return_value = ([self.tel_conn._tn], [], [])
+        self.assertEqual(self.tel_conn.read_prompt(), (six.b("\r\nlogin: "), "login"))
+        self.assertFalse(mock_select.called)
+        self.assertEqual(self.tel_conn.read_prompt(), (six.b("root@r1%"), "shell"))
+        self.assertTrue(mock_select.called)
+
+    def test_read_prompt_eof(self):
+        self.tel_conn._tn.read_very_eager.side_effect = EOFError
+        self.assertEqual(self.tel_conn.read_prompt(), (None, None))
+
     def test_tty_telnet_rawwrite_sys_py3(self):
         with patch.object(sys.modules["sys"], "version", "3.x") as mock_sys:
             self.tel_conn._tty_open()
@@ -1,5 +1,7 @@
 import os
+import shutil
 import sys
+import tempfile
 import unittest
 from unittest.mock import MagicMock, patch
 
@@ -867,6 +869,121 @@ class TestConfig(unittest.TestCase):
             mock_exec.call_args[0][0].attrib, {"format": "text", "action": "override"}
         )
 
+    def _snapshot_rpcs(self, config="system { host-name r1; }"):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.commit = etree.XML(
+            "<commit-information><commit-history>"
+            "<sequence-number>0</sequence-number><user>test</user>"
+            "<client>cli</client>"
+            '<date-time seconds="1600000000">2020-09-13 12:26:40 UTC</date-time>'
+            "</commit-history><commit-history>"
+            "<sequence-number>1</sequence-number><user>test</user>"
+            "<client>cli</client><date-time>2020-09-12 12:26:40 UTC</date-time>"
+            "</commit-history></commit-information>"
+        )
+        self.conf.rpc.get_commit_information = MagicMock(
+            side_effect=lambda: self.commit
+        )
+        self.config = config
+        self.conf.rpc.get_config = MagicMock(
+            side_effect=lambda **kvargs: etree.XML(
+                "<configuration-text>%s</configuration-text>" % self.config
+            )
+        )
+
+    def _commit(self, seconds):
+        self.commit[0].find("date-time").set("seconds", seconds)
+
+    def test_config_snapshot(self):
+        self._snapshot_rpcs()
+        snap = self.conf.snapshot(self.tmpdir)
+        self.assertTrue(snap["changed"])
+        self.assertEqual(snap["format"], "text")
+        self.assertEqual(snap["commit"]["seconds"], "1600000000")
+        self.assertEqual(snap["commit"]["sequence-number"], "0")
+        self.assertTrue(snap["file"].endswith(".conf"))
+        with open(snap["file"]) as fp:
+            self.assertEqual(fp.read(), "system { host-name r1; }")
+        self.conf.rpc.get_config.assert_called_once_with(
+            options={"database": "committed", "format": "text"}
+        )
+        # no commit since, the configuration is not fetched
+        snap2 = self.conf.snapshot(self.tmpdir)
+        self.assertFalse(snap2["changed"])
+        self.assertEqual(snap2["file"], snap["file"])
+        self.assertEqual(self.conf.rpc.get_config.call_count, 1)
+        self._commit("1600000100")
+        self.config = "system { host-name r2; }"
+        snap3 = self.conf.snapshot(self.tmpdir)
+        self.assertTrue(snap3["changed"])
+        self.assertNotEqual(snap3["file"], snap["file"])
+        snapshots = self.conf.snapshots(self.tmpdir)
+        self.assertEqual([s["file"] for s in snapshots], [snap["file"], snap3["file"]])
+        self.assertNotIn("changed", snapshots[0])
+
+    def test_config_snapshot_same_config(self):
+        self._snapshot_rpcs()
+        snap = self.conf.snapshot(self.tmpdir)
+        # an empty commit
+        self._commit("1600000100")
+        snap2 = self.conf.snapshot(self.tmpdir)
+        self.assertFalse(snap2["changed"])
+        self.assertEqual(snap2["file"], snap["file"])
+        self.assertEqual(snap2["commit"]["seconds"], "1600000100")
+        self.assertEqual(self.conf.rpc.get_config.call_count, 2)
+        # the newer commit is recorded
+        self.conf.snapshot(self.tmpdir)
+        self.assertEqual(self.conf.rpc.get_config.call_count, 2)
+        self.assertEqual(len(self.conf.snapshots(self.tmpdir)), 1)
+
+    def test_config_snapshot_force_and_format(self):
+        self._snapshot_rpcs()
+        self.conf.snapshot(self.tmpdir)
+        self.conf.snapshot(self.tmpdir, force=True)
+        self.assertEqual(self.conf.rpc.get_config.call_count, 2)
+        self.conf.rpc.get_config.side_effect = lambda **kvargs: {"configuration": {}}
+        snap = self.conf.snapshot(self.tmpdir, format="json")
+        self.assertTrue(snap["changed"])
+        self.assertTrue(snap["file"].endswith(".json"))
+        with open(snap["file"]) as fp:
+            self.assertEqual(fp.read(), '{\n  "configuration": {}\n}')
+        self.assertRaises(ValueError, self.conf.snapshot, self.tmpdir, format="yaml")
+
+    def test_config_snapshot_history(self):
+        self._snapshot_rpcs()
+        files = []
+        for seconds in range(4):
+            self._commit(str(seconds))
+            self.config = "version %d;" % seconds
+            files.append(self.conf.snapshot(self.tmpdir, history=2)["file"])
+        self.assertEqual(len(set(files)), 4)
+        self.assertEqual(
+            [s["file"] for s in self.conf.snapshots(self.tmpdir)], files[2:]
+        )
+        self.assertEqual(
+            sorted(os.listdir(self.tmpdir)),
+            sorted([os.path.basename(f) for f in files[2:]] + ["snapshots.json"]),
+        )
+
+    def test_config_snapshot_no_commit_history(self):
+        self._snapshot_rpcs()
+        self.conf.rpc.get_commit_information.side_effect = RpcError()
+        snap = self.conf.snapshot(self.tmpdir)
+        self.assertIsNone(snap["commit"])
+        self.assertFalse(self.conf.snapshot(self.tmpdir)["changed"])
+        self.assertEqual(self.conf.rpc.get_config.call_count, 2)
+        self.conf.rpc.get_commit_information.side_effect = RpcTimeoutError(
+            self.dev, "get-commit-information", 30
+        )
+        self.assertRaises(RpcTimeoutError, self.conf.snapshot, self.tmpdir)
+
+    def test_config_snapshot_file_removed(self):
+        self._snapshot_rpcs()
+        snap = self.conf.snapshot(self.tmpdir)
+        os.remove(snap["file"])
+        self.assertTrue(self.conf.snapshot(self.tmpdir)["changed"])
+
     def _read_file(self, fname):
         fpath = os.path.join(os.path.dirname(__file__), "rpc-reply", fname)
         foo = open(fpath).read()
@@ -1,11 +1,11 @@
 import sys
 import unittest
 from contextlib import contextmanager
-from unittest.mock import patch
+from unittest.mock import MagicMock, call, patch
 
 import nose2
 from jnpr.junos import Device
-from jnpr.junos.utils.scp import SCP
+from jnpr.junos.utils.scp import SCP, BandwidthLimit
 from six import StringIO
 
 __author__ = "Rick Sherman, Nitin Kumar"
@@ -181,6 +181,55 @@ class TestScp(unittest.TestCase):
         self.assertFalse(mock_sshclient.mock_calls[0][2]["allow_agent"])
         self.assertFalse(mock_sshclient.mock_calls[0][2]["look_for_keys"])
 
+    @patch("paramiko.SSHClient")
+    @patch("scp.SCPClient.put")
+    @patch("scp.SCPClient.__init__")
+    def test_scp_bandwidth(self, mock_scpclient, mock_put, mock_sshclient):
+        mock_scpclient.return_value = None
+        limit = MagicMock(spec=BandwidthLimit)
+        reports = []
+
+        def fn(file, total, tfd):
+            reports.append(tfd)
+
+        with SCP(self.dev, progress=fn, bandwidth=limit) as scp:
+            scp.put("test.tgz")
+        progress = mock_scpclient.mock_calls[0][2]["progress"]
+        self.assertNotIn("bandwidth", mock_scpclient.mock_calls[0][2])
+        progress("test.tgz", 100, 0)
+        progress("test.tgz", 100, 40)
+        progress("test.tgz", 100, 100)
+        self.assertEqual(limit.consume.call_args_list, [call(0), call(40), call(60)])
+        self.assertEqual(reports, [0, 40, 100])
+
+    @patch("paramiko.SSHClient")
+    @patch("scp.SCPClient.put")
+    @patch("scp.SCPClient.__init__")
+    def test_scp_bandwidth_rate(self, mock_scpclient, mock_put, mock_sshclient):
+        mock_scpclient.return_value = None
+        with SCP(self.dev, bandwidth=1000) as scp:
+            scp.put("test.tgz")
+        with patch("jnpr.junos.utils.scp.time.sleep") as mock_sleep:
+            mock_scpclient.mock_calls[0][2]["progress"]("test.tgz", 100, 100)
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 0.1, places=2)
+
+    @patch("jnpr.junos.utils.scp.time")
+    def test_bandwidth_limit(self, mock_time):
+        mock_time.monotonic.return_value = 0
+        limit = BandwidthLimit(100)
+        limit.consume(50)
+        mock_time.sleep.assert_called_with(0.5)
+        # the bytes of the transfers sharing the limit add up
+        limit.consume(100)
+        mock_time.sleep.assert_called_with(1.5)
+        # no credit is accumulated while idle
+        mock_time.monotonic.return_value = 10
+        limit.consume(50)
+        mock_time.sleep.assert_called_with(0.5)
+
+    def test_bandwidth_limit_invalid(self):
+        self.assertRaises(ValueError, BandwidthLimit, 0)
+
     @contextmanager
     def capture(self, command, *args, **kwargs):
         out, sys.stdout = sys.stdout, StringIO()
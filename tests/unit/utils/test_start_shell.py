@@ -104,3 +104,73 @@ class TestStartShell(unittest.TestCase):
         """
         ]
         self.assertTrue(self.shell.run("show version", this=None)[0])
+
+    @patch("jnpr.junos.utils.start_shell.select")
+    def test_startshell_wait_for_prompt_split(self, mock_select):
+        mock_select.return_value = ([1], [], [])
+        self.shell._chan = MagicMock()
+        self.shell._chan.recv.side_effect = [b"ls\r\nuser %", b" ", b"more"]
+        self.assertEqual(self.shell.wait_for(), ["ls\r\nuser %", " "])
+
+    def _recv(self, *chunks):
+        patcher = patch("jnpr.junos.utils.start_shell.select")
+        patcher.start().return_value = ([1], [], [])
+        self.addCleanup(patcher.stop)
+        self.shell._chan = MagicMock()
+        self.shell._chan.recv.side_effect = list(chunks)
+
+    def test_startshell_run_iter(self):
+        self._recv(
+            b"cat messages\r\nline 1\r\nli",
+            b"ne 2\r\n\xc3",
+            b"\xa9\r\nuser %",
+            b" ",
+            b"echo $?\r\n0\r\nuser % ",
+        )
+        lines = self.shell.run_iter("cat messages")
+        self.assertEqual(next(lines), "cat messages\r\n")
+        self.assertEqual(next(lines), "line 1\r\n")
+        self.assertEqual(list(lines), ["line 2\r\n", "é\r\n", "user % "])
+        self.assertTrue(self.shell.last_ok)
+        self.assertEqual(
+            self.shell._chan.send.call_args_list,
+            [call("cat messages"), call("\n"), call("echo $?"), call("\n")],
+        )
+
+    def test_startshell_run_iter_batch(self):
+        self._recv(b"cd /var/log; false\r\nuser % ", b"echo $?\r\n1\r\nuser % ")
+        self.assertEqual(
+            list(self.shell.run_iter(["cd /var/log", "false"])),
+            ["cd /var/log; false\r\n", "user % "],
+        )
+        self.assertFalse(self.shell.last_ok)
+        self.shell._chan.send.assert_any_call("cd /var/log; false")
+
+    def test_startshell_run_iter_closed(self):
+        self._recv(b"tcpdump\r\npacket 1\r\npacket 2\r\n", b"^C\r\nuser % ")
+        lines = self.shell.run_iter("tcpdump", timeout=10)
+        self.assertEqual(next(lines), "tcpdump\r\n")
+        lines.close()
+        # the command is interrupted and the prompt read
+        self.shell._chan.send.assert_called_with("\x03")
+        self.assertEqual(self.shell._chan.recv.call_count, 2)
+        self.assertFalse(self.shell.last_ok)
+
+    def test_startshell_run_iter_this_None(self):
+        self._recv(b"show version\r\nJUNOS", b"")
+        self.assertEqual(
+            list(self.shell.run_iter("show version", this=None)),
+            ["show version\r\n", "JUNOS"],
+        )
+        self.assertTrue(self.shell.last_ok)
+
+    @patch("jnpr.junos.utils.start_shell.time.monotonic")
+    def test_startshell_run_iter_timeout(self, mock_monotonic):
+        # the timeout starts over with each output received
+        mock_monotonic.side_effect = [0, 0, 9, 9, 18, 18, 27, 40]
+        self._recv(b"tail -f messages\r\n", b"line 1\r\n", b"line 2")
+        self.assertEqual(
+            list(self.shell.run_iter("tail -f messages", this=r"\$ ", timeout=10)),
+            ["tail -f messages\r\n", "line 1\r\n", "line 2"],
+        )
+        self.assertFalse(self.shell.last_ok)
@@ -151,6 +151,11 @@ class TestSW(unittest.TestCase):
         self.sw.put(package)
         self.assertTrue(call("test.tgz", "/var/tmp") in mock_scp_put.mock_calls)
 
+    @patch("jnpr.junos.utils.sw.SCP")
+    def test_sw_put_bandwidth(self, mock_scp):
+        self.sw.put("test.tgz", bandwidth=1000)
+        mock_scp.assert_called_with(self.dev, progress=None, bandwidth=1000)
+
     @patch("jnpr.junos.utils.sw.FTP")
     def test_sw_put_ftp(self, mock_ftp_put):
         dev = Device(